@@ -0,0 +1,91 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+Multi-threaded throughput benchmark of the fake Shared Data Layer (SDL) database backend.
+Every thread executes a mix of 'set', 'get', 'set_if' and 'add_member' operations in a namespace
+of its own or, with '--shared-namespace', all the threads use the same namespace. Counters
+incremented with 'set_if' are verified after the run.
+
+Usage (ricsdl package installed or in PYTHONPATH):
+    python fake_dict_db_threads.py --threads 1 2 4 8 --operations 20000
+"""
+import argparse
+import threading
+import time
+from ricsdl.backend.fake_dict_db import FakeDictBackend
+from ricsdl.configuration import _Configuration
+
+
+def _worker(db, ns, operations, barrier):
+    key = 'counter'
+    barrier.wait()
+    for i in range(operations // 4):
+        db.set(ns, {'key-{}'.format(i % 1000): b'value'})
+        db.get(ns, ['key-{}'.format(i % 1000)])
+        while True:
+            old = db.get(ns, [key])[key]
+            if db.set_if(ns, key, old, b'%d' % (int(old) + 1)):
+                break
+        db.add_member(ns, 'group', {b'%d' % (i % 1000)})
+
+
+def run(threads, operations, shared_namespace):
+    """Run the benchmark with a number of threads and return operations per second."""
+    db = FakeDictBackend(_Configuration(fake_db_backend='dict'))
+    namespaces = ['ns' if shared_namespace else 'ns-{}'.format(i) for i in range(threads)]
+    for ns in set(namespaces):
+        db.set(ns, {'counter': b'0'})
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=_worker, args=(db, ns, operations, barrier))
+               for ns in namespaces]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    expected = (operations // 4) * namespaces.count(namespaces[0])
+    counter = int(db.get(namespaces[0], ['counter'])['counter'])
+    if counter != expected:
+        raise AssertionError("Lost updates: counter {}, expected {}".format(counter, expected))
+    # 'set_if' retries are not counted.
+    return threads * (operations // 4) * 4 / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Numbers of threads to run the benchmark with")
+    parser.add_argument('--operations', type=int, default=20000,
+                        help="Number of operations per thread")
+    parser.add_argument('--shared-namespace', action='store_true',
+                        help="All the threads use the same namespace")
+    args = parser.parse_args()
+    for threads in args.threads:
+        ops = run(threads, args.operations, args.shared_namespace)
+        print('threads: {:3d}  operations/s: {:12.0f}'.format(threads, ops))
+
+
+if __name__ == '__main__':
+    main()
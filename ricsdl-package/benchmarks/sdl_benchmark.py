@@ -0,0 +1,395 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+Benchmark of the Shared Data Layer (SDL) SyncStorage operations.
+
+Every operation is measured with every combination of the given key counts, value sizes and
+thread counts against the fake dictionary database backend ('dict') and against the Redis
+backend ('redis'). The Redis backend is connected to an in-process Redis server stand-in, or to
+a real Redis server (with the DBaaS module) given with '--redis-address'.
+
+Every thread uses a namespace of its own and all the threads share one SyncStorage instance.
+The latency of every call is measured, preparation steps, like refilling the removed keys, are
+not. Throughput is the number of measured calls divided by the time when at least one thread was
+in a measured call. Operations not depending on the key count are measured with one key only.
+Operation 'event_delivery' measures the latency from 'set_and_publish' until the event callback
+is called.
+
+Results are written as a table, JSON or CSV. A JSON result file of an earlier run, for example
+with an earlier SDL version, can be given with '--baseline' to compare the throughput.
+
+Usage (from the ricsdl-package directory, which provides the ricsdl package and the Redis
+server stand-in of the tests):
+    PYTHONPATH=. python benchmarks/sdl_benchmark.py --backends dict redis --keys 1 100 \\
+        --value-sizes 16 4096 --threads 1 4 --format json --output results.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from collections import namedtuple
+import ricsdl
+from ricsdl.syncstorage import SyncStorage
+from tests.backend.fake_redis_server import FakeRedisServer
+
+
+_DELIVERY_TIMEOUT = 5.0
+
+_FIELDS = ['backend', 'operation', 'keys', 'value_size', 'threads', 'calls', 'throughput',
+           'p50_us', 'p99_us', 'mean_us', 'max_us']
+
+
+class _Context:
+    """Data of one benchmark thread."""
+    def __init__(self, sdl, index, keys, value_size, delivered):
+        self.sdl = sdl
+        self.ns = 'sdl-benchmark-{}'.format(index)
+        self.key_set = {'key-{}'.format(i) for i in range(keys)}
+        self.values = (b'a' * value_size, b'b' * value_size)
+        self.data_map = {key: self.values[0] for key in self.key_set}
+        self.members = {b'member-%d' % i for i in range(keys)}
+        self.events = {'events': 'event'}
+        self.delivery_channel = 'delivery-{}'.format(index)
+        self.delivered = delivered
+        self.lock = sdl.get_lock_resource(self.ns, 'lock', 10)
+
+    def fill(self):
+        self.sdl.set(self.ns, self.data_map)
+        self.sdl.add_member(self.ns, 'group', self.members)
+
+    def swap_value(self, i, publish=False):
+        old, new = self.values[i % 2], self.values[(i + 1) % 2]
+        if publish:
+            return self.sdl.set_if_and_publish(self.ns, self.events, 'key-0', old, new)
+        return self.sdl.set_if(self.ns, 'key-0', old, new)
+
+    def lock_and_unlock(self):
+        self.lock.acquire()
+        self.lock.release()
+
+    def run_batch(self):
+        batch = self.sdl.batch()
+        batch.set(self.ns, self.data_map)
+        batch.get(self.ns, self.key_set)
+        batch.execute()
+
+    def deliver_event(self):
+        self.delivered.clear()
+        self.sdl.set_and_publish(self.ns, {self.delivery_channel: 'event'},
+                                 {'key-0': self.values[0]})
+        if not self.delivered.wait(_DELIVERY_TIMEOUT):
+            raise RuntimeError("Event was not delivered to channel {}".
+                               format(self.delivery_channel))
+
+
+# Measured call and an optional preparation step, both called with the context and the
+# iteration index, and whether the call depends on the key count.
+_Operation = namedtuple('_Operation', ['run', 'prepare', 'multi_key'])
+
+
+def _set_first_key(c, i):
+    c.sdl.set(c.ns, {'key-0': c.values[0]})
+
+
+def _remove_first_key(c, i):
+    c.sdl.remove(c.ns, 'key-0')
+
+
+def _set_keys(c, i):
+    c.sdl.set(c.ns, c.data_map)
+
+
+def _add_members(c, i):
+    c.sdl.add_member(c.ns, 'group', c.members)
+
+
+OPERATIONS = {
+    'set': _Operation(lambda c, i: c.sdl.set(c.ns, c.data_map), None, True),
+    'get': _Operation(lambda c, i: c.sdl.get(c.ns, c.key_set), None, True),
+    'find_keys': _Operation(lambda c, i: c.sdl.find_keys(c.ns, 'key-*'), None, True),
+    'find_and_get': _Operation(lambda c, i: c.sdl.find_and_get(c.ns, 'key-*'), None, True),
+    'iter_keys': _Operation(lambda c, i: list(c.sdl.iter_keys(c.ns, 'key-*')), None, True),
+    'set_if': _Operation(lambda c, i: c.swap_value(i), None, False),
+    'set_if_not_exists': _Operation(
+        lambda c, i: c.sdl.set_if_not_exists(c.ns, 'key-0', c.values[0]),
+        _remove_first_key, False),
+    'remove': _Operation(lambda c, i: c.sdl.remove(c.ns, c.key_set), _set_keys, True),
+    'remove_if': _Operation(lambda c, i: c.sdl.remove_if(c.ns, 'key-0', c.values[0]),
+                            _set_first_key, False),
+    'remove_all': _Operation(lambda c, i: c.sdl.remove_all(c.ns), _set_keys, True),
+    'add_member': _Operation(lambda c, i: c.sdl.add_member(c.ns, 'group', c.members),
+                             lambda c, i: c.sdl.remove_group(c.ns, 'group'), True),
+    'remove_member': _Operation(lambda c, i: c.sdl.remove_member(c.ns, 'group', c.members),
+                                _add_members, True),
+    'remove_group': _Operation(lambda c, i: c.sdl.remove_group(c.ns, 'group'),
+                               _add_members, True),
+    'get_members': _Operation(lambda c, i: c.sdl.get_members(c.ns, 'group'), None, True),
+    'is_member': _Operation(lambda c, i: c.sdl.is_member(c.ns, 'group', b'member-0'),
+                            None, False),
+    'group_size': _Operation(lambda c, i: c.sdl.group_size(c.ns, 'group'), None, False),
+    'set_and_publish': _Operation(
+        lambda c, i: c.sdl.set_and_publish(c.ns, c.events, c.data_map), None, True),
+    'set_if_and_publish': _Operation(lambda c, i: c.swap_value(i, publish=True), None, False),
+    'set_if_not_exists_and_publish': _Operation(
+        lambda c, i: c.sdl.set_if_not_exists_and_publish(c.ns, c.events, 'key-0', c.values[0]),
+        _remove_first_key, False),
+    'remove_and_publish': _Operation(
+        lambda c, i: c.sdl.remove_and_publish(c.ns, c.events, c.key_set), _set_keys, True),
+    'remove_if_and_publish': _Operation(
+        lambda c, i: c.sdl.remove_if_and_publish(c.ns, c.events, 'key-0', c.values[0]),
+        _set_first_key, False),
+    'remove_all_and_publish': _Operation(
+        lambda c, i: c.sdl.remove_all_and_publish(c.ns, c.events), _set_keys, True),
+    'batch': _Operation(lambda c, i: c.run_batch(), None, True),
+    'lock': _Operation(lambda c, i: c.lock_and_unlock(), None, False),
+    'event_delivery': _Operation(lambda c, i: c.deliver_event(), None, False),
+}
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _worker(ctx, operation, warmup, iterations, barrier, latencies):
+    run, prepare = operation.run, operation.prepare
+    perf_counter = time.perf_counter
+    barrier.wait()
+    for i in range(warmup + iterations):
+        if prepare is not None:
+            prepare(ctx, i)
+        start = perf_counter()
+        run(ctx, i)
+        elapsed = perf_counter() - start
+        if i >= warmup:
+            latencies.append((start, elapsed))
+
+
+def run_case(sdl, delivered, operation, keys, value_size, threads, iterations, warmup):
+    """Measure one operation and return the start times and latencies of the calls of every
+    thread."""
+    contexts = [_Context(sdl, index, keys, value_size, delivered[index])
+                for index in range(threads)]
+    for ctx in contexts:
+        ctx.fill()
+    latencies = [[] for _ in contexts]
+    barrier = threading.Barrier(threads)
+    workers = [threading.Thread(target=_worker,
+                                args=(ctx, operation, warmup, iterations, barrier, latencies[i]))
+               for i, ctx in enumerate(contexts)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    for ctx in contexts:
+        sdl.remove_all(ctx.ns)
+    if any(len(thread_latencies) != iterations for thread_latencies in latencies):
+        raise RuntimeError("Benchmark thread failed")
+    return latencies
+
+
+def _busy_time(calls):
+    """Return the length of the union of the time intervals of the calls."""
+    busy = 0.0
+    busy_end = None
+    for start, elapsed in sorted(calls):
+        end = start + elapsed
+        if busy_end is None or start >= busy_end:
+            busy += elapsed
+            busy_end = end
+        elif end > busy_end:
+            busy += end - busy_end
+            busy_end = end
+    return busy
+
+
+def summarize(latencies):
+    """Return throughput and latency statistics of the calls of every thread."""
+    calls = [call for thread_calls in latencies for call in thread_calls]
+    all_latencies = sorted(elapsed for _, elapsed in calls)
+    throughput = len(calls) / _busy_time(calls)
+    return {
+        'calls': len(all_latencies),
+        'throughput': round(throughput, 1),
+        'p50_us': round(_percentile(all_latencies, 0.50) * 1e6, 1),
+        'p99_us': round(_percentile(all_latencies, 0.99) * 1e6, 1),
+        'mean_us': round(sum(all_latencies) / len(all_latencies) * 1e6, 1),
+        'max_us': round(all_latencies[-1] * 1e6, 1),
+    }
+
+
+def _delivery_cb(delivered):
+    def cb(channel, events):
+        delivered.set()
+    return cb
+
+
+class _Backend:
+    """SyncStorage instance of a backend, subscribed to the event delivery channels."""
+    def __init__(self, name, redis_address, max_threads):
+        self.server = None
+        if name == 'dict':
+            self.sdl = SyncStorage(fake_db_backend='dict')
+        else:
+            if redis_address is None:
+                self.server = FakeRedisServer()
+                self.server.start()
+                redis_address = '{}:{}'.format(self.server.host, self.server.port)
+            self.__set_redis_environment(redis_address)
+            self.sdl = SyncStorage()
+        self.delivered = [threading.Event() for _ in range(max_threads)]
+        for index, event in enumerate(self.delivered):
+            self.sdl.subscribe_channel('sdl-benchmark-{}'.format(index), _delivery_cb(event),
+                                       'delivery-{}'.format(index))
+        self.sdl.start_event_listener()
+
+    @staticmethod
+    def __set_redis_environment(redis_address):
+        host, _, port = redis_address.rpartition(':')
+        os.environ['DBAAS_SERVICE_HOST'] = host
+        os.environ['DBAAS_SERVICE_PORT'] = port
+        for name in ('DBAAS_SERVICE_SENTINEL_PORT', 'DBAAS_MASTER_NAME',
+                     'DBAAS_CLUSTER_ADDR_LIST'):
+            os.environ.pop(name, None)
+
+    def close(self):
+        self.sdl.close()
+        if self.server is not None:
+            self.server.stop()
+
+
+def run_benchmarks(args):
+    """Run the benchmarks and return a list of results."""
+    results = []
+    for backend_name in args.backends:
+        backend = _Backend(backend_name, args.redis_address, max(args.threads))
+        try:
+            for name in args.operations:
+                operation = OPERATIONS[name]
+                for keys in (args.keys if operation.multi_key else [1]):
+                    for value_size in args.value_sizes:
+                        for threads in args.threads:
+                            latencies = run_case(backend.sdl, backend.delivered, operation, keys,
+                                                 value_size, threads, args.iterations,
+                                                 args.warmup)
+                            result = {'backend': backend_name, 'operation': name, 'keys': keys,
+                                      'value_size': value_size, 'threads': threads}
+                            result.update(summarize(latencies))
+                            results.append(result)
+                            if args.output is not None or args.format != 'table':
+                                print(_format_row(result, None), file=sys.stderr)
+        finally:
+            backend.close()
+    return results
+
+
+def _case_id(result):
+    return tuple(result[field] for field in ('backend', 'operation', 'keys', 'value_size',
+                                             'threads'))
+
+
+def load_baseline(path):
+    """Return the results of a JSON result file indexed by the benchmark case."""
+    with open(path) as baseline_file:
+        return {_case_id(result): result for result in json.load(baseline_file)['results']}
+
+
+def _format_row(result, baseline):
+    row = '{backend:7} {operation:30} {keys:6} {value_size:8} {threads:4} {throughput:12.1f} ' \
+          '{p50_us:10.1f} {p99_us:10.1f}'.format(**result)
+    if baseline is not None:
+        old = baseline.get(_case_id(result))
+        if old is None:
+            row += '{:>10}'.format('-')
+        else:
+            row += '{:+9.1f}%'.format((result['throughput'] / old['throughput'] - 1) * 100)
+    return row
+
+
+def write_results(results, args, out):
+    """Write the results in the requested format."""
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    if baseline is not None:
+        for result in results:
+            old = baseline.get(_case_id(result))
+            result['baseline_throughput'] = None if old is None else old['throughput']
+    if args.format == 'json':
+        json.dump({'sdl_version': ricsdl.__version__,
+                   'python_version': platform.python_version(),
+                   'platform': platform.platform(),
+                   'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                   'iterations': args.iterations,
+                   'results': results}, out, indent=2)
+        out.write('\n')
+    elif args.format == 'csv':
+        fields = _FIELDS + (['baseline_throughput'] if baseline is not None else [])
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        header = '{:7} {:30} {:>6} {:>8} {:>4} {:>12} {:>10} {:>10}'.format(
+            'backend', 'operation', 'keys', 'size', 'thr', 'calls/s', 'p50 us', 'p99 us')
+        if baseline is not None:
+            header += '{:>10}'.format('change')
+        out.write(header + '\n')
+        for result in results:
+            out.write(_format_row(result, baseline) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', choices=['dict', 'redis'],
+                        default=['dict', 'redis'], help="Database backends to benchmark")
+    parser.add_argument('--redis-address', metavar='HOST:PORT',
+                        help="Address of a Redis server with the DBaaS module to use instead "
+                             "of the in-process Redis server stand-in")
+    parser.add_argument('--operations', nargs='+', choices=sorted(OPERATIONS),
+                        default=list(OPERATIONS), help="Operations to benchmark")
+    parser.add_argument('--keys', type=int, nargs='+', default=[1, 10, 100],
+                        help="Numbers of keys (and group members) per operation")
+    parser.add_argument('--value-sizes', type=int, nargs='+', default=[16, 1024],
+                        help="Value sizes in bytes")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4],
+                        help="Numbers of threads")
+    parser.add_argument('--iterations', type=int, default=100,
+                        help="Number of measured calls per thread")
+    parser.add_argument('--warmup', type=int, default=10,
+                        help="Number of calls per thread before the measurement")
+    parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table',
+                        help="Output format")
+    parser.add_argument('--output', help="Output file, standard output by default")
+    parser.add_argument('--baseline', help="JSON result file to compare the throughput to")
+    args = parser.parse_args()
+    results = run_benchmarks(args)
+    if args.output is None:
+        write_results(results, args, sys.stdout)
+    else:
+        with open(args.output, 'w', newline='') as out:
+            write_results(results, args, out)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,7 +21,8 @@
 
 """Shared Data Layer (SDL) library."""
 
-from .syncstorage import (SyncStorage, SyncLock)
+from .syncstorage import (SyncStorage, SyncLock, SyncBatch, SyncBatchResult)
+from .asyncstorage import (AsyncStorage, AsyncLock)
 from .exceptions import (
     SdlTypeError,
     SdlException,
@@ -37,6 +38,10 @@
 __all__ = [
     'SyncStorage',
     'SyncLock',
+    'SyncBatch',
+    'SyncBatchResult',
+    'AsyncStorage',
+    'AsyncLock',
     'SdlTypeError',
     'SdlException',
     'BackendError',
@@ -0,0 +1,304 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+"""The module provides implementation of the asynchronous Shared Data Layer (SDL) interface."""
+import builtins
+from typing import (Any, Callable, Dict, Set, List, Optional, Tuple, Union)
+from ricsdl.configuration import _Configuration
+from ricsdl.asyncstorage_abc import (AsyncStorageAbc, AsyncLockAbc)
+import ricsdl.backend
+from ricsdl.backend.async_dbbackend_abc import AsyncDbBackendAbc
+from ricsdl.exceptions import (SdlException, SdlTypeError)
+from ricsdl.syncstorage import (func_arg_checker, _validate_callback, _validate_channels_events,
+                                _validate_key_value_dict)
+
+
+class AsyncLock(AsyncLockAbc):
+    """
+    This class implements Shared Data Layer (SDL) abstract 'AsyncLockAbc' class.
+
+    A lock instance is created per namespace and it is identified by its `name` within a namespace.
+
+    Args:
+        ns (str): Namespace under which this lock is targeted.
+        name (str): Lock name, identifies the lock key in SDL storage.
+        expiration (int, float): Lock expiration time after which the lock is removed if it hasn't
+                                 been released earlier by a 'release' method.
+        storage (AsyncStorage): Database backend object containing connection to a database.
+    """
+    @func_arg_checker(SdlTypeError, 1, ns=str, name=str, expiration=(int, float))
+    def __init__(self, ns: str, name: str, expiration: Union[int, float],
+                 storage: 'AsyncStorage') -> None:
+
+        super().__init__(ns, name, expiration)
+        self.__configuration = storage.get_configuration()
+        self.__dbbackendlock = ricsdl.backend.get_async_backend_lock_instance(
+            self.__configuration, ns, name, expiration, storage.get_backend())
+
+    def __str__(self):
+        return str(
+            {
+                "namespace": self._ns,
+                "name": self._name,
+                "expiration": self._expiration,
+                "backend lock": str(self.__dbbackendlock)
+            }
+        )
+
+    @func_arg_checker(SdlTypeError, 1, retry_interval=(int, float),
+                      retry_timeout=(int, float))
+    async def acquire(self, retry_interval: Union[int, float] = 0.1,
+                      retry_timeout: Union[int, float] = 10) -> bool:
+        return await self.__dbbackendlock.acquire(retry_interval, retry_timeout)
+
+    async def release(self) -> None:
+        await self.__dbbackendlock.release()
+
+    async def refresh(self) -> None:
+        await self.__dbbackendlock.refresh()
+
+    async def get_validity_time(self) -> Union[int, float]:
+        return await self.__dbbackendlock.get_validity_time()
+
+
+class AsyncStorage(AsyncStorageAbc):
+    """
+    This class implements Shared Data Layer (SDL) abstract 'AsyncStorageAbc' class.
+
+    This class provides asynchronous access to all the namespaces in SDL storage.
+    Data can be written, read and removed based on keys known to clients. Keys are unique within
+    a namespace, namespace identifier is passed as a parameter to all the operations.
+
+    Args:
+        fake_db_backend (str): Optional parameter. Parameter enables fake DB backend usage for an
+                               SDL instance. Fake DB backend is ONLY allowed to use for testing
+                               purposes at development phase of SDL clients when more advanced
+                               database services are not necessarily needed. Currently value 'dict'
+                               is only allowed value for the parameter, which enables dictionary
+                               type of fake DB backend.
+        trusted_caller (bool): Optional parameter. Parameter disables validation of the items of
+                               the dictionary arguments: the type of every key and value of the
+                               data maps given to 'set' and 'set_and_publish' functions and the
+                               type of every channel and event given to the '*_and_publish'
+                               functions, including the check that events do not contain the
+                               event separator. Types of the function arguments themselves are
+                               still validated. Enable only if the caller is known to give valid
+                               keys, values, channels and events, otherwise the behavior of SDL
+                               is undefined. By default validation is enabled.
+        db_connection_options (dict): Optional parameter. Database connection pool and socket
+                                      options, which override the corresponding environment
+                                      variables. Supported options are 'db_max_connections',
+                                      'db_pool_blocking', 'db_pool_timeout',
+                                      'db_socket_timeout', 'db_socket_connect_timeout',
+                                      'db_socket_keepalive', 'db_health_check_interval' and
+                                      'db_read_preference'.
+    """
+    def __init__(self, fake_db_backend=None, trusted_caller: bool = False,
+                 db_connection_options: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__()
+        self.__dbbackend = None
+        self.__trusted_caller = trusted_caller
+        self.__configuration = _Configuration(fake_db_backend, **(db_connection_options or {}))
+        self.event_separator = self.__configuration.get_event_separator()
+        self.__dbbackend = ricsdl.backend.get_async_backend_instance(self.__configuration)
+
+    def __str__(self):
+        return str(
+            {
+                "configuration": str(self.__configuration),
+                "backend": str(self.__dbbackend)
+            }
+        )
+
+    async def is_active(self):
+        try:
+            return await self.__dbbackend.is_connected()
+        except SdlException:
+            return False
+
+    async def close(self):
+        if self.__dbbackend:
+            await self.__dbbackend.close()
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, data_map=dict)
+    async def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
+        self._validate_key_value_dict(data_map)
+        await self.__dbbackend.set(ns, data_map)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, old_data=bytes, new_data=bytes)
+    async def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
+        return await self.__dbbackend.set_if(ns, key, old_data, new_data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
+    async def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
+        return await self.__dbbackend.set_if_not_exists(ns, key, data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set))
+    async def get(self, ns: str, keys: Union[str, Set[str]]) -> Dict[str, bytes]:
+        disordered = await self.__dbbackend.get(ns, list(keys))
+        return {k: disordered[k] for k in sorted(disordered)}
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str)
+    async def find_keys(self, ns: str, key_pattern: str) -> List[str]:
+        return await self.__dbbackend.find_keys(ns, key_pattern)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str)
+    async def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+        disordered = await self.__dbbackend.find_and_get(ns, key_pattern)
+        return {k: disordered[k] for k in sorted(disordered)}
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set))
+    async def remove(self, ns: str, keys: Union[str, Set[str]]) -> None:
+        await self.__dbbackend.remove(ns, list(keys))
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
+    async def remove_if(self, ns: str, key: str, data: bytes) -> bool:
+        return await self.__dbbackend.remove_if(ns, key, data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str)
+    async def remove_all(self, ns: str) -> None:
+        keys = await self.__dbbackend.find_keys(ns, '*')
+        if keys:
+            await self.__dbbackend.remove(ns, keys)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
+    async def add_member(self, ns: str, group: str, members: Union[bytes, Set[bytes]]) -> None:
+        await self.__dbbackend.add_member(ns, group, members)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
+    async def remove_member(self, ns: str, group: str, members: Union[bytes, Set[bytes]]) -> None:
+        await self.__dbbackend.remove_member(ns, group, members)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    async def remove_group(self, ns: str, group: str) -> None:
+        await self.__dbbackend.remove_group(ns, group)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    async def get_members(self, ns: str, group: str) -> Set[bytes]:
+        return await self.__dbbackend.get_members(ns, group)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, member=bytes)
+    async def is_member(self, ns: str, group: str, member: bytes) -> bool:
+        return await self.__dbbackend.is_member(ns, group, member)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    async def group_size(self, ns: str, group: str) -> int:
+        return await self.__dbbackend.group_size(ns, group)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, data_map=dict)
+    async def set_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
+                              data_map: Dict[str, bytes]) -> None:
+        self._validate_key_value_dict(data_map)
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        await self.__dbbackend.set_and_publish(ns, channels_and_events, data_map)
+
+    @func_arg_checker(SdlTypeError,
+                      1,
+                      ns=str,
+                      channels_and_events=dict,
+                      key=str,
+                      old_data=bytes,
+                      new_data=bytes)
+    async def set_if_and_publish(self, ns: str,
+                                 channels_and_events: Dict[str, Union[str, List[str]]],
+                                 key: str, old_data: bytes, new_data: bytes) -> bool:
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        return await self.__dbbackend.set_if_and_publish(ns, channels_and_events, key, old_data,
+                                                         new_data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
+    async def set_if_not_exists_and_publish(self, ns: str,
+                                            channels_and_events: Dict[str, Union[str, List[str]]],
+                                            key: str, data: bytes) -> bool:
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        return await self.__dbbackend.set_if_not_exists_and_publish(ns, channels_and_events, key,
+                                                                    data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, keys=(str, builtins.set))
+    async def remove_and_publish(self, ns: str,
+                                 channels_and_events: Dict[str, Union[str, List[str]]],
+                                 keys: Union[str, Set[str]]) -> None:
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        await self.__dbbackend.remove_and_publish(ns, channels_and_events, keys)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
+    async def remove_if_and_publish(self, ns: str,
+                                    channels_and_events: Dict[str, Union[str, List[str]]],
+                                    key: str, data: bytes) -> bool:
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        return await self.__dbbackend.remove_if_and_publish(ns, channels_and_events, key, data)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict)
+    async def remove_all_and_publish(self, ns: str,
+                                     channels_and_events: Dict[str, Union[str, List[str]]]) -> None:
+        self._validate_channels_events(channels_and_events)
+        for channel, events in channels_and_events.items():
+            channels_and_events[channel] = [events] if isinstance(events, str) else events
+        await self.__dbbackend.remove_all_and_publish(ns, channels_and_events)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, cb=Callable, channels=(str, builtins.set))
+    async def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
+                                channels: Union[str, Set[str]]) -> None:
+        _validate_callback(cb)
+        channels = [channels] if isinstance(channels, str) else list(channels)
+        await self.__dbbackend.subscribe_channel(ns, cb, channels)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels=(str, builtins.set))
+    async def unsubscribe_channel(self, ns: str, channels: Union[str, Set[str]]) -> None:
+        channels = [channels] if isinstance(channels, str) else list(channels)
+        await self.__dbbackend.unsubscribe_channel(ns, channels)
+
+    async def start_event_listener(self) -> None:
+        await self.__dbbackend.start_event_listener()
+
+    async def handle_events(self) -> Optional[Tuple[str, List[str]]]:
+        return await self.__dbbackend.handle_events()
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, resource=str, expiration=(int, float))
+    def get_lock_resource(self, ns: str, resource: str,
+                          expiration: Union[int, float]) -> AsyncLock:
+        return AsyncLock(ns, resource, expiration, self)
+
+    def get_backend(self) -> AsyncDbBackendAbc:
+        """Return backend instance."""
+        return self.__dbbackend
+
+    def get_configuration(self) -> _Configuration:
+        """Return configuration what was valid when the SDL instance was initiated."""
+        return self.__configuration
+
+    def _validate_key_value_dict(self, kv):
+        if not self.__trusted_caller:
+            _validate_key_value_dict(kv)
+
+    def _validate_channels_events(self, channels_and_events: Dict[Any, Any]):
+        if not self.__trusted_caller:
+            _validate_channels_events(channels_and_events, self.event_separator)
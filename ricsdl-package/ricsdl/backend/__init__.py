@@ -59,3 +59,39 @@ def get_backend_lock_instance(configuration, ns, name, expiration, backend):
     backend_lock_class = getattr(backend_module, backend_lock_name)
     instance = backend_lock_class(ns, name, expiration, backend)
     return instance
+
+
+def get_async_backend_instance(configuration):
+    """
+    Select asynchronous database backend solution and return and instance of it.
+    """
+    if configuration.get_params().db_type == DbBackendType.FAKE_DICT:
+        backend_name = 'AsyncFakeDictBackend'
+        backend_module_name = 'async_fake_dict_db'
+    else:
+        backend_name = 'AsyncRedisBackend'
+        backend_module_name = 'async_redis'
+
+    package = __package__ or __name__
+    backend_module = import_module('.' + backend_module_name, package=package)
+    backend_class = getattr(backend_module, backend_name)
+    instance = backend_class(configuration)
+    return instance
+
+
+def get_async_backend_lock_instance(configuration, ns, name, expiration, backend):
+    """
+    Select asynchronous database backend lock solution and return and instance of it.
+    """
+    if configuration.get_params().db_type == DbBackendType.FAKE_DICT:
+        backend_lock_name = 'AsyncFakeDictBackendLock'
+        backend_module_name = 'async_fake_dict_db'
+    else:
+        backend_lock_name = 'AsyncRedisBackendLock'
+        backend_module_name = 'async_redis'
+
+    package = __package__ or __name__
+    backend_module = import_module('.' + backend_module_name, package=package)
+    backend_lock_class = getattr(backend_module, backend_lock_name)
+    instance = backend_lock_class(ns, name, expiration, backend)
+    return instance
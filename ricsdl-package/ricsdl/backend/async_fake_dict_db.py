@@ -0,0 +1,234 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+The module provides fake implementation of Shared Data Layer (SDL) asynchronous database backend
+interface.
+"""
+import asyncio
+import inspect
+from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
+from ricsdl.configuration import _Configuration
+from ricsdl.exceptions import RejectedByBackend
+from .async_dbbackend_abc import AsyncDbBackendAbc
+from .async_dbbackend_abc import AsyncDbBackendLockAbc
+from .fake_dict_db import (FakeDictBackend, FakeDictBackendLock)
+
+
+class AsyncFakeDictBackend(AsyncDbBackendAbc):
+    """
+    A class providing fake implementation of asynchronous database backend of Shared Data Layer
+    (SDL). This class does not provide working database solution, this class can be used in
+    testing purposes only. Data is stored into a 'FakeDictBackend' instance, events are delivered
+    via an asyncio queue.
+
+    Args:
+        configuration (_Configuration): SDL configuration, containing credentials to connect to
+                                        Redis database backend.
+    """
+    def __init__(self, configuration: _Configuration) -> None:
+        super().__init__()
+        self._db = FakeDictBackend(configuration)
+        self._queue = None
+        self._channel_cbs = {}
+        self._listen_task = None
+        self._run_in_task = False
+
+    def __str__(self):
+        return str(
+            {
+                "DB type": "FAKE DB asyncio",
+            }
+        )
+
+    async def is_connected(self):
+        return True
+
+    async def close(self):
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            self._listen_task = None
+
+    async def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
+        self._db.set(ns, data_map)
+
+    async def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
+        return self._db.set_if(ns, key, old_data, new_data)
+
+    async def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
+        return self._db.set_if_not_exists(ns, key, data)
+
+    async def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
+        return self._db.get(ns, keys)
+
+    async def find_keys(self, ns: str, key_pattern: str) -> List[str]:
+        return self._db.find_keys(ns, key_pattern)
+
+    async def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+        return self._db.find_and_get(ns, key_pattern)
+
+    async def remove(self, ns: str, keys: List[str]) -> None:
+        self._db.remove(ns, keys)
+
+    async def remove_if(self, ns: str, key: str, data: bytes) -> bool:
+        return self._db.remove_if(ns, key, data)
+
+    async def add_member(self, ns: str, group: str, members: Set[bytes]) -> None:
+        self._db.add_member(ns, group, members)
+
+    async def remove_member(self, ns: str, group: str, members: Set[bytes]) -> None:
+        self._db.remove_member(ns, group, members)
+
+    async def remove_group(self, ns: str, group: str) -> None:
+        self._db.remove_group(ns, group)
+
+    async def get_members(self, ns: str, group: str) -> Set[bytes]:
+        return self._db.get_members(ns, group)
+
+    async def is_member(self, ns: str, group: str, member: bytes) -> bool:
+        return self._db.is_member(ns, group, member)
+
+    async def group_size(self, ns: str, group: str) -> int:
+        return self._db.group_size(ns, group)
+
+    async def set_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                              data_map: Dict[str, bytes]) -> None:
+        self._db.set(ns, data_map)
+        self._publish(channels_and_events)
+
+    async def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                 key: str, old_data: bytes, new_data: bytes) -> bool:
+        if self._db.set_if(ns, key, old_data, new_data):
+            self._publish(channels_and_events)
+            return True
+        return False
+
+    async def set_if_not_exists_and_publish(self, ns: str,
+                                            channels_and_events: Dict[str, List[str]],
+                                            key: str, data: bytes) -> bool:
+        if self._db.set_if_not_exists(ns, key, data):
+            self._publish(channels_and_events)
+            return True
+        return False
+
+    async def remove_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                 keys: List[str]) -> None:
+        self._db.remove(ns, keys)
+        self._publish(channels_and_events)
+
+    async def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                    key: str, data: bytes) -> bool:
+        if self._db.remove_if(ns, key, data):
+            self._publish(channels_and_events)
+            return True
+        return False
+
+    async def remove_all_and_publish(self, ns: str,
+                                     channels_and_events: Dict[str, List[str]]) -> None:
+        self._db.remove(ns, self._db.find_keys(ns, '*'))
+        self._publish(channels_and_events)
+
+    async def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
+                                channels: List[str]) -> None:
+        for channel in channels:
+            self._channel_cbs[channel] = cb
+        if self._listen_task is None and self._run_in_task:
+            self._listen_task = asyncio.ensure_future(self._listen())
+
+    async def unsubscribe_channel(self, ns: str, channels: List[str]) -> None:
+        for channel in channels:
+            self._channel_cbs.pop(channel, None)
+
+    async def start_event_listener(self) -> None:
+        if self._listen_task is not None:
+            raise RejectedByBackend("Event loop already started")
+        if len(self._channel_cbs) > 0:
+            self._listen_task = asyncio.ensure_future(self._listen())
+        self._run_in_task = True
+
+    async def handle_events(self) -> Optional[Tuple[str, List[str]]]:
+        if self._listen_task is not None or self._run_in_task:
+            raise RejectedByBackend("Event loop already started")
+        try:
+            message = self._get_queue().get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        await self._notify(message)
+        return (message[0], message[1])
+
+    def _get_queue(self):
+        # Queue is created lazily to bind it to the event loop where it is used first time.
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def _publish(self, channels_and_events: Dict[str, List[str]]) -> None:
+        for channel, events in channels_and_events.items():
+            self._get_queue().put_nowait((channel, events))
+
+    async def _notify(self, message):
+        cb = self._channel_cbs.get(message[0], None)
+        if cb:
+            ret = cb(message[0], message[1])
+            if inspect.isawaitable(ret):
+                await ret
+
+    async def _listen(self):
+        while True:
+            message = await self._get_queue().get()
+            await self._notify(message)
+
+
+class AsyncFakeDictBackendLock(AsyncDbBackendLockAbc):
+    """
+    A class providing fake implementation of asynchronous database backend lock of Shared Data
+    Layer (SDL). This class does not provide working database solution, this class can be used in
+    testing purposes only.
+
+    Args:
+        ns (str): Namespace under which this lock is targeted.
+        name (str): Lock name, identifies the lock key in a Redis database backend.
+        expiration (int, float): Lock expiration time after which the lock is removed if it hasn't
+                                 been released earlier by a 'release' method.
+        redis_backend (AsyncFakeDictBackend): Database backend object containing fake database
+                                              connection.
+    """
+
+    def __init__(self, ns: str, name: str, expiration: Union[int, float],
+                 redis_backend: AsyncFakeDictBackend) -> None:
+        super().__init__(ns, name)
+        self._lock = FakeDictBackendLock(ns, name, expiration, redis_backend)
+
+    def __str__(self):
+        return str(self._lock)
+
+    async def acquire(self, retry_interval: Union[int, float] = 0.1,
+                      retry_timeout: Union[int, float] = 10) -> bool:
+        return self._lock.acquire(retry_interval, retry_timeout)
+
+    async def release(self) -> None:
+        self._lock.release()
+
+    async def refresh(self) -> None:
+        self._lock.refresh()
+
+    async def get_validity_time(self) -> Union[int, float]:
+        return self._lock.get_validity_time()
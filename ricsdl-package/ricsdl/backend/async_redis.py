@@ -0,0 +1,529 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+The module provides implementation of Shared Data Layer (SDL) asynchronous database backend
+interface.
+"""
+import asyncio
+import inspect
+from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
+import redis.asyncio.client
+from redis.asyncio import (Redis, BlockingConnectionPool)
+from redis.asyncio.sentinel import (Sentinel, SentinelConnectionPool)
+from redis.asyncio.lock import Lock
+from redis.utils import str_if_bytes
+from redis import exceptions as redis_exceptions
+from ricsdl.configuration import (_Configuration, DbBackendType, DbReadPreference)
+from ricsdl.sharding import _create_ns_sharding
+from ricsdl.exceptions import RejectedByBackend
+from .async_dbbackend_abc import AsyncDbBackendAbc
+from .async_dbbackend_abc import AsyncDbBackendLockAbc
+from .redis import (
+    _get_connection_kwargs,
+    _get_pool_kwargs,
+    _map_to_sdl_exception,
+    _add_channels_ns_prefix,
+    _add_key_ns_prefix,
+    _add_keys_ns_prefix,
+    _add_data_map_ns_prefix,
+    _strip_ns_from_bin_keys,
+    _prepare_channels,
+    PubSub
+)
+
+
+class AsyncPubSub(redis.asyncio.client.PubSub):
+    def __init__(self, event_separator, connection_pool, ignore_subscribe_messages=False):
+        super().__init__(connection_pool, shard_hint=None, ignore_subscribe_messages=ignore_subscribe_messages)
+        self.event_separator = event_separator
+
+    async def handle_message(self, response, ignore_subscribe_messages=False):
+        """
+        Parses a pub/sub message. If the channel was subscribed to with a message handler, the
+        handler is invoked with the channel name and the list of events. Handler can be either
+        a plain function or a coroutine function.
+        """
+        message_type = str_if_bytes(response[0])
+        if message_type == 'pong':
+            return None
+
+        # if this is an unsubscribe message, remove it from memory
+        if message_type in self.UNSUBSCRIBE_MESSAGE_TYPES:
+            channel = response[1]
+            if channel in self.pending_unsubscribe_channels:
+                self.pending_unsubscribe_channels.remove(channel)
+                self.channels.pop(channel, None)
+
+        if message_type in self.PUBLISH_MESSAGE_TYPES:
+            handler = self.channels.get(response[1], None)
+            message_channel = PubSub._strip_ns_from_bin_key('', response[1])
+            messages = response[2].decode('utf-8').split(self.event_separator)
+            if handler:
+                ret = handler(message_channel, messages)
+                if inspect.isawaitable(ret):
+                    await ret
+            return message_channel, messages
+
+        # this is a subscribe/unsubscribe message. ignore if we don't want them
+        if ignore_subscribe_messages or self.ignore_subscribe_messages:
+            return None
+        return {'type': message_type, 'pattern': None, 'channel': response[1],
+                'data': response[2]}
+
+
+class _AsyncBlockingSentinelConnectionPool(SentinelConnectionPool, BlockingConnectionPool):
+    """Sentinel backed connection pool, which waits for a free connection if the pool is full."""
+    pass
+
+
+class AsyncRedisBackend(AsyncDbBackendAbc):
+    """
+    A class providing an implementation of asynchronous database backend of Shared Data Layer
+    (SDL), when backend database solution is Redis. Redis commands are executed with redis-py
+    asyncio client.
+
+    Args:
+        configuration (_Configuration): SDL configuration, containing credentials to connect to
+                                        Redis database backend.
+    """
+    def __init__(self, configuration: _Configuration) -> None:
+        super().__init__()
+        self.next_client_event = 0
+        self.event_separator = configuration.get_event_separator()
+        self.clients = list()
+        if configuration.get_params().db_type == DbBackendType.REDIS_CLUSTER:
+            raise RejectedByBackend("Redis Cluster is not supported by asynchronous SDL storage")
+        self.read_preference = configuration.get_params().db_read_preference
+        with _map_to_sdl_exception():
+            self.clients = self.__create_redis_clients(configuration)
+        self.ns_sharding = self.__create_ns_sharding(configuration)
+
+    def __str__(self):
+        out = {"DB type": "Redis asyncio"}
+        for i, r in enumerate(self.clients):
+            out["Redis client[" + str(i) + "]"] = str(r)
+        return str(out)
+
+    async def is_connected(self):
+        is_connected = True
+        with _map_to_sdl_exception():
+            for c in self.clients:
+                if not await c.redis_client.ping():
+                    is_connected = False
+                    break
+        return is_connected
+
+    async def close(self):
+        for c in self.clients:
+            if c.pubsub_task is not None:
+                c.pubsub_task.cancel()
+                c.pubsub_task = None
+            await c.redis_pubsub.close()
+            await c.redis_client.close()
+            if c.replica_client is not None:
+                await c.replica_client.close()
+
+    async def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
+        db_data_map = _add_data_map_ns_prefix(ns, data_map)
+        with _map_to_sdl_exception():
+            await self.__getClient(ns).mset(db_data_map)
+
+    async def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        with _map_to_sdl_exception():
+            return await self.__getClient(ns).execute_command('SETIE', db_key, new_data, old_data)
+
+    async def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        with _map_to_sdl_exception():
+            return await self.__getClient(ns).setnx(db_key, data)
+
+    async def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
+        ret = dict()
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        with _map_to_sdl_exception():
+            values = await self.__read(ns, lambda client: client.mget(db_keys))
+            for idx, val in enumerate(values):
+                # return only key values, which has a value
+                if val is not None:
+                    ret[keys[idx]] = val
+            return ret
+
+    async def find_keys(self, ns: str, key_pattern: str) -> List[str]:
+        db_key_pattern = _add_key_ns_prefix(ns, key_pattern)
+        with _map_to_sdl_exception():
+            ret = await self.__read(ns, lambda client: client.keys(db_key_pattern))
+            return _strip_ns_from_bin_keys(ns, ret)
+
+    async def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+        ret = dict()  # type: Dict[str, bytes]
+        with _map_to_sdl_exception():
+            matched_keys = await self.find_keys(ns, key_pattern)
+            if matched_keys:
+                ret = await self.get(ns, matched_keys)
+        return ret
+
+    async def remove(self, ns: str, keys: List[str]) -> None:
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        with _map_to_sdl_exception():
+            await self.__getClient(ns).delete(*db_keys)
+
+    async def remove_if(self, ns: str, key: str, data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        with _map_to_sdl_exception():
+            return await self.__getClient(ns).execute_command('DELIE', db_key, data)
+
+    async def add_member(self, ns: str, group: str, members: Set[bytes]) -> None:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            await self.__getClient(ns).sadd(db_key, *members)
+
+    async def remove_member(self, ns: str, group: str, members: Set[bytes]) -> None:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            await self.__getClient(ns).srem(db_key, *members)
+
+    async def remove_group(self, ns: str, group: str) -> None:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            await self.__getClient(ns).delete(db_key)
+
+    async def get_members(self, ns: str, group: str) -> Set[bytes]:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            return await self.__read(ns, lambda client: client.smembers(db_key))
+
+    async def is_member(self, ns: str, group: str, member: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            return await self.__read(ns, lambda client: client.sismember(db_key, member))
+
+    async def group_size(self, ns: str, group: str) -> int:
+        db_key = _add_key_ns_prefix(ns, group)
+        with _map_to_sdl_exception():
+            return await self.__read(ns, lambda client: client.scard(db_key))
+
+    async def set_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                              data_map: Dict[str, bytes]) -> None:
+        db_data_map = _add_data_map_ns_prefix(ns, data_map)
+        channels_and_events_prepared, total_events = _prepare_channels(ns, channels_and_events,
+                                                                       self.event_separator)
+        with _map_to_sdl_exception():
+            return await self.__getClient(ns).execute_command(
+                "MSETMPUB",
+                len(db_data_map),
+                total_events,
+                *[val for data in db_data_map.items() for val in data],
+                *channels_and_events_prepared,
+            )
+
+    async def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                 key: str, old_data: bytes, new_data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        channels_and_events_prepared, _ = _prepare_channels(ns, channels_and_events,
+                                                            self.event_separator)
+        with _map_to_sdl_exception():
+            ret = await self.__getClient(ns).execute_command("SETIEMPUB", db_key, new_data,
+                                                             old_data,
+                                                             *channels_and_events_prepared)
+            return ret == b"OK"
+
+    async def set_if_not_exists_and_publish(self, ns: str,
+                                            channels_and_events: Dict[str, List[str]],
+                                            key: str, data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        channels_and_events_prepared, _ = _prepare_channels(ns, channels_and_events,
+                                                            self.event_separator)
+        with _map_to_sdl_exception():
+            ret = await self.__getClient(ns).execute_command("SETNXMPUB", db_key, data,
+                                                             *channels_and_events_prepared)
+            return ret == b"OK"
+
+    async def remove_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                 keys: List[str]) -> None:
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        channels_and_events_prepared, total_events = _prepare_channels(ns, channels_and_events,
+                                                                       self.event_separator)
+        with _map_to_sdl_exception():
+            return await self.__getClient(ns).execute_command(
+                "DELMPUB",
+                len(db_keys),
+                total_events,
+                *db_keys,
+                *channels_and_events_prepared,
+            )
+
+    async def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
+                                    key: str, data: bytes) -> bool:
+        db_key = _add_key_ns_prefix(ns, key)
+        channels_and_events_prepared, _ = _prepare_channels(ns, channels_and_events,
+                                                            self.event_separator)
+        with _map_to_sdl_exception():
+            ret = await self.__getClient(ns).execute_command("DELIEMPUB", db_key, data,
+                                                             *channels_and_events_prepared)
+            return bool(ret)
+
+    async def remove_all_and_publish(self, ns: str,
+                                     channels_and_events: Dict[str, List[str]]) -> None:
+        channels_and_events_prepared, total_events = _prepare_channels(ns, channels_and_events,
+                                                                       self.event_separator)
+        with _map_to_sdl_exception():
+            keys = await self.__getClient(ns).keys(_add_key_ns_prefix(ns, "*"))
+            return await self.__getClient(ns).execute_command(
+                "DELMPUB",
+                len(keys),
+                total_events,
+                *keys,
+                *channels_and_events_prepared,
+            )
+
+    async def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
+                                channels: List[str]) -> None:
+        channels = _add_channels_ns_prefix(ns, channels)
+        redis_ctx = self.__getClientConn(ns)
+        with _map_to_sdl_exception():
+            await redis_ctx.redis_pubsub.subscribe(**{channel: cb for channel in channels})
+        if redis_ctx.pubsub_task is None and redis_ctx.run_in_task:
+            redis_ctx.pubsub_task = asyncio.ensure_future(self.__listen(redis_ctx))
+
+    async def unsubscribe_channel(self, ns: str, channels: List[str]) -> None:
+        channels = _add_channels_ns_prefix(ns, channels)
+        with _map_to_sdl_exception():
+            await self.__getClientConn(ns).redis_pubsub.unsubscribe(*channels)
+
+    async def start_event_listener(self) -> None:
+        for redis_ctx in self.clients:
+            if redis_ctx.pubsub_task is not None:
+                raise RejectedByBackend("Event loop already started")
+            if redis_ctx.redis_pubsub.subscribed:
+                redis_ctx.pubsub_task = asyncio.ensure_future(self.__listen(redis_ctx))
+            redis_ctx.run_in_task = True
+
+    async def handle_events(self) -> Optional[Tuple[str, List[str]]]:
+        if self.next_client_event >= len(self.clients):
+            self.next_client_event = 0
+        redis_ctx = self.clients[self.next_client_event]
+        self.next_client_event += 1
+        if redis_ctx.pubsub_task is not None or redis_ctx.run_in_task:
+            raise RejectedByBackend("Event loop already started")
+        try:
+            with _map_to_sdl_exception():
+                return await redis_ctx.redis_pubsub.get_message(ignore_subscribe_messages=True)
+        except RuntimeError:
+            return None
+
+    @classmethod
+    async def __listen(cls, redis_ctx):
+        # Blocks in socket read until a message arrives, no polling between the messages.
+        while True:
+            try:
+                await redis_ctx.redis_pubsub.get_message(ignore_subscribe_messages=True,
+                                                         timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except RuntimeError:
+                # No subscriptions left in the connection, wait for new subscriptions.
+                await asyncio.sleep(0.1)
+            except redis_exceptions.RedisError:
+                await asyncio.sleep(0.1)
+
+    def __create_redis_clients(self, config):
+        clients = list()
+        cfg_params = config.get_params()
+        for i, addr in enumerate(cfg_params.db_cluster_addrs):
+            port = cfg_params.db_ports[i] if i < len(cfg_params.db_ports) else ""
+            sport = cfg_params.db_sentinel_ports[i] if i < len(cfg_params.db_sentinel_ports) else ""
+            name = cfg_params.db_sentinel_master_names[i] if i < len(cfg_params.db_sentinel_master_names) else ""
+
+            client = self.__create_redis_client(addr, port, sport, name, cfg_params)
+            clients.append(client)
+        return clients
+
+    def __create_redis_client(self, addr, port, sentinel_port, master_name, cfg_params):
+        new_sentinel = None
+        new_redis = None
+        new_replica = None
+        conn_kwargs = _get_connection_kwargs(cfg_params)
+        # Waiting for a free connection costs only a suspended coroutine, thus a limited pool
+        # is always blocking, so that operations exceeding the pool size are not failed.
+        blocking = any((cfg_params.db_pool_blocking, len(sentinel_port) == 0,
+                        cfg_params.db_max_connections))
+        pool_kwargs = _get_pool_kwargs(cfg_params._replace(db_pool_blocking=blocking))
+        if len(sentinel_port) == 0:
+            pool = BlockingConnectionPool(host=addr, port=port, db=0, **pool_kwargs,
+                                          **conn_kwargs)
+            new_redis = Redis(connection_pool=pool)
+        else:
+            sentinel_node = (addr, sentinel_port)
+            # Socket options are applied to the sentinel connections too.
+            new_sentinel = Sentinel([sentinel_node], **conn_kwargs)
+            if blocking:
+                pool_kwargs['connection_pool_class'] = _AsyncBlockingSentinelConnectionPool
+            new_redis = new_sentinel.master_for(master_name, **pool_kwargs)
+            if cfg_params.db_read_preference != DbReadPreference.MASTER:
+                new_replica = new_sentinel.slave_for(master_name, **pool_kwargs)
+
+        new_redis.set_response_callback('SETIE', lambda r: r and str_if_bytes(r) == 'OK' or False)
+        new_redis.set_response_callback('DELIE', lambda r: r and int(r) == 1 or False)
+
+        redis_pubsub = AsyncPubSub(self.event_separator, new_redis.connection_pool,
+                                   ignore_subscribe_messages=True)
+        return _AsyncRedisConn(new_redis, redis_pubsub, new_replica)
+
+    @classmethod
+    def __create_ns_sharding(cls, config):
+        cfg_params = config.get_params()
+        if not cfg_params.db_cluster_addrs:
+            return None
+        # Sentinel port is the address of a database instance, when Sentinel is used.
+        ports = cfg_params.db_sentinel_ports or cfg_params.db_ports
+        return _create_ns_sharding(cfg_params.db_sharding, cfg_params.db_cluster_addrs,
+                                   cfg_params.db_sharding_weights, cfg_params.db_sharding_vnodes,
+                                   ports)
+
+    def __getClientConn(self, ns):
+        return self.clients[self.ns_sharding.get_index(ns)]
+
+    def __getClient(self, ns):
+        return self.__getClientConn(ns).redis_client
+
+    async def __read(self, ns, read_fn):
+        """Await a read-only database function with the client of the read preference."""
+        redis_ctx = self.__getClientConn(ns)
+        if redis_ctx.replica_client is None:
+            return await read_fn(redis_ctx.redis_client)
+        if self.read_preference == DbReadPreference.REPLICA:
+            return await read_fn(redis_ctx.replica_client)
+        try:
+            return await read_fn(redis_ctx.replica_client)
+        except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError):
+            return await read_fn(redis_ctx.redis_client)
+
+    def get_redis_connection(self, ns: str):
+        """Return existing Redis database connection valid for the namespace."""
+        return self.__getClient(ns)
+
+
+class _AsyncRedisConn:
+    """
+    Internal class container to hold asyncio redis client connection
+    """
+
+    def __init__(self, redis_client, pubsub, replica_client=None):
+        self.redis_client = redis_client
+        self.replica_client = replica_client
+        self.redis_pubsub = pubsub
+        self.pubsub_task = None
+        self.run_in_task = False
+
+    def __str__(self):
+        return str(
+            {
+                "Client": repr(self.redis_client),
+                "Replica client": repr(self.replica_client),
+                "Subscrions": self.redis_pubsub.subscribed,
+                "PubSub task": repr(self.pubsub_task),
+                "Run in task": self.run_in_task,
+            }
+        )
+
+
+class AsyncRedisBackendLock(AsyncDbBackendLockAbc):
+    """
+    A class providing an implementation of asynchronous database backend lock of Shared Data
+    Layer (SDL), when backend database solution is Redis.
+
+    Args:
+        ns (str): Namespace under which this lock is targeted.
+        name (str): Lock name, identifies the lock key in a Redis database backend.
+        expiration (int, float): Lock expiration time after which the lock is removed if it hasn't
+                                 been released earlier by a 'release' method.
+        redis_backend (AsyncRedisBackend): Database backend object containing connection to Redis
+                                           database.
+    """
+    # KEYS[1] - lock name
+    # ARGS[1] - token
+    # return < 0 in case of failure, otherwise return lock validity time in milliseconds.
+    LUA_GET_VALIDITY_TIME_SCRIPT = """
+        local token = redis.call('get', KEYS[1])
+        if not token then
+            return -10
+        end
+        if token ~= ARGV[1] then
+            return -11
+        end
+        return redis.call('pttl', KEYS[1])
+    """
+
+    def __init__(self, ns: str, name: str, expiration: Union[int, float],
+                 redis_backend: AsyncRedisBackend) -> None:
+        super().__init__(ns, name)
+        self.__redis = redis_backend.get_redis_connection(ns)
+        with _map_to_sdl_exception():
+            redis_lockname = '{' + ns + '},' + self._lock_name
+            self.__redis_lock = Lock(redis=self.__redis, name=redis_lockname, timeout=expiration)
+            self.lua_get_validity_time = self.__redis.register_script(
+                self.LUA_GET_VALIDITY_TIME_SCRIPT)
+
+    def __str__(self):
+        return str(
+            {
+                "lock DB type": "Redis asyncio",
+                "lock namespace": self._ns,
+                "lock name": self._lock_name,
+            }
+        )
+
+    async def acquire(self, retry_interval: Union[int, float] = 0.1,
+                      retry_timeout: Union[int, float] = 10) -> bool:
+        succeeded = False
+        self.__redis_lock.sleep = retry_interval
+        with _map_to_sdl_exception():
+            succeeded = await self.__redis_lock.acquire(blocking_timeout=retry_timeout)
+        return succeeded
+
+    async def release(self) -> None:
+        with _map_to_sdl_exception():
+            await self.__redis_lock.release()
+
+    async def refresh(self) -> None:
+        with _map_to_sdl_exception():
+            await self.__redis_lock.reacquire()
+
+    async def get_validity_time(self) -> Union[int, float]:
+        validity = 0
+        if self.__redis_lock.local.token is None:
+            msg = u'Cannot get validity time of an unlocked lock %s' % self._lock_name
+            raise RejectedByBackend(msg)
+
+        with _map_to_sdl_exception():
+            validity = await self.lua_get_validity_time(keys=[self.__redis_lock.name],
+                                                        args=[self.__redis_lock.local.token],
+                                                        client=self.__redis)
+        if validity < 0:
+            msg = (u'Getting validity time of a lock %s failed with error code: %d'
+                   % (self._lock_name, validity))
+            raise RejectedByBackend(msg)
+        ftime = validity / 1000.0
+        if ftime.is_integer():
+            return int(ftime)
+        return ftime
@@ -21,7 +21,7 @@
 
 """The module provides Shared Data Layer (SDL) database backend interface."""
 
-from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
+from typing import (Any, Callable, Dict, Iterator, Set, List, Optional, Tuple, Union)
 from abc import ABC, abstractmethod
 
 
@@ -39,8 +39,12 @@ def close(self):
         pass
 
     @abstractmethod
-    def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
-        """Write key value data mapping to database under a namespace."""
+    def set(self, ns: str, data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        """
+        Write key value data mapping to database under a namespace. If a large data mapping
+        is split to several database commands, commands are executed atomically if 'atomic'
+        is true.
+        """
         pass
 
     @abstractmethod
@@ -55,7 +59,7 @@ def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
 
     @abstractmethod
     def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
-        """"Return values of the keys under a namespace."""
+        """"Return values of the keys under a namespace in the order of the given keys."""
         pass
 
     @abstractmethod
@@ -64,16 +68,46 @@ def find_keys(self, ns: str, key_pattern: str) -> List[str]:
         pass
 
     @abstractmethod
-    def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+    def find_and_get(self, ns: str, key_pattern: str, ordered: bool = False) -> Dict[str, bytes]:
         """
         Return all the keys with their values matching search pattern under a namespace in
-        database.
+        database. If 'ordered' is true, returned mapping is sorted by keys.
+        """
+        pass
+
+    @abstractmethod
+    def iter_keys(self, ns: str, key_pattern: str, batch_size: int) -> Iterator[str]:
+        """
+        Return an iterator over the keys matching search pattern under a namespace in
+        database. Keys are fetched incrementally roughly 'batch_size' keys at a time.
+        """
+        pass
+
+    @abstractmethod
+    def iter_items(self, ns: str, key_pattern: str,
+                   batch_size: int) -> Iterator[Tuple[str, bytes]]:
+        """
+        Return an iterator over the keys with their values matching search pattern under a
+        namespace in database. Keys and values are fetched incrementally at most 'batch_size'
+        items at a time.
         """
         pass
 
     @abstractmethod
-    def remove(self, ns: str, keys: List[str]) -> None:
-        """Remove keys and their data from database."""
+    def remove(self, ns: str, keys: List[str], atomic: bool = True) -> None:
+        """
+        Remove keys and their data from database. If a large number of keys is split to several
+        database commands, commands are executed atomically if 'atomic' is true.
+        """
+        pass
+
+    @abstractmethod
+    def remove_all_in_batches(self, ns: str, batch_size: int,
+                              progress_cb: Optional[Callable[[int], None]]) -> int:
+        """
+        Remove all the keys and their data under a namespace from database at most
+        'batch_size' keys at a time. Return the number of removed keys.
+        """
         pass
 
     @abstractmethod
@@ -116,8 +150,11 @@ def group_size(self, ns: str, group: str) -> int:
 
     @abstractmethod
     def set_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                        data_map: Dict[str, bytes]) -> None:
-        """Publish event to channel after writing data."""
+                        data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        """
+        Publish event to channel after writing data. If a large data mapping is split to
+        several database commands, commands are executed atomically if 'atomic' is true.
+        """
         pass
 
     @abstractmethod
@@ -140,8 +177,11 @@ def set_if_not_exists_and_publish(self, ns: str, channels_and_events: Dict[str,
 
     @abstractmethod
     def remove_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                           keys: List[str]) -> None:
-        """Publish event to channel after removing data."""
+                           keys: List[str], atomic: bool = True) -> None:
+        """
+        Publish event to channel after removing data. If a large number of keys is split to
+        several database commands, commands are executed atomically if 'atomic' is true.
+        """
         pass
 
     @abstractmethod
@@ -160,6 +200,16 @@ def remove_all_and_publish(self, ns: str, channels_and_events: Dict[str, List[st
         """
         pass
 
+    @abstractmethod
+    def track_namespace(self, ns: str,
+                        invalidate_cb: Callable[[str, Optional[List[str]]], None]) -> None:
+        """
+        Start tracking modifications of the keys under a namespace in database. Invalidation
+        callback is called with the namespace and a list of modified keys, or with None instead
+        of the list if all the keys of the namespace may have been modified.
+        """
+        pass
+
     @abstractmethod
     def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
                           channels: List[str]) -> None:
@@ -170,6 +220,17 @@ def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
         """
         pass
 
+    @abstractmethod
+    def subscribe_channel_batch(self, ns: str, cb: Callable[[List[Tuple[str, List[str]]]], None],
+                                channels: List[str]) -> None:
+        """
+        This takes a batch callback function and one or many channels to be subscribed.
+        The event listener thread calls the batch callback with a list of (channel,
+        notifications) tuples of all the events it has received at once, 'handle_events' and
+        'handle_events_batch' call it with one event at a time.
+        """
+        pass
+
     @abstractmethod
     def unsubscribe_channel(self, ns: str, channels: List[str]) -> None:
         """Unsubscribes from channel and removes set callback function."""
@@ -191,6 +252,26 @@ def handle_events(self) -> Optional[Tuple[str, List[str]]]:
         """
         pass
 
+    @abstractmethod
+    def handle_events_batch(self, max_events: int,
+                            timeout: float) -> List[Tuple[str, List[str]]]:
+        """
+        handle_events_batch waits at most 'timeout' seconds for an event and returns a list of
+        tuples containing channel name and message(s) of at most 'max_events' events received
+        without further waiting.
+        """
+        pass
+
+    @abstractmethod
+    def execute_batch(self, operations: List[Tuple[str, str, Tuple]]) -> List[Any]:
+        """
+        Execute a batch of operations with as few database round trips as possible.
+        Every operation is a tuple of backend function name, namespace and function arguments.
+        Return a list of operation results in the same order as the operations were given,
+        failed operations are returned as an SdlException instance.
+        """
+        pass
+
 
 class DbBackendLockAbc(ABC):
     """
@@ -20,23 +20,118 @@
 
 
 """The module provides fake implementation of Shared Data Layer (SDL) database backend interface."""
+import bisect
 import fnmatch
-from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
+import functools
+import logging
+import re
+from typing import (Any, Callable, Dict, Iterator, Set, List, Optional, Tuple, Union)
 import queue
 import threading
-import time
 from ricsdl.configuration import _Configuration
+from ricsdl.configuration import EventQueueOverflow
+from ricsdl.exceptions import (BackendError, SdlException)
 from .dbbackend_abc import DbBackendAbc
 from .dbbackend_abc import DbBackendLockAbc
 
 
+_GLOB_SPECIAL_CHARS = re.compile(r'[*?[]')
+
+# Maximum number of events the listener thread takes from the event queue at a time.
+_LISTEN_BATCH_SIZE = 100
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_key_pattern(key_pattern: str) -> Tuple[str, Optional[Callable[[str], Any]]]:
+    """
+    Return the literal prefix of a key search pattern and a function matching a key to the
+    pattern. Match function is None, if every key having the prefix matches the pattern.
+    """
+    special = _GLOB_SPECIAL_CHARS.search(key_pattern)
+    if special is None:
+        return key_pattern, re.compile(re.escape(key_pattern) + r'\Z').match
+    prefix = key_pattern[:special.start()]
+    if key_pattern[special.start():] == '*':
+        return prefix, None
+    return prefix, re.compile(fnmatch.translate(key_pattern)).match
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    # Smallest string greater than all the strings having the prefix.
+    while prefix:
+        if ord(prefix[-1]) < 0x10FFFF:
+            return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class _SortedKeyIndex():
+    """
+    Sorted list of the keys of a namespace. Added and removed keys are merged to the list
+    lazily, when the index is searched, thus writes do not pay for keeping the list sorted.
+    """
+    def __init__(self) -> None:
+        self._keys = []  # type: List[str]
+        self._added = set()  # type: Set[str]
+        self._removed = set()  # type: Set[str]
+
+    def add(self, key: str) -> None:
+        """Add a key, which is not in the index."""
+        if key in self._removed:
+            self._removed.discard(key)
+        else:
+            self._added.add(key)
+
+    def remove(self, key: str) -> None:
+        """Remove a key, which is in the index."""
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._removed.add(key)
+
+    def clear(self) -> None:
+        """Remove all the keys."""
+        self._keys = []
+        self._added.clear()
+        self._removed.clear()
+
+    def find_prefix(self, prefix: str, after: Optional[str] = None, limit: int = 0) -> List[str]:
+        """
+        Return the keys having a prefix in sorted order. If 'after' is given, only the keys
+        greater than it are returned. Zero 'limit' means no limit.
+        """
+        self.__merge()
+        start = bisect.bisect_left(self._keys, prefix) if prefix else 0
+        if after is not None:
+            start = max(start, bisect.bisect_right(self._keys, after))
+        upper_bound = _prefix_upper_bound(prefix)
+        end = bisect.bisect_left(self._keys, upper_bound) if upper_bound else len(self._keys)
+        if limit:
+            end = min(end, start + limit)
+        return self._keys[start:end]
+
+    def __merge(self) -> None:
+        if self._removed:
+            self._keys = [k for k in self._keys if k not in self._removed]
+            self._removed.clear()
+        if self._added:
+            # Sort detects and merges the two sorted runs in linear time.
+            self._keys.extend(sorted(self._added))
+            self._keys.sort()
+            self._added.clear()
+
+
 class FakeDictBackend(DbBackendAbc):
     """
     A class providing fake implementation of database backend of Shared Data Layer (SDL).
     This class does not provide working database solution, this class can be used in testing
     purposes only. Implementation does not provide shared database resource, SDL client sees
-    only its local local 'fake' database, which is a simple Python dictionary. Also keys are
-    stored in database under the same namespace.
+    only its local local 'fake' database, which is a Python dictionary per namespace. Keys of a
+    namespace are indexed in sorted order, thus key search patterns having a literal prefix,
+    like 'cell_*', are served by a range lookup instead of matching every key of the namespace.
+    Backend can be used concurrently from several threads. Operations of a namespace are
+    serialized by a namespace lock, thus conditional operations are atomic. Published events are
+    queued to an event queue, which size and overflow policy are configurable.
 
     Args:
         configuration (_Configuration): SDL configuration, containing credentials to connect to
@@ -44,10 +139,18 @@ class FakeDictBackend(DbBackendAbc):
     """
     def __init__(self, configuration: _Configuration) -> None:
         super().__init__()
-        self._db = {}
+        self._db = {}  # type: Dict[str, Dict[str, Any]]
+        self._key_indexes = {}  # type: Dict[str, _SortedKeyIndex]
+        self._ns_locks = {}  # type: Dict[str, threading.RLock]
         self._configuration = configuration
-        self._queue = queue.Queue(1)
+        params = configuration.get_params()
+        self._queue = queue.Queue(params.fake_db_event_queue_size)
+        self._queue_overflow = params.fake_db_event_queue_overflow
+        self._queue_lock = threading.Lock()
+        self.dropped_events = 0
         self._channel_cbs = {}
+        self._channel_batch_cbs = {}
+        self._listen_lock = threading.Lock()
         self._listen_thread = threading.Thread(target=self._listen, daemon=True)
         self._run_in_thread = False
 
@@ -64,155 +167,219 @@ def is_connected(self):
     def close(self):
         pass
 
-    def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
-        self._db.update(data_map.copy())
+    def set(self, ns: str, data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        with self._ns_lock(ns):
+            for key, val in data_map.items():
+                self._set_value(ns, key, val)
 
     def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
-        if key not in self._db:
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if key not in ns_db:
+                return False
+            db_data = ns_db[key]
+            if db_data == old_data:
+                ns_db[key] = new_data
+                return True
             return False
-        db_data = self._db[key]
-        if db_data == old_data:
-            self._db[key] = new_data
-            return True
-        return False
 
     def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
-        if key not in self._db:
-            self._db[key] = data
-            return True
-        return False
+        with self._ns_lock(ns):
+            if key not in self._db.get(ns, {}):
+                self._set_value(ns, key, data)
+                return True
+            return False
 
     def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
         ret = {}
-        for k in keys:
-            if k in self._db:
-                ret[k] = self._db[k]
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            for k in keys:
+                if k in ns_db:
+                    ret[k] = ns_db[k]
         return ret
 
     def find_keys(self, ns: str, key_pattern: str) -> List[str]:
-        ret = []
-        for k in self._db:
-            if fnmatch.fnmatch(k, key_pattern):
-                ret.append(k)
-        return ret
-
-    def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
-        ret = {}
-        for key, val in self._db.items():
-            if fnmatch.fnmatch(key, key_pattern):
-                ret[key] = val
-        return ret
-
-    def remove(self, ns: str, keys: List[str]) -> None:
-        for key in keys:
-            self._db.pop(key, None)
+        with self._ns_lock(ns):
+            return self._find_keys(ns, key_pattern)
+
+    def find_and_get(self, ns: str, key_pattern: str, ordered: bool = False) -> Dict[str, bytes]:
+        # Keys are found in sorted order.
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            return {key: ns_db[key] for key in self._find_keys(ns, key_pattern)}
+
+    def iter_keys(self, ns: str, key_pattern: str, batch_size: int) -> Iterator[str]:
+        yield from self.find_keys(ns, key_pattern)
+
+    def iter_items(self, ns: str, key_pattern: str,
+                   batch_size: int) -> Iterator[Tuple[str, bytes]]:
+        yield from self.find_and_get(ns, key_pattern).items()
+
+    def remove(self, ns: str, keys: List[str], atomic: bool = True) -> None:
+        with self._ns_lock(ns):
+            for key in keys:
+                self._pop_value(ns, key)
+
+    def remove_all_in_batches(self, ns: str, batch_size: int,
+                              progress_cb: Optional[Callable[[int], None]]) -> int:
+        keys = self.find_keys(ns, '*')
+        for idx in range(0, len(keys), batch_size):
+            self.remove(ns, keys[idx:idx + batch_size])
+            if progress_cb:
+                progress_cb(min(idx + batch_size, len(keys)))
+        return len(keys)
 
     def remove_if(self, ns: str, key: str, data: bytes) -> bool:
-        if key in self._db:
-            db_data = self._db[key]
-            if db_data == data:
-                self._db.pop(key)
-                return True
-        return False
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if key in ns_db:
+                db_data = ns_db[key]
+                if db_data == data:
+                    self._pop_value(ns, key)
+                    return True
+            return False
 
     def add_member(self, ns: str, group: str, members: Set[bytes]) -> None:
-        if group in self._db:
-            self._db[group] = self._db[group] | members.copy()
-        else:
-            self._db[group] = members.copy()
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if group in ns_db:
+                ns_db[group] = ns_db[group] | members.copy()
+            else:
+                self._set_value(ns, group, members.copy())
 
     def remove_member(self, ns: str, group: str, members: Set[bytes]) -> None:
-        if group not in self._db:
-            return
-        for member in members:
-            self._db[group].discard(member)
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if group not in ns_db:
+                return
+            # Group set is replaced, thus a set returned by 'get_members' is not modified.
+            ns_db[group] = ns_db[group] - members
 
     def remove_group(self, ns: str, group: str) -> None:
-        self._db.pop(group, None)
+        with self._ns_lock(ns):
+            self._pop_value(ns, group)
 
     def get_members(self, ns: str, group: str) -> Set[bytes]:
-        return self._db.get(group, set())
+        with self._ns_lock(ns):
+            return self._db.get(ns, {}).get(group, set())
 
     def is_member(self, ns: str, group: str, member: bytes) -> bool:
-        if group not in self._db:
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if group not in ns_db:
+                return False
+            if member in ns_db[group]:
+                return True
             return False
-        if member in self._db[group]:
-            return True
-        return False
 
     def group_size(self, ns: str, group: str) -> int:
-        if group not in self._db:
-            return 0
-        return len(self._db[group])
+        with self._ns_lock(ns):
+            ns_db = self._db.get(ns, {})
+            if group not in ns_db:
+                return 0
+            return len(ns_db[group])
 
     def set_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                        data_map: Dict[str, bytes]) -> None:
-        self._db.update(data_map.copy())
-        for channel, events in channels_and_events.items():
-            self._queue.put((channel, events))
+                        data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        self.set(ns, data_map)
+        self._publish(channels_and_events)
 
     def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]], key: str,
                            old_data: bytes, new_data: bytes) -> bool:
         if self.set_if(ns, key, old_data, new_data):
-            for channel, events in channels_and_events.items():
-                self._queue.put((channel, events))
+            self._publish(channels_and_events)
             return True
         return False
 
     def set_if_not_exists_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
                                       key: str, data: bytes) -> bool:
         if self.set_if_not_exists(ns, key, data):
-            for channel, events in channels_and_events.items():
-                self._queue.put((channel, events))
+            self._publish(channels_and_events)
             return True
         return False
 
     def remove_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                           keys: List[str]) -> None:
-        for key in keys:
-            self._db.pop(key, None)
-        for channel, events in channels_and_events.items():
-            self._queue.put((channel, events))
+                           keys: List[str], atomic: bool = True) -> None:
+        self.remove(ns, keys)
+        self._publish(channels_and_events)
 
     def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]], key: str,
                               data: bytes) -> bool:
         if self.remove_if(ns, key, data):
-            for channel, events in channels_and_events.items():
-                self._queue.put((channel, events))
+            self._publish(channels_and_events)
             return True
         return False
 
     def remove_all_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]]) -> None:
-        # Note: Since fake db has only one namespace, this deletes all keys
-        self._db.clear()
-        for channel, events in channels_and_events.items():
-            self._queue.put((channel, events))
+        with self._ns_lock(ns):
+            self._db.pop(ns, None)
+            self._key_indexes.pop(ns, None)
+        self._publish(channels_and_events)
+
+    def track_namespace(self, ns: str,
+                        invalidate_cb: Callable[[str, Optional[List[str]]], None]) -> None:
+        # Fake database is local to the SDL instance, nobody else can modify the keys.
+        pass
 
     def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
                           channels: List[str]) -> None:
-        for channel in channels:
-            self._channel_cbs[channel] = cb
-            if not self._listen_thread.is_alive() and self._run_in_thread:
-                self._listen_thread.start()
+        with self._listen_lock:
+            for channel in channels:
+                self._channel_cbs[channel] = cb
+                if not self._listen_thread.is_alive() and self._run_in_thread:
+                    self._listen_thread.start()
+
+    def subscribe_channel_batch(self, ns: str, cb: Callable[[List[Tuple[str, List[str]]]], None],
+                                channels: List[str]) -> None:
+        def handle_event(channel: str, events: List[str]) -> None:
+            cb([(channel, events)])
+        with self._listen_lock:
+            for channel in channels:
+                self._channel_batch_cbs[channel] = cb
+        self.subscribe_channel(ns, handle_event, channels)
 
     def _listen(self):
         while True:
-            message = self._queue.get()
-            cb = self._channel_cbs.get(message[0], None)
-            if cb:
-                cb(message[0], message[1])
-            time.sleep(0.001)
+            messages = [self._queue.get()]
+            # Queued events are drained in batches to wake up the listener less often.
+            while len(messages) < _LISTEN_BATCH_SIZE:
+                try:
+                    messages.append(self._queue.get(block=False))
+                except queue.Empty:
+                    break
+            batches = {}  # type: Dict[Callable, List[Tuple[str, List[str]]]]
+            for message in messages:
+                batch_cb = self._channel_batch_cbs.get(message[0], None)
+                if batch_cb:
+                    batches.setdefault(batch_cb, []).append((message[0], message[1]))
+                    continue
+                cb = self._channel_cbs.get(message[0], None)
+                if cb:
+                    self.__call_listener_cb(cb, message[0], message[1])
+            for batch_cb, events in batches.items():
+                self.__call_listener_cb(batch_cb, events)
+
+    @classmethod
+    def __call_listener_cb(cls, cb, *args):
+        try:
+            cb(*args)
+        except SdlException:
+            # Event was rejected by the event callback dispatcher.
+            logging.getLogger('ricsdl').exception("Event handling failed")
 
     def unsubscribe_channel(self, ns: str, channels: List[str]) -> None:
         for channel in channels:
             self._channel_cbs.pop(channel, None)
+            self._channel_batch_cbs.pop(channel, None)
 
     def start_event_listener(self) -> None:
-        if self._listen_thread.is_alive():
-            raise Exception("Event loop already started")
-        if len(self._channel_cbs) > 0:
-            self._listen_thread.start()
-        self._run_in_thread = True
+        with self._listen_lock:
+            if self._listen_thread.is_alive():
+                raise Exception("Event loop already started")
+            if len(self._channel_cbs) > 0:
+                self._listen_thread.start()
+            self._run_in_thread = True
 
     def handle_events(self) -> Optional[Tuple[str, List[str]]]:
         if self._listen_thread.is_alive() or self._run_in_thread:
@@ -226,14 +393,99 @@ def handle_events(self) -> Optional[Tuple[str, List[str]]]:
             cb(message[0], message[1])
         return (message[0], message[1])
 
+    def handle_events_batch(self, max_events: int,
+                            timeout: float) -> List[Tuple[str, List[str]]]:
+        if self._listen_thread.is_alive() or self._run_in_thread:
+            raise Exception("Event loop already started")
+        events = []  # type: List[Tuple[str, List[str]]]
+        try:
+            message = self._queue.get(block=timeout > 0, timeout=timeout)
+            while True:
+                cb = self._channel_cbs.get(message[0], None)
+                if cb:
+                    cb(message[0], message[1])
+                events.append((message[0], message[1]))
+                if len(events) >= max_events:
+                    break
+                message = self._queue.get(block=False)
+        except queue.Empty:
+            pass
+        return events
+
+    def execute_batch(self, operations: List[Tuple[str, str, Tuple]]) -> List[Any]:
+        results = []  # type: List[Any]
+        for operation, ns, args in operations:
+            try:
+                results.append(getattr(self, operation)(ns, *args))
+            except SdlException as exc:
+                results.append(exc)
+        return results
+
+    def _ns_lock(self, ns: str) -> threading.RLock:
+        # Operations of a namespace are serialized, operations of different namespaces run
+        # concurrently. Dictionary 'setdefault' is atomic, thus one lock is created per namespace.
+        lock = self._ns_locks.get(ns)
+        if lock is None:
+            lock = self._ns_locks.setdefault(ns, threading.RLock())
+        return lock
+
+    def _publish(self, channels_and_events: Dict[str, List[str]]) -> None:
+        # Events are queued without holding a namespace lock, because a full queue blocks until
+        # the listener has called a callback, which may access the same namespace.
+        for channel, events in channels_and_events.items():
+            if self._queue_overflow == EventQueueOverflow.BLOCK:
+                self._queue.put((channel, events))
+            elif self._queue_overflow == EventQueueOverflow.DROP_OLDEST:
+                self.__put_dropping_oldest((channel, events))
+            else:
+                try:
+                    self._queue.put((channel, events), block=False)
+                except queue.Full:
+                    raise BackendError("Event queue is full, event to channel {} is not "
+                                       "published".format(channel))
+
+    def __put_dropping_oldest(self, message) -> None:
+        with self._queue_lock:
+            while True:
+                try:
+                    self._queue.put(message, block=False)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    self._queue.get(block=False)
+                    self.dropped_events += 1
+                except queue.Empty:
+                    pass
+
+    def _set_value(self, ns: str, key: str, value: Any) -> None:
+        ns_db = self._db.setdefault(ns, {})
+        if key not in ns_db:
+            self._key_indexes.setdefault(ns, _SortedKeyIndex()).add(key)
+        ns_db[key] = value
+
+    def _pop_value(self, ns: str, key: str) -> None:
+        ns_db = self._db.get(ns, {})
+        if key in ns_db:
+            del ns_db[key]
+            self._key_indexes[ns].remove(key)
+
+    def _find_keys(self, ns: str, key_pattern: str) -> List[str]:
+        if ns not in self._key_indexes:
+            return []
+        prefix, match = _compile_key_pattern(key_pattern)
+        keys = self._key_indexes[ns].find_prefix(prefix)
+        if match is None:
+            return keys
+        return [key for key in keys if match(key)]
+
 
 class FakeDictBackendLock(DbBackendLockAbc):
     """
     A class providing fake implementation of database backend lock of Shared Data Layer (SDL).
     This class does not provide working database solution, this class can be used in testing
     purposes only. Implementation does not provide shared database resource, SDL client sees
-    only its local local 'fake' database, which is a simple Python dictionary. Also keys are
-    stored in database under the same namespace.
+    only its local local 'fake' database, which is a Python dictionary per namespace.
     Args:
         ns (str): Namespace under which this lock is targeted.
         name (str): Lock name, identifies the lock key in a Redis database backend.
@@ -21,23 +21,28 @@
 
 """The module provides implementation of Shared Data Layer (SDL) database backend interface."""
 import contextlib
+import functools
+import logging
 import threading
-from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
-import zlib
+import time
+from typing import (Any, Callable, Dict, Iterator, Set, List, Optional, Tuple, Union)
 import redis
-from redis import Redis
-from redis.sentinel import Sentinel
+from redis import (Redis, BlockingConnectionPool)
+from redis.sentinel import (Sentinel, SentinelConnectionPool)
 from redis.lock import Lock
 from redis.utils import str_if_bytes
 from redis import exceptions as redis_exceptions
-from ricsdl.configuration import _Configuration
+from ricsdl.configuration import (_Configuration, DbBackendType, DbReadPreference)
+from ricsdl.sharding import _create_ns_sharding
 from ricsdl.exceptions import (
+    SdlException,
     RejectedByBackend,
     NotConnected,
     BackendError
 )
 from .dbbackend_abc import DbBackendAbc
 from .dbbackend_abc import DbBackendLockAbc
+from .redis_cluster import (_RedisClusterClient, _create_startup_nodes)
 
 
 @contextlib.contextmanager
@@ -56,6 +61,124 @@ def _map_to_sdl_exception():
                            format(str(exc))) from exc
 
 
+@functools.lru_cache(maxsize=4096)
+def _get_ns_prefix(ns: str) -> bytes:
+    """Return encoded database key prefix of a namespace. Prefix is computed once per namespace."""
+    return ('{' + ns + '},').encode()
+
+
+def _add_key_ns_prefix(ns: str, key: str) -> bytes:
+    return _get_ns_prefix(ns) + key.encode()
+
+
+def _add_keys_ns_prefix(ns: str, keylist: List[str]) -> List[bytes]:
+    prefix = _get_ns_prefix(ns)
+    return [prefix + k.encode() for k in keylist]
+
+
+def _add_data_map_ns_prefix(ns: str, data_dict: Dict[str, bytes]) -> Dict[bytes, bytes]:
+    prefix = _get_ns_prefix(ns)
+    return {prefix + key.encode(): val for key, val in data_dict.items()}
+
+
+def _add_channels_ns_prefix(ns: str, channels: List[str]) -> List[str]:
+    # Pubsub handlers are given to redis-py as keyword arguments, thus channel names are strings.
+    return ['{' + ns + '},' + channel for channel in channels]
+
+
+def _strip_ns_from_bin_keys(ns: str, nskeylist: List[bytes]) -> List[str]:
+    prefix = _get_ns_prefix(ns)
+    prefix_len = len(prefix)
+    ret_keys = []
+    for k in nskeylist:
+        if not k.startswith(prefix):
+            msg = u'Namespace %s key:%s has no namespace prefix' % (ns, k)
+            raise RejectedByBackend(msg)
+        try:
+            ret_keys.append(k[prefix_len:].decode("utf-8"))
+        except UnicodeDecodeError as exc:
+            msg = u'Namespace %s key conversion to string failed: %s' % (ns, str(exc))
+            raise RejectedByBackend(msg)
+    return ret_keys
+
+
+def _prepare_channels(ns: str, channels_and_events: Dict[str, List[str]],
+                      event_separator: str) -> Tuple[List, int]:
+    channels_and_events_prepared = []
+    for channel, events in channels_and_events.items():
+        one_channel_join_events = None
+        for event in events:
+            if one_channel_join_events is None:
+                channels_and_events_prepared.append(_add_key_ns_prefix(ns, channel))
+                one_channel_join_events = event
+            else:
+                one_channel_join_events = one_channel_join_events + event_separator + event
+        channels_and_events_prepared.append(one_channel_join_events)
+    pairs_cnt = int(len(channels_and_events_prepared) / 2)
+    return channels_and_events_prepared, pairs_cnt
+
+
+def _split_to_chunks(items: List[Any], max_items: int, max_bytes: int,
+                     item_size: Callable[[Any], int]) -> List[List[Any]]:
+    """
+    Split items to chunks having at most 'max_items' items and at most 'max_bytes' bytes, but
+    at least one item. Zero limit means no limit.
+    """
+    chunks = []  # type: List[List[Any]]
+    chunk = []  # type: List[Any]
+    chunk_bytes = 0
+    for item in items:
+        size = item_size(item) if max_bytes else 0
+        items_full = max_items and len(chunk) >= max_items
+        bytes_full = max_bytes and chunk_bytes + size > max_bytes
+        if chunk and (items_full or bytes_full):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(item)
+        chunk_bytes += size
+    if chunk or not chunks:
+        chunks.append(chunk)
+    return chunks
+
+
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+def _get_connection_kwargs(cfg_params) -> Dict[str, Any]:
+    """Return keyword arguments of Redis connections for configured connection options."""
+    kwargs = {}  # type: Dict[str, Any]
+    if cfg_params.db_socket_timeout is not None:
+        kwargs['socket_timeout'] = cfg_params.db_socket_timeout
+    if cfg_params.db_socket_connect_timeout is not None:
+        kwargs['socket_connect_timeout'] = cfg_params.db_socket_connect_timeout
+    if cfg_params.db_socket_keepalive:
+        kwargs['socket_keepalive'] = True
+    if cfg_params.db_health_check_interval:
+        kwargs['health_check_interval'] = cfg_params.db_health_check_interval
+    return kwargs
+
+
+def _get_pool_kwargs(cfg_params) -> Dict[str, Any]:
+    """Return keyword arguments of a Redis connection pool for configured pool options."""
+    kwargs = {}  # type: Dict[str, Any]
+    if cfg_params.db_max_connections:
+        kwargs['max_connections'] = cfg_params.db_max_connections
+    if cfg_params.db_pool_blocking:
+        # Blocking pool is always limited.
+        kwargs.setdefault('max_connections', DEFAULT_MAX_CONNECTIONS)
+        if cfg_params.db_pool_timeout is not None:
+            kwargs['timeout'] = cfg_params.db_pool_timeout
+    return kwargs
+
+
+class _BlockingSentinelConnectionPool(SentinelConnectionPool, BlockingConnectionPool):
+    """Sentinel backed connection pool, which waits for a free connection if the pool is full."""
+    def disconnect(self, inuse_connections=True):
+        # Blocking pool does not keep track of in-use connections, all are disconnected.
+        BlockingConnectionPool.disconnect(self)
+
+
 class PubSub(redis.client.PubSub):
     def __init__(self, event_separator, connection_pool, ignore_subscribe_messages=False):
         super().__init__(connection_pool, shard_hint=None, ignore_subscribe_messages=ignore_subscribe_messages)
@@ -114,9 +237,7 @@ def handle_message(self, response, ignore_subscribe_messages=False):
             if handler:
                 # Need to send only channel and notification instead of raw
                 # message
-                message_channel = self._strip_ns_from_bin_key('', message['channel'])
-                message_data = message['data'].decode('utf-8')
-                messages = message_data.split(self.event_separator)
+                message_channel, messages = self._parse_event(message['channel'], message['data'])
                 handler(message_channel, messages)
                 return message_channel, messages
         elif message_type != 'pong':
@@ -127,6 +248,43 @@ def handle_message(self, response, ignore_subscribe_messages=False):
 
         return message
 
+    def handle_messages(self, timeout: float, max_messages: int) -> int:
+        """
+        Reads the messages already received to the pub/sub connection in one pass, waiting at
+        most 'timeout' seconds for the first message, and invokes the message handlers. Events
+        of the channels subscribed with a '_BatchHandler' are collected during the pass and the
+        batch callback of the handler is called once with all its events, instead of handling
+        every message one by one. Returns the number of read messages.
+        """
+        if not self.subscribed and not self.subscribed_event.wait(timeout):
+            return 0
+        batches = {}  # type: Dict[_BatchHandler, List[Tuple[str, List[str]]]]
+        count = 0
+        try:
+            while count < max_messages:
+                response = self.parse_response(block=False, timeout=timeout)
+                if response is None:
+                    break
+                count += 1
+                timeout = 0.0
+                handler = None
+                if str_if_bytes(response[0]) == 'message':
+                    handler = self.channels.get(response[1], None)
+                if isinstance(handler, _BatchHandler):
+                    batches.setdefault(handler, []).append(self._parse_event(response[1],
+                                                                             response[2]))
+                else:
+                    self.handle_message(response, ignore_subscribe_messages=True)
+        finally:
+            # Events read before a connection failure are delivered as well.
+            for handler, events in batches.items():
+                handler.batch_cb(events)
+        return count
+
+    def _parse_event(self, channel: bytes, data: bytes) -> Tuple[str, List[str]]:
+        return (self._strip_ns_from_bin_key('', channel),
+                data.decode('utf-8').split(self.event_separator))
+
     @classmethod
     def _strip_ns_from_bin_key(cls, ns: str, nskey: bytes) -> str:
         try:
@@ -150,13 +308,23 @@ class RedisBackend(DbBackendAbc):
         configuration (_Configuration): SDL configuration, containing credentials to connect to
                                         Redis database backend.
     """
+    # Interval of polling the pub/sub connections of several database instances for events.
+    EVENT_POLL_INTERVAL = 0.01
+
     def __init__(self, configuration: _Configuration) -> None:
         super().__init__()
         self.next_client_event = 0
         self.event_separator = configuration.get_event_separator()
         self.clients = list()
+        self.invalidate_cbs = {}  # type: Dict[str, Callable[[str, Optional[List[str]]], None]]
+        cfg_params = configuration.get_params()
+        self.max_keys_per_command = cfg_params.db_max_keys_per_command
+        self.max_bytes_per_command = cfg_params.db_max_bytes_per_command
+        self.read_preference = cfg_params.db_read_preference
+        self.redis_cluster = cfg_params.db_type == DbBackendType.REDIS_CLUSTER
         with _map_to_sdl_exception():
             self.clients = self.__create_redis_clients(configuration)
+        self.ns_sharding = self.__create_ns_sharding(configuration)
 
     def __del__(self):
         self.close()
@@ -178,28 +346,51 @@ def is_connected(self):
 
     def close(self):
         for c in self.clients:
+            for tracker in c.invalidation_trackers.values():
+                tracker.close()
+            if isinstance(c.pubsub_thread, _PubSubListener):
+                c.pubsub_thread.stop()
             c.redis_client.close()
+            if c.replica_client is not None:
+                c.replica_client.close()
 
-    def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
-        db_data_map = self.__add_data_map_ns_prefix(ns, data_map)
+    def set(self, ns: str, data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        db_data_map = _add_data_map_ns_prefix(ns, data_map)
+        chunks = self.__split_data_map(db_data_map)
         with _map_to_sdl_exception():
-            self.__getClient(ns).mset(db_data_map)
+            if len(chunks) == 1:
+                self.__getClient(ns).mset(db_data_map)
+                return
+            pipe = self.__getClient(ns).pipeline(transaction=atomic)
+            for chunk in chunks:
+                pipe.mset(chunk)
+            pipe.execute()
 
     def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         with _map_to_sdl_exception():
             return self.__getClient(ns).execute_command('SETIE', db_key, new_data, old_data)
 
     def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         with _map_to_sdl_exception():
             return self.__getClient(ns).setnx(db_key, data)
 
     def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
         ret = dict()
-        db_keys = self.__add_keys_ns_prefix(ns, keys)
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        chunks = self.__split_keys(db_keys)
+
+        def read_values(client):
+            if len(chunks) == 1:
+                return client.mget(db_keys)
+            pipe = client.pipeline(transaction=False)
+            for chunk in chunks:
+                pipe.mget(chunk)
+            return [val for chunk_values in pipe.execute() for val in chunk_values]
+
         with _map_to_sdl_exception():
-            values = self.__getClient(ns).mget(db_keys)
+            values = self.__read(ns, read_values)
             for idx, val in enumerate(values):
                 # return only key values, which has a value
                 if val is not None:
@@ -207,78 +398,172 @@ def get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
             return ret
 
     def find_keys(self, ns: str, key_pattern: str) -> List[str]:
-        db_key_pattern = self.__add_key_ns_prefix(ns, key_pattern)
+        db_key_pattern = _add_key_ns_prefix(ns, key_pattern)
         with _map_to_sdl_exception():
-            ret = self.__getClient(ns).keys(db_key_pattern)
-            return self.__strip_ns_from_bin_keys(ns, ret)
+            ret = self.__read(ns, lambda client: client.keys(db_key_pattern))
+            return _strip_ns_from_bin_keys(ns, ret)
 
-    def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+    def find_and_get(self, ns: str, key_pattern: str, ordered: bool = False) -> Dict[str, bytes]:
         # todo: replace below implementation with redis 'NGET' module
         ret = dict()  # type: Dict[str, bytes]
         with _map_to_sdl_exception():
             matched_keys = self.find_keys(ns, key_pattern)
             if matched_keys:
+                if ordered:
+                    # Values are returned in the order of the keys.
+                    matched_keys.sort()
                 ret = self.get(ns, matched_keys)
         return ret
 
-    def remove(self, ns: str, keys: List[str]) -> None:
-        db_keys = self.__add_keys_ns_prefix(ns, keys)
+    def iter_keys(self, ns: str, key_pattern: str, batch_size: int) -> Iterator[str]:
+        for keys in self.__scan_keys(ns, key_pattern, batch_size):
+            yield from keys
+
+    def iter_items(self, ns: str, key_pattern: str,
+                   batch_size: int) -> Iterator[Tuple[str, bytes]]:
+        chunk = []  # type: List[str]
+        for keys in self.__scan_keys(ns, key_pattern, batch_size):
+            chunk.extend(keys)
+            while len(chunk) >= batch_size:
+                yield from self.get(ns, chunk[:batch_size]).items()
+                del chunk[:batch_size]
+        if chunk:
+            yield from self.get(ns, chunk).items()
+
+    def __scan_keys(self, ns: str, key_pattern: str, batch_size: int) -> Iterator[List[str]]:
+        for db_keys in self.__scan_db_keys(ns, key_pattern, batch_size):
+            yield _strip_ns_from_bin_keys(ns, db_keys)
+
+    def __scan_db_keys(self, ns: str, key_pattern: str, batch_size: int,
+                       from_master: bool = False) -> Iterator[List[bytes]]:
+        db_key_pattern = _add_key_ns_prefix(ns, key_pattern)
+        scan_client = None
+
+        def scan(client, cursor=0):
+            nonlocal scan_client
+            scan_client = client
+            return client.scan(cursor, match=db_key_pattern, count=batch_size)
+
         with _map_to_sdl_exception():
-            self.__getClient(ns).delete(*db_keys)
+            if from_master:
+                cursor, db_keys = scan(self.__getClient(ns))
+            else:
+                # SCAN cursor is valid only in the database instance, which returned it, thus
+                # the client of the read preference is selected once, for the first SCAN.
+                cursor, db_keys = self.__read(ns, scan)
+        while True:
+            if db_keys:
+                yield db_keys
+            if cursor == 0:
+                break
+            with _map_to_sdl_exception():
+                cursor, db_keys = scan(scan_client, cursor)
+
+    def remove(self, ns: str, keys: List[str], atomic: bool = True) -> None:
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        chunks = self.__split_keys(db_keys)
+        with _map_to_sdl_exception():
+            if len(chunks) == 1:
+                self.__getClient(ns).delete(*db_keys)
+                return
+            pipe = self.__getClient(ns).pipeline(transaction=atomic)
+            for chunk in chunks:
+                pipe.delete(*chunk)
+            pipe.execute()
+
+    def remove_all_in_batches(self, ns: str, batch_size: int,
+                              progress_cb: Optional[Callable[[int], None]]) -> int:
+        client = self.__getClient(ns)
+        removed = 0
+        chunk = []  # type: List[bytes]
+
+        def unlink_chunk(db_keys):
+            nonlocal removed
+            # UNLINK reclaims the memory of the removed values in a background thread.
+            with _map_to_sdl_exception():
+                removed += client.unlink(*db_keys)
+            if progress_cb:
+                progress_cb(removed)
+
+        # Keys are scanned from the master, which removes them, because a replica may not yet
+        # have the latest keys.
+        for db_keys in self.__scan_db_keys(ns, '*', batch_size, from_master=True):
+            chunk.extend(db_keys)
+            while len(chunk) >= batch_size:
+                unlink_chunk(chunk[:batch_size])
+                del chunk[:batch_size]
+        if chunk:
+            unlink_chunk(chunk)
+        return removed
 
     def remove_if(self, ns: str, key: str, data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         with _map_to_sdl_exception():
             return self.__getClient(ns).execute_command('DELIE', db_key, data)
 
     def add_member(self, ns: str, group: str, members: Set[bytes]) -> None:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
             self.__getClient(ns).sadd(db_key, *members)
 
     def remove_member(self, ns: str, group: str, members: Set[bytes]) -> None:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
             self.__getClient(ns).srem(db_key, *members)
 
     def remove_group(self, ns: str, group: str) -> None:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
             self.__getClient(ns).delete(db_key)
 
     def get_members(self, ns: str, group: str) -> Set[bytes]:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
-            return self.__getClient(ns).smembers(db_key)
+            return self.__read(ns, lambda client: client.smembers(db_key))
 
     def is_member(self, ns: str, group: str, member: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
-            return self.__getClient(ns).sismember(db_key, member)
+            return self.__read(ns, lambda client: client.sismember(db_key, member))
 
     def group_size(self, ns: str, group: str) -> int:
-        db_key = self.__add_key_ns_prefix(ns, group)
+        db_key = _add_key_ns_prefix(ns, group)
         with _map_to_sdl_exception():
-            return self.__getClient(ns).scard(db_key)
+            return self.__read(ns, lambda client: client.scard(db_key))
 
     def set_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                        data_map: Dict[str, bytes]) -> None:
-        db_data_map = self.__add_data_map_ns_prefix(ns, data_map)
+                        data_map: Dict[str, bytes], atomic: bool = True) -> None:
+        db_data_map = _add_data_map_ns_prefix(ns, data_map)
         channels_and_events_prepared = []
         total_events = 0
         channels_and_events_prepared, total_events = self._prepare_channels(ns, channels_and_events)
+        chunks = self.__split_data_map(db_data_map)
         with _map_to_sdl_exception():
-            return self.__getClient(ns).execute_command(
+            if len(chunks) == 1:
+                return self.__getClient(ns).execute_command(
+                    "MSETMPUB",
+                    len(db_data_map),
+                    total_events,
+                    *[val for data in db_data_map.items() for val in data],
+                    *channels_and_events_prepared,
+                )
+            # Events are published only once, along with the last chunk.
+            pipe = self.__getClient(ns).pipeline(transaction=atomic)
+            for chunk in chunks[:-1]:
+                pipe.mset(chunk)
+            pipe.execute_command(
                 "MSETMPUB",
-                len(db_data_map),
+                len(chunks[-1]),
                 total_events,
-                *[val for data in db_data_map.items() for val in data],
+                *[val for data in chunks[-1].items() for val in data],
                 *channels_and_events_prepared,
             )
+            pipe.execute()
+            return None
 
     def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]], key: str,
                            old_data: bytes, new_data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         channels_and_events_prepared = []
         channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
         with _map_to_sdl_exception():
@@ -288,7 +573,7 @@ def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
 
     def set_if_not_exists_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
                                       key: str, data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
         with _map_to_sdl_exception():
             ret = self.__getClient(ns).execute_command("SETNXMPUB", db_key, data,
@@ -296,21 +581,34 @@ def set_if_not_exists_and_publish(self, ns: str, channels_and_events: Dict[str,
             return ret == b"OK"
 
     def remove_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]],
-                           keys: List[str]) -> None:
-        db_keys = self.__add_keys_ns_prefix(ns, keys)
+                           keys: List[str], atomic: bool = True) -> None:
+        db_keys = _add_keys_ns_prefix(ns, keys)
         channels_and_events_prepared, total_events = self._prepare_channels(ns, channels_and_events)
+        chunks = self.__split_keys(db_keys)
         with _map_to_sdl_exception():
-            return self.__getClient(ns).execute_command(
-                "DELMPUB",
-                len(db_keys),
-                total_events,
-                *db_keys,
-                *channels_and_events_prepared,
-            )
+            if len(chunks) == 1:
+                return self.__getClient(ns).execute_command(
+                    "DELMPUB",
+                    len(db_keys),
+                    total_events,
+                    *db_keys,
+                    *channels_and_events_prepared,
+                )
+            # Events are published in the same transaction as the keys are removed. Unlike
+            # DELMPUB, a transaction can not check the number of removed keys, thus events are
+            # published even if none of the keys existed.
+            pipe = self.__getClient(ns).pipeline(transaction=atomic)
+            for chunk in chunks:
+                pipe.delete(*chunk)
+            for idx in range(0, len(channels_and_events_prepared), 2):
+                pipe.publish(channels_and_events_prepared[idx],
+                             channels_and_events_prepared[idx + 1])
+            pipe.execute()
+            return None
 
     def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]], key: str,
                               data: bytes) -> bool:
-        db_key = self.__add_key_ns_prefix(ns, key)
+        db_key = _add_key_ns_prefix(ns, key)
         channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
         with _map_to_sdl_exception():
             ret = self.__getClient(ns).execute_command("DELIEMPUB", db_key, data,
@@ -318,7 +616,7 @@ def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, List[str
             return bool(ret)
 
     def remove_all_and_publish(self, ns: str, channels_and_events: Dict[str, List[str]]) -> None:
-        keys = self.__getClient(ns).keys(self.__add_key_ns_prefix(ns, "*"))
+        keys = self.__getClient(ns).keys(_add_key_ns_prefix(ns, "*"))
         channels_and_events_prepared, total_events = self._prepare_channels(ns, channels_and_events)
         with _map_to_sdl_exception():
             return self.__getClient(ns).execute_command(
@@ -329,19 +627,55 @@ def remove_all_and_publish(self, ns: str, channels_and_events: Dict[str, List[st
                 *channels_and_events_prepared,
             )
 
+    def track_namespace(self, ns: str,
+                        invalidate_cb: Callable[[str, Optional[List[str]]], None]) -> None:
+        redis_ctx = self.__getClientConn(ns)
+        prefix = _add_key_ns_prefix(ns, '')
+        self.invalidate_cbs[ns] = invalidate_cb
+        tracker_client = redis_ctx.redis_client
+        node_name = None
+        if self.redis_cluster:
+            # Keys are tracked in the node owning the hash slot of the namespace.
+            node = tracker_client.get_node_from_key(prefix)
+            node_name = node.name
+            tracker_client = tracker_client.get_redis_connection(node)
+        if node_name not in redis_ctx.invalidation_trackers:
+            redis_ctx.invalidation_trackers[node_name] = _InvalidationTracker(
+                tracker_client, lambda db_keys: self.__invalidate(redis_ctx, db_keys))
+        with _map_to_sdl_exception():
+            redis_ctx.invalidation_trackers[node_name].add_prefix(prefix)
+
+    def __invalidate(self, redis_ctx, db_keys: Optional[List[bytes]]) -> None:
+        if db_keys is None:
+            for ns, invalidate_cb in list(self.invalidate_cbs.items()):
+                if self.__getClientConn(ns) is redis_ctx:
+                    invalidate_cb(ns, None)
+            return
+        ns_keys = {}  # type: Dict[str, List[str]]
+        for db_key in db_keys:
+            nskey = str_if_bytes(db_key).split('},', 1)
+            if len(nskey) == 2 and nskey[0].startswith('{'):
+                ns_keys.setdefault(nskey[0][1:], []).append(nskey[1])
+        for ns, keys in ns_keys.items():
+            if ns in self.invalidate_cbs:
+                self.invalidate_cbs[ns](ns, keys)
+
     def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
                           channels: List[str]) -> None:
-        channels = self.__add_keys_ns_prefix(ns, channels)
+        channels = _add_channels_ns_prefix(ns, channels)
         for channel in channels:
             with _map_to_sdl_exception():
                 redis_ctx = self.__getClientConn(ns)
                 redis_ctx.redis_pubsub.subscribe(**{channel: cb})
                 if not redis_ctx.pubsub_thread.is_alive() and redis_ctx.run_in_thread:
-                    redis_ctx.pubsub_thread = redis_ctx.redis_pubsub.run_in_thread(sleep_time=0.001,
-                                                                                   daemon=True)
+                    redis_ctx.pubsub_thread = self.__start_pubsub_listener(redis_ctx.redis_pubsub)
+
+    def subscribe_channel_batch(self, ns: str, cb: Callable[[List[Tuple[str, List[str]]]], None],
+                                channels: List[str]) -> None:
+        self.subscribe_channel(ns, _BatchHandler(cb), channels)
 
     def unsubscribe_channel(self, ns: str, channels: List[str]) -> None:
-        channels = self.__add_keys_ns_prefix(ns, channels)
+        channels = _add_channels_ns_prefix(ns, channels)
         for channel in channels:
             with _map_to_sdl_exception():
                 self.__getClientConn(ns).redis_pubsub.unsubscribe(channel)
@@ -352,7 +686,7 @@ def start_event_listener(self) -> None:
             if redis_ctx.pubsub_thread.is_alive():
                 raise RejectedByBackend("Event loop already started")
             if redis_ctx.redis_pubsub.subscribed and len(redis_ctx.redis_client.pubsub_channels()) > 0:
-                redis_ctx.pubsub_thread = redis_ctx.redis_pubsub.run_in_thread(sleep_time=0.001, daemon=True)
+                redis_ctx.pubsub_thread = self.__start_pubsub_listener(redis_ctx.redis_pubsub)
             redis_ctx.run_in_thread = True
 
     def handle_events(self) -> Optional[Tuple[str, List[str]]]:
@@ -367,104 +701,310 @@ def handle_events(self) -> Optional[Tuple[str, List[str]]]:
         except RuntimeError:
             return None
 
+    def handle_events_batch(self, max_events: int,
+                            timeout: float) -> List[Tuple[str, List[str]]]:
+        for redis_ctx in self.clients:
+            if redis_ctx.pubsub_thread.is_alive() or redis_ctx.run_in_thread:
+                raise RejectedByBackend("Event loop already started")
+        events = []  # type: List[Tuple[str, List[str]]]
+        deadline = time.monotonic() + timeout
+        while True:
+            for redis_ctx in self.clients:
+                self.__read_events(redis_ctx.redis_pubsub, events, max_events, 0.0)
+            wait_time = deadline - time.monotonic()
+            if events or wait_time <= 0:
+                return events
+            # Wait for the first event. Pub/sub connections of several database instances are
+            # polled in turns.
+            if len(self.clients) > 1:
+                wait_time = min(wait_time, self.EVENT_POLL_INTERVAL)
+            for redis_ctx in self.clients:
+                if self.__read_events(redis_ctx.redis_pubsub, events, 1, wait_time):
+                    break
+
+    @classmethod
+    def __read_events(cls, redis_pubsub, events: List[Tuple[str, List[str]]], max_events: int,
+                      timeout: float) -> bool:
+        # Read events already received to the pub/sub connection, wait for the first event at
+        # most 'timeout' seconds. Return True if there may be more events to read.
+        while len(events) < max_events:
+            try:
+                message = redis_pubsub.get_message(ignore_subscribe_messages=True,
+                                                   timeout=timeout)
+            except RuntimeError:
+                return False
+            if message is None:
+                return False
+            if isinstance(message, tuple):
+                events.append(message)
+            timeout = 0.0
+        return True
+
+    @classmethod
+    def __start_pubsub_listener(cls, redis_pubsub):
+        listener = _PubSubListener(redis_pubsub)
+        listener.start()
+        return listener
+
+    def execute_batch(self, operations: List[Tuple[str, str, Tuple]]) -> List[Any]:
+        results = [None] * len(operations)  # type: List[Any]
+        client_operations = dict()  # type: Dict[Any, List[int]]
+        for idx, (_, ns, _) in enumerate(operations):
+            client_operations.setdefault(self.__getClient(ns), []).append(idx)
+
+        for client, indexes in client_operations.items():
+            pipe = client.pipeline(transaction=False)
+            reply_handlers = []
+            for idx in indexes:
+                operation, ns, args = operations[idx]
+                queue_operation = getattr(self, '_queue_batch_' + operation, None)
+                if queue_operation is None:
+                    raise RejectedByBackend("Operation {} is not supported in a batch".
+                                            format(operation))
+                reply_handlers.append(queue_operation(pipe, ns, *args))
+            with _map_to_sdl_exception():
+                replies = pipe.execute(raise_on_error=False)
+            for idx, reply_handler, reply in zip(indexes, reply_handlers, replies):
+                try:
+                    with _map_to_sdl_exception():
+                        if isinstance(reply, Exception):
+                            raise reply
+                        results[idx] = reply_handler(reply)
+                except SdlException as exc:
+                    results[idx] = exc
+        return results
+
+    @classmethod
+    def _queue_batch_set(cls, pipe, ns: str, data_map: Dict[str, bytes]):
+        pipe.mset(_add_data_map_ns_prefix(ns, data_map))
+        return lambda reply: None
+
+    @classmethod
+    def _queue_batch_set_if(cls, pipe, ns: str, key: str, old_data: bytes, new_data: bytes):
+        pipe.execute_command('SETIE', _add_key_ns_prefix(ns, key), new_data, old_data)
+        return bool
+
+    @classmethod
+    def _queue_batch_set_if_not_exists(cls, pipe, ns: str, key: str, data: bytes):
+        pipe.setnx(_add_key_ns_prefix(ns, key), data)
+        return bool
+
+    @classmethod
+    def _queue_batch_get(cls, pipe, ns: str, keys: List[str]):
+        pipe.mget(_add_keys_ns_prefix(ns, keys))
+        return lambda values: {key: val for key, val in zip(keys, values) if val is not None}
+
+    @classmethod
+    def _queue_batch_remove(cls, pipe, ns: str, keys: List[str]):
+        pipe.delete(*_add_keys_ns_prefix(ns, keys))
+        return lambda reply: None
+
+    @classmethod
+    def _queue_batch_remove_if(cls, pipe, ns: str, key: str, data: bytes):
+        pipe.execute_command('DELIE', _add_key_ns_prefix(ns, key), data)
+        return bool
+
+    @classmethod
+    def _queue_batch_add_member(cls, pipe, ns: str, group: str, members: Set[bytes]):
+        pipe.sadd(_add_key_ns_prefix(ns, group), *members)
+        return lambda reply: None
+
+    @classmethod
+    def _queue_batch_remove_member(cls, pipe, ns: str, group: str, members: Set[bytes]):
+        pipe.srem(_add_key_ns_prefix(ns, group), *members)
+        return lambda reply: None
+
+    @classmethod
+    def _queue_batch_remove_group(cls, pipe, ns: str, group: str):
+        pipe.delete(_add_key_ns_prefix(ns, group))
+        return lambda reply: None
+
+    @classmethod
+    def _queue_batch_get_members(cls, pipe, ns: str, group: str):
+        pipe.smembers(_add_key_ns_prefix(ns, group))
+        return lambda reply: reply
+
+    @classmethod
+    def _queue_batch_is_member(cls, pipe, ns: str, group: str, member: bytes):
+        pipe.sismember(_add_key_ns_prefix(ns, group), member)
+        return bool
+
+    @classmethod
+    def _queue_batch_group_size(cls, pipe, ns: str, group: str):
+        pipe.scard(_add_key_ns_prefix(ns, group))
+        return lambda reply: reply
+
+    def _queue_batch_set_and_publish(self, pipe, ns: str,
+                                     channels_and_events: Dict[str, List[str]],
+                                     data_map: Dict[str, bytes]):
+        db_data_map = _add_data_map_ns_prefix(ns, data_map)
+        channels_and_events_prepared, total_events = self._prepare_channels(ns, channels_and_events)
+        pipe.execute_command("MSETMPUB", len(db_data_map), total_events,
+                             *[val for data in db_data_map.items() for val in data],
+                             *channels_and_events_prepared)
+        return lambda reply: None
+
+    def _queue_batch_set_if_and_publish(self, pipe, ns: str,
+                                        channels_and_events: Dict[str, List[str]], key: str,
+                                        old_data: bytes, new_data: bytes):
+        channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
+        pipe.execute_command("SETIEMPUB", _add_key_ns_prefix(ns, key), new_data, old_data,
+                             *channels_and_events_prepared)
+        return lambda reply: reply == b"OK"
+
+    def _queue_batch_set_if_not_exists_and_publish(self, pipe, ns: str,
+                                                   channels_and_events: Dict[str, List[str]],
+                                                   key: str, data: bytes):
+        channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
+        pipe.execute_command("SETNXMPUB", _add_key_ns_prefix(ns, key), data,
+                             *channels_and_events_prepared)
+        return lambda reply: reply == b"OK"
+
+    def _queue_batch_remove_and_publish(self, pipe, ns: str,
+                                        channels_and_events: Dict[str, List[str]],
+                                        keys: List[str]):
+        db_keys = _add_keys_ns_prefix(ns, keys)
+        channels_and_events_prepared, total_events = self._prepare_channels(ns, channels_and_events)
+        pipe.execute_command("DELMPUB", len(db_keys), total_events, *db_keys,
+                             *channels_and_events_prepared)
+        return lambda reply: None
+
+    def _queue_batch_remove_if_and_publish(self, pipe, ns: str,
+                                           channels_and_events: Dict[str, List[str]], key: str,
+                                           data: bytes):
+        channels_and_events_prepared, _ = self._prepare_channels(ns, channels_and_events)
+        pipe.execute_command("DELIEMPUB", _add_key_ns_prefix(ns, key), data,
+                             *channels_and_events_prepared)
+        return bool
+
+    def __split_keys(self, db_keys: List[str]) -> List[List[str]]:
+        if not self.max_keys_per_command and not self.max_bytes_per_command:
+            return [db_keys]
+        return _split_to_chunks(db_keys, self.max_keys_per_command, self.max_bytes_per_command,
+                                len)
+
+    def __split_data_map(self, db_data_map: Dict[str, bytes]) -> List[Dict[str, bytes]]:
+        if not self.max_keys_per_command and not self.max_bytes_per_command:
+            return [db_data_map]
+        chunks = _split_to_chunks(list(db_data_map.items()), self.max_keys_per_command,
+                                  self.max_bytes_per_command, lambda kv: len(kv[0]) + len(kv[1]))
+        return [dict(chunk) for chunk in chunks]
+
     def __create_redis_clients(self, config):
         clients = list()
         cfg_params = config.get_params()
+        if cfg_params.db_type == DbBackendType.REDIS_CLUSTER:
+            return [self.__create_redis_cluster_client(cfg_params)]
         for i, addr in enumerate(cfg_params.db_cluster_addrs):
             port = cfg_params.db_ports[i] if i < len(cfg_params.db_ports) else ""
             sport = cfg_params.db_sentinel_ports[i] if i < len(cfg_params.db_sentinel_ports) else ""
             name = cfg_params.db_sentinel_master_names[i] if i < len(cfg_params.db_sentinel_master_names) else ""
 
-            client = self.__create_redis_client(addr, port, sport, name)
+            client = self.__create_redis_client(addr, port, sport, name, cfg_params)
             clients.append(client)
         return clients
 
-    def __create_redis_client(self, addr, port, sentinel_port, master_name):
+    def __create_redis_client(self, addr, port, sentinel_port, master_name, cfg_params):
         new_sentinel = None
         new_redis = None
+        new_replica = None
+        conn_kwargs = _get_connection_kwargs(cfg_params)
+        pool_kwargs = _get_pool_kwargs(cfg_params)
         if len(sentinel_port) == 0:
-            new_redis = Redis(host=addr, port=port, db=0, max_connections=20)
+            if cfg_params.db_pool_blocking:
+                pool = BlockingConnectionPool(host=addr, port=port, db=0, **pool_kwargs,
+                                              **conn_kwargs)
+                new_redis = Redis(connection_pool=pool)
+            else:
+                pool_kwargs.setdefault('max_connections', DEFAULT_MAX_CONNECTIONS)
+                new_redis = Redis(host=addr, port=port, db=0, **pool_kwargs, **conn_kwargs)
         else:
             sentinel_node = (addr, sentinel_port)
-            new_sentinel = Sentinel([sentinel_node])
-            new_redis = new_sentinel.master_for(master_name)
+            # Socket options are applied to the sentinel connections too.
+            new_sentinel = Sentinel([sentinel_node], **conn_kwargs)
+            if cfg_params.db_pool_blocking:
+                pool_kwargs['connection_pool_class'] = _BlockingSentinelConnectionPool
+            new_redis = new_sentinel.master_for(master_name, **pool_kwargs)
+            if cfg_params.db_read_preference != DbReadPreference.MASTER:
+                new_replica = new_sentinel.slave_for(master_name, **pool_kwargs)
 
         new_redis.set_response_callback('SETIE', lambda r: r and str_if_bytes(r) == 'OK' or False)
         new_redis.set_response_callback('DELIE', lambda r: r and int(r) == 1 or False)
 
-        redis_pubsub = PubSub(self.event_separator, new_redis.connection_pool, ignore_subscribe_messages=True)
+        return self.__create_redis_conn(new_redis, new_redis.connection_pool, new_replica)
+
+    def __create_redis_cluster_client(self, cfg_params):
+        pool_kwargs = _get_pool_kwargs(cfg_params)
+        pool_kwargs.setdefault('max_connections', DEFAULT_MAX_CONNECTIONS)
+        # Blocking pool is not supported by redis-py cluster client, only the pool size.
+        replica_reads = cfg_params.db_read_preference != DbReadPreference.MASTER
+        # Reads are sent to the replicas per command by a replica reading client, not by redis-py
+        # 'read_from_replicas', to read tracked namespaces and to fall back to the master.
+        new_redis = _RedisClusterClient(
+            startup_nodes=_create_startup_nodes(cfg_params.db_cluster_addrs, cfg_params.db_ports),
+            read_from_replicas=False,
+            readonly_connections=replica_reads,
+            max_connections=pool_kwargs['max_connections'],
+            **_get_connection_kwargs(cfg_params))
+        new_redis.set_response_callback('SETIE', lambda r: r and str_if_bytes(r) == 'OK' or False)
+        new_redis.set_response_callback('DELIE', lambda r: r and int(r) == 1 or False)
+        # Published events are forwarded to every node of the cluster, hence events are received
+        # from the default node, which serves also the PUBSUB commands.
+        pubsub_pool = new_redis.get_default_node().redis_connection.connection_pool
+        new_replica = new_redis.replica_reads_client() if replica_reads else None
+        return self.__create_redis_conn(new_redis, pubsub_pool, new_replica)
+
+    def __create_redis_conn(self, new_redis, pubsub_pool, new_replica=None):
+        redis_pubsub = PubSub(self.event_separator, pubsub_pool, ignore_subscribe_messages=True)
         pubsub_thread = threading.Thread(target=None)
         run_in_thread = False
 
-        return _RedisConn(new_redis, redis_pubsub, pubsub_thread, run_in_thread)
+        return _RedisConn(new_redis, redis_pubsub, pubsub_thread, run_in_thread, new_replica)
 
     def __getClientConns(self):
         return self.clients
 
-    def __getClientConn(self, ns):
-        clients_cnt = len(self.clients)
-        client_id = self.__get_hash(ns) % clients_cnt
-        return self.clients[client_id]
-
-    def __getClient(self, ns):
-        clients_cnt = len(self.clients)
-        client_id = 0
-        if clients_cnt > 1:
-            client_id = self.__get_hash(ns) % clients_cnt
-        return self.clients[client_id].redis_client
-
-    @classmethod
-    def __get_hash(cls, str):
-        return zlib.crc32(str.encode())
-
     @classmethod
-    def __add_key_ns_prefix(cls, ns: str, key: str):
-        return '{' + ns + '},' + key
-
-    @classmethod
-    def __add_keys_ns_prefix(cls, ns: str, keylist: List[str]) -> List[str]:
-        ret_nskeys = []
-        for k in keylist:
-            ret_nskeys.append('{' + ns + '},' + k)
-        return ret_nskeys
+    def __create_ns_sharding(cls, config):
+        cfg_params = config.get_params()
+        if not cfg_params.db_cluster_addrs or cfg_params.db_type == DbBackendType.REDIS_CLUSTER:
+            return None
+        # Sentinel port is the address of a database instance, when Sentinel is used.
+        ports = cfg_params.db_sentinel_ports or cfg_params.db_ports
+        return _create_ns_sharding(cfg_params.db_sharding, cfg_params.db_cluster_addrs,
+                                   cfg_params.db_sharding_weights, cfg_params.db_sharding_vnodes,
+                                   ports)
 
-    @classmethod
-    def __add_data_map_ns_prefix(cls, ns: str, data_dict: Dict[str, bytes]) -> Dict[str, bytes]:
-        ret_nsdict = {}
-        for key, val in data_dict.items():
-            ret_nsdict['{' + ns + '},' + key] = val
-        return ret_nsdict
+    def __getClientConn(self, ns):
+        return self.clients[self.get_client_index(ns)]
 
-    @classmethod
-    def __strip_ns_from_bin_keys(cls, ns: str, nskeylist: List[bytes]) -> List[str]:
-        ret_keys = []
-        for k in nskeylist:
-            try:
-                redis_key = k.decode("utf-8")
-            except UnicodeDecodeError as exc:
-                msg = u'Namespace %s key conversion to string failed: %s' % (ns, str(exc))
-                raise RejectedByBackend(msg)
-            nskey = redis_key.split(',', 1)
-            if len(nskey) != 2:
-                msg = u'Namespace %s key:%s has no namespace prefix' % (ns, redis_key)
-                raise RejectedByBackend(msg)
-            ret_keys.append(nskey[1])
-        return ret_keys
+    def __getClient(self, ns):
+        return self.__getClientConn(ns).redis_client
+
+    def __read(self, ns, read_fn):
+        """Run a read-only database function with the client of the read preference."""
+        redis_ctx = self.__getClientConn(ns)
+        # Tracked namespaces are read from the master, which sends the invalidations, to not
+        # cache a value older than the latest invalidation.
+        if redis_ctx.replica_client is None or ns in self.invalidate_cbs:
+            return read_fn(redis_ctx.redis_client)
+        if self.read_preference == DbReadPreference.REPLICA:
+            return read_fn(redis_ctx.replica_client)
+        try:
+            return read_fn(redis_ctx.replica_client)
+        except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError):
+            return read_fn(redis_ctx.redis_client)
 
     def _prepare_channels(self, ns: str,
                           channels_and_events: Dict[str, List[str]]) -> Tuple[List, int]:
-        channels_and_events_prepared = []
-        for channel, events in channels_and_events.items():
-            one_channel_join_events = None
-            for event in events:
-                if one_channel_join_events is None:
-                    channels_and_events_prepared.append(self.__add_key_ns_prefix(ns, channel))
-                    one_channel_join_events = event
-                else:
-                    one_channel_join_events = one_channel_join_events + self.event_separator + event
-            channels_and_events_prepared.append(one_channel_join_events)
-        pairs_cnt = int(len(channels_and_events_prepared) / 2)
-        return channels_and_events_prepared, pairs_cnt
+        return _prepare_channels(ns, channels_and_events, self.event_separator)
+
+    def get_client_index(self, ns: str) -> int:
+        """Return index of the database client of the namespace."""
+        if self.ns_sharding is None:
+            # Redis Cluster client routes a namespace to a node by the hash slot.
+            return 0
+        return self.ns_sharding.get_index(ns)
 
     def get_redis_connection(self, ns: str):
         """Return existing Redis database connection valid for the namespace."""
@@ -476,16 +1016,20 @@ class _RedisConn:
     Internal class container to hold redis client connection
     """
 
-    def __init__(self, redis_client, pubsub, pubsub_thread, run_in_thread):
+    def __init__(self, redis_client, pubsub, pubsub_thread, run_in_thread, replica_client=None):
         self.redis_client = redis_client
+        self.replica_client = replica_client
         self.redis_pubsub = pubsub
         self.pubsub_thread = pubsub_thread
         self.run_in_thread = run_in_thread
+        # Invalidation trackers by Redis Cluster node name, or None if not a cluster.
+        self.invalidation_trackers = {}  # type: Dict[Optional[str], _InvalidationTracker]
 
     def __str__(self):
         return str(
             {
                 "Client": repr(self.redis_client),
+                "Replica client": repr(self.replica_client),
                 "Subscrions": self.redis_pubsub.subscribed,
                 "PubSub thread": repr(self.pubsub_thread),
                 "Run in thread": self.run_in_thread,
@@ -493,6 +1037,184 @@ def __str__(self):
         )
 
 
+class _BatchHandler:
+    """
+    Internal class of a pub/sub message handler of the channels subscribed with a batch callback.
+    '_PubSubListener' delivers the events to the batch callback in batches, other event handling
+    calls the handler, and thus the batch callback, with one event at a time.
+
+    Args:
+        batch_cb (function): Batch callback, which takes a list of (channel, events) tuples.
+    """
+    def __init__(self, batch_cb: Callable[[List[Tuple[str, List[str]]]], None]) -> None:
+        self.batch_cb = batch_cb
+
+    def __call__(self, channel: str, events: List[str]) -> None:
+        self.batch_cb([(channel, events)])
+
+
+class _PubSubListener(threading.Thread):
+    """
+    Internal class to run a thread handling the events received to a Redis pub/sub connection.
+
+    Thread blocks reading the pub/sub connection socket until an event is received, instead of
+    polling the socket with a short timeout, so that an idle listener does not consume CPU.
+    Then the events already received are drained in one pass, at most 'LISTEN_BATCH_SIZE'
+    events, and the events of the channels subscribed with a batch callback are delivered to it
+    as one batch.
+    The read is interrupted every 'LISTEN_TIMEOUT' seconds only to check if the listener has been
+    stopped. If the connection is lost, the pub/sub connection is reconnected and the channels
+    are resubscribed by the next read after 'RECONNECT_INTERVAL' seconds.
+
+    Args:
+        pubsub (PubSub): Redis pub/sub object which subscribed channel handlers are called.
+    """
+    LISTEN_TIMEOUT = 1.0
+    LISTEN_BATCH_SIZE = 1000
+    RECONNECT_INTERVAL = 1.0
+
+    def __init__(self, pubsub) -> None:
+        super().__init__(daemon=True)
+        self.pubsub = pubsub
+        self.running = threading.Event()
+        self.running.set()
+
+    def run(self):
+        while self.running.is_set():
+            try:
+                self.pubsub.handle_messages(self.LISTEN_TIMEOUT, self.LISTEN_BATCH_SIZE)
+            except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError):
+                time.sleep(self.RECONNECT_INTERVAL)
+            except SdlException:
+                # Event was rejected by the event callback dispatcher, continue listening.
+                logging.getLogger('ricsdl').exception("Event handling failed")
+        self.pubsub.close()
+
+    def stop(self) -> None:
+        """Stop the listener thread. Thread exits at the latest after 'LISTEN_TIMEOUT'."""
+        self.running.clear()
+
+
+class _InvalidationTracker:
+    """
+    Internal class to receive key invalidation notifications of Redis client side caching.
+
+    Tracking is enabled in broadcasting mode for key prefixes of the tracked namespaces, thus
+    Redis notifies about every modified key having one of the prefixes regardless of which client
+    has read the key. Because notifications are delivered only in RESP3 protocol to the tracking
+    connection itself, tracking is enabled with one dedicated connection and notifications are
+    redirected to another dedicated connection subscribed to the '__redis__:invalidate' channel.
+    Dedicated connections are created with the connection settings of the connection pool of the
+    Redis client, but outside the pool, so that they do not reduce the number of connections
+    available to the database operations.
+
+    Invalidation callback is called with a list of modified Redis keys, or with None if all the
+    keys may have been modified, which is the case when the connection to Redis was lost.
+
+    Args:
+        redis_client (Redis): Redis client, which connection pool settings are used to create
+                              the connections.
+        invalidate_cb (function): Invalidation callback.
+    """
+    INVALIDATE_CHANNEL = '__redis__:invalidate'
+    RECONNECT_INTERVAL = 1.0
+
+    def __init__(self, redis_client, invalidate_cb) -> None:
+        self.redis_client = redis_client
+        self.invalidate_cb = invalidate_cb
+        self.prefixes = []  # type: List[str]
+        self.listen_conn = None
+        self.listen_conn_id = None
+        self.track_conn = None
+        self.listen_thread = None
+        self.closed = False
+        self.lock = threading.RLock()
+
+    def add_prefix(self, prefix: str) -> None:
+        """Enable tracking of a key prefix. Start listening notifications if not started yet."""
+        with self.lock:
+            if prefix in self.prefixes:
+                return
+            if self.track_conn is None:
+                self.__connect(self.prefixes + [prefix])
+            else:
+                self.__enable_tracking([prefix])
+            self.prefixes.append(prefix)
+            if self.listen_thread is None:
+                self.listen_thread = threading.Thread(target=self._listen, daemon=True)
+                self.listen_thread.start()
+
+    def close(self) -> None:
+        """Stop tracking and close the dedicated connections."""
+        with self.lock:
+            self.closed = True
+            self.__disconnect()
+
+    def __connect(self, prefixes):
+        try:
+            self.listen_conn = self.__create_connection()
+            self.listen_conn.send_command('CLIENT', 'ID')
+            self.listen_conn_id = self.listen_conn.read_response()
+            self.listen_conn.send_command('SUBSCRIBE', self.INVALIDATE_CHANNEL)
+            self.listen_conn.read_response()
+            self.track_conn = self.__create_connection()
+            self.__enable_tracking(prefixes)
+        except Exception:
+            self.__disconnect()
+            raise
+
+    def __enable_tracking(self, prefixes):
+        prefix_args = []
+        for prefix in prefixes:
+            prefix_args.extend(['PREFIX', prefix])
+        self.track_conn.send_command('CLIENT', 'TRACKING', 'ON', 'REDIRECT', self.listen_conn_id,
+                                     'BCAST', *prefix_args)
+        self.track_conn.read_response()
+
+    def __create_connection(self):
+        pool = self.redis_client.connection_pool
+        return pool.connection_class(**pool.connection_kwargs)
+
+    def __disconnect(self):
+        for conn in (self.listen_conn, self.track_conn):
+            if conn is not None:
+                conn.disconnect()
+        self.listen_conn = None
+        self.track_conn = None
+
+    def _listen(self):
+        while not self.closed:
+            try:
+                conn = self.listen_conn
+                if conn is None:
+                    self.__reconnect()
+                elif conn.can_read(timeout=self.RECONNECT_INTERVAL):
+                    self.__handle_message(conn.read_response())
+            except (redis_exceptions.RedisError, OSError, ValueError):
+                # Notifications may have been lost, hence everything is invalidated.
+                if self.closed:
+                    break
+                with self.lock:
+                    self.__disconnect()
+                self.invalidate_cb(None)
+                time.sleep(self.RECONNECT_INTERVAL)
+
+    def __reconnect(self):
+        with self.lock:
+            if self.closed:
+                return
+            # 'add_prefix' connects, if it is called after the connection was lost.
+            if self.listen_conn is None:
+                self.__connect(self.prefixes)
+        # Keys modified while tracking was disabled are not notified.
+        self.invalidate_cb(None)
+
+    def __handle_message(self, response):
+        if str_if_bytes(response[0]) != 'message':
+            return
+        self.invalidate_cb(response[2])
+
+
 class RedisBackendLock(DbBackendLockAbc):
     """
     A class providing an implementation of database backend lock of Shared Data Layer (SDL), when
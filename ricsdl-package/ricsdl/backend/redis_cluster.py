@@ -0,0 +1,222 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+The module provides Redis Cluster client of Shared Data Layer (SDL) Redis database backend.
+
+SDL database keys and channels have the namespace as a hash tag ('{ns},key'), thus all the keys
+and channels of a namespace belong to one hash slot and every SDL command, also a multi-key
+command, is served by the node owning the slot of the namespace. Slot map discovery, MOVED and
+ASK redirections and topology refresh are done by redis-py 'RedisCluster'. This module adds
+routing of the commands redis-py cannot route by itself and routing of the reads of a replica
+reading client to the replicas of the slot.
+
+Routing overrides internal methods of redis-py 'RedisCluster' and 'ClusterPipeline'
+(determine_slot, _determine_nodes, _process_result, on_connect and close), which are not part of the redis-py
+public API. Hence redis-py version is pinned in setup.py and the unit tests check the
+signatures of the overridden methods, when redis-py is upgraded.
+"""
+import copy
+from typing import (Any, List, Optional)
+from redis.cluster import (RedisCluster, ClusterPipeline, ClusterNode, READ_COMMANDS, REPLICA)
+from redis.exceptions import (AskError, ClusterDownError, ConnectionError, RedisClusterException,
+                              TimeoutError)
+from redis.client import list_or_args
+from redis.utils import str_if_bytes
+
+
+DEFAULT_PORT = 6379
+
+
+# Index of the argument routing a command, which redis-py cannot route. DBaaS module commands
+# are unknown to redis-py, KEYS and SCAN are sent by default to all or to a random node and
+# PUBLISH has no key.
+_ROUTING_ARG_INDEXES = {
+    'KEYS': 1,
+    'PUBLISH': 1,
+    'SETIE': 1,
+    'DELIE': 1,
+    'SETIEMPUB': 1,
+    'SETNXMPUB': 1,
+    'DELIEMPUB': 1,
+    'MSETMPUB': 3,
+    'DELMPUB': 3,
+}
+
+# Read-only commands of a replica reading client, SCAN is missing from redis-py READ_COMMANDS.
+_REPLICA_READ_COMMANDS = READ_COMMANDS | {'SCAN'}
+
+
+def _get_routing_arg(args) -> Optional[Any]:
+    command = str_if_bytes(args[0]).upper()
+    if command == 'SCAN':
+        for idx in range(1, len(args) - 1):
+            if isinstance(args[idx], (str, bytes)) and str_if_bytes(args[idx]).upper() == 'MATCH':
+                return args[idx + 1]
+        return None
+    idx = _ROUTING_ARG_INDEXES.get(command)
+    if idx is None or idx >= len(args):
+        return None
+    return args[idx]
+
+
+def _create_startup_nodes(addrs: List[str], ports: List[str]) -> List[ClusterNode]:
+    nodes = []
+    for i, addr in enumerate(addrs):
+        port = ports[i] if i < len(ports) and ports[i] else DEFAULT_PORT
+        nodes.append(ClusterNode(addr, int(port)))
+    return nodes
+
+
+class _SlotRouting:
+    """Mixin routing SDL commands to the node owning the hash slot of the namespace."""
+    replica_reads = False
+
+    def determine_slot(self, *args):
+        routing_arg = _get_routing_arg(args)
+        if routing_arg is None:
+            return super().determine_slot(*args)
+        return self.keyslot(routing_arg)
+
+    def _determine_nodes(self, *args, **kwargs):
+        command = str_if_bytes(args[0]).upper()
+        replica_read = self.replica_reads and command in _REPLICA_READ_COMMANDS
+        if command in ('KEYS', 'SCAN'):
+            routed = _get_routing_arg(args) is not None
+        else:
+            routed = replica_read and command not in self.command_flags
+        if routed and kwargs.get('nodes_flag') is None:
+            # A replica is selected randomly, the primary only if the slot has no replicas.
+            return [self.nodes_manager.get_node_from_slot(
+                self.determine_slot(*args), server_type=REPLICA if replica_read else None)]
+        return super()._determine_nodes(*args, **kwargs)
+
+    def _process_result(self, command, res, **kwargs):
+        if command == 'SCAN' and len(res) == 1:
+            # Cursor of a namespace scan is the cursor of the one node owning the namespace.
+            return list(res.values())[0]
+        return super()._process_result(command, res, **kwargs)
+
+
+class _RedisClusterClient(_SlotRouting, RedisCluster):
+    """
+    Redis Cluster client of SDL. Pipelines support transactions, when all the commands of the
+    pipeline belong to one hash slot.
+
+    Args:
+        readonly_connections (bool): Send READONLY in every new connection, thus the replicas
+                                     serve the reads of the client returned by
+                                     'replica_reads_client'. READONLY does not affect a primary.
+    """
+    def __init__(self, *args, readonly_connections=False, **kwargs) -> None:
+        # Connections are created already by the constructor of redis-py 'RedisCluster'.
+        self.readonly_connections = readonly_connections
+        super().__init__(*args, **kwargs)
+
+    def on_connect(self, connection):
+        super().on_connect(connection)
+        if self.readonly_connections and not self.read_from_replicas:
+            connection.send_command('READONLY')
+            if str_if_bytes(connection.read_response()) != 'OK':
+                raise ConnectionError("READONLY command failed")
+
+    def replica_reads_client(self) -> '_RedisClusterClient':
+        """
+        Return a client, which sends the read-only commands to a replica of the slot and other
+        commands to the primary. The client shares the nodes and the connections of this
+        client, which closes them.
+        """
+        client = copy.copy(self)
+        client.replica_reads = True
+        return client
+
+    def close(self):
+        if not self.replica_reads:
+            super().close()
+
+    def pipeline(self, transaction=None, shard_hint=None):
+        if shard_hint:
+            raise RedisClusterException("shard_hint is deprecated in cluster mode")
+        return _RedisClusterPipeline(
+            transaction=transaction,
+            nodes_manager=self.nodes_manager,
+            commands_parser=self.commands_parser,
+            startup_nodes=self.nodes_manager.startup_nodes,
+            result_callbacks=self.result_callbacks,
+            cluster_response_callbacks=self.cluster_response_callbacks,
+            cluster_error_retry_attempts=self.cluster_error_retry_attempts,
+            read_from_replicas=self.read_from_replicas,
+            reinitialize_steps=self.reinitialize_steps,
+            lock=self._lock,
+        )
+
+
+class _RedisClusterPipeline(_SlotRouting, ClusterPipeline):
+    """
+    Redis Cluster pipeline of SDL. A transaction is executed with MULTI/EXEC in the node owning
+    the hash slot of the commands and retried after refreshing the slot map, if the slot has
+    been moved or the node has failed.
+    """
+    def __init__(self, transaction=None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.transaction = bool(transaction)
+
+    # Multi-key commands are blocked in redis-py cluster pipelines, because keys could belong to
+    # different slots. Keys of an SDL command belong to the slot of one namespace.
+    def delete(self, *names):
+        return self.execute_command('DEL', *names)
+
+    def mget(self, keys, *args):
+        return self.execute_command('MGET', *list_or_args(keys, args))
+
+    def mset(self, mapping):
+        items = []
+        for pair in mapping.items():
+            items.extend(pair)
+        return self.execute_command('MSET', *items)
+
+    def publish(self, channel, message):
+        return self.execute_command('PUBLISH', channel, message)
+
+    def execute(self, raise_on_error=True):
+        if not self.transaction:
+            return super().execute(raise_on_error)
+        try:
+            return self.__execute_transaction(raise_on_error)
+        finally:
+            self.reset()
+
+    def __execute_transaction(self, raise_on_error):
+        exception = None
+        for _ in range(self.cluster_error_retry_attempts):
+            slots = {self.determine_slot(*c.args) for c in self.command_stack}
+            if len(slots) != 1:
+                raise RedisClusterException("Commands of a transaction must map to one key slot")
+            node = self.nodes_manager.get_node_from_slot(slots.pop())
+            pipe = self.get_redis_connection(node).pipeline(transaction=True)
+            for command in self.command_stack:
+                pipe.execute_command(*command.args, **command.options)
+            try:
+                return pipe.execute(raise_on_error)
+            except (AskError, ClusterDownError, ConnectionError, TimeoutError) as exc:
+                exception = exc
+                self.nodes_manager.initialize()
+        raise exception
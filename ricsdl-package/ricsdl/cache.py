@@ -0,0 +1,116 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""The module provides client side cache for Shared Data Layer (SDL) read operations."""
+from collections import OrderedDict
+import threading
+from typing import (Any, Hashable, Iterable, Optional, Tuple)
+
+
+class _ReadCache():
+    """
+    Bounded cache of values read from SDL storage. When the cache is full, the least recently
+    used entry is evicted.
+
+    An entry is identified by a namespace, a key and a kind of the read operation, because one
+    key can be read by several operations (for example 'get_members' and 'is_member' of a
+    group). All the entries of a key are removed when the key is invalidated.
+
+    A value read from the storage must not be stored, if the key has been invalidated while
+    the read operation was in progress. That is why 'get_epoch' is called before the storage is
+    read and the returned epoch is given to 'store', which drops the value if any invalidation
+    of the same namespace, or 'clear', has happened in between. Invalidations of the other
+    namespaces do not affect the stored values.
+
+    Args:
+        max_entries (int): Maximum number of entries in the cache.
+    """
+    MISS = object()
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries = OrderedDict()  # type: OrderedDict
+        # Kinds of the cached entries of a key, grouped by namespace and key.
+        self._index = {}  # type: dict
+        # Invalidation epochs by namespace, and an epoch of clearing the whole cache.
+        self._ns_epochs = {}  # type: dict
+        self._clear_epoch = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_epoch(self, ns: str) -> Tuple[int, int]:
+        """Return the current invalidation epoch of a namespace."""
+        with self._lock:
+            return self._clear_epoch, self._ns_epochs.get(ns, 0)
+
+    def lookup(self, ns: str, key: str, kind: Hashable) -> Any:
+        """Return cached value or 'MISS' if the value is not in the cache."""
+        entry = (ns, key, kind)
+        with self._lock:
+            value = self._entries.get(entry, self.MISS)
+            if value is not self.MISS:
+                self._entries.move_to_end(entry)
+            return value
+
+    def store(self, ns: str, key: str, kind: Hashable, value: Any, epoch: Tuple[int, int]) -> None:
+        """Store a value read from the storage at the given invalidation epoch."""
+        entry = (ns, key, kind)
+        with self._lock:
+            if epoch != (self._clear_epoch, self._ns_epochs.get(ns, 0)):
+                return
+            self._entries[entry] = value
+            self._entries.move_to_end(entry)
+            self._index.setdefault(ns, {}).setdefault(key, set()).add(kind)
+            while len(self._entries) > self._max_entries:
+                (old_ns, old_key, old_kind), _ = self._entries.popitem(last=False)
+                self.__unindex(old_ns, old_key, old_kind)
+
+    def invalidate(self, ns: str, keys: Optional[Iterable[str]] = None) -> None:
+        """Remove the keys of a namespace, or the whole namespace if keys are not given."""
+        with self._lock:
+            self._ns_epochs[ns] = self._ns_epochs.get(ns, 0) + 1
+            ns_index = self._index.get(ns)
+            if not ns_index:
+                return
+            if keys is None:
+                keys = list(ns_index)
+            for key in keys:
+                for kind in ns_index.pop(key, ()):
+                    self._entries.pop((ns, key, kind), None)
+            if not ns_index:
+                del self._index[ns]
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            self._clear_epoch += 1
+            self._entries.clear()
+            self._index.clear()
+
+    def __unindex(self, ns, key, kind):
+        kinds = self._index[ns][key]
+        kinds.discard(kind)
+        if not kinds:
+            del self._index[ns][key]
+            if not self._index[ns]:
+                del self._index[ns]
@@ -29,16 +29,130 @@ class DbBackendType(Enum):
     """Enumeration class of supported SDL database backend types."""
     REDIS = 1
     FAKE_DICT = 2
+    REDIS_CLUSTER = 3
+
+
+class DbShardingType(Enum):
+    """
+    Enumeration class of supported methods to select a database instance for a namespace, when
+    there are several database instances.
+    """
+    MODULO = 1
+    CONSISTENT = 2
+    RENDEZVOUS = 3
+
+
+class DbReadPreference(Enum):
+    """
+    Enumeration class of supported database instances of read-only operations, when Redis
+    sentinel is used. Replicas are updated asynchronously, thus a value read from a replica
+    can be older than the value in the master.
+    """
+    MASTER = 1
+    REPLICA_PREFERRED = 2
+    REPLICA = 3
+
+
+class EventQueueOverflow(Enum):
+    """
+    Enumeration class of supported policies to handle an event, when an event queue is full.
+    With BLOCK the publisher waits for free space, with DROP_OLDEST the oldest queued event is
+    discarded and with RAISE the publisher gets an exception.
+    """
+    BLOCK = 1
+    DROP_OLDEST = 2
+    RAISE = 3
 
 
 class _Configuration():
-    """This class implements Shared Data Layer (SDL) configurability."""
+    """
+    This class implements Shared Data Layer (SDL) configurability.
+
+    Database connection options are read from environment variables. An option given as a
+    keyword argument overrides the environment variable.
+
+    Args:
+        fake_db_backend (str): Fake DB backend type, see 'SyncStorage'.
+        db_max_connections (int): Maximum number of connections in a connection pool of one
+                                  database instance (SDL_DB_MAX_CONNECTIONS). By default 20,
+                                  unlimited if Redis sentinel is used and the pool is not blocking.
+        db_pool_blocking (bool): Wait for a free connection when the connection pool is full
+                                 instead of failing (SDL_DB_POOL_BLOCKING). Limited connection
+                                 pools of 'AsyncStorage' always wait.
+        db_pool_timeout (int, float): Seconds to wait for a free connection of a blocking
+                                      connection pool (SDL_DB_POOL_TIMEOUT). By default 20.
+        db_socket_timeout (int, float): Seconds to wait for a database reply
+                                        (SDL_DB_SOCKET_TIMEOUT). By default no timeout.
+        db_socket_connect_timeout (int, float): Seconds to wait for a database connection
+                                                (SDL_DB_SOCKET_CONNECT_TIMEOUT). By default no
+                                                timeout.
+        db_socket_keepalive (bool): Enable TCP keepalive of database connections
+                                    (SDL_DB_SOCKET_KEEPALIVE).
+        db_health_check_interval (int): Seconds after which an idle connection is checked with
+                                        PING before it is used (SDL_DB_HEALTH_CHECK_INTERVAL).
+                                        By default not checked.
+        db_read_preference (DbReadPreference, str): Database instance of read-only operations,
+                                                    when Redis sentinel or Redis Cluster is used
+                                                    (SDL_DB_READ_PREFERENCE): 'master',
+                                                    'replica-preferred' or 'replica'. By default
+                                                    'master'. With 'replica-preferred' a read is
+                                                    retried on the master, if a replica fails.
+                                                    With 'replica' the master is used only if
+                                                    sentinel or the cluster knows no replicas.
+                                                    Namespaces tracked by a read cache are
+                                                    always read from the master. Key scans of
+                                                    'iter_keys' and 'iter_items' follow the
+                                                    preference, keys removed by 'remove_all'
+                                                    are always scanned from the master.
+        fake_db_options (dict): Options of the fake database backend, which are not database
+                                connection options. An option given in the dictionary overrides
+                                the environment variable. Supported options are
+                                'event_queue_size', maximum number of queued events
+                                (SDL_FAKE_DB_EVENT_QUEUE_SIZE), by default unlimited, and
+                                'event_queue_overflow', handling of an event published to a
+                                full event queue (SDL_FAKE_DB_EVENT_QUEUE_OVERFLOW): 'block',
+                                'drop-oldest' or 'raise', by default 'block'.
+    """
     Params = namedtuple('Params', ['db_host', 'db_ports', 'db_sentinel_ports',
                                    'db_sentinel_master_names',
-                                   'db_cluster_addrs', 'db_type'])
+                                   'db_cluster_addrs', 'db_type',
+                                   'db_max_keys_per_command', 'db_max_bytes_per_command',
+                                   'db_sharding', 'db_sharding_vnodes', 'db_sharding_weights',
+                                   'db_max_connections', 'db_pool_blocking', 'db_pool_timeout',
+                                   'db_socket_timeout', 'db_socket_connect_timeout',
+                                   'db_socket_keepalive', 'db_health_check_interval',
+                                   'db_read_preference', 'fake_db_event_queue_size',
+                                   'fake_db_event_queue_overflow'],
+                        defaults=[0, 0, DbShardingType.MODULO, 160, None,
+                                  None, False, None, None, None, False, 0,
+                                  DbReadPreference.MASTER, 0, EventQueueOverflow.BLOCK])
 
-    def __init__(self, fake_db_backend):
+    # Connection options, their environment variables and value types.
+    CONNECTION_OPTIONS = {
+        'db_max_connections': ('SDL_DB_MAX_CONNECTIONS', int),
+        'db_pool_blocking': ('SDL_DB_POOL_BLOCKING', bool),
+        'db_pool_timeout': ('SDL_DB_POOL_TIMEOUT', float),
+        'db_socket_timeout': ('SDL_DB_SOCKET_TIMEOUT', float),
+        'db_socket_connect_timeout': ('SDL_DB_SOCKET_CONNECT_TIMEOUT', float),
+        'db_socket_keepalive': ('SDL_DB_SOCKET_KEEPALIVE', bool),
+        'db_health_check_interval': ('SDL_DB_HEALTH_CHECK_INTERVAL', int),
+        'db_read_preference': ('SDL_DB_READ_PREFERENCE', DbReadPreference),
+    }
+
+    # Fake database backend options, their environment variables and value types. Parameter
+    # of an option is the option name prefixed with 'fake_db_'.
+    FAKE_DB_OPTIONS = {
+        'event_queue_size': ('SDL_FAKE_DB_EVENT_QUEUE_SIZE', int),
+        'event_queue_overflow': ('SDL_FAKE_DB_EVENT_QUEUE_OVERFLOW', EventQueueOverflow),
+    }
+
+    def __init__(self, fake_db_backend, fake_db_options=None, **connection_options):
         self.params = self._read_configuration(fake_db_backend)
+        self.params = self.params._replace(**self._read_connection_options(connection_options))
+        fake_db_params = self._read_options("fake database options", self.FAKE_DB_OPTIONS,
+                                            fake_db_options or {})
+        self.params = self.params._replace(**{'fake_db_' + option: value
+                                              for option, value in fake_db_params.items()})
 
     def __str__(self):
         return str(
@@ -69,6 +183,8 @@ def _read_configuration(cls, fake_db_backend):
                 raise ValueError(msg)
 
             backend_type = DbBackendType.FAKE_DICT
+        elif cls._read_bool_env('SDL_DB_REDIS_CLUSTER'):
+            backend_type = DbBackendType.REDIS_CLUSTER
         host = os.getenv('DBAAS_SERVICE_HOST', "")
 
         port_env = os.getenv('DBAAS_SERVICE_PORT')
@@ -86,15 +202,165 @@ def _read_configuration(cls, fake_db_backend):
         if len(addrs) == 0 and len(host) > 0:
             addrs.append(host)
 
+        if backend_type == DbBackendType.REDIS_CLUSTER and sentinel_ports:
+            msg = ("Configuration error: "
+                   "Redis Cluster (SDL_DB_REDIS_CLUSTER) cannot be used with Redis sentinel "
+                   "(DBAAS_SERVICE_SENTINEL_PORT).")
+            raise ValueError(msg)
+
         addrs, ports, sentinel_ports, sentinel_names = cls._complete_configuration(
             addrs, ports, sentinel_ports, sentinel_names)
 
+        max_keys = cls._read_non_negative_int_env('SDL_MAX_KEYS_PER_COMMAND')
+        max_bytes = cls._read_non_negative_int_env('SDL_MAX_BYTES_PER_COMMAND')
+
+        sharding = cls._read_sharding_type_env('SDL_NS_SHARDING')
+        sharding_vnodes = cls._read_non_negative_int_env('SDL_NS_SHARDING_VNODES', default=160)
+        sharding_weights = cls._read_weights_env('SDL_NS_SHARDING_WEIGHTS', len(addrs))
+
         return _Configuration.Params(db_host=host,
                                      db_ports=ports,
                                      db_sentinel_ports=sentinel_ports,
                                      db_sentinel_master_names=sentinel_names,
                                      db_cluster_addrs=addrs,
-                                     db_type=backend_type)
+                                     db_type=backend_type,
+                                     db_max_keys_per_command=max_keys,
+                                     db_max_bytes_per_command=max_bytes,
+                                     db_sharding=sharding,
+                                     db_sharding_vnodes=sharding_vnodes,
+                                     db_sharding_weights=sharding_weights)
+
+    @classmethod
+    def _read_non_negative_int_env(cls, name, default=0):
+        value_env = os.getenv(name)
+        if value_env is None or value_env == "":
+            return default
+        try:
+            value = int(value_env)
+        except ValueError:
+            value = -1
+        if value < 0:
+            msg = ("Configuration error: "
+                   "Environment variable {} has wrong value: {}. "
+                   "Value must be a non-negative integer.".
+                   format(name, value_env))
+            raise ValueError(msg)
+        return value
+
+    @classmethod
+    def _read_bool_env(cls, name):
+        value_env = os.getenv(name)
+        if value_env is None or value_env == "":
+            return False
+        return cls._convert_connection_option("Environment variable {}".format(name), value_env,
+                                              bool)
+
+    @classmethod
+    def _read_connection_options(cls, connection_options):
+        return cls._read_options("database connection options", cls.CONNECTION_OPTIONS,
+                                 connection_options)
+
+    @classmethod
+    def _read_options(cls, group, known_options, given_options):
+        unknown = set(given_options) - set(known_options)
+        if unknown:
+            msg = ("Configuration error: "
+                   "Unknown {}: {}.".
+                   format(group, ", ".join(sorted(unknown))))
+            raise ValueError(msg)
+        options = {}
+        for option, (env_name, value_type) in known_options.items():
+            if option in given_options:
+                value = given_options[option]
+                name = "Argument '{}'".format(option)
+            else:
+                value = os.getenv(env_name)
+                name = "Environment variable {}".format(env_name)
+                if value is None or value == "":
+                    continue
+            options[option] = cls._convert_connection_option(name, value, value_type)
+        return options
+
+    @classmethod
+    def _convert_connection_option(cls, name, value, value_type):
+        if value is None:
+            return None
+        if value_type is bool:
+            if isinstance(value, bool):
+                return value
+            if str(value).lower() in ('true', 'yes', '1'):
+                return True
+            if str(value).lower() in ('false', 'no', '0'):
+                return False
+            msg = ("Configuration error: "
+                   "{} has wrong value: {}. "
+                   "Value must be true or false.".
+                   format(name, value))
+            raise ValueError(msg)
+        if issubclass(value_type, Enum):
+            return cls._convert_enum_option(name, value, value_type)
+        try:
+            if isinstance(value, bool):
+                raise ValueError(value)
+            converted = value_type(value)
+        except (TypeError, ValueError):
+            converted = -1
+        if converted < 0 or (value_type is int and converted != float(value)):
+            msg = ("Configuration error: "
+                   "{} has wrong value: {}. "
+                   "Value must be a non-negative {}.".
+                   format(name, value, "integer" if value_type is int else "number"))
+            raise ValueError(msg)
+        return converted
+
+    @classmethod
+    def _convert_enum_option(cls, name, value, value_type):
+        if isinstance(value, value_type):
+            return value
+        try:
+            return value_type[str(value).upper().replace('-', '_')]
+        except KeyError:
+            msg = ("Configuration error: "
+                   "{} has wrong value: {}. "
+                   "Supported values are: {}.".
+                   format(name, value,
+                          ", ".join(t.name.lower().replace('_', '-') for t in value_type)))
+            raise ValueError(msg)
+
+    @classmethod
+    def _read_sharding_type_env(cls, name):
+        value_env = os.getenv(name)
+        if value_env is None or value_env == "":
+            return DbShardingType.MODULO
+        try:
+            return DbShardingType[value_env.upper()]
+        except KeyError:
+            msg = ("Configuration error: "
+                   "Environment variable {} has wrong value: {}. "
+                   "Supported values are: {}.".
+                   format(name, value_env,
+                          ", ".join(t.name.lower() for t in DbShardingType)))
+            raise ValueError(msg)
+
+    @classmethod
+    def _read_weights_env(cls, name, addr_count):
+        value_env = os.getenv(name)
+        if value_env is None or value_env == "":
+            return None
+        try:
+            weights = [float(w) for w in value_env.split(",")]
+        except ValueError:
+            weights = []
+        if not weights or len(weights) > addr_count or min(weights) <= 0:
+            msg = ("Configuration error: "
+                   "Environment variable {} has wrong value: {}. "
+                   "Value must be a comma separated list of positive numbers, at most one "
+                   "number per database address.".
+                   format(name, value_env))
+            raise ValueError(msg)
+        # Database instances without a given weight have the default weight.
+        weights.extend([1.0] * (addr_count - len(weights)))
+        return weights
 
     @classmethod
     def _complete_configuration(cls, addrs, ports, sentinel_ports, sentinel_names):
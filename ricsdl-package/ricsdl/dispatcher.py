@@ -0,0 +1,241 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""The module provides delivery of Shared Data Layer (SDL) events to the event callbacks."""
+from collections import deque
+import logging
+import threading
+import time
+from typing import (Callable, Hashable, List, Optional, Tuple, Union)
+from ricsdl.configuration import EventQueueOverflow
+from ricsdl.exceptions import BackendError
+
+
+class _CallbackDispatcher():
+    """
+    Bounded pool of worker threads calling event callbacks. Callbacks of one channel are called
+    in the order the events were received and never in parallel, callbacks of different channels
+    are called in parallel. Channels with pending events are served in round robin, thus one
+    busy channel does not starve the others.
+
+    Workers are started when needed. Events waiting for a worker form a backlog, which size can
+    be limited. An event received when the backlog is full is handled with the overflow policy:
+    BLOCK waits until there is space, DROP_OLDEST drops the oldest waiting event of any channel
+    and RAISE drops the received event and raises BackendError to the thread receiving the
+    events. Number of dropped events is in 'dropped_events'.
+
+    Args:
+        workers (int): Maximum number of worker threads.
+        backlog (int): Maximum number of events waiting for a worker, 0 if unlimited.
+        overflow (EventQueueOverflow, str): Handling of an event received when the backlog is
+                                            full: 'block', 'drop-oldest' or 'raise'.
+    """
+    def __init__(self, workers: int, backlog: int = 0,
+                 overflow: Union[EventQueueOverflow, str] = EventQueueOverflow.BLOCK) -> None:
+        if isinstance(overflow, str):
+            overflow = EventQueueOverflow.__members__.get(overflow.upper().replace('-', '_'),
+                                                          overflow)
+        if workers < 1 or backlog < 0 or not isinstance(overflow, EventQueueOverflow):
+            raise ValueError("Invalid event callback pool options: workers {}, backlog {}, "
+                             "overflow {}".format(workers, backlog, overflow))
+        self._max_workers = workers
+        self._backlog = backlog
+        self._overflow = overflow
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._ready = threading.Condition(self._lock)
+        # Waiting events of the channels, which have waiting events or a running callback.
+        self._pending = {}
+        # Channels having waiting events and no running callback.
+        self._ready_channels = deque()
+        self._pending_count = 0
+        self._sequence = 0
+        self._workers = []  # type: List[threading.Thread]
+        self._idle_workers = 0
+        self._closed = False
+        self.dropped_events = 0
+
+    def dispatch(self, key: Hashable, cb: Callable[[str, List[str]], None], channel: str,
+                 events: List[str]) -> None:
+        """Queue a callback call of events of a channel identified by a key."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._backlog and self._pending_count >= self._backlog:
+                if self._overflow == EventQueueOverflow.BLOCK:
+                    while self._pending_count >= self._backlog and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        return
+                elif self._overflow == EventQueueOverflow.DROP_OLDEST:
+                    self.__drop_oldest()
+                else:
+                    self.dropped_events += 1
+                    raise BackendError("Event callback backlog is full, event of channel {} is "
+                                       "dropped".format(channel))
+            queue = self._pending.get(key)
+            if queue is None:
+                queue = self._pending[key] = deque()
+                self._ready_channels.append(key)
+                self.__wake_up_worker()
+            queue.append([self._sequence, cb, channel, events])
+            self._sequence += 1
+            self._pending_count += 1
+
+    def __wake_up_worker(self):
+        if self._idle_workers > 0 or len(self._workers) >= self._max_workers:
+            self._ready.notify()
+            return
+        worker = threading.Thread(target=self._run, daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def __drop_oldest(self):
+        oldest = min((queue for queue in self._pending.values() if queue),
+                     key=lambda queue: queue[0][0])
+        oldest.popleft()
+        self._pending_count -= 1
+        self.dropped_events += 1
+
+    def _run(self):
+        with self._lock:
+            while True:
+                while not self._ready_channels and not self._closed:
+                    self._idle_workers += 1
+                    self._ready.wait()
+                    self._idle_workers -= 1
+                if self._closed:
+                    return
+                key = self._ready_channels.popleft()
+                queue = self._pending[key]
+                if not queue:
+                    # Waiting events were dropped.
+                    del self._pending[key]
+                    continue
+                _, cb, channel, events = queue.popleft()
+                self._pending_count -= 1
+                self._not_full.notify()
+                self._lock.release()
+                try:
+                    cb(channel, events)
+                except Exception:
+                    logging.getLogger('ricsdl').exception("Event callback of channel %s failed",
+                                                          channel)
+                finally:
+                    self._lock.acquire()
+                if queue:
+                    self._ready_channels.append(key)
+                else:
+                    del self._pending[key]
+
+    def close(self) -> None:
+        """Stop the workers. Events waiting for a worker are dropped."""
+        with self._lock:
+            self._closed = True
+            self._not_full.notify_all()
+            self._ready.notify_all()
+
+
+class _EventBatcher():
+    """
+    Event callback collecting the received events into batches. Events are added one at a time
+    by calling the instance, or as a list by 'add_events'. Batch is a list of (channel, events)
+    tuples in the order the events were received. Batch is delivered to the batch
+    callback when it has 'max_events' tuples or when its first tuple has waited 'max_latency'
+    seconds. A full batch is delivered by the thread receiving the events, an expired batch by
+    an internal thread started with the first event. Batches are delivered one at a time in
+    order.
+
+    Args:
+        cb (function): Batch callback, which takes a list of (channel, events) tuples.
+        max_events (int): Maximum number of (channel, events) tuples in a batch.
+        max_latency (int, float): Maximum time in seconds an event waits for the delivery.
+    """
+    def __init__(self, cb: Callable[[List[Tuple[str, List[str]]]], None], max_events: int,
+                 max_latency: float) -> None:
+        self._cb = cb
+        self._max_events = max_events
+        self._max_latency = max_latency
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.Lock()
+        self._first_event = threading.Condition(self._lock)
+        self._batch = []  # type: List[Tuple[str, List[str]]]
+        self._deadline = None  # type: Optional[float]
+        self._timer = None  # type: Optional[threading.Thread]
+        self._closed = False
+
+    def __call__(self, channel: str, events: List[str]) -> None:
+        self.add_events([(channel, events)])
+
+    def add_events(self, events: List[Tuple[str, List[str]]]) -> None:
+        """Collect a list of (channel, events) tuples read from the database at once."""
+        with self._lock:
+            if self._closed:
+                return
+            was_empty = not self._batch
+            self._batch.extend(events)
+            if was_empty and self._batch:
+                self._deadline = time.monotonic() + self._max_latency
+                if self._timer is None:
+                    self._timer = threading.Thread(target=self._run_timer, daemon=True)
+                    self._timer.start()
+                self._first_event.notify()
+            full = len(self._batch) >= self._max_events
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Deliver the collected events without waiting for the batch to become full."""
+        with self._delivery_lock:
+            with self._lock:
+                batch, self._batch, self._deadline = self._batch, [], None
+            for start in range(0, len(batch), self._max_events):
+                self._cb(batch[start:start + self._max_events])
+
+    def __wait_time(self) -> Optional[float]:
+        # Time until the collected events expire, None if there are no collected events.
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def _run_timer(self):
+        while True:
+            with self._lock:
+                wait_time = self.__wait_time()
+                while not self._closed and (wait_time is None or wait_time > 0):
+                    self._first_event.wait(wait_time)
+                    wait_time = self.__wait_time()
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logging.getLogger('ricsdl').exception("Event batch callback failed")
+
+    def close(self) -> None:
+        """
+        Stop the internal thread. Collected events, which are not delivered, and events added
+        after closing are dropped.
+        """
+        with self._lock:
+            self._closed = True
+            self._batch, self._deadline = [], None
+            self._first_event.notify()
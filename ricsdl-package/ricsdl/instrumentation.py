@@ -0,0 +1,609 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""The module provides instrumentation of Shared Data Layer (SDL) database backend operations."""
+from bisect import bisect_left
+from collections import deque
+import heapq
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import (Any, Dict, List, Optional, Tuple)
+from ricsdl.exceptions import SdlTypeError
+
+
+# Database backend functions measured by the instrumentation. Iterators are not measured,
+# because the database is accessed only when they are consumed.
+_INSTRUMENTED_OPERATIONS = frozenset([
+    'set', 'set_if', 'set_if_not_exists', 'get', 'find_keys', 'find_and_get', 'remove',
+    'remove_if', 'remove_all_in_batches', 'add_member', 'remove_member', 'remove_group',
+    'get_members', 'is_member', 'group_size', 'set_and_publish', 'set_if_and_publish',
+    'set_if_not_exists_and_publish', 'remove_and_publish', 'remove_if_and_publish',
+    'remove_all_and_publish', 'execute_batch'
+])
+
+# Upper bounds of the latency histogram buckets in seconds. The last bucket is unbounded.
+_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _payload_size(value: Any) -> int:
+    """Return the number of data bytes in an argument or a return value of a backend function."""
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (set, frozenset, list, tuple)):
+        return 0
+    return sum(len(item) for item in value if isinstance(item, bytes))
+
+
+class _Counters():
+    """Counters of one operation in one namespace."""
+    __slots__ = ('calls', 'errors', 'bytes_out', 'bytes_in', 'latency_sum', 'buckets')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = {}  # type: Dict[str, int]
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(_LATENCY_BUCKETS) + 1)
+
+    def add(self, other: '_Counters') -> None:
+        """Add the counts of other counters to these counters."""
+        self.calls += other.calls
+        for error, count in list(other.errors.items()):
+            self.errors[error] = self.errors.get(error, 0) + count
+        self.bytes_out += other.bytes_out
+        self.bytes_in += other.bytes_in
+        self.latency_sum += other.latency_sum
+        for idx, count in enumerate(other.buckets):
+            self.buckets[idx] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dictionary with cumulative latency buckets."""
+        cumulative = 0
+        latency_buckets = {}
+        for bound, count in zip(_LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            cumulative += count
+            latency_buckets[bound] = cumulative
+        return {
+            'calls': self.calls,
+            'errors': dict(self.errors),
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'latency_sum': self.latency_sum,
+            'latency_buckets': latency_buckets,
+        }
+
+
+class _ThreadOwner():
+    """Object of a thread local storage, which is released when the thread ends."""
+    __slots__ = ('__weakref__',)
+
+
+class _Statistics():
+    """
+    Statistics of SDL database backend operations per operation and namespace: number of calls,
+    number of failed calls by exception type, data bytes sent and received and a histogram of
+    the call latencies.
+
+    Counters are kept per thread, so that recording a call needs no locks and threads do not
+    contend with each other. The counters of all the threads are summed when the statistics are
+    read, thus the statistics may miss calls, which are being recorded at the same time. The
+    counters of an ended thread are added to the counters of the ended threads.
+    """
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._thread_counters = {}  # type: Dict[int, Dict[Tuple[str, str], _Counters]]
+        self._ended_threads_counters = {}  # type: Dict[Tuple[str, str], _Counters]
+        self._lock = threading.Lock()
+
+    def __get_thread_counters(self) -> Dict[Tuple[str, str], _Counters]:
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = {}  # type: Dict[Tuple[str, str], _Counters]
+            with self._lock:
+                self._thread_counters[id(counters)] = counters
+            self._local.counters = counters
+            # Thread local values of a thread are released, when the thread ends.
+            self._local.owner = _ThreadOwner()
+            weakref.finalize(self._local.owner, self.__end_thread, counters)
+            return counters
+
+    def __end_thread(self, counters: Dict[Tuple[str, str], _Counters]) -> None:
+        with self._lock:
+            del self._thread_counters[id(counters)]
+            for operation_ns, operation_ns_counters in counters.items():
+                self._ended_threads_counters.setdefault(operation_ns, _Counters()).add(
+                    operation_ns_counters)
+
+    def record(self, operation: str, ns: str, latency: float, bytes_out: int, bytes_in: int,
+               error: Optional[BaseException] = None) -> None:
+        """Record a call of an operation."""
+        thread_counters = self.__get_thread_counters()
+        counters = thread_counters.get((operation, ns))
+        if counters is None:
+            counters = thread_counters[(operation, ns)] = _Counters()
+        counters.calls += 1
+        if error is not None:
+            name = type(error).__name__
+            counters.errors[name] = counters.errors.get(name, 0) + 1
+        counters.bytes_out += bytes_out
+        counters.bytes_in += bytes_in
+        counters.latency_sum += latency
+        counters.buckets[bisect_left(_LATENCY_BUCKETS, latency)] += 1
+
+    def __merge(self) -> Dict[Tuple[str, str], _Counters]:
+        merged = {}  # type: Dict[Tuple[str, str], _Counters]
+        with self._lock:
+            all_thread_counters = list(self._thread_counters.values())
+            for operation_ns, counters in self._ended_threads_counters.items():
+                merged.setdefault(operation_ns, _Counters()).add(counters)
+        for thread_counters in all_thread_counters:
+            for operation_ns, counters in list(thread_counters.items()):
+                merged.setdefault(operation_ns, _Counters()).add(counters)
+        return merged
+
+    def get(self) -> Dict[str, Any]:
+        """
+        Return the statistics per operation ('operations') and per namespace and operation
+        ('namespaces').
+        """
+        operations = {}  # type: Dict[str, _Counters]
+        namespaces = {}  # type: Dict[str, Dict[str, Any]]
+        for (operation, ns), counters in sorted(self.__merge().items()):
+            operations.setdefault(operation, _Counters()).add(counters)
+            namespaces.setdefault(ns, {})[operation] = counters.to_dict()
+        return {
+            'operations': {operation: counters.to_dict()
+                           for operation, counters in operations.items()},
+            'namespaces': namespaces,
+        }
+
+    def to_prometheus(self, prefix: str = 'sdl') -> str:
+        """Return the statistics in Prometheus text exposition format."""
+        merged = sorted(self.__merge().items())
+        lines = []
+
+        def add_metric(name, metric_type, description, samples):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, description))
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, metric_type))
+            for suffix, labels, value in samples:
+                lines.append('{}_{}{}{{{}}} {}'.format(
+                    prefix, name, suffix,
+                    ','.join('{}="{}"'.format(label, _escape_label_value(label_value))
+                             for label, label_value in labels),
+                    _format_sample_value(value)))
+
+        def labels_of(operation, ns):
+            return [('operation', operation), ('namespace', ns)]
+
+        add_metric('operations_total', 'counter', 'Number of database operations.',
+                   [('', labels_of(*key), counters.calls) for key, counters in merged])
+        add_metric('operation_errors_total', 'counter',
+                   'Number of failed database operations by exception type.',
+                   [('', labels_of(*key) + [('error', error)], count)
+                    for key, counters in merged for error, count in sorted(counters.errors.items())])
+        add_metric('operation_sent_bytes_total', 'counter',
+                   'Data bytes sent to the database.',
+                   [('', labels_of(*key), counters.bytes_out) for key, counters in merged])
+        add_metric('operation_received_bytes_total', 'counter',
+                   'Data bytes received from the database.',
+                   [('', labels_of(*key), counters.bytes_in) for key, counters in merged])
+        samples = []
+        for key, counters in merged:
+            for bound, count in counters.to_dict()['latency_buckets'].items():
+                samples.append(('_bucket', labels_of(*key) + [('le', bound)], count))
+            samples.append(('_sum', labels_of(*key), counters.latency_sum))
+            samples.append(('_count', labels_of(*key), counters.calls))
+        add_metric('operation_duration_seconds', 'histogram',
+                   'Latency of database operations in seconds.', samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label_value(value: Any) -> str:
+    if isinstance(value, float):
+        return _format_sample_value(value)
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_sample_value(value: Any) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
+
+
+class _SlowOperationLog():
+    """
+    Bounded log of SDL database backend operations, which took at least a threshold time. When
+    the log is full, the oldest entry is dropped.
+
+    Args:
+        threshold (float): Minimum duration of a logged operation in seconds.
+        max_entries (int): Maximum number of entries in the log.
+        sample_rate (float): Fraction of the slow operations, which are logged, from 0 to 1.
+        log (bool): Also write the slow operations to the 'ricsdl' logger as warnings.
+    """
+    def __init__(self, threshold: float, max_entries: int = 100, sample_rate: float = 1.0,
+                 log: bool = False) -> None:
+        if threshold < 0 or max_entries < 1 or not 0 <= sample_rate <= 1:
+            raise ValueError("Invalid slow operation log options: threshold {}, max_entries {}, "
+                             "sample_rate {}".format(threshold, max_entries, sample_rate))
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self._entries = deque(maxlen=max_entries)  # type: deque
+        self._logger = logging.getLogger('ricsdl') if log else None
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Add an entry of a slow operation to the log, if it is sampled."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        self._entries.append(entry)
+        if self._logger is not None:
+            self._logger.warning("Slow SDL operation: %s", entry)
+
+    def get(self) -> List[Dict[str, Any]]:
+        """Return the logged entries from the oldest to the newest."""
+        return list(self._entries)
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        self._entries.clear()
+
+
+class _SpaceSaving():
+    """
+    Space-saving algorithm to find the most frequent items of a stream with bounded memory.
+    At most 'capacity' items are counted. When a new item comes and all the counters are in use,
+    the item with the smallest count is replaced by the new item, which inherits the count. Thus
+    a count can be overestimated, but at most by the count the item inherited (error). Every
+    item, which total weight is more than 1/capacity of the total weight of the stream, is
+    guaranteed to be counted.
+
+    Args:
+        capacity (int): Maximum number of counted items.
+    """
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        # Count and error of every counted item.
+        self._counters = {}  # type: Dict[Any, List[int]]
+        # Min-heap of (count, item) of every counted item. Counts of the heap are updated
+        # lazily, only when an outdated entry is popped from the top of the heap.
+        self._heap = []  # type: List[Tuple[int, Any]]
+
+    def add(self, item: Any, weight: int = 1) -> None:
+        """Add weight to the count of an item."""
+        counter = self._counters.get(item)
+        if counter is not None:
+            counter[0] += weight
+            return
+        error = 0
+        if len(self._counters) >= self._capacity:
+            error = self.__evict()
+        self._counters[item] = [error + weight, error]
+        heapq.heappush(self._heap, (error + weight, item))
+
+    def __evict(self) -> int:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self._counters[item][0]
+            if current == count:
+                del self._counters[item]
+                return count
+            heapq.heappush(self._heap, (current, item))
+
+    def top(self, count: int) -> List[Tuple[Any, int, int]]:
+        """Return (item, count, error) of the most frequent items in descending order."""
+        return [(item, counter[0], counter[1]) for item, counter in
+                heapq.nlargest(count, self._counters.items(), key=lambda i: i[1][0])]
+
+
+class _HotKeys():
+    """
+    Tracking of the most accessed keys and namespaces by the number of accesses and by the
+    number of data bytes.
+
+    Args:
+        capacity (int): Maximum number of tracked keys, and namespaces, per tracked quantity.
+    """
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("Invalid hot key tracking capacity: {}".format(capacity))
+        self._keys = {'calls': _SpaceSaving(capacity), 'bytes': _SpaceSaving(capacity)}
+        self._namespaces = {'calls': _SpaceSaving(capacity), 'bytes': _SpaceSaving(capacity)}
+        self._lock = threading.Lock()
+
+    def record(self, ns: str, key_payloads: List[Tuple[str, int]]) -> None:
+        """Record an access of keys of a namespace with the data bytes of every key."""
+        with self._lock:
+            total = 0
+            for key, size in key_payloads:
+                self._keys['calls'].add((ns, key))
+                if size:
+                    self._keys['bytes'].add((ns, key), size)
+                total += size
+            self._namespaces['calls'].add(ns)
+            if total:
+                self._namespaces['bytes'].add(ns, total)
+
+    def get_keys(self, count: int, by: str) -> List[Dict[str, Any]]:
+        """Return the hottest keys by number of accesses ('calls') or data bytes ('bytes')."""
+        with self._lock:
+            top = self.__select(self._keys, by).top(count)
+        return [{'namespace': item[0], 'key': item[1], by: total, 'error': error}
+                for item, total, error in top]
+
+    def get_namespaces(self, count: int, by: str) -> List[Dict[str, Any]]:
+        """Return the hottest namespaces by number of accesses ('calls') or data bytes ('bytes')."""
+        with self._lock:
+            top = self.__select(self._namespaces, by).top(count)
+        return [{'namespace': item, by: total, 'error': error} for item, total, error in top]
+
+    @staticmethod
+    def __select(summaries, by):
+        _validate_hot_key_quantity(by)
+        return summaries[by]
+
+
+def _validate_hot_key_quantity(by: str) -> None:
+    if by not in ('calls', 'bytes'):
+        raise SdlTypeError("Invalid hot key quantity: {}. Must be 'calls' or 'bytes'".format(by))
+
+
+class _InstrumentedBackend():
+    """
+    Proxy of an SDL database backend, which records the statistics, traces, logs the slow
+    backend operations and tracks the hot keys of the operations listed in
+    '_INSTRUMENTED_OPERATIONS'. Other attributes are forwarded to the backend as such.
+
+    Args:
+        backend (DbBackendAbc): Database backend.
+        statistics (_Statistics): Statistics of the backend operations, or None.
+        tracer: Tracer of the backend operations, or None. See 'SyncStorage'.
+        slow_log (_SlowOperationLog): Log of the slow backend operations, or None.
+        hot_keys (_HotKeys): Tracking of the most accessed keys and namespaces, or None.
+    """
+    def __init__(self, backend, statistics: Optional[_Statistics] = None, tracer=None,
+                 slow_log: Optional[_SlowOperationLog] = None,
+                 hot_keys: Optional[_HotKeys] = None) -> None:
+        self._backend = backend
+        self._statistics = statistics
+        self._tracer = tracer
+        self._slow_log = slow_log
+        self._hot_keys = hot_keys
+
+    def __str__(self):
+        return str(self._backend)
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name in _INSTRUMENTED_OPERATIONS:
+            if self._tracer is not None:
+                attr = self.__traced(name, attr)
+            if self._hot_keys is not None and name in _KEYS_ARG_INDEXES:
+                attr = self.__hot_key_tracked(name, attr)
+            if self._hot_keys is not None and name in _BATCH_OPERATIONS:
+                attr = self.__hot_key_tracked_batch(name, attr)
+            if self._slow_log is not None:
+                attr = self.__slow_logged(name, attr)
+            if self._statistics is not None:
+                attr = self.__counted(name, attr)
+            # Wrapper is stored to the instance, thus later lookups do not come here.
+            setattr(self, name, attr)
+        return attr
+
+    def __counted(self, operation, func):
+        record = self._statistics.record
+        perf_counter = time.perf_counter
+
+        def _counted(*args, **kwargs):
+            ns = _get_ns(args)
+            bytes_out = _get_args_payload_size(args, kwargs)
+            start = perf_counter()
+            try:
+                ret = func(*args, **kwargs)
+            except Exception as exc:
+                record(operation, ns, perf_counter() - start, bytes_out, 0, exc)
+                raise
+            record(operation, ns, perf_counter() - start, bytes_out, _payload_size(ret))
+            return ret
+        _counted.__name__ = operation
+        return _counted
+
+    def __hot_key_tracked(self, operation, func):
+        record = self._hot_keys.record
+
+        def _hot_key_tracked(*args, **kwargs):
+            ret = None
+            try:
+                ret = func(*args, **kwargs)
+                return ret
+            finally:
+                record(args[0], _get_key_payload_sizes(operation, args, ret))
+        _hot_key_tracked.__name__ = operation
+        return _hot_key_tracked
+
+    def __hot_key_tracked_batch(self, operation, func):
+        record = self._hot_keys.record
+
+        def _hot_key_tracked_batch(*args, **kwargs):
+            ret = None
+            try:
+                ret = func(*args, **kwargs)
+                return ret
+            finally:
+                # Keys of a failed batch are recorded without the received data.
+                replies = ret if isinstance(ret, list) else []
+                for idx, (batch_operation, ns, batch_args) in enumerate(args[0]):
+                    if batch_operation in _KEYS_ARG_INDEXES:
+                        reply = replies[idx] if idx < len(replies) else None
+                        record(ns, _get_key_payload_sizes(batch_operation,
+                                                          (ns,) + tuple(batch_args), reply))
+        _hot_key_tracked_batch.__name__ = operation
+        return _hot_key_tracked_batch
+
+    def __slow_logged(self, operation, func):
+        slow_log = self._slow_log
+        threshold = slow_log.threshold
+        perf_counter = time.perf_counter
+        get_client_index = getattr(self._backend, 'get_client_index', None)
+
+        def _slow_logged(*args, **kwargs):
+            start = perf_counter()
+            ret = None
+            error = None
+            try:
+                ret = func(*args, **kwargs)
+                return ret
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                duration = perf_counter() - start
+                if duration >= threshold:
+                    ns = _get_ns(args)
+                    key_count = _get_key_count(operation, args)
+                    if key_count is None and isinstance(ret, (dict, list)):
+                        key_count = len(ret)
+                    slow_log.record({
+                        'time': time.time() - duration,
+                        'operation': operation,
+                        'namespace': ns,
+                        'key_count': key_count,
+                        'key_pattern': args[1] if operation in _PATTERN_OPERATIONS else None,
+                        'bytes_out': _get_args_payload_size(args, kwargs),
+                        'bytes_in': _payload_size(ret),
+                        'duration': duration,
+                        'db_client_index': (get_client_index(ns)
+                                            if get_client_index is not None and ns else None),
+                        'error': None if error is None else type(error).__name__,
+                    })
+        _slow_logged.__name__ = operation
+        return _slow_logged
+
+    def __traced(self, operation, func):
+        start_span = self._tracer.start_as_current_span
+        span_name = 'sdl.' + operation
+        get_client_index = getattr(self._backend, 'get_client_index', None)
+
+        def _traced(*args, **kwargs):
+            ns = _get_ns(args)
+            key_count = _get_key_count(operation, args)
+            attributes = {
+                'sdl.operation': operation,
+                'sdl.namespace': ns,
+                'sdl.payload_bytes_out': _get_args_payload_size(args, kwargs),
+            }
+            if key_count is not None:
+                attributes['sdl.key_count'] = key_count
+            if get_client_index is not None and ns:
+                attributes['sdl.db_client_index'] = get_client_index(ns)
+            with start_span(span_name, attributes=attributes) as span:
+                try:
+                    ret = func(*args, **kwargs)
+                except Exception as exc:
+                    span.set_attribute('sdl.outcome', type(exc).__name__)
+                    raise
+                if key_count is None and isinstance(ret, (dict, list)):
+                    # Number of keys found with a key pattern.
+                    span.set_attribute('sdl.key_count', len(ret))
+                span.set_attribute('sdl.payload_bytes_in', _payload_size(ret))
+                span.set_attribute('sdl.outcome', 'ok')
+                return ret
+        _traced.__name__ = operation
+        return _traced
+
+
+def _get_ns(args) -> str:
+    if args and isinstance(args[0], list):
+        # Namespace of a batch is known only if all its operations are of the same namespace.
+        namespaces = {ns for _, ns, _ in args[0]}
+        return namespaces.pop() if len(namespaces) == 1 else ''
+    return args[0] if args and isinstance(args[0], str) else ''
+
+
+def _get_args_payload_size(args, kwargs) -> int:
+    if args and isinstance(args[0], list):
+        return sum(_get_args_payload_size((ns,) + tuple(batch_args), {})
+                   for _, ns, batch_args in args[0])
+    size = sum(_payload_size(arg) for arg in args[1:])
+    return size + sum(_payload_size(arg) for arg in kwargs.values())
+
+
+def _get_key_count(operation: str, args) -> Optional[int]:
+    """
+    Return the number of keys (or groups) an operation targets, or None if the keys are not
+    known before the operation is executed.
+    """
+    if operation in _BATCH_OPERATIONS:
+        if not args:
+            return None
+        key_count = 0
+        for batch_operation, ns, batch_args in args[0]:
+            count = _get_key_count(batch_operation, (ns,) + tuple(batch_args))
+            if count is None:
+                return None
+            key_count += count
+        return key_count
+    idx = _KEYS_ARG_INDEXES.get(operation)
+    if idx is None or idx >= len(args):
+        return None
+    keys = args[idx]
+    return 1 if isinstance(keys, str) else len(keys)
+
+
+def _get_key_payload_sizes(operation: str, args, ret) -> List[Tuple[str, int]]:
+    """Return the keys (or groups) of an operation and the number of data bytes of every key."""
+    idx = _KEYS_ARG_INDEXES[operation]
+    keys = args[idx]
+    if isinstance(keys, dict):
+        return [(key, _payload_size(value)) for key, value in keys.items()]
+    if isinstance(keys, str):
+        # Old data of a conditional set is only compared, only the new data is written.
+        data_idx = idx + 2 if operation in _CONDITIONAL_SET_OPERATIONS else idx + 1
+        return [(keys, sum(_payload_size(arg) for arg in args[data_idx:]) + _payload_size(ret))]
+    if isinstance(ret, dict):
+        return [(key, _payload_size(ret.get(key))) for key in keys]
+    return [(key, 0) for key in keys]
+
+
+# Backend functions, which find keys with a key pattern given as the second argument.
+_PATTERN_OPERATIONS = frozenset(['find_keys', 'find_and_get'])
+
+# Backend functions, which get a list of (operation, namespace, arguments) tuples as the first
+# argument. Keys of a batch are the keys of its operations.
+_BATCH_OPERATIONS = frozenset(['execute_batch'])
+
+# Backend functions, which get the old data before the new data after the key argument.
+_CONDITIONAL_SET_OPERATIONS = frozenset(['set_if', 'set_if_and_publish'])
+
+# Positions of the key, data map or key list arguments of the backend functions.
+_KEYS_ARG_INDEXES = {
+    'set': 1, 'set_if': 1, 'set_if_not_exists': 1, 'get': 1, 'remove': 1, 'remove_if': 1,
+    'add_member': 1, 'remove_member': 1, 'remove_group': 1, 'get_members': 1, 'is_member': 1,
+    'group_size': 1, 'set_and_publish': 2, 'set_if_and_publish': 2,
+    'set_if_not_exists_and_publish': 2, 'remove_and_publish': 2, 'remove_if_and_publish': 2,
+}
@@ -0,0 +1,193 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+The module provides selection of a database instance for a Shared Data Layer (SDL) namespace,
+when SDL data is sharded to several database instances by namespace.
+"""
+from abc import ABC, abstractmethod
+import bisect
+import functools
+import hashlib
+import math
+import zlib
+from typing import (Dict, Iterable, List, Optional, Sequence, Tuple)
+from ricsdl.configuration import DbShardingType
+
+
+DEFAULT_VNODES = 160
+
+
+def _hash32(value: str) -> int:
+    return zlib.crc32(value.encode())
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+
+def _get_node_ids(addrs: Sequence[str], ports: Optional[Sequence[str]] = None) -> List[str]:
+    ports = ports or []
+    node_ids = []
+    for i, addr in enumerate(addrs):
+        port = ports[i] if i < len(ports) else ""
+        node_ids.append('{}:{}'.format(addr, port) if port else addr)
+    return node_ids
+
+
+class _NsSharding(ABC):
+    """
+    Base class of the methods to select a database instance for a namespace. Instances are
+    identified by their address and port ('addr:port', or only 'addr' if the port is not given),
+    thus the selection of a namespace does not depend on the order of the instances and
+    instances on the same host are separate nodes.
+
+    Args:
+        nodes (list of str): Addresses of the database instances.
+        weights (list of float): Optional relative weights of the database instances. By default
+                                 every instance has weight 1.
+        ports (list of str): Optional ports of the database instances.
+    """
+    def __init__(self, nodes: Sequence[str], weights: Optional[Sequence[float]] = None,
+                 ports: Optional[Sequence[str]] = None) -> None:
+        if not nodes:
+            raise ValueError("Namespace sharding requires at least one database instance")
+        self.nodes = _get_node_ids(nodes, ports)
+        self.weights = list(weights) if weights else [1.0] * len(self.nodes)
+        # Selection is computed once per namespace, the number of namespaces is small.
+        self.get_index = functools.lru_cache(maxsize=4096)(self._get_index)
+
+    @abstractmethod
+    def _get_index(self, ns: str) -> int:
+        pass
+
+    def get_node(self, ns: str) -> str:
+        """Return the identifier ('addr:port' or 'addr') of the database instance of a namespace."""
+        return self.nodes[self.get_index(ns)]
+
+
+class _ModuloSharding(_NsSharding):
+    """
+    Selects an instance by CRC-32 hash of a namespace modulo the number of instances. Weights are
+    not supported. Almost every namespace is moved when the number of instances changes.
+    """
+    def _get_index(self, ns: str) -> int:
+        return _hash32(ns) % len(self.nodes)
+
+
+class _ConsistentSharding(_NsSharding):
+    """
+    Selects an instance by consistent hashing. Every instance has a number of virtual nodes on a
+    hash ring in proportion to its weight and a namespace belongs to the instance of the first
+    virtual node following the hash of the namespace on the ring. When an instance is added or
+    removed, only the namespaces of the added or removed virtual nodes are moved.
+
+    Args:
+        nodes (list of str): Addresses of the database instances.
+        weights (list of float): Optional relative weights of the database instances.
+        vnodes (int): Number of virtual nodes of an instance with weight 1.
+        ports (list of str): Optional ports of the database instances.
+    """
+    def __init__(self, nodes: Sequence[str], weights: Optional[Sequence[float]] = None,
+                 vnodes: int = DEFAULT_VNODES, ports: Optional[Sequence[str]] = None) -> None:
+        super().__init__(nodes, weights, ports)
+        ring = []
+        for idx, (node, weight) in enumerate(zip(self.nodes, self.weights)):
+            for vnode in range(max(1, round(vnodes * weight))):
+                ring.append((_hash64('{}#{}'.format(node, vnode)), idx))
+        ring.sort()
+        self.ring_hashes = [ring_hash for ring_hash, _ in ring]
+        self.ring_indexes = [idx for _, idx in ring]
+
+    def _get_index(self, ns: str) -> int:
+        pos = bisect.bisect(self.ring_hashes, _hash64(ns))
+        if pos == len(self.ring_hashes):
+            pos = 0
+        return self.ring_indexes[pos]
+
+
+class _RendezvousSharding(_NsSharding):
+    """
+    Selects an instance by weighted rendezvous (highest random weight) hashing. Every instance
+    gets a score of a namespace and the namespace belongs to the instance with the highest score.
+    When an instance is added or removed, only the namespaces of the added or removed instance
+    are moved.
+    """
+    def _get_index(self, ns: str) -> int:
+        scores = []
+        for node, weight in zip(self.nodes, self.weights):
+            # Hash is mapped to the open interval (0, 1).
+            point = (_hash64('{}#{}'.format(node, ns)) + 1) / (2**64 + 1)
+            scores.append(weight / -math.log(point))
+        return scores.index(max(scores))
+
+
+def _create_ns_sharding(sharding_type: DbShardingType, nodes: Sequence[str],
+                        weights: Optional[Sequence[float]] = None,
+                        vnodes: int = DEFAULT_VNODES,
+                        ports: Optional[Sequence[str]] = None) -> _NsSharding:
+    if sharding_type == DbShardingType.CONSISTENT:
+        return _ConsistentSharding(nodes, weights, vnodes, ports)
+    if sharding_type == DbShardingType.RENDEZVOUS:
+        return _RendezvousSharding(nodes, weights, ports)
+    return _ModuloSharding(nodes, ports=ports)
+
+
+def get_moved_namespaces(namespaces: Iterable[str], old_nodes: Sequence[str],
+                         new_nodes: Sequence[str],
+                         sharding_type: DbShardingType = DbShardingType.CONSISTENT,
+                         old_weights: Optional[Sequence[float]] = None,
+                         new_weights: Optional[Sequence[float]] = None,
+                         vnodes: int = DEFAULT_VNODES,
+                         old_ports: Optional[Sequence[str]] = None,
+                         new_ports: Optional[Sequence[str]] = None) -> Dict[str, Tuple[str, str]]:
+    """
+    Compute which namespaces move to another database instance, when the list of database
+    addresses (DBAAS_CLUSTER_ADDR_LIST), their ports or their weights (SDL_NS_SHARDING_WEIGHTS)
+    are changed.
+    The data of the returned namespaces has to be migrated before the new configuration is taken
+    into use.
+
+    Args:
+        namespaces (iterable of str): Namespaces to check.
+        old_nodes (list of str): Database addresses of the current configuration.
+        new_nodes (list of str): Database addresses of the new configuration.
+        sharding_type (DbShardingType): Sharding method (SDL_NS_SHARDING).
+        old_weights (list of float): Optional weights of the current configuration.
+        new_weights (list of float): Optional weights of the new configuration.
+        vnodes (int): Number of virtual nodes of consistent hashing (SDL_NS_SHARDING_VNODES).
+        old_ports (list of str): Optional database ports of the current configuration.
+        new_ports (list of str): Optional database ports of the new configuration.
+
+    Returns:
+        (dict of str: tuple): A dictionary mapping of a moved namespace to a tuple of its old and
+                              new database instance, 'addr:port' or 'addr' if the port is not
+                              given.
+    """
+    old_sharding = _create_ns_sharding(sharding_type, old_nodes, old_weights, vnodes, old_ports)
+    new_sharding = _create_ns_sharding(sharding_type, new_nodes, new_weights, vnodes, new_ports)
+    moved = {}
+    for ns in namespaces:
+        old_node = old_sharding.get_node(ns)
+        new_node = new_sharding.get_node(ns)
+        if old_node != new_node:
+            moved[ns] = (old_node, new_node)
+    return moved
@@ -21,37 +21,116 @@
 """The module provides implementation of the syncronous Shared Data Layer (SDL) interface."""
 import builtins
 import inspect
-from typing import (Any, Callable, Dict, Set, List, Optional, Tuple, Union)
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator, Set, List, Optional,
+                    Tuple, Union)
+from ricsdl.cache import _ReadCache
 from ricsdl.configuration import _Configuration
+from ricsdl.dispatcher import (_CallbackDispatcher, _EventBatcher)
+from ricsdl.instrumentation import (_HotKeys, _InstrumentedBackend, _SlowOperationLog,
+                                    _Statistics, _validate_hot_key_quantity)
 from ricsdl.syncstorage_abc import (SyncStorageAbc, SyncLockAbc)
 import ricsdl.backend
 from ricsdl.backend.dbbackend_abc import DbBackendAbc
-from ricsdl.exceptions import (SdlException, SdlTypeError)
+from ricsdl.exceptions import (SdlException, SdlTypeError, RejectedByBackend)
 
 
 def func_arg_checker(exception, start_arg_idx, **types):
-    """Decorator to validate function arguments."""
+    """
+    Decorator to validate function arguments. Positions of the validated positional arguments
+    are resolved once when the function is decorated, thus a call only runs 'isinstance' for
+    the given arguments. A coroutine function stays a coroutine function, which raises the
+    exception when it is awaited.
+    """
     def _check(func):
         if not __debug__:
             return func
 
-        def _validate(*args, **kwds):
-            for idx, arg in enumerate(args[start_arg_idx:], start_arg_idx):
-                if func.__code__.co_varnames[idx] in types and \
-                        not isinstance(arg, types[func.__code__.co_varnames[idx]]):
+        arg_names = func.__code__.co_varnames[:func.__code__.co_argcount]
+        pos_types = tuple((idx, name, types[name]) for idx, name in enumerate(arg_names)
+                          if idx >= start_arg_idx and name in types)
+
+        def _validate_args(args, kwds):
+            for idx, name, arg_types in pos_types:
+                if idx >= len(args):
+                    break
+                if not isinstance(args[idx], arg_types):
                     raise exception(r"Wrong argument type: '{}'={}. Must be: {}".
-                                    format(func.__code__.co_varnames[idx], type(arg),
-                                           types[func.__code__.co_varnames[idx]]))
+                                    format(name, type(args[idx]), arg_types))
             for kwdname, kwdval in kwds.items():
                 if kwdname in types and not isinstance(kwdval, types[kwdname]):
                     raise exception(r"Wrong argument type: '{}'={}. Must be: {}".
                                     format(kwdname, type(kwdval), types[kwdname]))
+
+        if inspect.iscoroutinefunction(func):
+            async def _validate_async(*args, **kwds):
+                _validate_args(args, kwds)
+                return await func(*args, **kwds)
+            _validate_async.__name__ = func.__name__
+            return _validate_async
+
+        def _validate(*args, **kwds):
+            _validate_args(args, kwds)
             return func(*args, **kwds)
         _validate.__name__ = func.__name__
         return _validate
     return _check
 
 
+def _sort_by_key(data_map: Dict[str, Any]) -> Dict[str, Any]:
+    """Return dictionary sorted by key. Already sorted dictionary is returned without a copy."""
+    keys = iter(data_map)
+    prev = next(keys, None)
+    for key in keys:
+        if key < prev:
+            return {k: data_map[k] for k in sorted(data_map)}
+        prev = key
+    return data_map
+
+
+def _validate_key_value_dict(kv: Dict[Any, Any]) -> None:
+    for k, v in kv.items():
+        if not isinstance(k, str):
+            raise SdlTypeError(r"Wrong dict key type: {}={}. Must be: str".format(k, type(k)))
+        if not isinstance(v, bytes):
+            raise SdlTypeError(r"Wrong dict value type: {}={}. Must be: bytes".format(v, type(v)))
+
+
+def _validate_channels_events(channels_and_events: Dict[Any, Any], event_separator: str) -> None:
+    for channel, events in channels_and_events.items():
+        if not isinstance(channel, str):
+            raise SdlTypeError(r"Wrong channel type: {}={}. Must be: str".format(
+                channel, type(channel)))
+        if not isinstance(events, (list, str)):
+            raise SdlTypeError(r"Wrong event type: {}={}. Must be: str".format(
+                events, type(events)))
+        if isinstance(events, list):
+            for event in events:
+                if not isinstance(event, str):
+                    raise SdlTypeError(r"Wrong event type: {}={}. Must be: str".format(
+                        events, type(events)))
+                if event_separator in event:
+                    raise SdlTypeError(r"Events {} contains illegal substring (\"{}\")".format(
+                        events, event_separator))
+        else:
+            if event_separator in events:
+                raise SdlTypeError(r"Events {} contains illegal substring (\"{}\")".format(
+                    events, event_separator))
+
+
+def _validate_batch_size(batch_size: int) -> None:
+    if batch_size <= 0:
+        raise SdlTypeError(r"Wrong batch size: {}. Must be a positive integer".format(
+            batch_size))
+
+
+def _validate_callback(cb: Callable, param_count: int = 2) -> None:
+    param_len = len(inspect.signature(cb).parameters)
+    if param_len != param_count:
+        raise SdlTypeError(
+            f"Callback function should take {param_count} positional argument but {param_len} "
+            "were given")
+
+
 class SyncLock(SyncLockAbc):
     """
     This class implements Shared Data Layer (SDL) abstract 'SyncLockAbc' class.
@@ -101,6 +180,234 @@ def get_validity_time(self) -> Union[int, float]:
         return self.__dbbackendlock.get_validity_time()
 
 
+class SyncBatchResult:
+    """
+    A result of an operation queued into a 'SyncBatch'. Result is available once the batch has
+    been executed.
+    """
+    def __init__(self, post_process: Optional[Callable[[Any], Any]] = None) -> None:
+        self.__done = False
+        self.__value = None  # type: Any
+        self.__exception = None  # type: Optional[SdlException]
+        self.__post_process = post_process
+
+    def done(self) -> bool:
+        """Return True if the batch containing the operation has been executed."""
+        return self.__done
+
+    def result(self) -> Any:
+        """
+        Return the result of the operation. The result is the same what the corresponding
+        'SyncStorage' function would have returned.
+
+        Raises:
+            RejectedByBackend: If the batch has not been executed yet.
+            SdlException: Exception raised by the operation, if the operation failed.
+        """
+        if not self.__done:
+            raise RejectedByBackend("Batch operation result is not available before the batch "
+                                    "has been executed")
+        if self.__exception is not None:
+            raise self.__exception
+        return self.__value
+
+    def _set_reply(self, reply: Any) -> None:
+        self.__done = True
+        if isinstance(reply, SdlException):
+            self.__exception = reply
+        elif self.__post_process is not None:
+            self.__value = self.__post_process(reply)
+        else:
+            self.__value = reply
+
+
+class SyncBatch:
+    """
+    A batch of Shared Data Layer (SDL) operations.
+
+    Operations are queued into the batch and they are sent to the backend data storage
+    only when the batch is executed. Operations targeted to the same backend database instance
+    are sent in one pipeline, which costs one network round trip regardless of the number of
+    operations. Batch is executed by calling 'execute' function or automatically when exiting
+    a 'with' block without an exception.
+
+    Operations of the same namespace are executed in the order they were queued. Batch as a
+    whole is not atomic, other clients may see the results of some operations before the others.
+
+    Every queue function returns a 'SyncBatchResult' instance, which can be used to read the
+    result of the operation after the batch has been executed.
+
+    Args:
+        storage (SyncStorage): SDL instance, which backend executes the batch.
+    """
+    def __init__(self, storage: 'SyncStorage') -> None:
+        self.__storage = storage
+        self.__operations = []  # type: List[Tuple[str, str, Tuple]]
+        self.__results = []  # type: List[SyncBatchResult]
+        self.__modified_keys = []  # type: List[Tuple[str, List[str]]]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        if exception_type is None:
+            self.execute()
+
+    def __len__(self):
+        return len(self.__operations)
+
+    def execute(self) -> None:
+        """
+        Execute all the queued operations. Batch is empty after execution and it can be
+        reused for a new set of operations.
+
+        Raises:
+            NotConnected: If SDL is not connected to the backend data storage.
+            RejectedByBackend: If backend data storage rejects the request.
+            BackendError: If the backend data storage fails to process the request.
+        """
+        operations, results = self.__operations, self.__results
+        modified_keys = self.__modified_keys
+        self.__operations, self.__results, self.__modified_keys = [], [], []
+        if not operations:
+            return
+        try:
+            replies = self.__storage.get_backend().execute_batch(operations)
+        except SdlException as exc:
+            for result in results:
+                result._set_reply(exc)
+            raise
+        finally:
+            for ns, keys in modified_keys:
+                self.__storage._invalidate_read_cache(ns, keys)
+        for result, reply in zip(results, replies):
+            result._set_reply(reply)
+
+    def __queue(self, operation: str, ns: str, *args,
+                post_process: Optional[Callable[[Any], Any]] = None,
+                modified_keys: Optional[List[str]] = None) -> SyncBatchResult:
+        result = SyncBatchResult(post_process)
+        self.__operations.append((operation, ns, args))
+        self.__results.append(result)
+        if modified_keys is not None:
+            self.__modified_keys.append((ns, modified_keys))
+        return result
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, data_map=dict)
+    def set(self, ns: str, data_map: Dict[str, bytes]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set' operation."""
+        self.__storage._validate_key_value_dict(data_map)
+        return self.__queue('set', ns, data_map, modified_keys=list(data_map))
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, old_data=bytes, new_data=bytes)
+    def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set_if' operation."""
+        return self.__queue('set_if', ns, key, old_data, new_data, modified_keys=[key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
+    def set_if_not_exists(self, ns: str, key: str, data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set_if_not_exists' operation."""
+        return self.__queue('set_if_not_exists', ns, key, data, modified_keys=[key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set), ordered=bool)
+    def get(self, ns: str, keys: Union[str, Set[str]], ordered: bool = True) -> SyncBatchResult:
+        """Queue a 'SyncStorage.get' operation."""
+        if ordered:
+            return self.__queue('get', ns, sorted(keys), post_process=_sort_by_key)
+        return self.__queue('get', ns, list(keys))
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set))
+    def remove(self, ns: str, keys: Union[str, Set[str]]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove' operation."""
+        return self.__queue('remove', ns, list(keys), modified_keys=list(keys))
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
+    def remove_if(self, ns: str, key: str, data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove_if' operation."""
+        return self.__queue('remove_if', ns, key, data, modified_keys=[key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
+    def add_member(self, ns: str, group: str,
+                   members: Union[bytes, Set[bytes]]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.add_member' operation."""
+        return self.__queue('add_member', ns, group, members, modified_keys=[group])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
+    def remove_member(self, ns: str, group: str,
+                      members: Union[bytes, Set[bytes]]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove_member' operation."""
+        return self.__queue('remove_member', ns, group, members, modified_keys=[group])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    def remove_group(self, ns: str, group: str) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove_group' operation."""
+        return self.__queue('remove_group', ns, group, modified_keys=[group])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    def get_members(self, ns: str, group: str) -> SyncBatchResult:
+        """Queue a 'SyncStorage.get_members' operation."""
+        return self.__queue('get_members', ns, group)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str, member=bytes)
+    def is_member(self, ns: str, group: str, member: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.is_member' operation."""
+        return self.__queue('is_member', ns, group, member)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
+    def group_size(self, ns: str, group: str) -> SyncBatchResult:
+        """Queue a 'SyncStorage.group_size' operation."""
+        return self.__queue('group_size', ns, group)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, data_map=dict)
+    def set_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
+                        data_map: Dict[str, bytes]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set_and_publish' operation."""
+        self.__storage._validate_key_value_dict(data_map)
+        return self.__queue('set_and_publish', ns,
+                            self.__prepare_channels_and_events(channels_and_events), data_map,
+                            modified_keys=list(data_map))
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str,
+                      old_data=bytes, new_data=bytes)
+    def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
+                           key: str, old_data: bytes, new_data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set_if_and_publish' operation."""
+        return self.__queue('set_if_and_publish', ns,
+                            self.__prepare_channels_and_events(channels_and_events), key,
+                            old_data, new_data, modified_keys=[key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
+    def set_if_not_exists_and_publish(self, ns: str,
+                                      channels_and_events: Dict[str, Union[str, List[str]]],
+                                      key: str, data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.set_if_not_exists_and_publish' operation."""
+        return self.__queue('set_if_not_exists_and_publish', ns,
+                            self.__prepare_channels_and_events(channels_and_events), key, data,
+                            modified_keys=[key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, keys=(str, builtins.set))
+    def remove_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
+                           keys: Union[str, Set[str]]) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove_and_publish' operation."""
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        return self.__queue('remove_and_publish', ns,
+                            self.__prepare_channels_and_events(channels_and_events), keys,
+                            modified_keys=keys)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
+    def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
+                              key: str, data: bytes) -> SyncBatchResult:
+        """Queue a 'SyncStorage.remove_if_and_publish' operation."""
+        return self.__queue('remove_if_and_publish', ns,
+                            self.__prepare_channels_and_events(channels_and_events), key, data,
+                            modified_keys=[key])
+
+    def __prepare_channels_and_events(self, channels_and_events):
+        self.__storage._validate_channels_events(channels_and_events)
+        return {channel: [events] if isinstance(events, str) else events
+                for channel, events in channels_and_events.items()}
+
+
 class SyncStorage(SyncStorageAbc):
     """
     This class implements Shared Data Layer (SDL) abstract 'SyncStorageAbc' class.
@@ -116,13 +423,111 @@ class SyncStorage(SyncStorageAbc):
                                database services are not necessarily needed. Currently value 'dict'
                                is only allowed value for the parameter, which enables dictionary
                                type of fake DB backend.
+        read_cache_size (int): Optional parameter. Parameter enables client side caching of the
+                               data read by 'get', 'get_members' and 'is_member' functions. Value
+                               is the maximum number of cached entries, when the cache is full the
+                               least recently used entry is evicted. Cached entries are
+                               invalidated by the backend data storage when the data is modified
+                               by any SDL client. Invalidation is asynchronous, thus an SDL
+                               instance may read stale data for a short while after another SDL
+                               instance has modified it. Modifications done via the SDL instance
+                               itself are visible immediately. By default caching is disabled.
+        trusted_caller (bool): Optional parameter. Parameter disables validation of the items of
+                               the dictionary arguments: the type of every key and value of the
+                               data maps given to 'set' and 'set_and_publish' functions, also of
+                               a batch, and the type of every channel and event given to the
+                               '*_and_publish' functions, including the check that events do
+                               not contain the event separator. Types of the function arguments
+                               themselves are still validated. Enable only if the caller is known
+                               to give valid keys, values, channels and events, otherwise the
+                               behavior of SDL is undefined. By default validation is enabled.
+        db_connection_options (dict): Optional parameter. Database connection pool and socket
+                                      options, which override the corresponding environment
+                                      variables. Supported options are 'db_max_connections',
+                                      'db_pool_blocking', 'db_pool_timeout',
+                                      'db_socket_timeout', 'db_socket_connect_timeout',
+                                      'db_socket_keepalive', 'db_health_check_interval',
+                                      'db_read_preference'.
+        statistics (bool): Optional parameter. Parameter enables statistics of the backend data
+                           storage operations, see 'get_statistics'. By default statistics are
+                           disabled.
+        tracer: Optional parameter. Tracer, which creates a span of every backend data storage
+                operation. An OpenTelemetry tracer can be given as such, any other tracer must
+                have function 'start_as_current_span(name, attributes)' returning a context
+                manager of a span having function 'set_attribute(key, value)'. Span name is
+                'sdl.' followed by the backend operation name. Span attributes are
+                'sdl.operation', 'sdl.namespace', 'sdl.key_count', 'sdl.payload_bytes_out',
+                'sdl.payload_bytes_in', 'sdl.db_client_index' (Redis backend only) and
+                'sdl.outcome', which is 'ok' or the name of the raised exception type. Exception
+                is propagated through the span context manager. By default operations are not
+                traced.
+        slow_operation_log (dict): Optional parameter. Parameter enables logging of the backend
+                                   data storage operations, which take at least 'threshold'
+                                   seconds, see 'get_slow_operations'. Supported options are
+                                   'threshold' (mandatory), 'max_entries' (maximum number of
+                                   logged operations, by default 100), 'sample_rate' (fraction
+                                   of the slow operations logged, by default 1.0) and 'log'
+                                   (write the slow operations also as warnings to the 'ricsdl'
+                                   logger, by default False). By default slow operations are not
+                                   logged.
+        hot_key_capacity (int): Optional parameter. Parameter enables tracking of the most
+                                accessed keys and namespaces, see 'get_hot_keys'. Value is the
+                                maximum number of tracked keys, which bounds the memory usage.
+                                By default tracking is disabled.
+        fake_db_options (dict): Optional parameter. Options of the fake DB backend, which
+                                override the corresponding environment variables. Supported
+                                options are 'event_queue_size' (maximum number of queued
+                                events, by default unlimited) and 'event_queue_overflow'
+                                (handling of an event published to a full event queue:
+                                'block', 'drop-oldest' or 'raise', by default 'block').
+        event_callback_pool (dict): Optional parameter. Parameter enables calling the callbacks
+                                    given to 'subscribe_channel' by a pool of worker threads
+                                    instead of the thread receiving the events. Callbacks of one
+                                    channel are called in order, one at a time, callbacks of
+                                    different channels in parallel. Supported options are
+                                    'workers' (mandatory, maximum number of worker threads),
+                                    'backlog' (maximum number of events waiting for a worker, by
+                                    default 0, which is unlimited) and 'overflow' (handling of an
+                                    event received when the backlog is full: 'block',
+                                    'drop-oldest' or 'raise', by default 'block'). By default
+                                    callbacks are called by the thread receiving the events.
     """
-    def __init__(self, fake_db_backend=None) -> None:
+    def __init__(self, fake_db_backend=None, read_cache_size: int = 0,
+                 trusted_caller: bool = False,
+                 db_connection_options: Optional[Dict[str, Any]] = None,
+                 statistics: bool = False, tracer=None,
+                 slow_operation_log: Optional[Dict[str, Any]] = None,
+                 hot_key_capacity: int = 0,
+                 fake_db_options: Optional[Dict[str, Any]] = None,
+                 event_callback_pool: Optional[Dict[str, Any]] = None) -> None:
         super().__init__()
         self.__dbbackend = None
-        self.__configuration = _Configuration(fake_db_backend)
+        self.__dispatcher = None  # type: Optional[_CallbackDispatcher]
+        self.__batchers = {}  # type: Dict[Tuple[str, str], _EventBatcher]
+        self.__trusted_caller = trusted_caller
+        self.__read_cache = None  # type: Optional[_ReadCache]
+        self.__tracked_namespaces = set()  # type: Set[str]
+        self.__configuration = _Configuration(fake_db_backend, fake_db_options,
+                                              **(db_connection_options or {}))
         self.event_separator = self.__configuration.get_event_separator()
         self.__dbbackend = ricsdl.backend.get_backend_instance(self.__configuration)
+        self.__statistics = None  # type: Optional[_Statistics]
+        self.__slow_log = None  # type: Optional[_SlowOperationLog]
+        if statistics:
+            self.__statistics = _Statistics()
+        if slow_operation_log is not None:
+            self.__slow_log = _SlowOperationLog(**slow_operation_log)
+        self.__hot_keys = None  # type: Optional[_HotKeys]
+        if hot_key_capacity > 0:
+            self.__hot_keys = _HotKeys(hot_key_capacity)
+        if any(instrument is not None for instrument in (self.__statistics, tracer,
+                                                         self.__slow_log, self.__hot_keys)):
+            self.__dbbackend = _InstrumentedBackend(self.__dbbackend, self.__statistics, tracer,
+                                                    self.__slow_log, self.__hot_keys)
+        if read_cache_size > 0:
+            self.__read_cache = _ReadCache(read_cache_size)
+        if event_callback_pool is not None:
+            self.__dispatcher = _CallbackDispatcher(**event_callback_pool)
 
     def __del__(self):
         self.close()
@@ -144,80 +549,149 @@ def is_active(self):
     def close(self):
         if self.__dbbackend:
             self.__dbbackend.close()
-
-    @func_arg_checker(SdlTypeError, 1, ns=str, data_map=dict)
-    def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
+        if self.__dispatcher:
+            self.__dispatcher.close()
+        for batcher in self.__get_batchers():
+            batcher.close()
+        self.__batchers.clear()
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, data_map=dict, atomic=bool)
+    def set(self, ns: str, data_map: Dict[str, bytes], atomic: bool = True) -> None:
         self._validate_key_value_dict(data_map)
-        self.__dbbackend.set(ns, data_map)
+        try:
+            self.__dbbackend.set(ns, data_map, atomic=atomic)
+        finally:
+            self._invalidate_read_cache(ns, data_map)
 
     @func_arg_checker(SdlTypeError, 1, ns=str, key=str, old_data=bytes, new_data=bytes)
     def set_if(self, ns: str, key: str, old_data: bytes, new_data: bytes) -> bool:
-        return self.__dbbackend.set_if(ns, key, old_data, new_data)
+        try:
+            return self.__dbbackend.set_if(ns, key, old_data, new_data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
     def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
-        return self.__dbbackend.set_if_not_exists(ns, key, data)
-
-    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set))
-    def get(self, ns: str, keys: Union[str, Set[str]]) -> Dict[str, bytes]:
-        disordered = self.__dbbackend.get(ns, list(keys))
-        return {k: disordered[k] for k in sorted(disordered)}
+        try:
+            return self.__dbbackend.set_if_not_exists(ns, key, data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set), ordered=bool)
+    def get(self, ns: str, keys: Union[str, Set[str]],
+            ordered: bool = True) -> Dict[str, bytes]:
+        # Backend returns the values in the order of the keys, thus sorting the keys beforehand
+        # makes the result sorted without copying it.
+        keys = sorted(keys) if ordered else list(keys)
+        if self.__read_cache is None:
+            ret = self.__dbbackend.get(ns, keys)
+        else:
+            ret = self.__cached_get(ns, keys)
+        return _sort_by_key(ret) if ordered else ret
 
     @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str)
     def find_keys(self, ns: str, key_pattern: str) -> List[str]:
         return self.__dbbackend.find_keys(ns, key_pattern)
 
-    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str)
-    def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
-        disordered = self.__dbbackend.find_and_get(ns, key_pattern)
-        return {k: disordered[k] for k in sorted(disordered)}
+    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str, ordered=bool)
+    def find_and_get(self, ns: str, key_pattern: str, ordered: bool = True) -> Dict[str, bytes]:
+        ret = self.__dbbackend.find_and_get(ns, key_pattern, ordered=ordered)
+        return _sort_by_key(ret) if ordered else ret
 
-    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set))
-    def remove(self, ns: str, keys: Union[str, Set[str]]) -> None:
-        self.__dbbackend.remove(ns, list(keys))
+    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str, batch_size=int)
+    def iter_keys(self, ns: str, key_pattern: str, batch_size: int = 1000) -> Iterator[str]:
+        _validate_batch_size(batch_size)
+        return self.__dbbackend.iter_keys(ns, key_pattern, batch_size)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, key_pattern=str, batch_size=int)
+    def iter_items(self, ns: str, key_pattern: str,
+                   batch_size: int = 1000) -> Iterator[Tuple[str, bytes]]:
+        _validate_batch_size(batch_size)
+        return self.__dbbackend.iter_items(ns, key_pattern, batch_size)
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, keys=(str, builtins.set), atomic=bool)
+    def remove(self, ns: str, keys: Union[str, Set[str]], atomic: bool = True) -> None:
+        try:
+            self.__dbbackend.remove(ns, list(keys), atomic=atomic)
+        finally:
+            self._invalidate_read_cache(ns, list(keys))
 
     @func_arg_checker(SdlTypeError, 1, ns=str, key=str, data=bytes)
     def remove_if(self, ns: str, key: str, data: bytes) -> bool:
-        return self.__dbbackend.remove_if(ns, key, data)
-
-    @func_arg_checker(SdlTypeError, 1, ns=str)
-    def remove_all(self, ns: str) -> None:
-        keys = self.__dbbackend.find_keys(ns, '*')
-        if keys:
-            self.__dbbackend.remove(ns, keys)
+        try:
+            return self.__dbbackend.remove_if(ns, key, data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
+
+    @func_arg_checker(SdlTypeError, 1, ns=str, batch_size=(int, type(None)),
+                      progress_cb=(Callable, type(None)))
+    def remove_all(self, ns: str, batch_size: Optional[int] = None,
+                   progress_cb: Optional[Callable[[int], None]] = None) -> Optional[int]:
+        if batch_size is not None:
+            _validate_batch_size(batch_size)
+        try:
+            if batch_size is not None:
+                return self.__dbbackend.remove_all_in_batches(ns, batch_size, progress_cb)
+            keys = self.__dbbackend.find_keys(ns, '*')
+            if keys:
+                self.__dbbackend.remove(ns, keys, atomic=False)
+            return None
+        finally:
+            self._invalidate_read_cache(ns, None)
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
     def add_member(self, ns: str, group: str, members: Union[bytes, Set[bytes]]) -> None:
-        self.__dbbackend.add_member(ns, group, members)
+        try:
+            self.__dbbackend.add_member(ns, group, members)
+        finally:
+            self._invalidate_read_cache(ns, [group])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str, members=(bytes, builtins.set))
     def remove_member(self, ns: str, group: str, members: Union[bytes, Set[bytes]]) -> None:
-        self.__dbbackend.remove_member(ns, group, members)
+        try:
+            self.__dbbackend.remove_member(ns, group, members)
+        finally:
+            self._invalidate_read_cache(ns, [group])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
     def remove_group(self, ns: str, group: str) -> None:
-        self.__dbbackend.remove_group(ns, group)
+        try:
+            self.__dbbackend.remove_group(ns, group)
+        finally:
+            self._invalidate_read_cache(ns, [group])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
     def get_members(self, ns: str, group: str) -> Set[bytes]:
-        return self.__dbbackend.get_members(ns, group)
+        if self.__read_cache is None:
+            return self.__dbbackend.get_members(ns, group)
+        members = self.__cached_read(
+            ns, group, 'get_members',
+            lambda ns, group: frozenset(self.__dbbackend.get_members(ns, group)))
+        return set(members)
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str, member=bytes)
     def is_member(self, ns: str, group: str, member: bytes) -> bool:
-        return self.__dbbackend.is_member(ns, group, member)
+        if self.__read_cache is None:
+            return self.__dbbackend.is_member(ns, group, member)
+        return self.__cached_read(ns, group, ('is_member', member),
+                                  lambda ns, group: self.__dbbackend.is_member(ns, group, member))
 
     @func_arg_checker(SdlTypeError, 1, ns=str, group=str)
     def group_size(self, ns: str, group: str) -> int:
         return self.__dbbackend.group_size(ns, group)
 
-    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, data_map=dict)
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, data_map=dict,
+                      atomic=bool)
     def set_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
-                        data_map: Dict[str, bytes]) -> None:
+                        data_map: Dict[str, bytes], atomic: bool = True) -> None:
         self._validate_key_value_dict(data_map)
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
-        self.__dbbackend.set_and_publish(ns, channels_and_events, data_map)
+        try:
+            self.__dbbackend.set_and_publish(ns, channels_and_events, data_map, atomic=atomic)
+        finally:
+            self._invalidate_read_cache(ns, data_map)
 
     @func_arg_checker(SdlTypeError,
                       1,
@@ -231,7 +705,11 @@ def set_if_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str,
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
-        return self.__dbbackend.set_if_and_publish(ns, channels_and_events, key, old_data, new_data)
+        try:
+            return self.__dbbackend.set_if_and_publish(ns, channels_and_events, key, old_data,
+                                                       new_data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
     def set_if_not_exists_and_publish(self, ns: str,
@@ -240,16 +718,24 @@ def set_if_not_exists_and_publish(self, ns: str,
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
-        return self.__dbbackend.set_if_not_exists_and_publish(ns, channels_and_events, key, data)
+        try:
+            return self.__dbbackend.set_if_not_exists_and_publish(ns, channels_and_events, key,
+                                                                  data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
 
-    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, keys=(str, builtins.set))
+    @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, keys=(str, builtins.set),
+                      atomic=bool)
     def remove_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
-                           keys: Union[str, Set[str]]) -> None:
+                           keys: Union[str, Set[str]], atomic: bool = True) -> None:
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
         keys = [keys] if isinstance(keys, str) else list(keys)
-        self.__dbbackend.remove_and_publish(ns, channels_and_events, keys)
+        try:
+            self.__dbbackend.remove_and_publish(ns, channels_and_events, keys, atomic=atomic)
+        finally:
+            self._invalidate_read_cache(ns, keys)
 
     @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict, key=str, data=bytes)
     def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
@@ -257,7 +743,10 @@ def remove_if_and_publish(self, ns: str, channels_and_events: Dict[str, Union[st
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
-        return self.__dbbackend.remove_if_and_publish(ns, channels_and_events, key, data)
+        try:
+            return self.__dbbackend.remove_if_and_publish(ns, channels_and_events, key, data)
+        finally:
+            self._invalidate_read_cache(ns, [key])
 
     @func_arg_checker(SdlTypeError, 1, ns=str, channels_and_events=dict)
     def remove_all_and_publish(self, ns: str,
@@ -265,19 +754,61 @@ def remove_all_and_publish(self, ns: str,
         self._validate_channels_events(channels_and_events)
         for channel, events in channels_and_events.items():
             channels_and_events[channel] = [events] if isinstance(events, str) else events
-        self.__dbbackend.remove_all_and_publish(ns, channels_and_events)
+        try:
+            self.__dbbackend.remove_all_and_publish(ns, channels_and_events)
+        finally:
+            self._invalidate_read_cache(ns, None)
 
     @func_arg_checker(SdlTypeError, 1, ns=str, cb=Callable, channels=(str, builtins.set))
     def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
                           channels: Union[str, Set[str]]) -> None:
-        self._validate_callback(cb)
+        _validate_callback(cb)
         channels = [channels] if isinstance(channels, str) else list(channels)
+        if self.__dispatcher is not None:
+            cb = self.__dispatched_callback(ns, cb)
         self.__dbbackend.subscribe_channel(ns, cb, channels)
 
+    @func_arg_checker(SdlTypeError, 1, ns=str, cb=Callable, channels=(str, builtins.set),
+                      max_events=int, max_latency=(int, float))
+    def subscribe_channel_batch(self, ns: str, cb: Callable[[List[Tuple[str, List[str]]]], None],
+                                channels: Union[str, Set[str]], max_events: int = 100,
+                                max_latency: Union[int, float] = 0.01) -> None:
+        _validate_callback(cb, 1)
+        _validate_batch_size(max_events)
+        if max_latency < 0:
+            raise SdlTypeError(r"Wrong maximum latency: {}. Must not be negative".format(
+                max_latency))
+        batcher = _EventBatcher(cb, max_events, max_latency)
+        channels = [channels] if isinstance(channels, str) else list(channels)
+        self.__dbbackend.subscribe_channel_batch(ns, batcher.add_events, channels)
+        self.__close_batchers(ns, channels)
+        for channel in channels:
+            self.__batchers[(ns, channel)] = batcher
+
+    def __get_batchers(self) -> List[_EventBatcher]:
+        # A batcher is shared by the channels subscribed together.
+        return list(dict.fromkeys(self.__batchers.values()))
+
+    def __close_batchers(self, ns: str, channels: List[str]) -> None:
+        # Close the batchers of the channels, which are not batchers of other channels.
+        batchers = [self.__batchers.pop((ns, channel)) for channel in channels
+                    if (ns, channel) in self.__batchers]
+        for batcher in set(batchers) - set(self.__batchers.values()):
+            batcher.close()
+
+    def __dispatched_callback(self, ns: str, cb: Callable[[str, List[str]], None]
+                              ) -> Callable[[str, List[str]], None]:
+        dispatcher = self.__dispatcher
+
+        def dispatch(channel: str, events: List[str]) -> None:
+            dispatcher.dispatch((ns, channel), cb, channel, events)
+        return dispatch
+
     @func_arg_checker(SdlTypeError, 1, ns=str, channels=(str, builtins.set))
     def unsubscribe_channel(self, ns: str, channels: Union[str, Set[str]]) -> None:
         channels = [channels] if isinstance(channels, str) else list(channels)
         self.__dbbackend.unsubscribe_channel(ns, channels)
+        self.__close_batchers(ns, channels)
 
     def start_event_listener(self) -> None:
         self.__dbbackend.start_event_listener()
@@ -285,10 +816,51 @@ def start_event_listener(self) -> None:
     def handle_events(self) -> Optional[Tuple[str, List[str]]]:
         return self.__dbbackend.handle_events()
 
+    @func_arg_checker(SdlTypeError, 1, max_events=int, timeout=(int, float))
+    def handle_events_batch(self, max_events: int = 100,
+                            timeout: Union[int, float] = 0) -> List[Tuple[str, List[str]]]:
+        _validate_batch_size(max_events)
+        events = self.__dbbackend.handle_events_batch(max_events, timeout)
+        for batcher in self.__get_batchers():
+            batcher.flush()
+        return events
+
+    def batch(self) -> SyncBatch:
+        return SyncBatch(self)
+
     @func_arg_checker(SdlTypeError, 1, ns=str, resource=str, expiration=(int, float))
     def get_lock_resource(self, ns: str, resource: str, expiration: Union[int, float]) -> SyncLock:
         return SyncLock(ns, resource, expiration, self)
 
+    def get_statistics(self) -> Dict[str, Any]:
+        if self.__statistics is None:
+            return {'operations': {}, 'namespaces': {}}
+        return self.__statistics.get()
+
+    def get_prometheus_metrics(self) -> str:
+        if self.__statistics is None:
+            return ''
+        return self.__statistics.to_prometheus()
+
+    def get_slow_operations(self) -> List[Dict[str, Any]]:
+        if self.__slow_log is None:
+            return []
+        return self.__slow_log.get()
+
+    @func_arg_checker(SdlTypeError, 1, count=int, by=str)
+    def get_hot_keys(self, count: int = 10, by: str = 'calls') -> List[Dict[str, Any]]:
+        _validate_hot_key_quantity(by)
+        if self.__hot_keys is None:
+            return []
+        return self.__hot_keys.get_keys(count, by)
+
+    @func_arg_checker(SdlTypeError, 1, count=int, by=str)
+    def get_hot_namespaces(self, count: int = 10, by: str = 'calls') -> List[Dict[str, Any]]:
+        _validate_hot_key_quantity(by)
+        if self.__hot_keys is None:
+            return []
+        return self.__hot_keys.get_namespaces(count, by)
+
     def get_backend(self) -> DbBackendAbc:
         """Return backend instance."""
         return self.__dbbackend
@@ -297,38 +869,51 @@ def get_configuration(self) -> _Configuration:
         """Return configuration what was valid when the SDL instance was initiated."""
         return self.__configuration
 
-    @classmethod
-    def _validate_key_value_dict(cls, kv):
-        for k, v in kv.items():
-            if not isinstance(k, str):
-                raise SdlTypeError(r"Wrong dict key type: {}={}. Must be: str".format(k, type(k)))
-            if not isinstance(v, bytes):
-                raise SdlTypeError(r"Wrong dict value type: {}={}. Must be: bytes".format(v, type(v)))
+    def _invalidate_read_cache(self, ns: str, keys: Optional[Iterable[str]]) -> None:
+        """Invalidate cached data of the keys, or of all the keys if keys are not given."""
+        if self.__read_cache is not None:
+            self.__read_cache.invalidate(ns, keys)
+
+    def __track(self, ns: str) -> None:
+        # Tracking must be enabled before the data is read the first time, otherwise
+        # modifications done between the read and enabling the tracking would not be notified.
+        if ns not in self.__tracked_namespaces:
+            self.__dbbackend.track_namespace(ns, self._invalidate_read_cache)
+            self.__tracked_namespaces.add(ns)
+
+    def __cached_get(self, ns: str, keys: List[str]) -> Dict[str, bytes]:
+        ret = {}
+        missed_keys = []
+        for key in keys:
+            value = self.__read_cache.lookup(ns, key, 'get')
+            if value is _ReadCache.MISS:
+                missed_keys.append(key)
+            elif value is not None:
+                ret[key] = value
+        if missed_keys:
+            self.__track(ns)
+            epoch = self.__read_cache.get_epoch(ns)
+            read = self.__dbbackend.get(ns, missed_keys)
+            for key in missed_keys:
+                # A nonexistent key is cached too, as None.
+                self.__read_cache.store(ns, key, 'get', read.get(key), epoch)
+            ret.update(read)
+        return ret
+
+    def __cached_read(self, ns: str, key: str, kind: Hashable,
+                      read: Callable[[str, str], Any]) -> Any:
+        value = self.__read_cache.lookup(ns, key, kind)
+        if value is _ReadCache.MISS:
+            self.__track(ns)
+            epoch = self.__read_cache.get_epoch(ns)
+            value = read(ns, key)
+            self.__read_cache.store(ns, key, kind, value, epoch)
+        return value
+
+    def _validate_key_value_dict(self, kv):
+        if not self.__trusted_caller:
+            _validate_key_value_dict(kv)
 
     def _validate_channels_events(self, channels_and_events: Dict[Any, Any]):
-        for channel, events in channels_and_events.items():
-            if not isinstance(channel, str):
-                raise SdlTypeError(r"Wrong channel type: {}={}. Must be: str".format(
-                    channel, type(channel)))
-            if not isinstance(events, (list, str)):
-                raise SdlTypeError(r"Wrong event type: {}={}. Must be: str".format(
-                    events, type(events)))
-            if isinstance(events, list):
-                for event in events:
-                    if not isinstance(event, str):
-                        raise SdlTypeError(r"Wrong event type: {}={}. Must be: str".format(
-                            events, type(events)))
-                    if self.event_separator in event:
-                        raise SdlTypeError(r"Events {} contains illegal substring (\"{}\")".format(
-                            events, self.event_separator))
-            else:
-                if self.event_separator in events:
-                    raise SdlTypeError(r"Events {} contains illegal substring (\"{}\")".format(
-                        events, self.event_separator))
-
-    @classmethod
-    def _validate_callback(cls, cb):
-        param_len = len(inspect.signature(cb).parameters)
-        if param_len != 2:
-            raise SdlTypeError(
-                f"Callback function should take 2 positional argument but {param_len} were given")
+        if not self.__trusted_caller:
+            _validate_channels_events(channels_and_events, self.event_separator)
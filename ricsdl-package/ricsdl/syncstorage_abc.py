@@ -20,7 +20,7 @@
 
 
 """The module provides synchronous Shared Data Layer (SDL) interface."""
-from typing import (Callable, Dict, Set, List, Optional, Tuple, Union)
+from typing import (Any, Callable, Dict, Iterator, Set, List, Optional, Tuple, Union)
 from abc import ABC, abstractmethod
 from ricsdl.exceptions import (
     RejectedByBackend
@@ -207,11 +207,20 @@ def close(self):
         pass
 
     @abstractmethod
-    def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
+    def set(self, ns: str, data_map: Dict[str, bytes], atomic: bool = True) -> None:
         """
         Write data to SDL storage.
 
         Writing is done atomically, i.e. either all succeeds, or all fails.
+
+        If SDL is configured to limit the size of a database command (see environment variables
+        SDL_MAX_KEYS_PER_COMMAND and SDL_MAX_BYTES_PER_COMMAND), large requests are split to
+        several commands, which are sent in one pipeline. By default the split commands are
+        executed as one transaction, hence the operation stays atomic. If `atomic` is false, the
+        split commands are executed as independent commands, which does not block the backend
+        data storage for the duration of the whole operation, but other clients may see the
+        results of some commands before the others.
+
         All the exceptions except SdlTypeError are derived from SdlException base class. Client
         can catch only that exception if separate handling for different SDL error situations is
         not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
@@ -220,6 +229,7 @@ def set(self, ns: str, data_map: Dict[str, bytes]) -> None:
         Args:
             ns (str): Namespace under which this operation is targeted.
             data_map (dict of str: bytes): Data to be written.
+            atomic (bool): Execute the split commands atomically. True by default.
 
         Returns:
             None
@@ -292,11 +302,18 @@ def set_if_not_exists(self, ns: str, key: str, data: bytes) -> bool:
         pass
 
     @abstractmethod
-    def get(self, ns: str, keys: Union[str, Set[str]]) -> Dict[str, bytes]:
+    def get(self, ns: str, keys: Union[str, Set[str]],
+            ordered: bool = True) -> Dict[str, bytes]:
         """
         Read data from SDL storage.
 
         Only those entries that are found will be returned.
+        By default returned dictionary is sorted by key values. If the caller does not need the
+        order, sorting can be skipped by setting 'ordered' to false, which saves the cost of
+        sorting a large number of keys.
+        If SDL is configured to limit the size of a database command (see environment variables
+        SDL_MAX_KEYS_PER_COMMAND and SDL_MAX_BYTES_PER_COMMAND), a large number of keys is read
+        with several commands sent in one pipeline.
         All the exceptions except SdlTypeError are derived from SdlException base class. Client
         can catch only that exception if separate handling for different SDL error situations is
         not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
@@ -305,10 +322,12 @@ def get(self, ns: str, keys: Union[str, Set[str]]) -> Dict[str, bytes]:
         Args:
             ns (str): Namespace under which this operation is targeted.
             keys (str or set of str): One or multiple keys to be read.
+            ordered (bool): If true, returned dictionary is sorted by key values.
 
         Returns:
             (dict of str: bytes): A dictionary mapping of a key to the read data from the storage.
-                                  Dictionary is sorted by key values in alphabetical order.
+                                  If 'ordered' is true, dictionary is sorted by key values in
+                                  alphabetical order, otherwise the order is undefined.
 
         Raises:
             SdlTypeError: If function's argument is of an inappropriate type.
@@ -360,7 +379,7 @@ def find_keys(self, ns: str, key_pattern: str) -> List[str]:
         pass
 
     @abstractmethod
-    def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
+    def find_and_get(self, ns: str, key_pattern: str, ordered: bool = True) -> Dict[str, bytes]:
         r"""
         Find keys and get their respective data from SDL storage.
 
@@ -380,6 +399,9 @@ def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
 
         NOTE: `find_and_get` function is not guaranteed to be atomic or isolated.
 
+        By default returned dictionary is sorted by key values. If the caller does not need the
+        order, sorting can be skipped by setting 'ordered' to false, which saves the cost of
+        sorting a large number of keys.
         All the exceptions except SdlTypeError are derived from SdlException base class. Client
         can catch only that exception if separate handling for different SDL error situations is
         not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
@@ -388,10 +410,12 @@ def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
         Args:
             ns (str): Namespace under which this operation is targeted.
             key_pattern (str): Key search pattern.
+            ordered (bool): If true, returned dictionary is sorted by key values.
 
         Returns:
             (dict of str: bytes): A dictionary mapping of a key to the read data from the storage.
-                                  Dictionary is sorted by key values in alphabetical order.
+                                  If 'ordered' is true, dictionary is sorted by key values in
+                                  alphabetical order, otherwise the order is undefined.
 
         Raises:
             SdlTypeError: If function's argument is of an inappropriate type.
@@ -402,11 +426,127 @@ def find_and_get(self, ns: str, key_pattern: str) -> Dict[str, bytes]:
         pass
 
     @abstractmethod
-    def remove(self, ns: str, keys: Union[str, Set[str]]) -> None:
+    def iter_keys(self, ns: str, key_pattern: str, batch_size: int = 1000) -> Iterator[str]:
+        r"""
+        Iterate over the keys matching search pattern under the namespace.
+
+        Unlike `find_keys` function, keys are not searched with one blocking database query but
+        incrementally with a database cursor, fetching roughly `batch_size` keys at a time. The
+        backend data storage is not blocked for the duration of the whole search and the memory
+        usage of the client does not grow with the number of keys in the namespace. Use this
+        function instead of `find_keys` for namespaces with a large number of keys.
+
+        Supported glob-style patterns:
+            `?` matches any single character. For example `?at` matches Cat, cat, Bat or bat.
+            `*` matches any number of any characters including none. For example `*Law*` matches
+                Law, GrokLaw, or Lawyer.
+            `[abc]` matches one character given in the bracket. For example `[CB]at` matches Cat or
+                    Bat.
+            `[a-z]` matches one character from the range given in the bracket. For example
+                    `Letter[0-9]` matches Letter0 up to Letter9.
+            `[^abc]` matches any single character what is not given in the bracket. For example
+                     `h[^e]llo` matches hallo, hillo but not hello.
+
+        If searched key itself contains a special character, use a backslash (\) character to
+        escape the special character to match it verbatim.
+
+        NOTE: `iter_keys` function is not guaranteed to be atomic or isolated. A key which exists
+        for the whole duration of the iteration is returned at least once, but a key may be
+        returned more than once. A key which is added or removed during the iteration may or may
+        not be returned.
+
+        All the exceptions except SdlTypeError are derived from SdlException base class. Client
+        can catch only that exception if separate handling for different SDL error situations is
+        not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
+        misuse of the SDL API. Exceptions other than SdlTypeError are raised when the iterator is
+        advanced.
+
+        Args:
+            ns (str): Namespace under which this operation is targeted.
+            key_pattern (str): Key search pattern.
+            batch_size (int): Hint for the number of keys fetched from the storage at a time.
+                              Must be a positive integer.
+
+        Returns:
+            (iterator of str): An iterator over the found keys.
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type.
+            NotConnected: If SDL is not connected to the backend data storage.
+            RejectedByBackend: If backend data storage rejects the request.
+            BackendError: If the backend data storage fails to process the request.
+        """
+        pass
+
+    @abstractmethod
+    def iter_items(self, ns: str, key_pattern: str,
+                   batch_size: int = 1000) -> Iterator[Tuple[str, bytes]]:
+        r"""
+        Iterate over the keys matching search pattern and their respective data in SDL storage.
+
+        Unlike `find_and_get` function, keys are searched incrementally with a database cursor
+        and their data is read at most `batch_size` keys at a time. Neither the found keys nor
+        their data are collected into one dictionary, so the memory usage of the client does not
+        grow with the number of keys in the namespace. Use this function instead of
+        `find_and_get` for namespaces with a large number of keys.
+
+        Supported glob-style patterns:
+            `?` matches any single character. For example `?at` matches Cat, cat, Bat or bat.
+            `*` matches any number of any characters including none. For example `*Law*` matches
+                Law, GrokLaw, or Lawyer.
+            `[abc]` matches one character given in the bracket. For example `[CB]at` matches Cat or
+                    Bat.
+            `[a-z]` matches one character from the range given in the bracket. For example
+                    `Letter[0-9]` matches Letter0 up to Letter9.
+            `[^abc]` matches any single character what is not given in the bracket. For example
+                     `h[^e]llo` matches hallo, hillo but not hello.
+
+        If searched key itself contains a special character, use a backslash (\) character to
+        escape the special character to match it verbatim.
+
+        NOTE: `iter_items` function is not guaranteed to be atomic or isolated. A key which
+        exists for the whole duration of the iteration is returned at least once, but a key may
+        be returned more than once. A key which is added or removed during the iteration may or
+        may not be returned. Items are not sorted by key values.
+
+        All the exceptions except SdlTypeError are derived from SdlException base class. Client
+        can catch only that exception if separate handling for different SDL error situations is
+        not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
+        misuse of the SDL API. Exceptions other than SdlTypeError are raised when the iterator is
+        advanced.
+
+        Args:
+            ns (str): Namespace under which this operation is targeted.
+            key_pattern (str): Key search pattern.
+            batch_size (int): Maximum number of keys which data is read from the storage at a
+                              time. Must be a positive integer.
+
+        Returns:
+            (iterator of tuple(str, bytes)): An iterator over the found keys and their data.
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type.
+            NotConnected: If SDL is not connected to the backend data storage.
+            RejectedByBackend: If backend data storage rejects the request.
+            BackendError: If the backend data storage fails to process the request.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, ns: str, keys: Union[str, Set[str]], atomic: bool = True) -> None:
         """
         Remove data from SDL storage. Existing keys are removed.
 
         Removing is done atomically, i.e. either all succeeds, or all fails.
+
+        If SDL is configured to limit the size of a database command (see environment variables
+        SDL_MAX_KEYS_PER_COMMAND and SDL_MAX_BYTES_PER_COMMAND), large requests are split to
+        several commands, which are sent in one pipeline. By default the split commands are
+        executed as one transaction, hence the operation stays atomic. If `atomic` is false, the
+        split commands are executed as independent commands, which does not block the backend
+        data storage for the duration of the whole operation, but other clients may see the
+        results of some commands before the others.
+
         All the exceptions except SdlTypeError are derived from SdlException base class. Client
         can catch only that exception if separate handling for different SDL error situations is
         not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
@@ -415,6 +555,7 @@ def remove(self, ns: str, keys: Union[str, Set[str]]) -> None:
         Args:
             ns (str): Namespace under which this operation is targeted.
             keys (str or set of str): One key or multiple keys, which data is to be removed.
+            atomic (bool): Execute the split commands atomically. True by default.
 
         Returns:
             None
@@ -456,12 +597,22 @@ def remove_if(self, ns: str, key: str, data: bytes) -> bool:
         pass
 
     @abstractmethod
-    def remove_all(self, ns: str) -> None:
+    def remove_all(self, ns: str, batch_size: Optional[int] = None,
+                   progress_cb: Optional[Callable[[int], None]] = None) -> Optional[int]:
         """
         Remove all keys under the namespace.
 
         No prior knowledge about the keys in the given namespace exists, thus operation is not
         guaranteed to be atomic or isolated.
+
+        By default all the keys of the namespace are first searched with one database query and
+        then removed with one database request. For namespaces with a large number of keys give
+        `batch_size` argument, keys are then searched incrementally with a database cursor and
+        removed at most `batch_size` keys at a time. In this mode the backend data storage is not
+        blocked for the duration of the whole operation and the memory of the removed data is
+        reclaimed by the backend data storage in the background. Optional `progress_cb` callback
+        is called after each removed batch with the number of keys removed so far.
+
         All the exceptions except SdlTypeError are derived from SdlException base class. Client
         can catch only that exception if separate handling for different SDL error situations is
         not needed. Exception SdlTypeError is derived from build-in TypeError and it indicates
@@ -469,9 +620,15 @@ def remove_all(self, ns: str) -> None:
 
         Args:
             ns (str): Namespace under which this operation is targeted.
+            batch_size (int, optional): Maximum number of keys removed at a time. Must be a
+                                        positive integer. If not given, all keys are removed at
+                                        once.
+            progress_cb (function, optional): A function taking the number of keys removed so far
+                                              as an argument. Called only if `batch_size` is
+                                              given.
 
         Returns:
-            None
+            int: The number of removed keys if `batch_size` is given, otherwise None.
 
         Raises:
             SdlTypeError: If function's argument is of an inappropriate type.
@@ -652,7 +809,7 @@ def group_size(self, ns: str, group: str) -> int:
 
     @abstractmethod
     def set_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
-                        data_map: Dict[str, bytes]) -> None:
+                        data_map: Dict[str, bytes], atomic: bool = True) -> None:
         """
         Publish event to channel after writing data.
 
@@ -668,10 +825,20 @@ def set_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, Lis
         E.g. {"channel1": ["event1", "event3"], "channel2": ["event2"]}
         will send event1 and event3 to channel1 and event2 to channel2.
 
+        If SDL is configured to limit the size of a database command (see environment variables
+        SDL_MAX_KEYS_PER_COMMAND and SDL_MAX_BYTES_PER_COMMAND), large requests are split to
+        several commands, which are sent in one pipeline. By default the split commands are
+        executed as one transaction, hence the operation stays atomic. If `atomic` is false, the
+        split commands are executed as independent commands, which does not block the backend
+        data storage for the duration of the whole operation, but other clients may see the
+        results of some commands before the others.
+        Events are published only once, after all the data has been written.
+
         Args:
             ns: Namespace under which this operation is targeted.
             channels_and_events: Channel to publish if data was set successfully.
             data_map: Data to be written.
+            atomic: Execute the split commands atomically. True by default.
 
         Returns:
             None
@@ -746,7 +913,7 @@ def set_if_not_exists_and_publish(self, ns: str,
 
     @abstractmethod
     def remove_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str, List[str]]],
-                           keys: Union[str, Set[str]]) -> None:
+                           keys: Union[str, Set[str]], atomic: bool = True) -> None:
         """
         Publish event to channel after removing data.
 
@@ -757,10 +924,24 @@ def remove_and_publish(self, ns: str, channels_and_events: Dict[str, Union[str,
         at least one key is removed (if several keys given). If the given key(s) doesn't
         exist when trying to remove, no event is published.
 
+        If SDL is configured to limit the size of a database command (see environment variables
+        SDL_MAX_KEYS_PER_COMMAND and SDL_MAX_BYTES_PER_COMMAND), large requests are split to
+        several commands, which are sent in one pipeline. By default the split commands are
+        executed as one transaction, hence the operation stays atomic. If `atomic` is false, the
+        split commands are executed as independent commands, which does not block the backend
+        data storage for the duration of the whole operation, but other clients may see the
+        results of some commands before the others.
+        Events are published only once, after all the data has been removed. When the request
+        is split, events are published in the same transaction as the data is removed, also if
+        none of the given keys existed. If `atomic` is false, events are published in the same
+        pipeline after the data has been removed, but with no atomicity guarantee: a lost
+        connection may leave the data removed and the events unpublished.
+
         Args:
             ns: Namespace under which this operation is targeted.
             channels_and_events: Channel to publish if data was removed successfully.
             keys: One key or multiple keys, which data is to be removed.
+            atomic: Execute the split commands atomically. True by default.
 
         Returns:
             None
@@ -851,7 +1032,11 @@ def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
         When receiving events in callback routine, it is a good practice to return from
         callback as quickly as possible. Also it should be noted that in case of several
         events received from different channels, callbacks are called in series one by
-        one.
+        one. If SDL is created with an 'event_callback_pool', callbacks are instead called by
+        a pool of worker threads: callbacks of one channel are still called in series in the
+        order the events were received, but callbacks of different channels are called in
+        parallel. Events waiting for a worker form a backlog, which size and overflow handling
+        are set by the pool options 'backlog' and 'overflow'.
 
         Args:
             ns: Namespace under which this operation is targeted.
@@ -869,6 +1054,47 @@ def subscribe_channel(self, ns: str, cb: Callable[[str, List[str]], None],
         """
         pass
 
+    @abstractmethod
+    def subscribe_channel_batch(self, ns: str, cb: Callable[[List[Tuple[str, List[str]]]], None],
+                                channels: Union[str, Set[str]], max_events: int = 100,
+                                max_latency: Union[int, float] = 0.01) -> None:
+        """
+        Subscribes the client to the specified channels with a batch callback.
+
+        subscribe_channel_batch works as subscribe_channel, but instead of calling the callback
+        for every received notification, notifications are collected into a batch and the
+        callback is called with a list of (channel, notification list) tuples in the order
+        the notifications were received. This reduces the cost of the callback calls when
+        events are published at a high rate. Event listener thread started by
+        start_event_listener reads all the notifications received at once and adds them to the
+        batch together, without handling them one by one.
+
+        Batch is delivered when it has 'max_events' tuples or when its first notification has
+        waited 'max_latency' seconds. A full batch is delivered by the thread receiving the
+        notifications, an expired batch by a dedicated thread. Batches are delivered in order,
+        one at a time. handle_events_batch delivers the collected notifications before it
+        returns. Batch callbacks are not called by the event callback worker threads.
+
+        Args:
+            ns: Namespace under which this operation is targeted.
+            cb: A function that is called with a list of (channel, notification list) tuples.
+            channels: One channel or multiple channels to be subscribed.
+            max_events: Maximum number of (channel, notification list) tuples in a batch. By
+                        default 100.
+            max_latency: Maximum time in seconds a notification waits for the delivery. By
+                         default 0.01.
+
+        Returns:
+            None
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type.
+            NotConnected: If SDL is not connected to the backend data storage.
+            RejectedByBackend: If backend data storage rejects the request.
+            BackendError: If the backend data storage fails to process the request.
+        """
+        pass
+
     @abstractmethod
     def unsubscribe_channel(self, ns: str, channels: Union[str, Set[str]]) -> None:
         """
@@ -934,6 +1160,73 @@ def handle_events(self) -> Optional[Tuple[str, List[str]]]:
         """
         pass
 
+    @abstractmethod
+    def handle_events_batch(self, max_events: int = 100,
+                            timeout: Union[int, float] = 0) -> List[Tuple[str, List[str]]]:
+        """
+        handle_events_batch is a batch counterpart of handle_events. It waits at most 'timeout'
+        seconds for a notification and then handles, without further waiting, the
+        notifications already received, at most 'max_events'. The registered callback
+        functions are called as with handle_events, and the notifications collected for batch
+        callbacks of subscribe_channel_batch are delivered before the function returns.
+
+        This function is called if SDL user decides to handle notifications in its own
+        event loop. Calling this function after start_event_listener raises an exception.
+        If there are no notifications, an empty list is returned.
+
+        Args:
+            max_events: Maximum number of handled notifications. By default 100.
+            timeout: Maximum time in seconds to wait for a notification. By default 0, which
+                     does not wait.
+
+        Returns:
+            List: (channel: str, message(s): list of str) tuples in the order the notifications
+                  were received.
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type.
+            NotConnected: If SDL is not connected to the backend data storage.
+            RejectedByBackend: If backend data storage rejects the request.
+            BackendError: If the backend data storage fails to process the request.
+        """
+        pass
+
+    @abstractmethod
+    def batch(self):
+        """
+        Return a new batch for SDL operations.
+
+        Batch queues SDL operations and sends them to the backend data storage only when the
+        batch is executed. Operations targeted to the same backend database instance are sent
+        in one pipeline, which saves network round trips compared to calling the corresponding
+        SDL functions one by one. Batch supports all the functions of this class, which operate
+        with known keys and groups: set, set_if, set_if_not_exists, get, remove, remove_if,
+        add_member, remove_member, remove_group, get_members, is_member, group_size and the
+        publishing variants of the set and remove functions. Every queued operation returns a
+        result object, which returns the result of the operation after the batch execution.
+
+        Batch is executed when its 'execute' function is called or when a 'with' block is
+        exited without an exception:
+
+            with sdl.batch() as batch:
+                data = batch.get(ns, {'key1', 'key2'})
+                batch.set_if(ns, 'key3', b'old', b'new')
+            print(data.result())
+
+        Batch as a whole is not atomic. Operations under the same namespace are executed in the
+        order they were queued.
+
+        Args:
+            None
+
+        Returns:
+            SyncBatch: An empty batch instance.
+
+        Raises:
+            None
+        """
+        pass
+
     @abstractmethod
     def get_lock_resource(self, ns: str, resource: str,
                           expiration: Union[int, float]) -> SyncLockAbc:
@@ -964,3 +1257,148 @@ def get_lock_resource(self, ns: str, resource: str,
             BackendError: If the backend data storage fails to process the request.
         """
         pass
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Return statistics of the backend data storage operations of the SDL instance.
+
+        Statistics are collected only if they are enabled with the 'statistics' parameter of the
+        SDL instance. An operation is counted once per call of the backend data storage, thus
+        reads served from the client side read cache are not counted and a batch is counted as
+        one 'execute_batch' operation.
+
+        Statistics are returned per operation under key 'operations' and per namespace and
+        operation under key 'namespaces':
+
+            {'operations': {'get': {...}, ...},
+             'namespaces': {'some-ns': {'get': {...}, ...}, ...}}
+
+        Statistics of an operation is a dictionary of:
+            calls (int): Number of calls, including the failed calls.
+            errors (dict): Number of failed calls by the name of the raised exception type.
+            bytes_out (int): Number of data bytes (values and group members) sent.
+            bytes_in (int): Number of data bytes received.
+            latency_sum (float): Total latency of the calls in seconds.
+            latency_buckets (dict): Number of calls, which completed within the given number of
+                                    seconds. The last bound is infinity.
+
+        Args:
+            None
+
+        Returns:
+            dict: Statistics of the operations. Empty if statistics are disabled.
+
+        Raises:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def get_prometheus_metrics(self) -> str:
+        """
+        Return the statistics of the backend data storage operations in Prometheus text
+        exposition format. See 'get_statistics' for the details of the statistics.
+
+        Returned metrics are 'sdl_operations_total', 'sdl_operation_errors_total',
+        'sdl_operation_sent_bytes_total', 'sdl_operation_received_bytes_total' and histogram
+        'sdl_operation_duration_seconds' with labels 'operation' and 'namespace'.
+
+        Args:
+            None
+
+        Returns:
+            str: Metrics in Prometheus text format. Empty if statistics are disabled.
+
+        Raises:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def get_slow_operations(self) -> List[Dict[str, Any]]:
+        """
+        Return the logged slow backend data storage operations of the SDL instance.
+
+        Slow operations are logged only if logging is enabled with the 'slow_operation_log'
+        parameter of the SDL instance. The log keeps a limited number of the latest slow
+        operations. Like in 'get_statistics', an operation is a call of the backend data
+        storage.
+
+        A logged operation is a dictionary of:
+            time (float): Start time of the operation in seconds since the epoch.
+            operation (str): Backend operation name.
+            namespace (str): Namespace of the operation, empty for a batch.
+            key_count (int): Number of keys, or groups, of the operation or the number of keys
+                             found with a key pattern. None if not known.
+            key_pattern (str): Key pattern of 'find_keys' and 'find_and_get', otherwise None.
+            bytes_out (int): Number of data bytes sent.
+            bytes_in (int): Number of data bytes received.
+            duration (float): Duration of the operation in seconds.
+            db_client_index (int): Index of the database client of the namespace, None if the
+                                   backend data storage has no clients.
+            error (str): Name of the exception type raised by the operation, None on success.
+
+        Args:
+            None
+
+        Returns:
+            list: Logged operations from the oldest to the newest. Empty if logging is disabled.
+
+        Raises:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def get_hot_keys(self, count: int = 10, by: str = 'calls') -> List[Dict[str, Any]]:
+        """
+        Return the most accessed keys of the SDL instance.
+
+        Keys are tracked only if tracking is enabled with the 'hot_key_capacity' parameter of the
+        SDL instance. An access is a backend data storage operation of a known key or group, thus
+        keys found with a key pattern and reads served from the client side read cache are not
+        counted. Tracking uses the space-saving algorithm, which counts at most
+        'hot_key_capacity' keys: a count can be overestimated, but at most by 'error', and every
+        key accessed more often than once per 'hot_key_capacity' accesses is found. Keys of the
+        operations of a 'batch' are tracked as separate accesses. Data bytes of a key are the
+        data written and read, for 'set_if' only the new data. If tracking is disabled, no keys
+        are tracked and an empty list is returned.
+
+        Args:
+            count (int): Maximum number of returned keys.
+            by (str): Order the keys by the number of accesses ('calls') or by the number of data
+                      bytes written and read ('bytes').
+
+        Returns:
+            list: Keys in descending order, as dictionaries of 'namespace', 'key', the number of
+                  accesses ('calls') or bytes ('bytes') and 'error'. Empty if tracking is
+                  disabled.
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type or 'by' is not
+                          'calls' or 'bytes'.
+        """
+        pass
+
+    @abstractmethod
+    def get_hot_namespaces(self, count: int = 10, by: str = 'calls') -> List[Dict[str, Any]]:
+        """
+        Return the most accessed namespaces of the SDL instance. See 'get_hot_keys' for the
+        details of the tracking. If tracking is disabled, an empty list is returned.
+
+        Args:
+            count (int): Maximum number of returned namespaces.
+            by (str): Order the namespaces by the number of accesses ('calls') or by the number
+                      of data bytes written and read ('bytes').
+
+        Returns:
+            list: Namespaces in descending order, as dictionaries of 'namespace', the number of
+                  accesses ('calls') or bytes ('bytes') and 'error'. Empty if tracking is
+                  disabled.
+
+        Raises:
+            SdlTypeError: If function's argument is of an inappropriate type or 'by' is not
+                          'calls' or 'bytes'.
+        """
+        pass
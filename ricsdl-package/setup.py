@@ -58,6 +58,8 @@ def _long_descr():
     keywords="RIC SDL",
     install_requires=[
         'setuptools',
+        # Redis Cluster client of SDL overrides internal methods of redis-py, which may change in
+        # any redis-py release. tests/backend/test_redis_cluster.py checks their signatures.
         'redis==4.3.6',
         'hiredis==2.0.0'
     ],
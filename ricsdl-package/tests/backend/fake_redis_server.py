@@ -0,0 +1,1049 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+"""
+The module provides an in-process stand-in of a Redis server for testing and benchmarking of
+the Shared Data Layer (SDL) Redis database backend without external services.
+
+The server speaks RESP2 and RESP3 (negotiated with HELLO) over TCP and implements the
+commands SDL uses: string and set commands, key search with KEYS and SCAN, MULTI/EXEC
+transactions, pub/sub, broadcasting mode client side caching (CLIENT TRACKING), key expiration,
+the DBaaS module commands (SETIE, DELIE, MSETMPUB, SETIEMPUB, SETNXMPUB, DELMPUB and DELIEMPUB)
+and the Lua scripts of SDL and redis-py locks. Other Lua scripts are not supported. All the data
+is in the memory of the server and is lost when the server is stopped.
+
+The server can be run in an asyncio event loop of the caller, in a thread of its own or as a
+standalone process (from the ricsdl-package directory):
+
+    python -m tests.backend.fake_redis_server --port 6379
+
+The module is test support code and is not part of the installed ricsdl package.
+"""
+import argparse
+import asyncio
+import bisect
+import fnmatch
+import hashlib
+import re
+import threading
+import time
+from typing import (Any, Callable, Dict, List, Optional, Set, Tuple)
+from redis.lock import Lock
+from ricsdl.backend.redis import RedisBackendLock
+
+
+# Reported Redis version. Client side caching requires Redis 6.
+REDIS_VERSION = '6.2.0'
+
+INVALIDATE_CHANNEL = b'__redis__:invalidate'
+
+# Maximum number of unfinished SCAN iterations, the oldest one is forgotten first.
+_MAX_SCAN_CURSORS = 10000
+
+_GLOB_SPECIAL_CHARS = re.compile(r'[*?[]')
+
+_PUBSUB_COMMANDS = frozenset(['SUBSCRIBE', 'UNSUBSCRIBE', 'PSUBSCRIBE', 'PUNSUBSCRIBE', 'PING',
+                              'QUIT', 'RESET'])
+
+
+class _CommandError(Exception):
+    """Error reply of a command. Message starts with the error code, like 'ERR'."""
+    pass
+
+
+class _Status(str):
+    """Simple string reply."""
+    pass
+
+
+class _Push(list):
+    """Out-of-band message, like a pub/sub message. Push type of RESP3, array in RESP2."""
+    pass
+
+
+_OK = _Status('OK')
+_QUEUED = _Status('QUEUED')
+_PONG = _Status('PONG')
+# Reply of a command, which has sent its replies itself.
+_NO_REPLY = object()
+
+
+def _encode(value: Any, protocol: int, out: List[bytes]) -> None:
+    if value is None:
+        out.append(b'_\r\n' if protocol == 3 else b'$-1\r\n')
+    elif isinstance(value, _CommandError):
+        out.append(b'-' + str(value).encode() + b'\r\n')
+    elif isinstance(value, _Status):
+        out.append(b'+' + value.encode() + b'\r\n')
+    elif isinstance(value, bool):
+        out.append((b'#t\r\n' if value else b'#f\r\n') if protocol == 3 else
+                   (b':1\r\n' if value else b':0\r\n'))
+    elif isinstance(value, int):
+        out.append(b':%d\r\n' % value)
+    elif isinstance(value, (bytes, str)):
+        if isinstance(value, str):
+            value = value.encode()
+        out.append(b'$%d\r\n' % len(value))
+        out.append(value)
+        out.append(b'\r\n')
+    elif isinstance(value, dict):
+        out.append((b'%%%d\r\n' if protocol == 3 else b'*%d\r\n') %
+                   (len(value) if protocol == 3 else 2 * len(value)))
+        for key, val in value.items():
+            _encode(key, protocol, out)
+            _encode(val, protocol, out)
+    else:
+        if isinstance(value, _Push) and protocol == 3:
+            out.append(b'>%d\r\n' % len(value))
+        elif isinstance(value, (set, frozenset)) and protocol == 3:
+            out.append(b'~%d\r\n' % len(value))
+        else:
+            out.append(b'*%d\r\n' % len(value))
+        for item in value:
+            _encode(item, protocol, out)
+
+
+def encode_reply(value: Any, protocol: int = 2) -> bytes:
+    """Encode a command reply or a push message to RESP2 or RESP3 protocol."""
+    out = []  # type: List[bytes]
+    _encode(value, protocol, out)
+    return b''.join(out)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.endswith(b'\r\n'):
+        raise _CommandError("ERR Protocol error: unterminated request")
+    if line[:1] != b'*':
+        # Inline command, like the ones typed to telnet.
+        return line.split()
+    try:
+        count = int(line[1:-2])
+    except ValueError:
+        raise _CommandError("ERR Protocol error: invalid multibulk length")
+    args = []
+    for _ in range(count):
+        header = await reader.readline()
+        if header[:1] != b'$':
+            raise _CommandError("ERR Protocol error: expected '$', got '{}'".format(
+                header[:1].decode('latin-1')))
+        try:
+            length = int(header[1:-2])
+        except ValueError:
+            raise _CommandError("ERR Protocol error: invalid bulk length")
+        data = await reader.readexactly(length + 2)
+        args.append(data[:-2])
+    return args
+
+
+def _key(arg: bytes) -> str:
+    # Keys are stored as strings to use the sorted key index, latin-1 maps every byte to a
+    # character.
+    return arg.decode('latin-1')
+
+
+def _compile_pattern(pattern: str) -> Tuple[str, Optional[Callable[[str], Any]]]:
+    """
+    Return the literal prefix of a glob-style pattern and a function matching a key or a channel
+    to the pattern. Match function is None, if every name having the prefix matches.
+    """
+    special = _GLOB_SPECIAL_CHARS.search(pattern)
+    if special is None:
+        return pattern, re.compile(re.escape(pattern) + r'\Z').match
+    prefix = pattern[:special.start()]
+    if pattern[special.start():] == '*':
+        return prefix, None
+    return prefix, re.compile(fnmatch.translate(pattern)).match
+
+
+class _KeyIndex():
+    """Sorted list of the keys for the key search by a prefix of KEYS and SCAN."""
+    def __init__(self) -> None:
+        self._keys = []  # type: List[str]
+
+    def add(self, key: str) -> None:
+        bisect.insort(self._keys, key)
+
+    def remove(self, key: str) -> None:
+        del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def clear(self) -> None:
+        self._keys = []
+
+    def find_prefix(self, prefix: str, after: Optional[str] = None, limit: int = 0) -> List[str]:
+        """
+        Return the keys having a prefix in sorted order. If 'after' is given, only the keys
+        greater than it are returned. Zero 'limit' means no limit.
+        """
+        start = bisect.bisect_left(self._keys, prefix)
+        if after is not None:
+            start = max(start, bisect.bisect_right(self._keys, after))
+        # Latin-1 keys have no characters greater than U+00FF.
+        end = bisect.bisect_left(self._keys, prefix + '\u0100')
+        if limit:
+            end = min(end, start + limit)
+        return self._keys[start:end]
+
+
+def _int(arg: bytes) -> int:
+    try:
+        return int(arg)
+    except ValueError:
+        raise _CommandError("ERR value is not an integer or out of range")
+
+
+class _Tracking():
+    """Client side caching state of a client in broadcasting mode."""
+    def __init__(self, redirect: int) -> None:
+        self.redirect = redirect
+        self.prefixes = []  # type: List[str]
+
+
+class _Client():
+    """State of a client connection."""
+    def __init__(self, client_id: int, writer: asyncio.StreamWriter) -> None:
+        self.id = client_id
+        self.writer = writer
+        self.protocol = 2
+        self.name = None  # type: Optional[bytes]
+        self.channels = set()  # type: Set[bytes]
+        self.patterns = set()  # type: Set[bytes]
+        self.multi = None  # type: Optional[List[List[bytes]]]
+        self.multi_error = False
+        self.tracking = None  # type: Optional[_Tracking]
+        self.closing = False
+
+    def send(self, value: Any) -> None:
+        """Send a reply or a push message to the client."""
+        self.writer.write(encode_reply(value, self.protocol))
+
+    def subscription_count(self) -> int:
+        """Return the number of subscribed channels and patterns."""
+        return len(self.channels) + len(self.patterns)
+
+
+class FakeRedisServer():
+    """
+    In-process stand-in of a Redis server with the DBaaS module commands. This class is intended
+    for testing and benchmarking purposes only.
+
+    Server is started either with 'start_serving' and 'close' coroutines in the event loop of
+    the caller, or with 'start' and 'stop' functions, which run the server in an event loop of a
+    thread of its own. Server can be used also as a context manager, which runs the server in a
+    thread.
+
+    Args:
+        host (str): Address to listen, by default the loopback address.
+        port (int): Port to listen, by default a free port is selected. Selected port is
+                    available in 'port' attribute after the server has been started.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self._data = {}  # type: Dict[str, Any]
+        self._expires = {}  # type: Dict[str, float]
+        self._index = _KeyIndex()
+        self._clients = {}  # type: Dict[int, _Client]
+        self._tasks = set()  # type: Set[asyncio.Task]
+        self._channels = {}  # type: Dict[bytes, Set[_Client]]
+        self._patterns = {}  # type: Dict[bytes, Set[_Client]]
+        self._modified = []  # type: List[str]
+        self._flushed = False
+        self._scan_cursors = {}  # type: Dict[int, str]
+        self._next_cursor = 1
+        self._next_client_id = 1
+        self._scripts = {}  # type: Dict[str, Callable[[List[bytes], List[bytes]], Any]]
+        for script, func in ((Lock.LUA_RELEASE_SCRIPT, self._lua_release),
+                             (Lock.LUA_EXTEND_SCRIPT, self._lua_extend),
+                             (Lock.LUA_REACQUIRE_SCRIPT, self._lua_reacquire),
+                             (RedisBackendLock.LUA_GET_VALIDITY_TIME_SCRIPT,
+                              self._lua_get_validity_time)):
+            self._scripts[hashlib.sha1(script.encode()).hexdigest()] = func
+        self._commands = self.__create_command_table()
+        self._server = None  # type: Optional[asyncio.AbstractServer]
+        self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    async def start_serving(self) -> None:
+        """Start listening client connections in the running event loop."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and close the client connections."""
+        if self._server is not None:
+            self._server.close()
+        for client in list(self._clients.values()):
+            client.writer.close()
+        # Connection handlers exit when they notice the closed connections.
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def start(self) -> None:
+        """Start the server in a thread of its own and wait until it accepts connections."""
+        started = threading.Event()
+        errors = []  # type: List[BaseException]
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start_serving())
+            except BaseException as exc:
+                errors.append(exc)
+                started.set()
+                self._loop.close()
+                return
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+
+    def stop(self) -> None:
+        """Stop the server started with 'start'."""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        client = _Client(self._next_client_id, writer)
+        self._next_client_id += 1
+        self._clients[client.id] = client
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            while not client.closing:
+                try:
+                    args = await _read_command(reader)
+                except _CommandError as exc:
+                    client.send(exc)
+                    break
+                if args is None:
+                    break
+                if args:
+                    reply = self._execute(client, args)
+                    if reply is not _NO_REPLY:
+                        client.send(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._tasks.discard(task)
+            self.__disconnect(client)
+
+    def __disconnect(self, client: _Client) -> None:
+        self._clients.pop(client.id, None)
+        for channel in client.channels:
+            self.__unregister(self._channels, channel, client)
+        for pattern in client.patterns:
+            self.__unregister(self._patterns, pattern, client)
+        client.writer.close()
+
+    @staticmethod
+    def __unregister(subscribers: Dict[bytes, Set[_Client]], name: bytes,
+                     client: _Client) -> None:
+        clients = subscribers.get(name)
+        if clients is not None:
+            clients.discard(client)
+            if not clients:
+                del subscribers[name]
+
+    def _execute(self, client: _Client, args: List[bytes]) -> Any:
+        name = args[0].decode('latin-1').upper()
+        command = self._commands.get(name)
+        if command is None:
+            reply = _CommandError("ERR unknown command '{}'".format(args[0].decode('latin-1')))
+        elif (command[1] >= 0 and len(args) != command[1]) or len(args) < -command[1]:
+            reply = _CommandError("ERR wrong number of arguments for '{}' command".format(
+                name.lower()))
+        elif client.multi is not None and name not in ('EXEC', 'DISCARD', 'MULTI'):
+            client.multi.append(args)
+            return _QUEUED
+        elif client.protocol == 2 and client.subscription_count() and \
+                name not in _PUBSUB_COMMANDS:
+            reply = _CommandError(
+                "ERR Can't execute '{}': only (P)SUBSCRIBE / (P)UNSUBSCRIBE / PING / QUIT / "
+                "RESET are allowed in this context".format(name.lower()))
+        else:
+            try:
+                reply = command[0](client, args[1:])
+            except _CommandError as exc:
+                reply = exc
+            self.__notify_invalidations()
+            return reply
+        if client.multi is not None:
+            client.multi_error = True
+        return reply
+
+    def __create_command_table(self) -> Dict[str, Tuple[Callable[[_Client, List[bytes]], Any],
+                                                        int]]:
+        # Arity counts the command name, negative arity is the minimum number of arguments.
+        return {
+            'PING': (self._ping, -1),
+            'ECHO': (lambda client, args: args[0], 2),
+            'HELLO': (self._hello, -1),
+            'AUTH': (lambda client, args: _OK, -2),
+            'SELECT': (lambda client, args: _OK, 2),
+            'QUIT': (self._quit, 1),
+            'RESET': (self._reset, 1),
+            'CLIENT': (self._client, -2),
+            'INFO': (self._info, -1),
+            'DBSIZE': (lambda client, args: len(self.__live_keys('')), 1),
+            'FLUSHALL': (self._flushall, -1),
+            'FLUSHDB': (self._flushall, -1),
+            'GET': (self._get, 2),
+            'SET': (self._set, -3),
+            'SETNX': (self._setnx, 3),
+            'MGET': (self._mget, -2),
+            'MSET': (self._mset, -3),
+            'DEL': (self._del, -2),
+            'UNLINK': (self._del, -2),
+            'EXISTS': (self._exists, -2),
+            'KEYS': (self._keys, 2),
+            'SCAN': (self._scan, -2),
+            'PTTL': (self._pttl, 2),
+            'TTL': (lambda client, args: self.__ttl(args[0], 1000), 2),
+            'PEXPIRE': (lambda client, args: self.__expire(args[0], _int(args[1])), 3),
+            'EXPIRE': (lambda client, args: self.__expire(args[0], 1000 * _int(args[1])), 3),
+            'SADD': (self._sadd, -3),
+            'SREM': (self._srem, -3),
+            'SMEMBERS': (self._smembers, 2),
+            'SISMEMBER': (self._sismember, 3),
+            'SCARD': (self._scard, 2),
+            'PUBLISH': (lambda client, args: self.__publish(args[0], args[1]), 3),
+            'SUBSCRIBE': (self._subscribe, -2),
+            'UNSUBSCRIBE': (self._unsubscribe, -1),
+            'PSUBSCRIBE': (self._psubscribe, -2),
+            'PUNSUBSCRIBE': (self._punsubscribe, -1),
+            'PUBSUB': (self._pubsub, -2),
+            'MULTI': (self._multi, 1),
+            'EXEC': (self._exec, 1),
+            'DISCARD': (self._discard, 1),
+            'SCRIPT': (self._script, -2),
+            'EVALSHA': (self._evalsha, -3),
+            'EVAL': (self._eval, -3),
+            'SETIE': (self._setie, 4),
+            'DELIE': (self._delie, 3),
+            'MSETMPUB': (self._msetmpub, -3),
+            'SETIEMPUB': (self._setiempub, -6),
+            'SETNXMPUB': (self._setnxmpub, -5),
+            'DELMPUB': (self._delmpub, -3),
+            'DELIEMPUB': (self._deliempub, -5),
+        }
+
+    # Key space
+
+    def __value(self, key: str) -> Any:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.__delete(key)
+            return None
+        return self._data.get(key)
+
+    def __string(self, key: str) -> Optional[bytes]:
+        value = self.__value(key)
+        if value is not None and not isinstance(value, bytes):
+            raise _CommandError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def __set(self, key: str) -> Optional[Set[bytes]]:
+        value = self.__value(key)
+        if value is not None and not isinstance(value, set):
+            raise _CommandError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def __store(self, key: str, value: Any, keep_ttl: bool = False) -> None:
+        if key not in self._data:
+            self._index.add(key)
+        self._data[key] = value
+        if not keep_ttl:
+            self._expires.pop(key, None)
+        self._modified.append(key)
+
+    def __delete(self, key: str) -> bool:
+        if key not in self._data:
+            return False
+        del self._data[key]
+        self._expires.pop(key, None)
+        self._index.remove(key)
+        self._modified.append(key)
+        return True
+
+    def __live_keys(self, pattern: str, after: Optional[str] = None,
+                    limit: int = 0) -> Tuple[List[str], Optional[str]]:
+        prefix, match = _compile_pattern(pattern)
+        keys = self._index.find_prefix(prefix, after, limit)
+        last = keys[-1] if keys and limit and len(keys) == limit else None
+        now = time.monotonic()
+        keys = [k for k in keys if match is None or match(k)]
+        keys = [k for k in keys if self._expires.get(k, now + 1) > now]
+        return keys, last
+
+    def __expire(self, key: bytes, milliseconds: int) -> int:
+        if self.__value(_key(key)) is None:
+            return 0
+        if milliseconds <= 0:
+            self.__delete(_key(key))
+        else:
+            self._expires[_key(key)] = time.monotonic() + milliseconds / 1000.0
+            self._modified.append(_key(key))
+        return 1
+
+    def __ttl(self, key: bytes, unit: int) -> int:
+        if self.__value(_key(key)) is None:
+            return -2
+        expires = self._expires.get(_key(key))
+        if expires is None:
+            return -1
+        return int(round((expires - time.monotonic()) * 1000)) // unit
+
+    # Connection commands
+
+    def _ping(self, client: _Client, args: List[bytes]) -> Any:
+        if client.subscription_count() and client.protocol == 2:
+            return [b'pong', args[0] if args else b'']
+        return args[0] if args else _PONG
+
+    def _hello(self, client: _Client, args: List[bytes]) -> Any:
+        if args:
+            protocol = _int(args[0])
+            if protocol not in (2, 3):
+                raise _CommandError("NOPROTO unsupported protocol version")
+            client.protocol = protocol
+            for idx, arg in enumerate(args[1:-1], 1):
+                if arg.upper() == b'SETNAME':
+                    client.name = args[idx + 1]
+        return {b'server': b'redis', b'version': REDIS_VERSION.encode(),
+                b'proto': client.protocol, b'id': client.id, b'mode': b'standalone',
+                b'role': b'master', b'modules': []}
+
+    def _quit(self, client: _Client, args: List[bytes]) -> Any:
+        client.closing = True
+        return _OK
+
+    def _reset(self, client: _Client, args: List[bytes]) -> Any:
+        self._unsubscribe(client, [], reply=False)
+        self._punsubscribe(client, [], reply=False)
+        client.multi = None
+        client.tracking = None
+        client.protocol = 2
+        return _Status('RESET')
+
+    def _client(self, client: _Client, args: List[bytes]) -> Any:
+        subcommand = args[0].upper()
+        if subcommand == b'ID':
+            return client.id
+        if subcommand == b'SETNAME' and len(args) == 2:
+            client.name = args[1]
+            return _OK
+        if subcommand == b'GETNAME':
+            return client.name
+        if subcommand == b'TRACKING' and len(args) >= 2:
+            return self.__client_tracking(client, args[1:])
+        raise _CommandError("ERR Unknown subcommand or wrong number of arguments for '{}'".
+                            format(args[0].decode('latin-1')))
+
+    def __client_tracking(self, client: _Client, args: List[bytes]) -> Any:
+        if args[0].upper() == b'OFF':
+            client.tracking = None
+            return _OK
+        if args[0].upper() != b'ON':
+            raise _CommandError("ERR syntax error")
+        redirect = 0
+        bcast = False
+        prefixes = []
+        idx = 1
+        while idx < len(args):
+            option = args[idx].upper()
+            if option == b'REDIRECT' and idx + 1 < len(args):
+                redirect = _int(args[idx + 1])
+                idx += 1
+            elif option == b'PREFIX' and idx + 1 < len(args):
+                prefixes.append(_key(args[idx + 1]))
+                idx += 1
+            elif option == b'BCAST':
+                bcast = True
+            elif option not in (b'NOLOOP', b'OPTIN', b'OPTOUT'):
+                raise _CommandError("ERR syntax error")
+            idx += 1
+        if not bcast:
+            raise _CommandError("ERR Only broadcasting mode of client tracking is supported")
+        if redirect and redirect not in self._clients:
+            raise _CommandError("ERR The client ID you want redirect to does not exist")
+        if client.tracking is None or client.tracking.redirect != redirect:
+            client.tracking = _Tracking(redirect)
+        client.tracking.prefixes.extend(p for p in prefixes or [''] if
+                                        p not in client.tracking.prefixes)
+        return _OK
+
+    def __notify_invalidations(self) -> None:
+        if not self._modified and not self._flushed:
+            return
+        modified = list(dict.fromkeys(self._modified))
+        flushed = self._flushed
+        self._modified = []
+        self._flushed = False
+        for client in list(self._clients.values()):
+            if client.tracking is None:
+                continue
+            if flushed:
+                keys = None  # type: Optional[List[bytes]]
+            else:
+                keys = [k.encode('latin-1') for k in modified
+                        if any(k.startswith(p) for p in client.tracking.prefixes)]
+                if not keys:
+                    continue
+            target = self._clients.get(client.tracking.redirect or client.id)
+            if target is None:
+                continue
+            if target.protocol == 3:
+                target.send(_Push([b'invalidate', keys]))
+            elif INVALIDATE_CHANNEL in target.channels:
+                target.send(_Push([b'message', INVALIDATE_CHANNEL, keys]))
+
+    def _info(self, client: _Client, args: List[bytes]) -> Any:
+        return ('# Server\r\nredis_version:{}\r\nredis_mode:standalone\r\n'
+                '# Clients\r\nconnected_clients:{}\r\n'
+                '# Keyspace\r\ndb0:keys={},expires={}\r\n'.format(
+                    REDIS_VERSION, len(self._clients), len(self._data),
+                    len(self._expires))).encode()
+
+    def _flushall(self, client: _Client, args: List[bytes]) -> Any:
+        self._data.clear()
+        self._expires.clear()
+        self._index.clear()
+        self._modified = []
+        self._flushed = True
+        return _OK
+
+    # String and key commands
+
+    def _get(self, client: _Client, args: List[bytes]) -> Any:
+        return self.__string(_key(args[0]))
+
+    def _set(self, client: _Client, args: List[bytes]) -> Any:
+        key = _key(args[0])
+        condition = None
+        milliseconds = None
+        keep_ttl = False
+        idx = 2
+        while idx < len(args):
+            option = args[idx].upper()
+            if option in (b'NX', b'XX'):
+                condition = option
+            elif option in (b'EX', b'PX') and idx + 1 < len(args):
+                milliseconds = _int(args[idx + 1]) * (1000 if option == b'EX' else 1)
+                if milliseconds <= 0:
+                    raise _CommandError("ERR invalid expire time in 'set' command")
+                idx += 1
+            elif option == b'KEEPTTL':
+                keep_ttl = True
+            else:
+                raise _CommandError("ERR syntax error")
+            idx += 1
+        exists = self.__value(key) is not None
+        if (condition == b'NX' and exists) or (condition == b'XX' and not exists):
+            return None
+        self.__store(key, args[1], keep_ttl)
+        if milliseconds is not None:
+            self._expires[key] = time.monotonic() + milliseconds / 1000.0
+        return _OK
+
+    def _setnx(self, client: _Client, args: List[bytes]) -> Any:
+        if self.__value(_key(args[0])) is not None:
+            return 0
+        self.__store(_key(args[0]), args[1])
+        return 1
+
+    def _mget(self, client: _Client, args: List[bytes]) -> Any:
+        values = []
+        for arg in args:
+            value = self.__value(_key(arg))
+            values.append(value if isinstance(value, bytes) else None)
+        return values
+
+    def _mset(self, client: _Client, args: List[bytes]) -> Any:
+        if len(args) % 2:
+            raise _CommandError("ERR wrong number of arguments for 'mset' command")
+        for idx in range(0, len(args), 2):
+            self.__store(_key(args[idx]), args[idx + 1])
+        return _OK
+
+    def _del(self, client: _Client, args: List[bytes]) -> Any:
+        deleted = 0
+        for arg in args:
+            if self.__value(_key(arg)) is not None:
+                deleted += self.__delete(_key(arg))
+        return deleted
+
+    def _exists(self, client: _Client, args: List[bytes]) -> Any:
+        return sum(1 for arg in args if self.__value(_key(arg)) is not None)
+
+    def _keys(self, client: _Client, args: List[bytes]) -> Any:
+        keys, _ = self.__live_keys(_key(args[0]))
+        return [k.encode('latin-1') for k in keys]
+
+    def _scan(self, client: _Client, args: List[bytes]) -> Any:
+        cursor = _int(args[0])
+        pattern = '*'
+        count = 10
+        idx = 1
+        while idx + 1 < len(args):
+            option = args[idx].upper()
+            if option == b'MATCH':
+                pattern = _key(args[idx + 1])
+            elif option == b'COUNT':
+                count = _int(args[idx + 1])
+                if count < 1:
+                    raise _CommandError("ERR syntax error")
+            elif option != b'TYPE':
+                raise _CommandError("ERR syntax error")
+            idx += 2
+        if idx != len(args):
+            raise _CommandError("ERR syntax error")
+        after = None
+        if cursor:
+            if cursor not in self._scan_cursors:
+                # Iteration has been forgotten, it is finished.
+                return [b'0', []]
+            after = self._scan_cursors.pop(cursor)
+        # Cursor refers to the last scanned key, thus keys present during the whole iteration
+        # are returned regardless of modifications of the key space.
+        keys, last = self.__live_keys(pattern, after, count)
+        next_cursor = 0
+        if last is not None:
+            next_cursor = self._next_cursor
+            self._next_cursor += 1
+            self._scan_cursors[next_cursor] = last
+            if len(self._scan_cursors) > _MAX_SCAN_CURSORS:
+                del self._scan_cursors[next(iter(self._scan_cursors))]
+        return [str(next_cursor).encode(), [k.encode('latin-1') for k in keys]]
+
+    def _pttl(self, client: _Client, args: List[bytes]) -> Any:
+        return self.__ttl(args[0], 1)
+
+    # Set commands
+
+    def _sadd(self, client: _Client, args: List[bytes]) -> Any:
+        key = _key(args[0])
+        members = self.__set(key)
+        new_members = set(args[1:]) - (members or set())
+        if new_members:
+            self.__store(key, (members or set()) | new_members, keep_ttl=True)
+        return len(new_members)
+
+    def _srem(self, client: _Client, args: List[bytes]) -> Any:
+        key = _key(args[0])
+        members = self.__set(key)
+        if not members:
+            return 0
+        removed = members & set(args[1:])
+        if removed:
+            if removed == members:
+                self.__delete(key)
+            else:
+                self.__store(key, members - removed, keep_ttl=True)
+        return len(removed)
+
+    def _smembers(self, client: _Client, args: List[bytes]) -> Any:
+        return set(self.__set(_key(args[0])) or set())
+
+    def _sismember(self, client: _Client, args: List[bytes]) -> Any:
+        return int(args[1] in (self.__set(_key(args[0])) or set()))
+
+    def _scard(self, client: _Client, args: List[bytes]) -> Any:
+        return len(self.__set(_key(args[0])) or set())
+
+    # Pub/sub commands
+
+    def __publish(self, channel: bytes, message: bytes) -> int:
+        receivers = 0
+        for client in self._channels.get(channel, ()):
+            client.send(_Push([b'message', channel, message]))
+            receivers += 1
+        for pattern, clients in self._patterns.items():
+            prefix, match = _compile_pattern(_key(pattern))
+            name = _key(channel)
+            if name.startswith(prefix) and (match is None or match(name)):
+                for client in clients:
+                    client.send(_Push([b'pmessage', pattern, channel, message]))
+                    receivers += 1
+        return receivers
+
+    def __publish_pairs(self, args: List[bytes]) -> None:
+        if len(args) % 2:
+            raise _CommandError("ERR wrong number of arguments for channel and message pairs")
+        for idx in range(0, len(args), 2):
+            self.__publish(args[idx], args[idx + 1])
+
+    def _pubsub(self, client: _Client, args: List[bytes]) -> Any:
+        subcommand = args[0].upper()
+        if subcommand == b'CHANNELS' and len(args) <= 2:
+            channels = sorted(self._channels)
+            if len(args) == 2:
+                prefix, match = _compile_pattern(_key(args[1]))
+                channels = [channel for channel in channels if _key(channel).startswith(prefix)]
+                if match is not None:
+                    channels = [channel for channel in channels if match(_key(channel))]
+            return channels
+        if subcommand == b'NUMSUB':
+            reply = []
+            for channel in args[1:]:
+                reply.extend([channel, len(self._channels.get(channel, ()))])
+            return reply
+        if subcommand == b'NUMPAT' and len(args) == 1:
+            return len(self._patterns)
+        raise _CommandError("ERR Unknown subcommand or wrong number of arguments for '{}'".
+                            format(args[0].decode('latin-1')))
+
+    def _subscribe(self, client: _Client, args: List[bytes]) -> Any:
+        for channel in args:
+            client.channels.add(channel)
+            self._channels.setdefault(channel, set()).add(client)
+            client.send(_Push([b'subscribe', channel, client.subscription_count()]))
+        return _NO_REPLY
+
+    def _unsubscribe(self, client: _Client, args: List[bytes], reply: bool = True) -> Any:
+        channels = args or sorted(client.channels)
+        if not channels and reply:
+            client.send(_Push([b'unsubscribe', None, client.subscription_count()]))
+        for channel in channels:
+            client.channels.discard(channel)
+            self.__unregister(self._channels, channel, client)
+            if reply:
+                client.send(_Push([b'unsubscribe', channel, client.subscription_count()]))
+        return _NO_REPLY
+
+    def _psubscribe(self, client: _Client, args: List[bytes]) -> Any:
+        for pattern in args:
+            client.patterns.add(pattern)
+            self._patterns.setdefault(pattern, set()).add(client)
+            client.send(_Push([b'psubscribe', pattern, client.subscription_count()]))
+        return _NO_REPLY
+
+    def _punsubscribe(self, client: _Client, args: List[bytes], reply: bool = True) -> Any:
+        patterns = args or sorted(client.patterns)
+        if not patterns and reply:
+            client.send(_Push([b'punsubscribe', None, client.subscription_count()]))
+        for pattern in patterns:
+            client.patterns.discard(pattern)
+            self.__unregister(self._patterns, pattern, client)
+            if reply:
+                client.send(_Push([b'punsubscribe', pattern, client.subscription_count()]))
+        return _NO_REPLY
+
+    # Transaction commands
+
+    def _multi(self, client: _Client, args: List[bytes]) -> Any:
+        if client.multi is not None:
+            raise _CommandError("ERR MULTI calls can not be nested")
+        client.multi = []
+        client.multi_error = False
+        return _OK
+
+    def _exec(self, client: _Client, args: List[bytes]) -> Any:
+        if client.multi is None:
+            raise _CommandError("ERR EXEC without MULTI")
+        commands = client.multi
+        client.multi = None
+        if client.multi_error:
+            raise _CommandError("EXECABORT Transaction discarded because of previous errors.")
+        # Commands are executed without giving control to other clients, thus atomically.
+        return [self._execute(client, command) for command in commands]
+
+    def _discard(self, client: _Client, args: List[bytes]) -> Any:
+        if client.multi is None:
+            raise _CommandError("ERR DISCARD without MULTI")
+        client.multi = None
+        return _OK
+
+    # Lua scripts
+
+    def _script(self, client: _Client, args: List[bytes]) -> Any:
+        subcommand = args[0].upper()
+        if subcommand == b'LOAD' and len(args) == 2:
+            sha = hashlib.sha1(args[1]).hexdigest()
+            if sha not in self._scripts:
+                raise _CommandError("ERR Lua scripts are not supported, except the scripts "
+                                    "of SDL and redis-py locks")
+            return sha.encode()
+        if subcommand == b'EXISTS':
+            return [int(arg.decode('latin-1').lower() in self._scripts) for arg in args[1:]]
+        if subcommand == b'FLUSH':
+            return _OK
+        raise _CommandError("ERR Unknown subcommand or wrong number of arguments for '{}'".
+                            format(args[0].decode('latin-1')))
+
+    def _evalsha(self, client: _Client, args: List[bytes]) -> Any:
+        script = self._scripts.get(args[0].decode('latin-1').lower())
+        if script is None:
+            raise _CommandError("NOSCRIPT No matching script. Please use EVAL.")
+        numkeys = _int(args[1])
+        if numkeys < 0 or numkeys > len(args) - 2:
+            raise _CommandError("ERR Number of keys can't be greater than number of args")
+        return script(args[2:2 + numkeys], args[2 + numkeys:])
+
+    def _eval(self, client: _Client, args: List[bytes]) -> Any:
+        sha = hashlib.sha1(args[0]).hexdigest()
+        if sha not in self._scripts:
+            raise _CommandError("ERR Lua scripts are not supported, except the scripts of SDL "
+                                "and redis-py locks")
+        return self._evalsha(client, [sha.encode()] + args[1:])
+
+    def _lua_release(self, keys: List[bytes], argv: List[bytes]) -> Any:
+        if self.__string(_key(keys[0])) != argv[0]:
+            return 0
+        self.__delete(_key(keys[0]))
+        return 1
+
+    def _lua_extend(self, keys: List[bytes], argv: List[bytes]) -> Any:
+        if self.__string(_key(keys[0])) != argv[0]:
+            return 0
+        expiration = self.__ttl(keys[0], 1)
+        if expiration < 0:
+            return 0
+        new_ttl = _int(argv[1])
+        if argv[2] == b'0':
+            new_ttl += expiration
+        return self.__expire(keys[0], new_ttl)
+
+    def _lua_reacquire(self, keys: List[bytes], argv: List[bytes]) -> Any:
+        if self.__string(_key(keys[0])) != argv[0]:
+            return 0
+        return self.__expire(keys[0], _int(argv[1]))
+
+    def _lua_get_validity_time(self, keys: List[bytes], argv: List[bytes]) -> Any:
+        token = self.__string(_key(keys[0]))
+        if token is None:
+            return -10
+        if token != argv[0]:
+            return -11
+        return self.__ttl(keys[0], 1)
+
+    # DBaaS module commands
+
+    def _setie(self, client: _Client, args: List[bytes]) -> Any:
+        key = _key(args[0])
+        if self.__string(key) != args[2]:
+            return None
+        self.__store(key, args[1])
+        return _OK
+
+    def _delie(self, client: _Client, args: List[bytes]) -> Any:
+        key = _key(args[0])
+        if self.__string(key) != args[1]:
+            return 0
+        return int(self.__delete(key))
+
+    @staticmethod
+    def __split_counted_args(args: List[bytes], key_args: int,
+                             min_keys: int = 1) -> Tuple[List[bytes], List[bytes]]:
+        keys_count = _int(args[0])
+        pairs_count = _int(args[1])
+        expected_len = 2 + key_args * keys_count + 2 * pairs_count
+        if keys_count < min_keys or pairs_count < 0 or len(args) != expected_len:
+            raise _CommandError("ERR wrong number of arguments")
+        split = 2 + key_args * keys_count
+        return args[2:split], args[split:]
+
+    def _msetmpub(self, client: _Client, args: List[bytes]) -> Any:
+        data, channels_and_messages = self.__split_counted_args(args, 2)
+        for idx in range(0, len(data), 2):
+            self.__store(_key(data[idx]), data[idx + 1])
+        self.__publish_pairs(channels_and_messages)
+        return _OK
+
+    def _setiempub(self, client: _Client, args: List[bytes]) -> Any:
+        if len(args) % 2 == 0:
+            raise _CommandError("ERR wrong number of arguments for 'setiempub' command")
+        if self._setie(client, args[:3]) is None:
+            return None
+        self.__publish_pairs(args[3:])
+        return _OK
+
+    def _setnxmpub(self, client: _Client, args: List[bytes]) -> Any:
+        if len(args) % 2:
+            raise _CommandError("ERR wrong number of arguments for 'setnxmpub' command")
+        if not self._setnx(client, args[:2]):
+            return None
+        self.__publish_pairs(args[2:])
+        return _OK
+
+    def _delmpub(self, client: _Client, args: List[bytes]) -> Any:
+        # SDL removes all the keys of an empty namespace with zero keys.
+        keys, channels_and_messages = self.__split_counted_args(args, 1, min_keys=0)
+        deleted = self._del(client, keys)
+        if deleted:
+            self.__publish_pairs(channels_and_messages)
+        return deleted
+
+    def _deliempub(self, client: _Client, args: List[bytes]) -> Any:
+        if len(args) % 2:
+            raise _CommandError("ERR wrong number of arguments for 'deliempub' command")
+        if not self._delie(client, args[:2]):
+            return 0
+        self.__publish_pairs(args[2:])
+        return 1
+
+
+def main():
+    """Run the server as a standalone process."""
+    parser = argparse.ArgumentParser(
+        description="In-process stand-in of a Redis server with DBaaS module commands for SDL "
+                    "testing and benchmarking.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen")
+    parser.add_argument('--port', type=int, default=6379, help="Port to listen")
+    args = parser.parse_args()
+
+    async def serve():
+        server = FakeRedisServer(args.host, args.port)
+        await server.start_serving()
+        print('Listening {}:{}'.format(server.host, server.port), flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
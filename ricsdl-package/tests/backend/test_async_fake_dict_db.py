@@ -0,0 +1,199 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+import asyncio
+from unittest.mock import Mock
+import pytest
+import ricsdl.backend
+from ricsdl.configuration import _Configuration
+from ricsdl.configuration import DbBackendType
+import ricsdl.exceptions
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture()
+def async_fake_dict_backend_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.dm = {'abc': b'1', 'bcd': b'2'}
+    request.cls.key = 'abc'
+    request.cls.keys = ['abc', 'bcd']
+    request.cls.old_data = b'1'
+    request.cls.new_data = b'3'
+    request.cls.keypattern = r'*bc*'
+    request.cls.group = 'some-group'
+    request.cls.groupmember = b'm1'
+    request.cls.groupmembers = set([b'm1', b'm2'])
+    request.cls.channels = ['abs', 'gma']
+    request.cls.channels_and_events = {'abs': ['cbn']}
+
+    request.cls.configuration = Mock()
+    mock_conf_params = _Configuration.Params(db_host=None,
+                                             db_ports=None,
+                                             db_sentinel_ports=None,
+                                             db_sentinel_master_names=None,
+                                             db_cluster_addrs=None,
+                                             db_type=DbBackendType.FAKE_DICT)
+    request.cls.configuration.get_params.return_value = mock_conf_params
+    request.cls.db = ricsdl.backend.get_async_backend_instance(request.cls.configuration)
+
+
+@pytest.mark.usefixtures('async_fake_dict_backend_fixture')
+class TestAsyncFakeDictBackend:
+    def test_is_connected_function_success(self):
+        assert run(self.db.is_connected()) is True
+
+    def test_set_and_get_function_success(self):
+        run(self.db.set(self.ns, self.dm))
+        assert run(self.db.get(self.ns, self.keys)) == self.dm
+
+    def test_set_if_function_success(self):
+        run(self.db.set(self.ns, self.dm))
+        assert run(self.db.set_if(self.ns, self.key, self.old_data, self.new_data)) is True
+        assert run(self.db.set_if(self.ns, self.key, self.old_data, self.new_data)) is False
+        assert run(self.db.get(self.ns, [self.key])) == {self.key: self.new_data}
+
+    def test_set_if_not_exists_function_success(self):
+        assert run(self.db.set_if_not_exists(self.ns, self.key, self.new_data)) is True
+        assert run(self.db.set_if_not_exists(self.ns, self.key, self.new_data)) is False
+
+    def test_find_keys_and_find_and_get_function_success(self):
+        run(self.db.set(self.ns, self.dm))
+        assert run(self.db.find_keys(self.ns, self.keypattern)) == self.keys
+        assert run(self.db.find_and_get(self.ns, self.keypattern)) == self.dm
+
+    def test_remove_and_remove_if_function_success(self):
+        run(self.db.set(self.ns, self.dm))
+        run(self.db.remove(self.ns, [self.keys[1]]))
+        assert run(self.db.remove_if(self.ns, self.key, self.new_data)) is False
+        assert run(self.db.remove_if(self.ns, self.key, self.old_data)) is True
+        assert run(self.db.get(self.ns, self.keys)) == {}
+
+    def test_group_functions_success(self):
+        run(self.db.add_member(self.ns, self.group, self.groupmembers))
+        assert run(self.db.get_members(self.ns, self.group)) == self.groupmembers
+        assert run(self.db.is_member(self.ns, self.group, self.groupmember)) is True
+        assert run(self.db.group_size(self.ns, self.group)) == 2
+        run(self.db.remove_member(self.ns, self.group, {self.groupmember}))
+        assert run(self.db.group_size(self.ns, self.group)) == 1
+        run(self.db.remove_group(self.ns, self.group))
+        assert run(self.db.group_size(self.ns, self.group)) == 0
+
+    def test_publish_functions_success(self):
+        async def _publish_and_handle():
+            cb = Mock()
+            await self.db.subscribe_channel(self.ns, cb, self.channels)
+            await self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+            assert await self.db.set_if_and_publish(self.ns, self.channels_and_events, self.key,
+                                                    self.old_data, self.new_data) is True
+            assert await self.db.set_if_not_exists_and_publish(self.ns,
+                                                               self.channels_and_events,
+                                                               'new', self.new_data) is True
+            assert await self.db.remove_if_and_publish(self.ns, self.channels_and_events,
+                                                       'new', self.new_data) is True
+            await self.db.remove_and_publish(self.ns, self.channels_and_events, [self.key])
+            await self.db.remove_all_and_publish(self.ns, self.channels_and_events)
+            events = []
+            while True:
+                ret = await self.db.handle_events()
+                if ret is None:
+                    break
+                events.append(ret)
+            assert events == [('abs', ['cbn'])] * 6
+            assert cb.call_count == 6
+            assert await self.db.get(self.ns, self.keys) == {}
+        run(_publish_and_handle())
+
+    def test_start_event_listener_calls_coroutine_callbacks(self):
+        async def _listen():
+            received = []
+
+            async def cb(channel, events):
+                received.append((channel, events))
+
+            await self.db.subscribe_channel(self.ns, cb, self.channels)
+            await self.db.start_event_listener()
+            await self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+            await asyncio.sleep(0.01)
+            await self.db.close()
+            return received
+        assert run(_listen()) == [('abs', ['cbn'])]
+
+    def test_start_event_listener_fail(self):
+        async def _start_twice():
+            await self.db.subscribe_channel(self.ns, Mock(), self.channels)
+            await self.db.start_event_listener()
+            try:
+                await self.db.start_event_listener()
+            finally:
+                await self.db.close()
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(_start_twice())
+
+    def test_handle_events_fail_if_event_listener_is_running(self):
+        async def _handle():
+            await self.db.start_event_listener()
+            await self.db.handle_events()
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(_handle())
+
+    def test_fake_dict_backend_object_string_representation(self):
+        assert str(self.db) is not None
+
+
+@pytest.fixture()
+def async_fake_dict_backend_lock_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.lockname = 'some-lock-name'
+    request.cls.expiration = 10
+    request.cls.retry_interval = 0.1
+    request.cls.retry_timeout = 1
+
+    request.cls.configuration = Mock()
+    mock_conf_params = _Configuration.Params(db_host=None,
+                                             db_ports=None,
+                                             db_sentinel_ports=None,
+                                             db_sentinel_master_names=None,
+                                             db_cluster_addrs=None,
+                                             db_type=DbBackendType.FAKE_DICT)
+    request.cls.configuration.get_params.return_value = mock_conf_params
+    request.cls.lock = ricsdl.backend.get_async_backend_lock_instance(request.cls.configuration,
+                                                                      request.cls.ns,
+                                                                      request.cls.lockname,
+                                                                      request.cls.expiration,
+                                                                      Mock())
+
+
+@pytest.mark.usefixtures('async_fake_dict_backend_lock_fixture')
+class TestAsyncFakeDictBackendLock:
+    def test_acquire_and_release_function_success(self):
+        assert run(self.lock.acquire(self.retry_interval, self.retry_timeout)) is True
+        assert run(self.lock.acquire(self.retry_interval, self.retry_timeout)) is False
+        run(self.lock.release())
+        assert run(self.lock.acquire(self.retry_interval, self.retry_timeout)) is True
+
+    def test_refresh_and_get_validity_time_function_success(self):
+        run(self.lock.refresh())
+        assert run(self.lock.get_validity_time()) == self.expiration
+
+    def test_fake_dict_backend_lock_object_string_representation(self):
+        assert str(self.lock) is not None
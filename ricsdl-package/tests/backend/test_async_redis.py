@@ -0,0 +1,480 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import asyncio
+from unittest.mock import patch, Mock, AsyncMock, call, ANY
+import pytest
+from redis import exceptions as redis_exceptions
+import ricsdl.backend
+from ricsdl.asyncstorage import AsyncStorage
+from ricsdl.backend.async_redis import AsyncPubSub
+from ricsdl.configuration import _Configuration
+from ricsdl.configuration import DbBackendType
+from ricsdl.configuration import DbReadPreference
+import ricsdl.exceptions
+from tests.backend.fake_redis_server import FakeRedisServer
+
+EVENT_SEPARATOR = "___"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def get_test_sdl_standby_config():
+    return _Configuration.Params(db_host='service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                 db_ports=['6379'],
+                                 db_sentinel_ports=[],
+                                 db_sentinel_master_names=[],
+                                 db_cluster_addrs=['service-ricplt-dbaas-tcp-cluster-0.ricplt'],
+                                 db_type=DbBackendType.REDIS)
+
+
+def get_test_sdl_sentinel_config():
+    return _Configuration.Params(db_host='service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                 db_ports=['6379'],
+                                 db_sentinel_ports=['26379'],
+                                 db_sentinel_master_names=['dbaasmaster'],
+                                 db_cluster_addrs=['service-ricplt-dbaas-tcp-cluster-0.ricplt'],
+                                 db_type=DbBackendType.REDIS)
+
+
+def _async_redis_mock():
+    mock = AsyncMock()
+    mock.set_response_callback = Mock()
+    mock.register_script = Mock()
+    return mock
+
+
+@pytest.fixture(params=['standalone', 'sentinel'])
+def async_redis_backend_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.dm = {'a': b'1', 'b': b'2'}
+    request.cls.dm_redis = {b'{some-ns},a': b'1', b'{some-ns},b': b'2'}
+    request.cls.dm_redis_flat = [b'{some-ns},a', b'1', b'{some-ns},b', b'2']
+    request.cls.key = 'a'
+    request.cls.key_redis = b'{some-ns},a'
+    request.cls.keys = ['a', 'b']
+    request.cls.keys_redis = [b'{some-ns},a', b'{some-ns},b']
+    request.cls.data = b'123'
+    request.cls.old_data = b'1'
+    request.cls.new_data = b'3'
+    request.cls.keypattern = r'[Aa]bc-\[1\].?-*'
+    request.cls.keypattern_redis = rb'{some-ns},[Aa]bc-\[1\].?-*'
+    request.cls.matchedkeys = ['Abc-[1].0-def', 'abc-[1].1-ghi']
+    request.cls.matchedkeys_redis = [b'{some-ns},Abc-[1].0-def',
+                                     b'{some-ns},abc-[1].1-ghi']
+    request.cls.matcheddata_redis = [b'10', b'11']
+    request.cls.matchedkeydata = {'Abc-[1].0-def': b'10',
+                                  'abc-[1].1-ghi': b'11'}
+    request.cls.group = 'some-group'
+    request.cls.group_redis = b'{some-ns},some-group'
+    request.cls.groupmembers = set([b'm1', b'm2'])
+    request.cls.groupmember = b'm1'
+    request.cls.channels = ['ch1', 'ch2']
+    request.cls.channels_and_events = {'ch1': ['ev1'], 'ch2': ['ev2', 'ev3']}
+    request.cls.channels_and_events_redis = [b'{some-ns},ch1', 'ev1',
+                                             b'{some-ns},ch2', 'ev2' + EVENT_SEPARATOR + 'ev3']
+
+    request.cls.configuration = Mock()
+    request.cls.configuration.get_event_separator.return_value = EVENT_SEPARATOR
+    if request.param == 'standalone':
+        cfg = get_test_sdl_standby_config()
+        request.cls.configuration.get_params.return_value = cfg
+        with patch('ricsdl.backend.async_redis.Redis') as mock_redis, patch(
+                   'ricsdl.backend.async_redis.BlockingConnectionPool') as mock_pool, patch(
+                   'ricsdl.backend.async_redis.AsyncPubSub') as mock_pubsub:
+            mock_redis.return_value = _async_redis_mock()
+            mock_pubsub.return_value = AsyncMock()
+            db = ricsdl.backend.get_async_backend_instance(request.cls.configuration)
+            request.cls.mock_redis = mock_redis.return_value
+            request.cls.mock_pubsub = mock_pubsub.return_value
+        mock_pool.assert_called_once_with(db=0, host=cfg.db_host, max_connections=20,
+                                          port=cfg.db_ports[0])
+        mock_redis.assert_called_once_with(connection_pool=mock_pool.return_value)
+    else:
+        cfg = get_test_sdl_sentinel_config()
+        request.cls.configuration.get_params.return_value = cfg
+        with patch('ricsdl.backend.async_redis.Sentinel') as mock_sentinel, patch(
+                   'ricsdl.backend.async_redis.AsyncPubSub') as mock_pubsub:
+            mock_sentinel.return_value.master_for.return_value = _async_redis_mock()
+            mock_pubsub.return_value = AsyncMock()
+            db = ricsdl.backend.get_async_backend_instance(request.cls.configuration)
+            request.cls.mock_redis = mock_sentinel.return_value.master_for.return_value
+            request.cls.mock_pubsub = mock_pubsub.return_value
+        mock_sentinel.assert_called_once_with([(cfg.db_host, cfg.db_sentinel_ports[0])])
+        mock_sentinel.return_value.master_for.assert_called_once_with(
+            cfg.db_sentinel_master_names[0])
+    mock_pubsub.assert_called_once_with(EVENT_SEPARATOR, request.cls.mock_redis.connection_pool,
+                                        ignore_subscribe_messages=True)
+    assert request.cls.mock_redis.set_response_callback.call_args_list == [call('SETIE', ANY),
+                                                                           call('DELIE', ANY)]
+    request.cls.db = db
+    yield
+
+
+@pytest.mark.usefixtures('async_redis_backend_fixture')
+class TestAsyncRedisBackend:
+    def test_is_connected_function_success(self):
+        self.mock_redis.ping.return_value = True
+        assert run(self.db.is_connected()) is True
+        self.mock_redis.ping.assert_awaited_once()
+
+    def test_is_connected_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.ping.side_effect = redis_exceptions.ResponseError('redis error!')
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.db.is_connected())
+
+    def test_close_function_success(self):
+        run(self.db.close())
+        self.mock_pubsub.close.assert_awaited_once()
+        self.mock_redis.close.assert_awaited_once()
+
+    def test_set_function_success(self):
+        run(self.db.set(self.ns, self.dm))
+        self.mock_redis.mset.assert_awaited_once_with(self.dm_redis)
+
+    def test_set_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.mset.side_effect = redis_exceptions.ConnectionError('redis error!')
+        with pytest.raises(ricsdl.exceptions.NotConnected):
+            run(self.db.set(self.ns, self.dm))
+
+    def test_set_if_function_success(self):
+        self.mock_redis.execute_command.return_value = True
+        ret = run(self.db.set_if(self.ns, self.key, self.old_data, self.new_data))
+        self.mock_redis.execute_command.assert_awaited_once_with('SETIE', self.key_redis,
+                                                                 self.new_data, self.old_data)
+        assert ret is True
+
+    def test_set_if_not_exists_function_success(self):
+        self.mock_redis.setnx.return_value = True
+        ret = run(self.db.set_if_not_exists(self.ns, self.key, self.new_data))
+        self.mock_redis.setnx.assert_awaited_once_with(self.key_redis, self.new_data)
+        assert ret is True
+
+    def test_get_function_success(self):
+        self.mock_redis.mget.return_value = [b'1', None]
+        ret = run(self.db.get(self.ns, self.keys))
+        self.mock_redis.mget.assert_awaited_once_with(self.keys_redis)
+        assert ret == {'a': b'1'}
+
+    def test_find_keys_function_success(self):
+        self.mock_redis.keys.return_value = self.matchedkeys_redis
+        ret = run(self.db.find_keys(self.ns, self.keypattern))
+        self.mock_redis.keys.assert_awaited_once_with(self.keypattern_redis)
+        assert ret == self.matchedkeys
+
+    def test_find_keys_function_can_raise_exception_when_redis_key_convert_to_string_fails(self):
+        self.mock_redis.keys.return_value = [b'\x81']
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.db.find_keys(self.ns, self.keypattern))
+
+    def test_find_and_get_function_success(self):
+        self.mock_redis.keys.return_value = self.matchedkeys_redis
+        self.mock_redis.mget.return_value = self.matcheddata_redis
+        ret = run(self.db.find_and_get(self.ns, self.keypattern))
+        self.mock_redis.mget.assert_awaited_once_with(self.matchedkeys_redis)
+        assert ret == self.matchedkeydata
+
+    def test_remove_function_success(self):
+        run(self.db.remove(self.ns, self.keys))
+        self.mock_redis.delete.assert_awaited_once_with(*self.keys_redis)
+
+    def test_remove_if_function_success(self):
+        self.mock_redis.execute_command.return_value = True
+        ret = run(self.db.remove_if(self.ns, self.key, self.new_data))
+        self.mock_redis.execute_command.assert_awaited_once_with('DELIE', self.key_redis,
+                                                                 self.new_data)
+        assert ret is True
+
+    def test_group_functions_success(self):
+        run(self.db.add_member(self.ns, self.group, self.groupmembers))
+        self.mock_redis.sadd.assert_awaited_once_with(self.group_redis, *self.groupmembers)
+        run(self.db.remove_member(self.ns, self.group, self.groupmembers))
+        self.mock_redis.srem.assert_awaited_once_with(self.group_redis, *self.groupmembers)
+        self.mock_redis.smembers.return_value = self.groupmembers
+        assert run(self.db.get_members(self.ns, self.group)) == self.groupmembers
+        self.mock_redis.sismember.return_value = True
+        assert run(self.db.is_member(self.ns, self.group, self.groupmember)) is True
+        self.mock_redis.scard.return_value = 2
+        assert run(self.db.group_size(self.ns, self.group)) == 2
+        run(self.db.remove_group(self.ns, self.group))
+        self.mock_redis.delete.assert_awaited_once_with(self.group_redis)
+
+    def test_set_and_publish_success(self):
+        run(self.db.set_and_publish(self.ns, self.channels_and_events, self.dm))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'MSETMPUB', len(self.dm), len(self.channels_and_events), *self.dm_redis_flat,
+            *self.channels_and_events_redis)
+
+    def test_set_if_and_publish_success(self):
+        self.mock_redis.execute_command.return_value = b"OK"
+        ret = run(self.db.set_if_and_publish(self.ns, self.channels_and_events, self.key,
+                                             self.old_data, self.new_data))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'SETIEMPUB', self.key_redis, self.new_data, self.old_data,
+            *self.channels_and_events_redis)
+        assert ret is True
+
+    def test_set_if_not_exists_and_publish_success(self):
+        self.mock_redis.execute_command.return_value = b"OK"
+        ret = run(self.db.set_if_not_exists_and_publish(self.ns, self.channels_and_events,
+                                                        self.key, self.new_data))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'SETNXMPUB', self.key_redis, self.new_data, *self.channels_and_events_redis)
+        assert ret is True
+
+    def test_remove_and_publish_success(self):
+        run(self.db.remove_and_publish(self.ns, self.channels_and_events, self.keys))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'DELMPUB', len(self.keys), len(self.channels_and_events), *self.keys_redis,
+            *self.channels_and_events_redis)
+
+    def test_remove_if_and_publish_success(self):
+        self.mock_redis.execute_command.return_value = 1
+        ret = run(self.db.remove_if_and_publish(self.ns, self.channels_and_events, self.key,
+                                                self.new_data))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'DELIEMPUB', self.key_redis, self.new_data, *self.channels_and_events_redis)
+        assert ret is True
+
+    def test_remove_all_and_publish_success(self):
+        self.mock_redis.keys.return_value = self.keys_redis
+        run(self.db.remove_all_and_publish(self.ns, self.channels_and_events))
+        self.mock_redis.execute_command.assert_awaited_once_with(
+            'DELMPUB', len(self.keys), len(self.channels_and_events), *self.keys_redis,
+            *self.channels_and_events_redis)
+
+    def test_subscribe_channel_success(self):
+        cb = Mock()
+        run(self.db.subscribe_channel(self.ns, cb, self.channels))
+        self.mock_pubsub.subscribe.assert_awaited_once_with(**{'{some-ns},ch1': cb,
+                                                               '{some-ns},ch2': cb})
+
+    def test_unsubscribe_channel_success(self):
+        run(self.db.unsubscribe_channel(self.ns, [self.channels[0]]))
+        self.mock_pubsub.unsubscribe.assert_awaited_once_with('{some-ns},ch1')
+
+    def test_start_event_listener_creates_listener_task(self):
+        async def _wait_for_message(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        async def _start_and_stop():
+            self.mock_pubsub.subscribed = True
+            self.mock_pubsub.get_message.side_effect = _wait_for_message
+            await self.db.start_event_listener()
+            assert self.db.clients[0].pubsub_task is not None
+            await asyncio.sleep(0)
+            await self.db.close()
+            assert self.db.clients[0].pubsub_task is None
+        run(_start_and_stop())
+        self.mock_pubsub.get_message.assert_awaited()
+
+    def test_start_event_listener_fail(self):
+        self.db.clients[0].pubsub_task = Mock()
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.db.start_event_listener())
+
+    def test_handle_events_success(self):
+        self.mock_pubsub.get_message.return_value = ('ch1', ['ev1'])
+        ret = run(self.db.handle_events())
+        self.mock_pubsub.get_message.assert_awaited_once_with(ignore_subscribe_messages=True)
+        assert ret == ('ch1', ['ev1'])
+
+    def test_handle_events_returns_none_if_no_subscriptions(self):
+        self.mock_pubsub.get_message.side_effect = RuntimeError
+        assert run(self.db.handle_events()) is None
+
+    def test_handle_events_fail_if_event_listener_is_running(self):
+        self.db.clients[0].run_in_task = True
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.db.handle_events())
+
+    def test_redis_backend_object_string_representation(self):
+        str_out = str(self.db)
+        assert str_out is not None
+
+
+def test_async_redis_clients_use_configured_connection_options():
+    mock_cfg = Mock()
+    mock_cfg.get_event_separator.return_value = EVENT_SEPARATOR
+    mock_cfg.get_params.return_value = get_test_sdl_sentinel_config()._replace(
+        db_pool_blocking=True, db_pool_timeout=5.0, db_socket_keepalive=True)
+    with patch('ricsdl.backend.async_redis.Sentinel') as mock_sentinel, patch(
+            'ricsdl.backend.async_redis.AsyncPubSub'):
+        mock_sentinel.return_value.master_for.return_value = _async_redis_mock()
+        ricsdl.backend.get_async_backend_instance(mock_cfg)
+    mock_sentinel.assert_called_once_with([('service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                            '26379')], socket_keepalive=True)
+    mock_sentinel.return_value.master_for.assert_called_once_with(
+        'dbaasmaster', max_connections=20, timeout=5.0,
+        connection_pool_class=ricsdl.backend.async_redis._AsyncBlockingSentinelConnectionPool)
+
+
+@pytest.mark.parametrize('read_preference', [DbReadPreference.REPLICA_PREFERRED,
+                                             DbReadPreference.REPLICA])
+def test_async_redis_read_functions_read_from_replica(read_preference):
+    mock_cfg = Mock()
+    mock_cfg.get_event_separator.return_value = EVENT_SEPARATOR
+    mock_cfg.get_params.return_value = get_test_sdl_sentinel_config()._replace(
+        db_read_preference=read_preference)
+    with patch('ricsdl.backend.async_redis.Sentinel') as mock_sentinel, patch(
+            'ricsdl.backend.async_redis.AsyncPubSub'):
+        mock_master = _async_redis_mock()
+        mock_replica = _async_redis_mock()
+        mock_sentinel.return_value.master_for.return_value = mock_master
+        mock_sentinel.return_value.slave_for.return_value = mock_replica
+        db = ricsdl.backend.get_async_backend_instance(mock_cfg)
+    mock_sentinel.return_value.slave_for.assert_called_once_with('dbaasmaster')
+    mock_replica.mget.return_value = [b'1']
+    mock_replica.scard.return_value = 2
+    assert run(db.get('some-ns', ['a'])) == {'a': b'1'}
+    assert run(db.group_size('some-ns', 'some-group')) == 2
+    assert not mock_master.mget.called
+    assert not mock_master.scard.called
+
+    mock_replica.mget.side_effect = redis_exceptions.ConnectionError('replica down')
+    mock_master.mget.return_value = [b'2']
+    if read_preference == DbReadPreference.REPLICA_PREFERRED:
+        assert run(db.get('some-ns', ['a'])) == {'a': b'2'}
+    else:
+        with pytest.raises(ricsdl.exceptions.NotConnected):
+            run(db.get('some-ns', ['a']))
+
+
+def test_async_redis_backend_can_raise_exception_with_redis_cluster():
+    mock_cfg = Mock()
+    mock_cfg.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_type=DbBackendType.REDIS_CLUSTER)
+    with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+        ricsdl.backend.get_async_backend_instance(mock_cfg)
+
+
+def test_async_pubsub_handle_message_calls_sync_and_coroutine_callbacks():
+    received = []
+
+    def cb(channel, events):
+        received.append((channel, events))
+
+    async def async_cb(channel, events):
+        received.append((channel, events))
+
+    pubsub = AsyncPubSub(EVENT_SEPARATOR, Mock(), ignore_subscribe_messages=True)
+    pubsub.channels = {b'{some-ns},ch1': cb, b'{some-ns},ch2': async_cb}
+    ret1 = run(pubsub.handle_message([b'message', b'{some-ns},ch1', b'ev1']))
+    ret2 = run(pubsub.handle_message([b'message', b'{some-ns},ch2',
+                                      b'ev2' + EVENT_SEPARATOR.encode() + b'ev3']))
+    assert ret1 == ('ch1', ['ev1'])
+    assert ret2 == ('ch2', ['ev2', 'ev3'])
+    assert received == [('ch1', ['ev1']), ('ch2', ['ev2', 'ev3'])]
+
+
+def test_async_pubsub_handle_message_ignores_subscribe_messages():
+    pubsub = AsyncPubSub(EVENT_SEPARATOR, Mock(), ignore_subscribe_messages=True)
+    assert run(pubsub.handle_message([b'subscribe', b'{some-ns},ch1', 1])) is None
+    assert run(pubsub.handle_message([b'pong', b''])) is None
+
+
+@pytest.fixture()
+def async_redis_backend_lock_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.lockname = 'some-lock-name'
+    request.cls.lockname_redis = '{some-ns},some-lock-name'
+    request.cls.expiration = 10
+    request.cls.retry_interval = 0.1
+    request.cls.retry_timeout = 1
+
+    request.cls.mock_lua_get_validity_time = AsyncMock()
+    request.cls.mock_redis_backend = Mock()
+    request.cls.mock_redis_backend.get_redis_connection.return_value.register_script.return_value \
+        = request.cls.mock_lua_get_validity_time
+    with patch('ricsdl.backend.async_redis.Lock') as mock_redis_lock:
+        mock_redis_lock.return_value = AsyncMock()
+        lock = ricsdl.backend.get_async_backend_lock_instance(Mock(), request.cls.ns,
+                                                              request.cls.lockname,
+                                                              request.cls.expiration,
+                                                              request.cls.mock_redis_backend)
+        request.cls.mock_redis_lock = mock_redis_lock.return_value
+    request.cls.lock = lock
+    yield
+
+
+@pytest.mark.usefixtures('async_redis_backend_lock_fixture')
+class TestAsyncRedisBackendLock:
+    def test_acquire_function_success(self):
+        self.mock_redis_lock.acquire.return_value = True
+        ret = run(self.lock.acquire(self.retry_interval, self.retry_timeout))
+        self.mock_redis_lock.acquire.assert_awaited_once_with(blocking_timeout=self.retry_timeout)
+        assert ret is True
+
+    def test_acquire_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis_lock.acquire.side_effect = redis_exceptions.LockError('redis lock error!')
+        with pytest.raises(ricsdl.exceptions.BackendError):
+            run(self.lock.acquire(self.retry_interval, self.retry_timeout))
+
+    def test_release_function_success(self):
+        run(self.lock.release())
+        self.mock_redis_lock.release.assert_awaited_once()
+
+    def test_refresh_function_success(self):
+        run(self.lock.refresh())
+        self.mock_redis_lock.reacquire.assert_awaited_once()
+
+    def test_get_validity_time_function_success(self):
+        self.mock_redis_lock.name = self.lockname_redis
+        self.mock_redis_lock.local.token = 123
+        self.mock_lua_get_validity_time.return_value = 234
+        ret = run(self.lock.get_validity_time())
+        assert ret == 0.234
+
+    def test_get_validity_time_function_can_raise_exception_if_lock_is_unlocked(self):
+        self.mock_redis_lock.local.token = None
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.lock.get_validity_time())
+
+    def test_get_validity_time_function_can_raise_exception_if_lua_script_fails(self):
+        self.mock_redis_lock.local.token = 123
+        self.mock_lua_get_validity_time.return_value = -10
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            run(self.lock.get_validity_time())
+
+
+def test_async_storage_operations_exceeding_pool_size_wait_for_connection(monkeypatch):
+    for name in ('DBAAS_SERVICE_SENTINEL_PORT', 'DBAAS_MASTER_NAME', 'DBAAS_CLUSTER_ADDR_LIST',
+                 'SDL_DB_REDIS_CLUSTER'):
+        monkeypatch.delenv(name, raising=False)
+    server = FakeRedisServer()
+    server.start()
+    monkeypatch.setenv('DBAAS_SERVICE_HOST', server.host)
+    monkeypatch.setenv('DBAAS_SERVICE_PORT', str(server.port))
+
+    async def use_storage():
+        sdl = AsyncStorage(db_connection_options={'db_max_connections': 2})
+        try:
+            await sdl.set('some-ns', {'a': b'1'})
+            return await asyncio.gather(*(sdl.get('some-ns', {'a'}) for _ in range(50)))
+        finally:
+            await sdl.close()
+
+    try:
+        assert run(use_storage()) == [{'a': b'1'}] * 50
+    finally:
+        server.stop()
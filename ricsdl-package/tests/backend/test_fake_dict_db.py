@@ -19,12 +19,15 @@
 #
 
 import queue
+import threading
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 import pytest
 import ricsdl.backend
 from ricsdl.configuration import _Configuration
 from ricsdl.configuration import DbBackendType
+from ricsdl.configuration import EventQueueOverflow
+import ricsdl.exceptions
 
 
 @pytest.fixture()
@@ -106,21 +109,66 @@ def test_find_keys_function_returns_empty_list_when_no_matching_keys_found(self)
         ret = self.db.find_keys(self.ns, self.keypattern)
         assert ret == []
 
+    def test_find_keys_function_finds_keys_by_prefix_in_sorted_order(self):
+        self.db.set(self.ns, {'cell_2': b'2', 'ue_1': b'3', 'cell_1': b'1', 'cell': b'4'})
+        self.db.remove(self.ns, ['cell_2'])
+        self.db.set(self.ns, {'cell_3': b'5'})
+        assert self.db.find_keys(self.ns, 'cell_*') == ['cell_1', 'cell_3']
+        assert self.db.find_keys(self.ns, 'cell?[13]') == ['cell_1', 'cell_3']
+        assert self.db.find_keys(self.ns, 'cell') == ['cell']
+        assert self.db.find_keys(self.ns, '*_1') == ['cell_1', 'ue_1']
+        assert self.db.find_keys(self.ns, '*') == ['cell', 'cell_1', 'cell_3', 'ue_1']
+
+    def test_keys_are_stored_under_namespace(self):
+        self.db.set(self.ns, self.dm)
+        self.db.set('other-ns', self.dm2)
+        self.db.add_member('other-ns', self.group, self.groupmembers)
+        assert self.db.get('other-ns', self.keys) == dict()
+        assert self.db.find_keys(self.ns, '*') == self.keys
+        assert self.db.group_size(self.ns, self.group) == 0
+        self.db.remove_all_and_publish('other-ns', {})
+        assert self.db.get(self.ns, self.keys) == self.dm
+        assert self.db.find_keys('other-ns', '*') == []
+
     def test_find_and_get_function_success(self):
         self.db.set(self.ns, self.dm)
         ret = self.db.find_and_get(self.ns, self.keypattern)
         assert ret == self.dm
 
+    def test_find_and_get_function_ordered_returns_sorted_dict(self):
+        self.db.set(self.ns, dict(reversed(list(self.dm.items()))))
+        ret = self.db.find_and_get(self.ns, self.keypattern, ordered=True)
+        assert ret == self.dm
+        assert list(ret) == sorted(self.dm)
+
     def test_find_and_get_function_returns_empty_dict_when_no_matching_keys_exist(self):
         ret = self.db.find_and_get(self.ns, self.keypattern)
         assert ret == dict()
 
+    def test_iter_keys_function_success(self):
+        self.db.set(self.ns, self.dm)
+        ret = list(self.db.iter_keys(self.ns, self.keypattern, 1))
+        assert ret == self.keys
+
+    def test_iter_items_function_success(self):
+        self.db.set(self.ns, self.dm)
+        ret = dict(self.db.iter_items(self.ns, self.keypattern, 1))
+        assert ret == self.dm
+
     def test_remove_function_success(self):
         self.db.set(self.ns, self.dm)
         self.db.remove(self.ns, self.keys)
         ret = self.db.get(self.ns, self.keys)
         assert ret == dict()
 
+    def test_remove_all_in_batches_function_success(self):
+        progress_cb = Mock()
+        self.db.set(self.ns, self.dm)
+        ret = self.db.remove_all_in_batches(self.ns, 1, progress_cb)
+        assert ret == len(self.dm)
+        assert self.db.find_keys(self.ns, '*') == []
+        progress_cb.assert_has_calls([call(1), call(2)])
+
     def test_remove_if_function_success(self):
         self.db.set(self.ns, self.dm)
         ret = self.db.remove_if(self.ns, self.key, self.old_data)
@@ -275,6 +323,68 @@ def test_listen(self):
         time.sleep(0.5)
         assert self.db._queue.qsize() == 0
 
+    def test_listen_drains_queued_events_in_order(self):
+        cb = Mock()
+        self.db.subscribe_channel(self.ns, cb, self.channels)
+        for idx in range(150):
+            self.db.set_and_publish(self.ns, {'abs': [str(idx)]}, self.dm)
+        self.db.start_event_listener()
+        time.sleep(0.5)
+        assert cb.call_args_list == [call('abs', [str(idx)]) for idx in range(150)]
+
+    def test_listen_delivers_drained_events_to_batch_callback_at_once(self):
+        batch_cb = Mock()
+        self.db.subscribe_channel_batch(self.ns, batch_cb, self.channels)
+        for idx in range(150):
+            self.db.set_and_publish(self.ns, {'abs': [str(idx)]}, self.dm)
+        self.db.start_event_listener()
+        time.sleep(0.5)
+        assert batch_cb.call_count == 2
+        events = [event for args in batch_cb.call_args_list for event in args[0][0]]
+        assert events == [('abs', [str(idx)]) for idx in range(150)]
+
+    def test_handle_events_calls_batch_callback_with_one_event(self):
+        batch_cb = Mock()
+        self.db.subscribe_channel_batch(self.ns, batch_cb, self.channels)
+        self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        assert self.db.handle_events() == ('abs', ['cbn'])
+        batch_cb.assert_called_once_with([('abs', ['cbn'])])
+
+    def test_unsubscribe_channel_removes_batch_callback(self):
+        self.db.subscribe_channel_batch(self.ns, Mock(), self.channels)
+        self.db.unsubscribe_channel(self.ns, [self.channels[0]])
+        assert self.db._channel_batch_cbs.get(self.channels[0], None) is None
+        assert self.db._channel_cbs.get(self.channels[0], None) is None
+        assert self.db._channel_batch_cbs.get(self.channels[1], None)
+
+    def test_publish_function_does_not_block_by_default(self):
+        self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        assert self.db.handle_events() == ('abs', ['cbn'])
+        assert self.db.handle_events() == ('abs', ['cbn'])
+        assert self.db.handle_events() is None
+
+    def test_publish_function_drops_oldest_event_if_queue_is_full(self):
+        self.configuration.get_params.return_value = self.configuration.get_params()._replace(
+            fake_db_event_queue_size=2,
+            fake_db_event_queue_overflow=EventQueueOverflow.DROP_OLDEST)
+        db = ricsdl.backend.get_backend_instance(self.configuration)
+        for idx in range(3):
+            db.set_and_publish(self.ns, {'abs': [str(idx)]}, self.dm)
+        assert db.dropped_events == 1
+        assert db.handle_events() == ('abs', ['1'])
+        assert db.handle_events() == ('abs', ['2'])
+
+    def test_publish_function_can_raise_exception_if_queue_is_full(self):
+        self.configuration.get_params.return_value = self.configuration.get_params()._replace(
+            fake_db_event_queue_size=1, fake_db_event_queue_overflow=EventQueueOverflow.RAISE)
+        db = ricsdl.backend.get_backend_instance(self.configuration)
+        db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        with pytest.raises(ricsdl.exceptions.BackendError):
+            db.remove_and_publish(self.ns, self.channels_and_events, self.keys)
+        assert db.get(self.ns, self.keys) == dict()
+        assert db.handle_events() == ('abs', ['cbn'])
+
     def test_start_event_listener_success(self):
         self.db.start_event_listener()
         assert self.db._run_in_thread
@@ -317,6 +427,58 @@ def test_handle_events_fail_already_set(self):
         with pytest.raises(Exception):
             self.db.handle_events()
 
+    def test_handle_events_batch_success(self):
+        cb = Mock()
+        self.db.subscribe_channel(self.ns, cb, self.channels)
+        for idx in range(3):
+            self.db.set_and_publish(self.ns, {'abs': [str(idx)]}, self.dm)
+        assert self.db.handle_events_batch(2, 0) == [('abs', ['0']), ('abs', ['1'])]
+        assert self.db.handle_events_batch(2, 0) == [('abs', ['2'])]
+        assert cb.call_args_list == [call('abs', [str(idx)]) for idx in range(3)]
+
+    def test_handle_events_batch_waits_for_first_event(self):
+        self.db.subscribe_channel(self.ns, Mock(), self.channels)
+        timer = threading.Timer(0.05, self.db.set_and_publish,
+                                (self.ns, self.channels_and_events, self.dm))
+        timer.start()
+        assert self.db.handle_events_batch(10, 2.0) == [('abs', ['cbn'])]
+        assert self.db.handle_events_batch(10, 0.01) == []
+
+    def test_handle_events_batch_fail_already_set(self):
+        self.db._run_in_thread = True
+        with pytest.raises(Exception):
+            self.db.handle_events_batch(10, 0)
+
+    def test_execute_batch_success(self):
+        ret = self.db.execute_batch([
+            ('set', self.ns, (self.dm,)),
+            ('set_if', self.ns, (self.key, self.old_data, self.new_data)),
+            ('get', self.ns, (self.keys,)),
+            ('add_member', self.ns, (self.group, self.groupmembers)),
+            ('group_size', self.ns, (self.group,)),
+            ('set_and_publish', self.ns, (self.channels_and_events, self.dm2)),
+        ])
+        assert ret == [None, True, self.new_dm, None, 2, None]
+        assert self.db._queue.qsize() == 1
+
+    def test_conditional_functions_are_atomic_when_called_from_several_threads(self):
+        def increment(count):
+            for _ in range(count):
+                while True:
+                    old = self.db.get(self.ns, [self.key])[self.key]
+                    if self.db.set_if(self.ns, self.key, old, b'%d' % (int(old) + 1)):
+                        break
+                self.db.add_member(self.ns, self.group, {b'%d' % int(old)})
+
+        self.db.set(self.ns, {self.key: b'0'})
+        threads = [threading.Thread(target=increment, args=(200,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert self.db.get(self.ns, [self.key]) == {self.key: b'1600'}
+        assert self.db.group_size(self.ns, self.group) == 1600
+
 @pytest.fixture()
 def fake_dict_backend_lock_fixture(request):
     request.cls.ns = 'some-ns'
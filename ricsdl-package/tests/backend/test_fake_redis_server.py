@@ -0,0 +1,218 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import asyncio
+import socket
+import time
+from unittest.mock import Mock, call, patch
+import pytest
+import ricsdl.exceptions
+from ricsdl.backend.redis import PubSub
+from ricsdl.asyncstorage import AsyncStorage
+from ricsdl.syncstorage import SyncStorage
+from tests.backend.fake_redis_server import (FakeRedisServer, encode_reply)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture()
+def fake_redis_server_fixture(request, monkeypatch):
+    for name in ('DBAAS_SERVICE_SENTINEL_PORT', 'DBAAS_MASTER_NAME', 'DBAAS_CLUSTER_ADDR_LIST',
+                 'SDL_DB_REDIS_CLUSTER', 'SDL_MAX_KEYS_PER_COMMAND'):
+        monkeypatch.delenv(name, raising=False)
+    server = FakeRedisServer()
+    server.start()
+    monkeypatch.setenv('DBAAS_SERVICE_HOST', server.host)
+    monkeypatch.setenv('DBAAS_SERVICE_PORT', str(server.port))
+    request.cls.server = server
+    request.cls.ns = 'some-ns'
+    request.cls.dm = {'abc': b'1', 'bcd': b'2'}
+    yield
+    server.stop()
+
+
+@pytest.mark.usefixtures('fake_redis_server_fixture')
+class TestFakeRedisServer:
+    def create_storage(self, **kwargs):
+        sdl = SyncStorage(**kwargs)
+        self.storages.append(sdl)
+        return sdl
+
+    @pytest.fixture(autouse=True)
+    def close_storages(self):
+        self.storages = []
+        yield
+        for sdl in self.storages:
+            sdl.close()
+
+    def send(self, sock, *args):
+        request = [b'*%d\r\n' % len(args)]
+        request.extend(b'$%d\r\n%s\r\n' % (len(arg), arg) for arg in args)
+        sock.sendall(b''.join(request))
+
+    def test_sync_storage_data_functions_work_end_to_end(self):
+        sdl = self.create_storage()
+        sdl.set(self.ns, self.dm)
+        assert sdl.get(self.ns, {'abc', 'bcd', 'cde'}) == self.dm
+        assert sdl.find_and_get(self.ns, 'a*') == {'abc': b'1'}
+        assert sdl.set_if(self.ns, 'abc', b'1', b'3') is True
+        assert sdl.set_if(self.ns, 'abc', b'1', b'4') is False
+        assert sdl.set_if_not_exists(self.ns, 'abc', b'5') is False
+        assert sdl.remove_if(self.ns, 'abc', b'3') is True
+        sdl.add_member(self.ns, 'group', {b'm1', b'm2'})
+        sdl.remove_member(self.ns, 'group', {b'm1'})
+        assert sdl.get_members(self.ns, 'group') == {b'm2'}
+        assert sdl.group_size(self.ns, 'group') == 1
+        assert sorted(sdl.iter_keys(self.ns, '*', batch_size=1)) == ['bcd', 'group']
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            sdl.is_member(self.ns, 'bcd', b'm1')
+        sdl.remove_all(self.ns)
+        assert sdl.find_keys(self.ns, '*') == []
+
+    def test_large_data_map_is_set_atomically_in_chunks(self, monkeypatch):
+        monkeypatch.setenv('SDL_MAX_KEYS_PER_COMMAND', '1')
+        sdl = self.create_storage()
+        sdl.set_and_publish(self.ns, {'ch': 'ev'}, self.dm)
+        assert sdl.get(self.ns, set(self.dm)) == self.dm
+        sdl.remove(self.ns, set(self.dm))
+        assert sdl.find_keys(self.ns, '*') == []
+
+    def test_events_are_delivered_end_to_end(self):
+        cb = Mock()
+        subscriber = self.create_storage()
+        subscriber.subscribe_channel(self.ns, cb, 'ch')
+        sdl = self.create_storage()
+        sdl.set_and_publish(self.ns, {'ch': ['ev1', 'ev2']}, self.dm)
+        assert sdl.set_if_and_publish(self.ns, {'ch': 'ev3'}, 'abc', b'1', b'3') is True
+        assert sdl.set_if_not_exists_and_publish(self.ns, {'ch': 'ev4'}, 'abc', b'4') is False
+        assert sdl.remove_if_and_publish(self.ns, {'ch': 'ev5'}, 'abc', b'3') is True
+        sdl.remove_and_publish(self.ns, {'ch': 'ev6'}, 'bcd')
+        sdl.remove_all_and_publish(self.ns, {'ch': 'ev-not-published'})
+        sdl.set(self.ns, self.dm)
+        sdl.remove_all_and_publish(self.ns, {'ch': 'ev7'})
+        subscriber.start_event_listener()
+        assert wait_for(lambda: cb.call_count == 5)
+        assert cb.call_args_list == [call('ch', ['ev1', 'ev2']), call('ch', ['ev3']),
+                                     call('ch', ['ev5']), call('ch', ['ev6']),
+                                     call('ch', ['ev7'])]
+
+    def test_events_are_delivered_in_batches_end_to_end(self):
+        batches = []
+        subscriber = self.create_storage()
+        subscriber.subscribe_channel_batch(self.ns, batches.append, {'ch1', 'ch2'}, max_events=3)
+        sdl = self.create_storage()
+        for idx in range(5):
+            sdl.set_and_publish(self.ns, {'ch1' if idx % 2 else 'ch2': str(idx)}, self.dm)
+        assert subscriber.handle_events_batch(10, 1.0) == [
+            ('ch2', ['0']), ('ch1', ['1']), ('ch2', ['2']), ('ch1', ['3']), ('ch2', ['4'])]
+        assert batches == [[('ch2', ['0']), ('ch1', ['1']), ('ch2', ['2'])],
+                           [('ch1', ['3']), ('ch2', ['4'])]]
+        assert subscriber.handle_events_batch(10, 0) == []
+
+    def test_event_listener_delivers_drained_events_without_per_event_handling(self):
+        batches = []
+        subscriber = self.create_storage()
+        subscriber.subscribe_channel_batch(self.ns, batches.append, 'ch1', max_latency=0.01)
+        sdl = self.create_storage()
+        for idx in range(50):
+            sdl.set_and_publish(self.ns, {'ch1': str(idx)}, self.dm)
+        with patch.object(PubSub, 'handle_message', autospec=True,
+                          side_effect=PubSub.handle_message) as mock_handle:
+            subscriber.start_event_listener()
+            assert wait_for(lambda: sum(len(batch) for batch in batches) == 50)
+        assert [event for batch in batches for event in batch] == [
+            ('ch1', [str(idx)]) for idx in range(50)]
+        assert len(batches) < 50
+        # Only the subscribe confirmation is handled message by message.
+        assert mock_handle.call_count == 1
+
+    def test_lock_functions_work_end_to_end(self):
+        sdl = self.create_storage()
+        lock = sdl.get_lock_resource(self.ns, 'lock', 10)
+        other_lock = self.create_storage().get_lock_resource(self.ns, 'lock', 10)
+        assert lock.acquire() is True
+        assert other_lock.acquire(retry_timeout=0) is False
+        assert 9 < lock.get_validity_time() <= 10
+        lock.refresh()
+        lock.release()
+        assert other_lock.acquire(retry_timeout=0) is True
+
+    def test_read_cache_is_invalidated_when_other_client_modifies_key(self):
+        cached = self.create_storage(read_cache_size=100)
+        sdl = self.create_storage()
+        sdl.set(self.ns, self.dm)
+        assert cached.get(self.ns, {'abc'}) == {'abc': b'1'}
+        sdl.set(self.ns, {'abc': b'3'})
+        assert wait_for(lambda: cached.get(self.ns, {'abc'}) == {'abc': b'3'})
+
+    def test_async_storage_works_end_to_end(self):
+        async def use_storage():
+            cb = Mock()
+            sdl = AsyncStorage()
+            await sdl.subscribe_channel(self.ns, cb, 'ch')
+            await sdl.start_event_listener()
+            await sdl.set_and_publish(self.ns, {'ch': 'ev'}, self.dm)
+            ret = await sdl.find_and_get(self.ns, '*')
+            for _ in range(100):
+                if cb.called:
+                    break
+                await asyncio.sleep(0.01)
+            await sdl.close()
+            return ret, cb
+
+        ret, cb = run(use_storage())
+        assert ret == self.dm
+        cb.assert_called_once_with('ch', ['ev'])
+
+    def test_server_speaks_resp3_after_hello(self):
+        with socket.create_connection((self.server.host, self.server.port)) as sub, \
+                socket.create_connection((self.server.host, self.server.port)) as pub:
+            self.send(sub, b'HELLO', b'3')
+            assert b'$5\r\nproto\r\n:3\r\n' in sub.recv(1024)
+            self.send(sub, b'SUBSCRIBE', b'ch')
+            assert sub.recv(1024) == b'>3\r\n$9\r\nsubscribe\r\n$2\r\nch\r\n:1\r\n'
+            self.send(pub, b'PUBLISH', b'ch', b'ev')
+            assert pub.recv(1024) == b':1\r\n'
+            assert sub.recv(1024) == b'>3\r\n$7\r\nmessage\r\n$2\r\nch\r\n$2\r\nev\r\n'
+            self.send(pub, b'SETIE', b'key', b'new', b'old')
+            assert pub.recv(1024) == b'$-1\r\n'
+            self.send(pub, b'EVAL', b'return 1', b'0')
+            assert pub.recv(1024).startswith(b'-ERR Lua scripts are not supported')
+            self.send(pub, b'NOSUCHCOMMAND')
+            assert pub.recv(1024).startswith(b'-ERR unknown command')
+
+
+def test_encode_reply_function_encodes_resp2_and_resp3_types():
+    assert encode_reply(None) == b'$-1\r\n'
+    assert encode_reply(None, 3) == b'_\r\n'
+    assert encode_reply({b'a'}) == b'*1\r\n$1\r\na\r\n'
+    assert encode_reply({b'a'}, 3) == b'~1\r\n$1\r\na\r\n'
+    assert encode_reply({b'a': 1}) == b'*2\r\n$1\r\na\r\n:1\r\n'
+    assert encode_reply({b'a': 1}, 3) == b'%1\r\n$1\r\na\r\n:1\r\n'
@@ -23,9 +23,12 @@
 import pytest
 from redis import exceptions as redis_exceptions
 import ricsdl.backend
+import ricsdl.sharding
 from ricsdl.backend.redis import (RedisBackendLock, _map_to_sdl_exception)
 from ricsdl.configuration import _Configuration
 from ricsdl.configuration import DbBackendType
+from ricsdl.configuration import DbShardingType
+from ricsdl.configuration import DbReadPreference
 import ricsdl.exceptions
 
 EVENT_SEPARATOR = "___"
@@ -59,17 +62,17 @@ def redis_backend_common_fixture(request):
     request.cls.ns = 'some-ns'
     request.cls.dl_redis = [b'1', b'2']
     request.cls.dm = {'a': b'1', 'b': b'2'}
-    request.cls.dm_redis = {'{some-ns},a': b'1', '{some-ns},b': b'2'}
-    request.cls.dm_redis_flat = ['{some-ns},a', b'1', '{some-ns},b', b'2']
+    request.cls.dm_redis = {b'{some-ns},a': b'1', b'{some-ns},b': b'2'}
+    request.cls.dm_redis_flat = [b'{some-ns},a', b'1', b'{some-ns},b', b'2']
     request.cls.key = 'a'
-    request.cls.key_redis = '{some-ns},a'
+    request.cls.key_redis = b'{some-ns},a'
     request.cls.keys = ['a', 'b']
-    request.cls.keys_redis = ['{some-ns},a', '{some-ns},b']
+    request.cls.keys_redis = [b'{some-ns},a', b'{some-ns},b']
     request.cls.data = b'123'
     request.cls.old_data = b'1'
     request.cls.new_data = b'3'
     request.cls.keypattern = r'[Aa]bc-\[1\].?-*'
-    request.cls.keypattern_redis = r'{some-ns},[Aa]bc-\[1\].?-*'
+    request.cls.keypattern_redis = rb'{some-ns},[Aa]bc-\[1\].?-*'
     request.cls.matchedkeys = ['Abc-[1].0-def', 'abc-[1].1-ghi']
     request.cls.matchedkeys_redis = [b'{some-ns},Abc-[1].0-def',
                                      b'{some-ns},abc-[1].1-ghi']
@@ -77,13 +80,13 @@ def redis_backend_common_fixture(request):
     request.cls.matchedkeydata = {'Abc-[1].0-def': b'10',
                                   'abc-[1].1-ghi': b'11'}
     request.cls.group = 'some-group'
-    request.cls.group_redis = '{some-ns},some-group'
+    request.cls.group_redis = b'{some-ns},some-group'
     request.cls.groupmembers = set([b'm1', b'm2'])
     request.cls.groupmember = b'm1'
     request.cls.channels = ['ch1', 'ch2']
     request.cls.channels_and_events = {'ch1': ['ev1'], 'ch2': ['ev2', 'ev3']}
-    request.cls.channels_and_events_redis = ['{some-ns},ch1', 'ev1',
-                                             '{some-ns},ch2', 'ev2' + EVENT_SEPARATOR + 'ev3']
+    request.cls.channels_and_events_redis = [b'{some-ns},ch1', 'ev1',
+                                             b'{some-ns},ch2', 'ev2' + EVENT_SEPARATOR + 'ev3']
 
     yield
 
@@ -299,9 +302,16 @@ def test_find_and_get_function_success(self):
         self.mock_redis.mget.return_value = self.matcheddata_redis
         ret = self.db.find_and_get(self.ns, self.keypattern)
         self.mock_redis.keys.assert_called_once_with(self.keypattern_redis)
-        self.mock_redis.mget.assert_called_once_with([i.decode() for i in self.matchedkeys_redis])
+        self.mock_redis.mget.assert_called_once_with(self.matchedkeys_redis)
         assert ret == self.matchedkeydata
 
+    def test_find_and_get_function_ordered_reads_sorted_keys(self):
+        self.mock_redis.keys.return_value = list(reversed(self.matchedkeys_redis))
+        self.mock_redis.mget.return_value = self.matcheddata_redis
+        ret = self.db.find_and_get(self.ns, self.keypattern, ordered=True)
+        self.mock_redis.mget.assert_called_once_with(sorted(self.matchedkeys_redis))
+        assert list(ret) == sorted(ret)
+
     def test_find_and_get_function_returns_empty_dict_when_no_matching_keys_exist(self):
         self.mock_redis.keys.return_value = list()
         ret = self.db.find_and_get(self.ns, self.keypattern)
@@ -332,6 +342,64 @@ def test_find_and_get_function_can_raise_exception_when_redis_key_is_without_pre
         assert f"Namespace {self.ns} key:{corrupt_redis_key} "
         "has no namespace prefix" in str(excinfo.value)
 
+    def test_iter_keys_function_success(self):
+        self.mock_redis.scan.side_effect = [(7, [self.matchedkeys_redis[0]]), (3, []),
+                                            (0, [self.matchedkeys_redis[1]])]
+        ret = list(self.db.iter_keys(self.ns, self.keypattern, 10))
+        self.mock_redis.scan.assert_has_calls([
+            call(0, match=self.keypattern_redis, count=10),
+            call(7, match=self.keypattern_redis, count=10),
+            call(3, match=self.keypattern_redis, count=10),
+        ])
+        assert not self.mock_redis.keys.called
+        assert ret == self.matchedkeys
+
+    def test_iter_keys_function_returns_nothing_when_no_matching_keys_found(self):
+        self.mock_redis.scan.return_value = (0, [])
+        ret = list(self.db.iter_keys(self.ns, self.keypattern, 10))
+        assert ret == []
+
+    def test_iter_keys_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.scan.side_effect = redis_exceptions.ResponseError('redis error!')
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            list(self.db.iter_keys(self.ns, self.keypattern, 10))
+
+    def test_iter_keys_function_can_raise_exception_when_redis_key_is_without_prefix(self):
+        self.mock_redis.scan.return_value = (0, [b'some-corrupt-key'])
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            list(self.db.iter_keys(self.ns, self.keypattern, 10))
+
+    def test_iter_items_function_success_reads_data_in_chunks(self):
+        self.mock_redis.scan.side_effect = [(5, self.matchedkeys_redis), (0, [])]
+        self.mock_redis.mget.side_effect = [[self.matcheddata_redis[0]],
+                                            [self.matcheddata_redis[1]]]
+        ret = list(self.db.iter_items(self.ns, self.keypattern, 1))
+        self.mock_redis.mget.assert_has_calls([
+            call([self.matchedkeys_redis[0]]),
+            call([self.matchedkeys_redis[1]]),
+        ])
+        assert ret == list(self.matchedkeydata.items())
+
+    def test_iter_items_function_success_reads_remaining_data_after_scan(self):
+        self.mock_redis.scan.side_effect = [(5, [self.matchedkeys_redis[0]]),
+                                            (0, [self.matchedkeys_redis[1]])]
+        self.mock_redis.mget.return_value = [self.matcheddata_redis[0], None]
+        ret = list(self.db.iter_items(self.ns, self.keypattern, 10))
+        self.mock_redis.mget.assert_called_once_with(self.matchedkeys_redis)
+        assert ret == [(self.matchedkeys[0], self.matcheddata_redis[0])]
+
+    def test_iter_items_function_returns_nothing_when_no_matching_keys_exist(self):
+        self.mock_redis.scan.return_value = (0, [])
+        ret = list(self.db.iter_items(self.ns, self.keypattern, 10))
+        assert not self.mock_redis.mget.called
+        assert ret == []
+
+    def test_iter_items_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.scan.return_value = (0, self.matchedkeys_redis)
+        self.mock_redis.mget.side_effect = redis_exceptions.ResponseError('redis error!')
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            list(self.db.iter_items(self.ns, self.keypattern, 10))
+
     def test_remove_function_success(self):
         self.db.remove(self.ns, self.keys)
         self.mock_redis.delete.assert_called_once_with(*self.keys_redis)
@@ -341,6 +409,41 @@ def test_remove_function_can_map_redis_exception_to_sdl_exception(self):
         with pytest.raises(ricsdl.exceptions.RejectedByBackend):
             self.db.remove(self.ns, self.keys)
 
+    def test_remove_all_in_batches_function_success(self):
+        progress_cb = Mock()
+        self.mock_redis.scan.side_effect = [(5, self.keys_redis[:1]), (0, self.keys_redis[1:])]
+        self.mock_redis.unlink.return_value = 1
+        ret = self.db.remove_all_in_batches(self.ns, 1, progress_cb)
+        self.mock_redis.scan.assert_has_calls([
+            call(0, match=b'{some-ns},*', count=1),
+            call(5, match=b'{some-ns},*', count=1),
+        ])
+        self.mock_redis.unlink.assert_has_calls([call(self.keys_redis[0]),
+                                                 call(self.keys_redis[1])])
+        assert not self.mock_redis.keys.called
+        assert not self.mock_redis.delete.called
+        progress_cb.assert_has_calls([call(1), call(2)])
+        assert ret == 2
+
+    def test_remove_all_in_batches_function_unlinks_scanned_keys_in_full_batches(self):
+        self.mock_redis.scan.side_effect = [(5, self.keys_redis[:1]), (0, self.keys_redis[1:])]
+        self.mock_redis.unlink.return_value = 2
+        ret = self.db.remove_all_in_batches(self.ns, 10, None)
+        self.mock_redis.unlink.assert_called_once_with(*self.keys_redis)
+        assert ret == 2
+
+    def test_remove_all_in_batches_function_does_nothing_when_namespace_is_empty(self):
+        self.mock_redis.scan.return_value = (0, [])
+        ret = self.db.remove_all_in_batches(self.ns, 10, None)
+        assert not self.mock_redis.unlink.called
+        assert ret == 0
+
+    def test_remove_all_in_batches_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.scan.return_value = (0, self.keys_redis)
+        self.mock_redis.unlink.side_effect = redis_exceptions.ResponseError('redis error!')
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            self.db.remove_all_in_batches(self.ns, 10, None)
+
     def test_remove_if_function_success(self):
         self.mock_redis.execute_command.return_value = True
         ret = self.db.remove_if(self.ns, self.key, self.new_data)
@@ -512,7 +615,7 @@ def test_remove_if_and_publish_can_map_redis_exception_to_sdl_exception(self):
                                           self.new_data)
 
     def test_remove_all_and_publish_success(self):
-        self.mock_redis.keys.return_value = ['{some-ns},a']
+        self.mock_redis.keys.return_value = [b'{some-ns},a']
         self.db.remove_all_and_publish(self.ns, self.channels_and_events)
         self.mock_redis.keys.assert_called_once()
         self.mock_redis.execute_command.assert_called_once_with('DELMPUB', len(self.key),
@@ -525,21 +628,41 @@ def test_remove_all_and_publish_can_map_redis_exception_to_sdl_exception(self):
         with pytest.raises(ricsdl.exceptions.RejectedByBackend):
             self.db.remove_all_and_publish(self.ns, self.channels_and_events)
 
+    def get_pubsub_listeners(self):
+        return [redis_ctx.pubsub_thread for redis_ctx in self.db.clients
+                if isinstance(redis_ctx.pubsub_thread, ricsdl.backend.redis._PubSubListener)]
+
     def test_subscribe_channel_success(self):
         cb = Mock()
         self.db.subscribe_channel(self.ns, cb, self.channels)
         for channel in self.channels:
             self.mock_pubsub.subscribe.assert_any_call(**{f'{{some-ns}},{channel}': cb})
 
+    def test_subscribe_channel_batch_subscribes_channels_with_batch_handler(self):
+        batch_cb = Mock()
+        self.db.subscribe_channel_batch(self.ns, batch_cb, self.channels)
+        handlers = [list(args[1].values())[0] for args in self.mock_pubsub.subscribe.call_args_list]
+        assert len(handlers) == len(self.channels)
+        for handler in handlers:
+            assert isinstance(handler, ricsdl.backend.redis._BatchHandler)
+            assert handler is handlers[0]
+        handlers[0]('ch1', ['ev1'])
+        batch_cb.assert_called_once_with([('ch1', ['ev1'])])
+
     def test_subscribe_channel_with_thread_success(self):
         cb = Mock()
         # Call first start_event_listener() to enable run_in_thread flag. When subscribe_channel()
         # is called thread is started if the flag is enabled. In real-life scenario it's highly
         # advisable at first to subscribe to some events by calling subscribe_channel() and only
         # after it start threads by calling start_event_listener().
-        self.db.start_event_listener()
-        self.db.subscribe_channel(self.ns, cb, self.channels)
-        self.mock_pubsub.run_in_thread.assert_called_once_with(daemon=True, sleep_time=0.001)
+        with patch('ricsdl.backend.redis._PubSubListener.start') as mock_start, \
+                patch('ricsdl.backend.redis._PubSubListener.is_alive', return_value=True):
+            self.db.start_event_listener()
+            self.db.subscribe_channel(self.ns, cb, self.channels)
+        mock_start.assert_called_once()
+        listeners = self.get_pubsub_listeners()
+        assert len(listeners) == 1
+        assert listeners[0].pubsub is self.mock_pubsub
 
     def test_subscribe_can_map_redis_exception_to_sdl_exeception(self):
         self.mock_pubsub.subscribe.side_effect = redis_exceptions.ResponseError('redis error!')
@@ -558,18 +681,17 @@ def test_unsubscribe_channel_can_map_redis_exception_to_sdl_exeception(self):
     def test_subscribe_and_start_event_listener(self):
         self.mock_redis.pubsub_channels.return_value = self.channels_and_events_redis
         self.db.subscribe_channel(self.ns, Mock(), self.channels)
-        self.db.start_event_listener()
+        with patch('ricsdl.backend.redis._PubSubListener.start') as mock_start:
+            self.db.start_event_listener()
 
         if self.test_backend_type == 'sentinel_cluster':
             assert self.mock_redis.pubsub_channels.call_count == 2
-            assert self.mock_pubsub.run_in_thread.call_count == 2
-            self.mock_pubsub.run_in_thread.assert_has_calls([
-                call(daemon=True, sleep_time=0.001),
-                call(daemon=True, sleep_time=0.001),
-            ])
+            assert mock_start.call_count == 2
+            assert len(self.get_pubsub_listeners()) == 2
         else:
             self.mock_redis.pubsub_channels.assert_called_once()
-            self.mock_pubsub.run_in_thread.assert_called_once_with(daemon=True, sleep_time=0.001)
+            mock_start.assert_called_once()
+            assert len(self.get_pubsub_listeners()) == 1
 
     def test_start_event_listener_fail(self):
         self.mock_pubsub_thread.is_alive.return_value = True
@@ -598,6 +720,33 @@ def test_handle_events_ignores_message_handling_redis_runtime_exception(self):
          self.db.handle_events()
          self.mock_pubsub.get_message.assert_called_once()
 
+    def test_handle_events_batch_success(self):
+        self.mock_pubsub.get_message.side_effect = [('ch1', ['ev1']), {'type': 'message'},
+                                                    ('ch2', ['ev2', 'ev3']), None, None]
+        assert self.db.handle_events_batch(10, 0) == [('ch1', ['ev1']), ('ch2', ['ev2', 'ev3'])]
+        self.mock_pubsub.get_message.assert_called_with(ignore_subscribe_messages=True,
+                                                        timeout=0.0)
+
+    def test_handle_events_batch_returns_at_most_max_events(self):
+        self.mock_pubsub.get_message.return_value = ('ch1', ['ev1'])
+        assert self.db.handle_events_batch(2, 0) == [('ch1', ['ev1']), ('ch1', ['ev1'])]
+        assert self.mock_pubsub.get_message.call_count == 2
+
+    def test_handle_events_batch_waits_for_first_event(self):
+        self.mock_pubsub.get_message.side_effect = [None] * len(self.db.clients) + [
+            ('ch1', ['ev1'])] + [None] * len(self.db.clients)
+        assert self.db.handle_events_batch(10, 1.0) == [('ch1', ['ev1'])]
+        assert self.mock_pubsub.get_message.call_args_list[len(self.db.clients)][1]['timeout'] > 0
+
+    def test_handle_events_batch_returns_empty_list_if_there_are_no_events(self):
+        self.mock_pubsub.get_message.side_effect = RuntimeError()
+        assert self.db.handle_events_batch(10, 0) == []
+
+    def test_handle_events_batch_fail_if_event_listener_already_running(self):
+        self.db.start_event_listener()
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            self.db.handle_events_batch(10, 0)
+
     def test_get_redis_connection_function_success(self):
         ret = self.db.get_redis_connection(self.ns)
         assert ret is self.mock_redis
@@ -607,8 +756,655 @@ def test_redis_backend_object_string_representation(self):
         assert str_out is not None
 
     def test_namespace_hash_algorithm_stays_unaltered(self):
-        ret_hash = self.db._RedisBackend__get_hash('sdltoolns')
+        ret_hash = ricsdl.sharding._hash32('sdltoolns')
         assert ret_hash == 2897969051
+        assert self.db.ns_sharding.get_index('sdltoolns') == 2897969051 % len(self.db.clients)
+
+    def test_get_client_index_function_returns_index_of_sharded_client(self):
+        assert self.db.get_client_index('sdltoolns') == 2897969051 % len(self.db.clients)
+
+    def test_execute_batch_function_success(self):
+        mock_pipe = self.mock_redis.pipeline.return_value
+        mock_pipe.execute.return_value = [True, [b'1', None], True, 1, {b'm1'}]
+        ret = self.db.execute_batch([
+            ('set', self.ns, (self.dm,)),
+            ('get', self.ns, (self.keys,)),
+            ('set_if', self.ns, (self.key, self.old_data, self.new_data)),
+            ('add_member', self.ns, (self.group, self.groupmembers)),
+            ('get_members', self.ns, (self.group,)),
+        ])
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        mock_pipe.mset.assert_called_once_with(self.dm_redis)
+        mock_pipe.mget.assert_called_once_with(self.keys_redis)
+        mock_pipe.execute_command.assert_called_once_with('SETIE', self.key_redis,
+                                                          self.new_data, self.old_data)
+        mock_pipe.sadd.assert_called_once_with(self.group_redis, *self.groupmembers)
+        mock_pipe.smembers.assert_called_once_with(self.group_redis)
+        mock_pipe.execute.assert_called_once_with(raise_on_error=False)
+        assert ret == [None, {'a': b'1'}, True, None, {b'm1'}]
+
+    def test_execute_batch_function_success_with_publish_operations(self):
+        mock_pipe = self.mock_redis.pipeline.return_value
+        mock_pipe.execute.return_value = [b'OK', b'OK', 1, 1]
+        ret = self.db.execute_batch([
+            ('set_and_publish', self.ns, (self.channels_and_events, self.dm)),
+            ('set_if_and_publish', self.ns, (self.channels_and_events, self.key,
+                                             self.old_data, self.new_data)),
+            ('remove_and_publish', self.ns, (self.channels_and_events, self.keys)),
+            ('remove_if_and_publish', self.ns, (self.channels_and_events, self.key,
+                                                self.new_data)),
+        ])
+        assert mock_pipe.execute_command.call_args_list == [
+            call('MSETMPUB', len(self.dm), len(self.channels_and_events), *self.dm_redis_flat,
+                 *self.channels_and_events_redis),
+            call('SETIEMPUB', self.key_redis, self.new_data, self.old_data,
+                 *self.channels_and_events_redis),
+            call('DELMPUB', len(self.keys), len(self.channels_and_events), *self.keys_redis,
+                 *self.channels_and_events_redis),
+            call('DELIEMPUB', self.key_redis, self.new_data, *self.channels_and_events_redis),
+        ]
+        assert ret == [None, True, None, True]
+
+    def test_execute_batch_function_maps_failed_operation_to_sdl_exception(self):
+        mock_pipe = self.mock_redis.pipeline.return_value
+        mock_pipe.execute.return_value = [redis_exceptions.ResponseError('redis error!'), 2]
+        ret = self.db.execute_batch([
+            ('remove_if', self.ns, (self.key, self.new_data)),
+            ('group_size', self.ns, (self.group,)),
+        ])
+        assert isinstance(ret[0], ricsdl.exceptions.RejectedByBackend)
+        assert ret[1] == 2
+
+    def test_execute_batch_function_can_map_redis_exception_to_sdl_exception(self):
+        mock_pipe = self.mock_redis.pipeline.return_value
+        mock_pipe.execute.side_effect = redis_exceptions.ConnectionError('redis error!')
+        with pytest.raises(ricsdl.exceptions.NotConnected):
+            self.db.execute_batch([('get', self.ns, (self.keys,))])
+
+    def test_execute_batch_function_rejects_unsupported_operation(self):
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            self.db.execute_batch([('find_keys', self.ns, ('*',))])
+
+    def test_track_namespace_function_enables_broadcast_tracking(self):
+        self.mock_redis.connection_pool.connection_kwargs = {}
+        mock_conn = self.mock_redis.connection_pool.connection_class.return_value
+        mock_conn.read_response.side_effect = [5, [b'subscribe', b'__redis__:invalidate', 1],
+                                               b'OK']
+        with patch('threading.Thread') as mock_thread:
+            self.db.track_namespace(self.ns, Mock())
+            self.db.track_namespace(self.ns, Mock())
+        assert mock_conn.send_command.call_args_list == [
+            call('CLIENT', 'ID'),
+            call('SUBSCRIBE', '__redis__:invalidate'),
+            call('CLIENT', 'TRACKING', 'ON', 'REDIRECT', 5, 'BCAST', 'PREFIX', b'{some-ns},'),
+        ]
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_track_namespace_function_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_redis.connection_pool.connection_kwargs = {}
+        mock_conn = self.mock_redis.connection_pool.connection_class.return_value
+        mock_conn.read_response.side_effect = [5, [b'subscribe', b'__redis__:invalidate', 1],
+                                               redis_exceptions.ResponseError('redis error!')]
+        with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+            self.db.track_namespace(self.ns, Mock())
+        mock_conn.disconnect.assert_called()
+
+    def test_track_namespace_function_calls_callback_with_invalidated_namespace_keys(self):
+        mock_cb = Mock()
+        with patch('threading.Thread'):
+            self.db.track_namespace(self.ns, mock_cb)
+        tracker = [t for c in self.db.clients for t in c.invalidation_trackers.values()][0]
+        tracker.invalidate_cb([b'{some-ns},a', b'{other-ns},b', b'{some-ns},c'])
+        mock_cb.assert_called_once_with(self.ns, ['a', 'c'])
+        mock_cb.reset_mock()
+        tracker.invalidate_cb(None)
+        mock_cb.assert_called_once_with(self.ns, None)
+
+    def test_close_function_closes_invalidation_tracker(self):
+        self.mock_redis.connection_pool.connection_kwargs = {}
+        mock_conn = self.mock_redis.connection_pool.connection_class.return_value
+        with patch('threading.Thread'):
+            self.db.track_namespace(self.ns, Mock())
+        self.db.close()
+        mock_conn.disconnect.assert_called()
+        self.mock_redis.connection_pool.release.assert_not_called()
+
+    def test_close_function_stops_event_listener(self):
+        self.mock_redis.pubsub_channels.return_value = self.channels_and_events_redis
+        self.db.subscribe_channel(self.ns, Mock(), self.channels)
+        with patch('ricsdl.backend.redis._PubSubListener.start'):
+            self.db.start_event_listener()
+        self.db.close()
+        listeners = self.get_pubsub_listeners()
+        assert listeners
+        for listener in listeners:
+            assert listener.running.is_set() is False
+
+
+@pytest.fixture(params=[{'db_max_keys_per_command': 1},
+                        {'db_max_bytes_per_command': len(b'{some-ns},a') + 1}])
+def redis_backend_chunking_fixture(request, redis_backend_common_fixture):
+    request.cls.configuration = Mock()
+    request.cls.configuration.get_event_separator.return_value = EVENT_SEPARATOR
+    request.cls.configuration.get_params.return_value = get_test_sdl_standby_config()._replace(
+        **request.param)
+    with patch('ricsdl.backend.redis.Redis') as mock_redis, patch(
+               'ricsdl.backend.redis.PubSub'), patch('threading.Thread'):
+        request.cls.db = ricsdl.backend.get_backend_instance(request.cls.configuration)
+        request.cls.mock_redis = mock_redis.return_value
+    request.cls.mock_pipe = request.cls.mock_redis.pipeline.return_value
+    yield
+
+
+@pytest.mark.usefixtures('redis_backend_chunking_fixture')
+class TestRedisBackendChunking:
+    def test_set_function_splits_data_map_to_atomic_pipeline(self):
+        self.db.set(self.ns, self.dm)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=True)
+        assert self.mock_pipe.mset.call_args_list == [call({b'{some-ns},a': b'1'}),
+                                                      call({b'{some-ns},b': b'2'})]
+        self.mock_pipe.execute.assert_called_once()
+        assert not self.mock_redis.mset.called
+
+    def test_set_function_splits_data_map_to_non_atomic_pipeline(self):
+        self.db.set(self.ns, self.dm, atomic=False)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert self.mock_pipe.mset.call_count == 2
+
+    def test_set_function_does_not_split_small_data_map(self):
+        self.db.set(self.ns, {'a': b''})
+        self.mock_redis.mset.assert_called_once_with({b'{some-ns},a': b''})
+        assert not self.mock_redis.pipeline.called
+
+    def test_get_function_splits_keys_to_pipeline(self):
+        self.mock_pipe.execute.return_value = [[b'1'], [None]]
+        ret = self.db.get(self.ns, self.keys)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert self.mock_pipe.mget.call_args_list == [call([b'{some-ns},a']),
+                                                      call([b'{some-ns},b'])]
+        assert ret == {'a': b'1'}
+
+    def test_remove_function_splits_keys_to_pipeline(self):
+        self.db.remove(self.ns, self.keys, atomic=False)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert self.mock_pipe.delete.call_args_list == [call(b'{some-ns},a'),
+                                                        call(b'{some-ns},b')]
+        assert not self.mock_redis.delete.called
+
+    def test_set_and_publish_function_publishes_events_with_last_chunk(self):
+        self.db.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=True)
+        self.mock_pipe.mset.assert_called_once_with({b'{some-ns},a': b'1'})
+        self.mock_pipe.execute_command.assert_called_once_with(
+            'MSETMPUB', 1, len(self.channels_and_events), b'{some-ns},b', b'2',
+            *self.channels_and_events_redis)
+        self.mock_pipe.execute.assert_called_once()
+
+    def test_remove_and_publish_function_publishes_events_in_same_transaction(self):
+        self.mock_pipe.execute.return_value = [1, 0, 1, 1]
+        self.db.remove_and_publish(self.ns, self.channels_and_events, self.keys)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=True)
+        assert self.mock_pipe.method_calls == [
+            call.delete(b'{some-ns},a'),
+            call.delete(b'{some-ns},b'),
+            call.publish(b'{some-ns},ch1', 'ev1'),
+            call.publish(b'{some-ns},ch2', 'ev2' + EVENT_SEPARATOR + 'ev3'),
+            call.execute(),
+        ]
+        assert not self.mock_redis.execute_command.called
+
+    def test_remove_and_publish_function_publishes_events_even_if_no_keys_were_removed(self):
+        self.mock_pipe.execute.return_value = [0, 0, 0, 0]
+        self.db.remove_and_publish(self.ns, self.channels_and_events, self.keys)
+        self.mock_pipe.execute.assert_called_once_with()
+        assert self.mock_pipe.publish.call_count == 2
+
+    def test_remove_and_publish_function_can_use_non_atomic_pipeline(self):
+        self.db.remove_and_publish(self.ns, self.channels_and_events, self.keys, atomic=False)
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert self.mock_pipe.publish.call_count == 2
+
+    def test_split_functions_can_map_redis_exception_to_sdl_exception(self):
+        self.mock_pipe.execute.side_effect = redis_exceptions.ConnectionError('redis error!')
+        with pytest.raises(ricsdl.exceptions.NotConnected):
+            self.db.set(self.ns, self.dm)
+        with pytest.raises(ricsdl.exceptions.NotConnected):
+            self.db.get(self.ns, self.keys)
+
+
+def test_split_to_chunks_function_limits_items_and_bytes():
+    split = ricsdl.backend.redis._split_to_chunks
+    assert split(['a', 'b', 'c'], 0, 0, len) == [['a', 'b', 'c']]
+    assert split(['a', 'b', 'c'], 2, 0, len) == [['a', 'b'], ['c']]
+    assert split(['aa', 'b', 'c', 'dddd'], 0, 3, len) == [['aa', 'b'], ['c'], ['dddd']]
+    assert split(['a', 'b', 'c'], 2, 1, len) == [['a'], ['b'], ['c']]
+    assert split([], 2, 1, len) == [[]]
+
+
+def test_namespace_prefix_is_encoded_once_and_stripped_from_keys():
+    assert ricsdl.backend.redis._get_ns_prefix('some-ns') is \
+        ricsdl.backend.redis._get_ns_prefix('some-ns')
+    assert ricsdl.backend.redis._add_keys_ns_prefix('some-ns', ['a', 'b,c']) == \
+        [b'{some-ns},a', b'{some-ns},b,c']
+    strip = ricsdl.backend.redis._strip_ns_from_bin_keys
+    assert strip('some-ns', [b'{some-ns},a', b'{some-ns},b,c']) == ['a', 'b,c']
+    with pytest.raises(ricsdl.exceptions.RejectedByBackend):
+        strip('some-ns', [b'{other-ns},a'])
+
+
+@pytest.fixture()
+def invalidation_tracker_fixture(request):
+    request.cls.mock_redis = Mock()
+    request.cls.mock_redis.connection_pool.connection_kwargs = {'host': 'localhost', 'port': 6379}
+    request.cls.mock_conn = request.cls.mock_redis.connection_pool.connection_class.return_value
+    request.cls.mock_invalidate_cb = Mock()
+    request.cls.tracker = ricsdl.backend.redis._InvalidationTracker(request.cls.mock_redis,
+                                                                    request.cls.mock_invalidate_cb)
+    request.cls.subscribe_replies = [5, [b'subscribe', b'__redis__:invalidate', 1], b'OK']
+    yield
+
+
+@pytest.mark.usefixtures('invalidation_tracker_fixture')
+class TestInvalidationTracker:
+    def close_tracker_on_second_call(self, keys):
+        if self.mock_invalidate_cb.call_count == 2:
+            self.tracker.closed = True
+
+    def test_listen_function_calls_callback_with_invalidated_keys(self):
+        self.mock_conn.read_response.side_effect = self.subscribe_replies
+        with patch('threading.Thread'):
+            self.tracker.add_prefix('{some-ns},')
+        self.mock_conn.read_response.side_effect = [
+            [b'message', b'__redis__:invalidate', [b'{some-ns},a']],
+            [b'pong', b''],
+            [b'message', b'__redis__:invalidate', None],
+        ]
+        self.mock_invalidate_cb.side_effect = self.close_tracker_on_second_call
+        self.tracker._listen()
+        assert self.mock_invalidate_cb.call_args_list == [call([b'{some-ns},a']), call(None)]
+
+    def test_listen_function_invalidates_all_and_reconnects_when_connection_is_lost(self):
+        self.mock_conn.read_response.side_effect = self.subscribe_replies
+        with patch('threading.Thread'):
+            self.tracker.add_prefix('{some-ns},')
+        self.mock_conn.send_command.reset_mock()
+        self.mock_conn.can_read.side_effect = redis_exceptions.ConnectionError('redis error!')
+        self.mock_conn.read_response.side_effect = self.subscribe_replies
+        self.mock_invalidate_cb.side_effect = self.close_tracker_on_second_call
+        with patch('ricsdl.backend.redis.time.sleep') as mock_sleep:
+            self.tracker._listen()
+        mock_sleep.assert_called_once_with(self.tracker.RECONNECT_INTERVAL)
+        assert self.mock_invalidate_cb.call_args_list == [call(None), call(None)]
+        self.mock_conn.disconnect.assert_called()
+        assert self.mock_conn.send_command.call_args_list == [
+            call('CLIENT', 'ID'),
+            call('SUBSCRIBE', '__redis__:invalidate'),
+            call('CLIENT', 'TRACKING', 'ON', 'REDIRECT', 5, 'BCAST', 'PREFIX', '{some-ns},'),
+        ]
+
+    def test_listen_function_does_not_reconnect_if_add_prefix_has_connected(self):
+        self.mock_conn.read_response.side_effect = self.subscribe_replies
+        with patch('threading.Thread'):
+            self.tracker.add_prefix('{some-ns},')
+        pool = self.mock_redis.connection_pool
+        pool.connection_class.reset_mock()
+        # Listening thread finds no connection, but 'add_prefix' connects before it gets the lock.
+        self.tracker.listen_conn = None
+        with patch.object(self.tracker, 'lock') as mock_lock:
+            mock_lock.__enter__.side_effect = lambda: setattr(self.tracker, 'listen_conn',
+                                                              self.mock_conn)
+            self.mock_invalidate_cb.side_effect = lambda keys: setattr(self.tracker, 'closed',
+                                                                       True)
+            self.tracker._listen()
+        pool.connection_class.assert_not_called()
+        self.mock_invalidate_cb.assert_called_once_with(None)
+
+    def test_add_prefix_function_enables_tracking_of_new_prefix(self):
+        self.mock_conn.read_response.side_effect = self.subscribe_replies + [b'OK']
+        with patch('threading.Thread') as mock_thread:
+            self.tracker.add_prefix('{some-ns},')
+            self.tracker.add_prefix('{other-ns},')
+        assert self.mock_conn.send_command.call_args_list[-1] == call(
+            'CLIENT', 'TRACKING', 'ON', 'REDIRECT', 5, 'BCAST', 'PREFIX', '{other-ns},')
+        assert self.tracker.prefixes == ['{some-ns},', '{other-ns},']
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_tracker_connections_are_created_outside_connection_pool(self):
+        pool = self.mock_redis.connection_pool
+        self.mock_conn.read_response.side_effect = self.subscribe_replies
+        with patch('threading.Thread'):
+            self.tracker.add_prefix('{some-ns},')
+        assert pool.connection_class.call_args_list == [call(host='localhost', port=6379)] * 2
+        pool.get_connection.assert_not_called()
+        self.tracker.close()
+        assert self.mock_conn.disconnect.call_count == 2
+        pool.release.assert_not_called()
+
+
+@pytest.fixture()
+def pubsub_listener_fixture(request):
+    request.cls.mock_pubsub = Mock()
+    request.cls.listener = ricsdl.backend.redis._PubSubListener(request.cls.mock_pubsub)
+    yield
+
+
+@pytest.mark.usefixtures('pubsub_listener_fixture')
+class TestPubSubListener:
+    def stop_listener_on_second_call(self, *args, **kwargs):
+        if self.mock_pubsub.handle_messages.call_count == 2:
+            self.listener.stop()
+
+    def test_run_function_blocks_on_pubsub_connection_until_stopped(self):
+        self.mock_pubsub.handle_messages.side_effect = self.stop_listener_on_second_call
+        self.listener.run()
+        assert self.mock_pubsub.handle_messages.call_args_list == [
+            call(self.listener.LISTEN_TIMEOUT, self.listener.LISTEN_BATCH_SIZE),
+            call(self.listener.LISTEN_TIMEOUT, self.listener.LISTEN_BATCH_SIZE),
+        ]
+        self.mock_pubsub.close.assert_called_once()
+
+    def test_run_function_retries_after_connection_error(self):
+        def fail_on_first_call(*args, **kwargs):
+            self.stop_listener_on_second_call()
+            if self.mock_pubsub.handle_messages.call_count == 1:
+                raise redis_exceptions.ConnectionError('redis error!')
+        self.mock_pubsub.handle_messages.side_effect = fail_on_first_call
+        with patch('ricsdl.backend.redis.time.sleep') as mock_sleep:
+            self.listener.run()
+        mock_sleep.assert_called_once_with(self.listener.RECONNECT_INTERVAL)
+        assert self.mock_pubsub.handle_messages.call_count == 2
+
+    def test_listener_thread_is_daemon(self):
+        assert self.listener.daemon is True
+
+
+def test_sentinel_cluster_selects_client_by_configured_sharding():
+    mock_cfg = Mock()
+    cfg_params = get_test_sdl_sentinel_cluster_config()._replace(
+        db_sharding=DbShardingType.CONSISTENT, db_sharding_weights=[1.0, 2.0])
+    mock_cfg.get_params.return_value = cfg_params
+    mock_cfg.get_event_separator.return_value = EVENT_SEPARATOR
+    with patch('ricsdl.backend.redis.Sentinel') as mock_sentinel, \
+            patch('ricsdl.backend.redis.PubSub'):
+        mock_sentinel.return_value.master_for.side_effect = [Mock(), Mock()]
+        db = ricsdl.backend.get_backend_instance(mock_cfg)
+    expected = ricsdl.sharding._create_ns_sharding(DbShardingType.CONSISTENT,
+                                                   cfg_params.db_cluster_addrs, [1.0, 2.0],
+                                                   ports=cfg_params.db_sentinel_ports)
+    for ns in ['ns-{}'.format(i) for i in range(20)]:
+        assert db.get_redis_connection(ns) is db.clients[expected.get_index(ns)].redis_client
+
+
+def test_standalone_redis_client_uses_configured_connection_options():
+    mock_cfg = Mock()
+    mock_cfg.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_max_connections=50, db_socket_timeout=1.5, db_socket_connect_timeout=0.5,
+        db_socket_keepalive=True, db_health_check_interval=30)
+    with patch('ricsdl.backend.redis.Redis') as mock_redis, patch('ricsdl.backend.redis.PubSub'):
+        ricsdl.backend.get_backend_instance(mock_cfg)
+    mock_redis.assert_called_once_with(db=0, host='service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                       port='6379', max_connections=50, socket_timeout=1.5,
+                                       socket_connect_timeout=0.5, socket_keepalive=True,
+                                       health_check_interval=30)
+
+
+def test_standalone_redis_client_can_use_blocking_connection_pool():
+    mock_cfg = Mock()
+    mock_cfg.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_pool_blocking=True, db_pool_timeout=5.0, db_socket_timeout=1.5)
+    with patch('ricsdl.backend.redis.Redis') as mock_redis, patch(
+            'ricsdl.backend.redis.BlockingConnectionPool') as mock_pool, patch(
+            'ricsdl.backend.redis.PubSub'):
+        ricsdl.backend.get_backend_instance(mock_cfg)
+    mock_pool.assert_called_once_with(host='service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                      port='6379', db=0, max_connections=20, timeout=5.0,
+                                      socket_timeout=1.5)
+    mock_redis.assert_called_once_with(connection_pool=mock_pool.return_value)
+
+
+def test_sentinel_redis_client_uses_configured_connection_options():
+    mock_cfg = Mock()
+    mock_cfg.get_params.return_value = get_test_sdl_sentinel_config()._replace(
+        db_max_connections=50, db_pool_blocking=True, db_socket_timeout=1.5)
+    with patch('ricsdl.backend.redis.Sentinel') as mock_sentinel, patch(
+            'ricsdl.backend.redis.PubSub'):
+        ricsdl.backend.get_backend_instance(mock_cfg)
+    mock_sentinel.assert_called_once_with([('service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                                            '26379')], socket_timeout=1.5)
+    mock_sentinel.return_value.master_for.assert_called_once_with(
+        'dbaasmaster', max_connections=50,
+        connection_pool_class=ricsdl.backend.redis._BlockingSentinelConnectionPool)
+
+
+def test_blocking_sentinel_connection_pool_waits_for_free_connection():
+    pool = ricsdl.backend.redis._BlockingSentinelConnectionPool('dbaasmaster', Mock(),
+                                                                max_connections=1,
+                                                                timeout=0.01)
+    pool.pool.get()
+    with pytest.raises(redis_exceptions.ConnectionError, match='No connection available'):
+        pool.get_connection('GET')
+    pool.disconnect(inuse_connections=False)
+
+
+@pytest.fixture(params=[DbReadPreference.REPLICA_PREFERRED, DbReadPreference.REPLICA])
+def redis_backend_read_preference_fixture(request, redis_backend_common_fixture):
+    request.cls.read_preference = request.param
+    configuration = Mock()
+    configuration.get_event_separator.return_value = EVENT_SEPARATOR
+    configuration.get_params.return_value = get_test_sdl_sentinel_config()._replace(
+        db_read_preference=request.param)
+    with patch('ricsdl.backend.redis.Sentinel') as mock_sentinel, patch(
+            'ricsdl.backend.redis.PubSub'):
+        request.cls.db = ricsdl.backend.get_backend_instance(configuration)
+    request.cls.mock_sentinel = mock_sentinel.return_value
+    request.cls.mock_master = mock_sentinel.return_value.master_for.return_value
+    request.cls.mock_replica = mock_sentinel.return_value.slave_for.return_value
+
+
+@pytest.mark.usefixtures('redis_backend_read_preference_fixture')
+class TestRedisBackendReadPreference:
+    def test_replica_client_is_created_by_sentinel(self):
+        self.mock_sentinel.slave_for.assert_called_once_with('dbaasmaster')
+
+    def test_read_functions_read_from_replica(self):
+        self.mock_replica.mget.return_value = self.dl_redis
+        self.mock_replica.keys.return_value = self.matchedkeys_redis
+        self.mock_replica.smembers.return_value = self.groupmembers
+        self.mock_replica.sismember.return_value = True
+        self.mock_replica.scard.return_value = 2
+        assert self.db.get(self.ns, self.keys) == self.dm
+        assert self.db.find_keys(self.ns, self.keypattern) == self.matchedkeys
+        assert self.db.get_members(self.ns, self.group) == self.groupmembers
+        assert self.db.is_member(self.ns, self.group, self.groupmember) is True
+        assert self.db.group_size(self.ns, self.group) == 2
+        assert not self.mock_master.mget.called
+        assert not self.mock_master.keys.called
+        assert not self.mock_master.smembers.called
+        assert not self.mock_master.sismember.called
+        assert not self.mock_master.scard.called
+
+    def test_write_functions_write_to_master(self):
+        self.db.set(self.ns, self.dm)
+        self.db.add_member(self.ns, self.group, self.groupmembers)
+        self.mock_master.mset.assert_called_once_with(self.dm_redis)
+        self.mock_master.sadd.assert_called_once_with(self.group_redis, *self.groupmembers)
+        assert not self.mock_replica.mset.called
+        assert not self.mock_replica.sadd.called
+
+    def test_read_function_falls_back_to_master_if_replica_fails(self):
+        self.mock_replica.mget.side_effect = redis_exceptions.ConnectionError('replica down')
+        self.mock_master.mget.return_value = self.dl_redis
+        if self.read_preference == DbReadPreference.REPLICA_PREFERRED:
+            assert self.db.get(self.ns, self.keys) == self.dm
+            self.mock_master.mget.assert_called_once_with(self.keys_redis)
+        else:
+            with pytest.raises(ricsdl.exceptions.NotConnected):
+                self.db.get(self.ns, self.keys)
+            assert not self.mock_master.mget.called
+
+    def test_iter_keys_function_scans_replica(self):
+        self.mock_replica.scan.side_effect = [(7, [self.matchedkeys_redis[0]]),
+                                              (0, [self.matchedkeys_redis[1]])]
+        assert list(self.db.iter_keys(self.ns, self.keypattern, 10)) == self.matchedkeys
+        assert self.mock_replica.scan.call_args_list == [
+            call(0, match=self.keypattern_redis, count=10),
+            call(7, match=self.keypattern_redis, count=10),
+        ]
+        assert not self.mock_master.scan.called
+
+    def test_iter_keys_function_continues_scan_in_master_if_replica_fails(self):
+        self.mock_replica.scan.side_effect = redis_exceptions.ConnectionError('replica down')
+        self.mock_master.scan.side_effect = [(7, [self.matchedkeys_redis[0]]),
+                                             (0, [self.matchedkeys_redis[1]])]
+        if self.read_preference == DbReadPreference.REPLICA_PREFERRED:
+            assert list(self.db.iter_keys(self.ns, self.keypattern, 10)) == self.matchedkeys
+            assert self.mock_master.scan.call_count == 2
+            self.mock_replica.scan.assert_called_once()
+        else:
+            with pytest.raises(ricsdl.exceptions.NotConnected):
+                list(self.db.iter_keys(self.ns, self.keypattern, 10))
+            assert not self.mock_master.scan.called
+
+    def test_remove_all_in_batches_function_scans_master(self):
+        self.mock_master.scan.return_value = (0, self.matchedkeys_redis)
+        self.mock_master.unlink.return_value = len(self.matchedkeys_redis)
+        assert self.db.remove_all_in_batches(self.ns, 10, None) == len(self.matchedkeys_redis)
+        self.mock_master.unlink.assert_called_once_with(*self.matchedkeys_redis)
+        assert not self.mock_replica.scan.called
+
+    def test_read_function_of_tracked_namespace_reads_from_master(self):
+        with patch('ricsdl.backend.redis._InvalidationTracker'):
+            self.db.track_namespace(self.ns, Mock())
+        self.mock_master.mget.return_value = self.dl_redis
+        assert self.db.get(self.ns, self.keys) == self.dm
+        assert not self.mock_replica.mget.called
+
+    def test_close_function_closes_replica_client(self):
+        self.db.close()
+        self.mock_master.close.assert_called_with()
+        self.mock_replica.close.assert_called_with()
+
+
+def test_standalone_redis_ignores_read_preference():
+    mock_cfg = Mock()
+    mock_cfg.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_read_preference=DbReadPreference.REPLICA)
+    with patch('ricsdl.backend.redis.Redis') as mock_redis, patch('ricsdl.backend.redis.PubSub'):
+        db = ricsdl.backend.get_backend_instance(mock_cfg)
+    mock_redis.return_value.mget.return_value = [b'1']
+    assert db.get('some-ns', ['a']) == {'a': b'1'}
+
+
+@pytest.fixture()
+def redis_cluster_backend_fixture(request, redis_backend_common_fixture):
+    configuration = Mock()
+    configuration.get_event_separator.return_value = EVENT_SEPARATOR
+    configuration.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_type=DbBackendType.REDIS_CLUSTER,
+        db_cluster_addrs=['service-ricplt-dbaas-tcp-cluster-0.ricplt',
+                          'service-ricplt-dbaas-tcp-cluster-1.ricplt'],
+        db_socket_timeout=1.5)
+    with patch('ricsdl.backend.redis._RedisClusterClient') as mock_cluster, patch(
+            'ricsdl.backend.redis.PubSub') as mock_pubsub:
+        request.cls.db = ricsdl.backend.get_backend_instance(configuration)
+    request.cls.mock_cluster_class = mock_cluster
+    request.cls.mock_redis = mock_cluster.return_value
+    request.cls.mock_pubsub_class = mock_pubsub
+
+
+@pytest.mark.usefixtures('redis_cluster_backend_fixture')
+class TestRedisClusterBackend:
+    def test_cluster_client_is_created_with_startup_nodes(self):
+        kwargs = self.mock_cluster_class.call_args.kwargs
+        assert [(n.host, n.port) for n in kwargs['startup_nodes']] == [
+            ('service-ricplt-dbaas-tcp-cluster-0.ricplt', 6379),
+            ('service-ricplt-dbaas-tcp-cluster-1.ricplt', 6379)]
+        assert kwargs['read_from_replicas'] is False
+        assert kwargs['max_connections'] == 20
+        assert kwargs['socket_timeout'] == 1.5
+        assert len(self.db.clients) == 1
+        assert self.db.ns_sharding is None
+        assert self.db.get_client_index('some-ns') == 0
+
+    def test_events_are_received_from_default_node(self):
+        default_node = self.mock_redis.get_default_node.return_value
+        self.mock_pubsub_class.assert_called_once_with(
+            EVENT_SEPARATOR, default_node.redis_connection.connection_pool,
+            ignore_subscribe_messages=True)
+
+    def test_functions_use_cluster_client_for_every_namespace(self):
+        self.mock_redis.mget.return_value = self.dl_redis
+        assert self.db.get(self.ns, self.keys) == self.dm
+        assert self.db.get('other-ns', self.keys) == self.dm
+        self.db.set(self.ns, self.dm)
+        self.mock_redis.mset.assert_called_once_with(self.dm_redis)
+
+    def test_track_namespace_function_tracks_keys_in_node_of_namespace(self):
+        node = self.mock_redis.get_node_from_key.return_value
+        node.name = 'dbaas-1:6379'
+        with patch('ricsdl.backend.redis._InvalidationTracker') as mock_tracker:
+            self.db.track_namespace(self.ns, Mock())
+        self.mock_redis.get_node_from_key.assert_called_once_with(b'{some-ns},')
+        mock_tracker.assert_called_once_with(self.mock_redis.get_redis_connection.return_value,
+                                             ANY)
+        self.mock_redis.get_redis_connection.assert_called_once_with(node)
+        mock_tracker.return_value.add_prefix.assert_called_once_with(b'{some-ns},')
+        assert self.db.clients[0].invalidation_trackers == {'dbaas-1:6379':
+                                                            mock_tracker.return_value}
+
+
+@pytest.fixture(params=[DbReadPreference.REPLICA_PREFERRED, DbReadPreference.REPLICA])
+def redis_cluster_read_preference_fixture(request, redis_backend_common_fixture):
+    request.cls.read_preference = request.param
+    configuration = Mock()
+    configuration.get_event_separator.return_value = EVENT_SEPARATOR
+    configuration.get_params.return_value = get_test_sdl_standby_config()._replace(
+        db_type=DbBackendType.REDIS_CLUSTER,
+        db_cluster_addrs=['service-ricplt-dbaas-tcp-cluster-0.ricplt'],
+        db_read_preference=request.param)
+    with patch('ricsdl.backend.redis._RedisClusterClient') as mock_cluster, patch(
+            'ricsdl.backend.redis.PubSub'):
+        request.cls.db = ricsdl.backend.get_backend_instance(configuration)
+    request.cls.mock_cluster_class = mock_cluster
+    request.cls.mock_master = mock_cluster.return_value
+    request.cls.mock_replica = mock_cluster.return_value.replica_reads_client.return_value
+
+
+@pytest.mark.usefixtures('redis_cluster_read_preference_fixture')
+class TestRedisClusterBackendReadPreference:
+    def test_cluster_client_reads_from_master_by_default(self):
+        kwargs = self.mock_cluster_class.call_args.kwargs
+        assert kwargs['read_from_replicas'] is False
+        assert kwargs['readonly_connections'] is True
+        assert self.db.clients[0].replica_client is self.mock_replica
+
+    def test_read_functions_read_from_replica(self):
+        self.mock_replica.mget.return_value = self.dl_redis
+        self.mock_replica.smembers.return_value = self.groupmembers
+        assert self.db.get(self.ns, self.keys) == self.dm
+        assert self.db.get_members(self.ns, self.group) == self.groupmembers
+        assert not self.mock_master.mget.called
+        assert not self.mock_master.smembers.called
+
+    def test_read_function_falls_back_to_master_if_replica_fails(self):
+        self.mock_replica.mget.side_effect = redis_exceptions.ConnectionError('replica down')
+        self.mock_master.mget.return_value = self.dl_redis
+        if self.read_preference == DbReadPreference.REPLICA_PREFERRED:
+            assert self.db.get(self.ns, self.keys) == self.dm
+            self.mock_master.mget.assert_called_once_with(self.keys_redis)
+        else:
+            with pytest.raises(ricsdl.exceptions.NotConnected):
+                self.db.get(self.ns, self.keys)
+            assert not self.mock_master.mget.called
+
+    def test_tracked_namespace_is_read_from_master(self):
+        with patch('ricsdl.backend.redis._InvalidationTracker'):
+            self.db.track_namespace(self.ns, Mock())
+        self.mock_master.mget.return_value = self.dl_redis
+        assert self.db.get(self.ns, self.keys) == self.dm
+        self.mock_master.mget.assert_called_once_with(self.keys_redis)
+        assert not self.mock_replica.mget.called
+
 
 def test_standalone_redis_init_exception_is_mapped_to_sdl_exeception():
     mock_cfg = Mock()
@@ -870,3 +1666,55 @@ def setup_class(cls):
     def test_handle_pubsub_message(self):
         assert self.pubsub.handle_message([b'message', b'{some-ns},ch1', b'cbn']) == ('ch1', ['cbn'])
         self.pubsub.channels.get(b'{some-ns},ch1').assert_called_once_with('ch1', ['cbn'])
+
+
+class TestPubSubHandleMessages:
+    def setup_method(self):
+        self.pubsub = ricsdl.backend.redis.PubSub(EVENT_SEPARATOR, Mock())
+        self.batch_cb = Mock()
+        self.cb = Mock()
+        batch_handler = ricsdl.backend.redis._BatchHandler(self.batch_cb)
+        self.pubsub.channels = {b'{some-ns},ch1': batch_handler,
+                                b'{some-ns},ch2': batch_handler,
+                                b'{some-ns},ch3': self.cb}
+        self.pubsub.subscribed_event.set()
+
+    def test_handle_messages_function_delivers_drained_events_as_one_batch(self):
+        responses = [[b'message', b'{some-ns},ch1', EVENT_SEPARATOR.join(['ev1', 'ev2']).encode()],
+                     [b'message', b'{some-ns},ch3', b'ev3'],
+                     [b'message', b'{some-ns},ch2', b'ev4'],
+                     [b'message', b'{some-ns},ch1', b'ev5'],
+                     None]
+        with patch.object(self.pubsub, 'parse_response', side_effect=responses) as mock_parse, \
+                patch.object(self.pubsub, 'handle_message',
+                             wraps=self.pubsub.handle_message) as mock_handle:
+            assert self.pubsub.handle_messages(1.0, 100) == 4
+        assert mock_parse.call_args_list == [call(block=False, timeout=1.0)] + \
+            [call(block=False, timeout=0.0)] * 4
+        self.batch_cb.assert_called_once_with([('ch1', ['ev1', 'ev2']), ('ch2', ['ev4']),
+                                               ('ch1', ['ev5'])])
+        # Only the event of the channel without a batch callback is handled one by one.
+        mock_handle.assert_called_once_with([b'message', b'{some-ns},ch3', b'ev3'],
+                                            ignore_subscribe_messages=True)
+        self.cb.assert_called_once_with('ch3', ['ev3'])
+
+    def test_handle_messages_function_reads_at_most_max_messages(self):
+        responses = [[b'message', b'{some-ns},ch1', 'ev{}'.format(idx).encode()]
+                     for idx in range(3)]
+        with patch.object(self.pubsub, 'parse_response', side_effect=responses):
+            assert self.pubsub.handle_messages(1.0, 2) == 2
+        self.batch_cb.assert_called_once_with([('ch1', ['ev0']), ('ch1', ['ev1'])])
+
+    def test_handle_messages_function_delivers_read_events_if_connection_fails(self):
+        responses = [[b'message', b'{some-ns},ch1', b'ev1'],
+                     redis_exceptions.ConnectionError('redis error!')]
+        with patch.object(self.pubsub, 'parse_response', side_effect=responses):
+            with pytest.raises(redis_exceptions.ConnectionError):
+                self.pubsub.handle_messages(1.0, 100)
+        self.batch_cb.assert_called_once_with([('ch1', ['ev1'])])
+
+    def test_handle_messages_function_returns_if_not_subscribed(self):
+        self.pubsub.subscribed_event.clear()
+        with patch.object(self.pubsub, 'parse_response') as mock_parse:
+            assert self.pubsub.handle_messages(0.01, 100) == 0
+        mock_parse.assert_not_called()
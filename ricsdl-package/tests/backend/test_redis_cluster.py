@@ -0,0 +1,190 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import inspect
+from unittest.mock import patch, Mock, call
+import pytest
+from redis import exceptions as redis_exceptions
+from redis.cluster import (ClusterNode, ClusterPipeline, RedisCluster)
+from ricsdl.backend.redis_cluster import (_RedisClusterClient, _create_startup_nodes,
+                                         _get_routing_arg)
+
+
+@pytest.fixture()
+def redis_cluster_client_fixture(request):
+    with patch('redis.cluster.NodesManager') as mock_nodes_manager, patch(
+            'redis.cluster.CommandsParser') as mock_commands_parser:
+        request.cls.client = _RedisClusterClient(startup_nodes=[ClusterNode('dbaas-0', 6379)])
+    request.cls.mock_nodes_manager = mock_nodes_manager.return_value
+    request.cls.mock_node = request.cls.mock_nodes_manager.get_node_from_slot.return_value
+    request.cls.mock_node_redis = request.cls.mock_node.redis_connection
+    # Keys of the multi-key commands of the tests, as returned by Redis COMMAND GETKEYS.
+    request.cls.mock_commands_parser = mock_commands_parser.return_value
+    request.cls.mock_commands_parser.get_keys.side_effect = (
+        lambda conn, *args: list(args[1::2]) if args[0] == 'MSET' else list(args[1:]))
+    request.cls.slot = request.cls.client.keyslot('{some-ns},a')
+
+
+@pytest.mark.usefixtures('redis_cluster_client_fixture')
+class TestRedisClusterClient:
+    def test_determine_slot_function_returns_slot_of_namespace_of_dbaas_commands(self):
+        assert self.client.keyslot('{some-ns},b') == self.slot
+        assert self.client.determine_slot('SETIE', '{some-ns},a', b'2', b'1') == self.slot
+        assert self.client.determine_slot('MSETMPUB', 1, 1, '{some-ns},a', b'1',
+                                          '{some-ns},ch', 'ev') == self.slot
+        assert self.client.determine_slot('DELMPUB', 0, 1, '{some-ns},ch', 'ev') == self.slot
+        assert self.client.determine_slot('PUBLISH', '{some-ns},ch', 'ev') == self.slot
+        assert not self.mock_commands_parser.get_keys.called
+
+    def test_determine_nodes_function_routes_keys_and_scan_to_node_of_namespace(self):
+        assert self.client._determine_nodes('KEYS', '{some-ns},*') == [self.mock_node]
+        assert self.client._determine_nodes('SCAN', 0, b'MATCH', '{some-ns},*',
+                                            b'COUNT', 10) == [self.mock_node]
+        self.mock_nodes_manager.get_node_from_slot.assert_has_calls([
+            call(self.slot, server_type=None), call(self.slot, server_type=None)])
+
+    def test_determine_nodes_function_leaves_reads_to_redis_py_in_primary_reading_client(self):
+        with patch.object(RedisCluster, '_determine_nodes') as mock_determine_nodes:
+            assert self.client._determine_nodes('MGET', '{some-ns},a') == \
+                mock_determine_nodes.return_value
+        mock_determine_nodes.assert_called_once_with('MGET', '{some-ns},a')
+
+    def test_replica_reads_client_routes_reads_to_replica_of_slot(self):
+        replica_client = self.client.replica_reads_client()
+        assert replica_client.nodes_manager is self.client.nodes_manager
+        assert not self.client.replica_reads
+        assert replica_client._determine_nodes('MGET', '{some-ns},a') == [self.mock_node]
+        assert replica_client._determine_nodes('SCAN', 0, b'MATCH', '{some-ns},*',
+                                               b'COUNT', 10) == [self.mock_node]
+        self.mock_nodes_manager.get_node_from_slot.assert_has_calls([
+            call(self.slot, server_type='replica'), call(self.slot, server_type='replica')])
+
+    def test_replica_reads_client_routes_writes_to_primary(self):
+        replica_client = self.client.replica_reads_client()
+        with patch.object(RedisCluster, '_determine_nodes') as mock_determine_nodes:
+            replica_client._determine_nodes('MSET', '{some-ns},a', b'1')
+        mock_determine_nodes.assert_called_once_with('MSET', '{some-ns},a', b'1')
+        assert not self.mock_nodes_manager.get_node_from_slot.called
+
+    def test_replica_reads_client_does_not_close_shared_nodes(self):
+        self.client.replica_reads_client().close()
+        assert not self.mock_nodes_manager.close.called
+        self.client.close()
+        self.mock_nodes_manager.close.assert_called_once_with()
+
+    def test_readonly_connections_are_set_readonly_when_connected(self):
+        self.client.readonly_connections = True
+        mock_conn = Mock()
+        mock_conn.read_response.return_value = b'OK'
+        self.client.on_connect(mock_conn)
+        mock_conn.send_command.assert_called_once_with('READONLY')
+
+    def test_readonly_connection_fails_if_readonly_is_rejected(self):
+        self.client.readonly_connections = True
+        mock_conn = Mock()
+        mock_conn.read_response.return_value = b'ERR'
+        with pytest.raises(redis_exceptions.ConnectionError):
+            self.client.on_connect(mock_conn)
+
+    def test_process_result_function_returns_cursor_of_one_node_scan(self):
+        assert self.client._process_result('SCAN', {'dbaas-0:6379': (5, [b'{some-ns},a'])}) == \
+            (5, [b'{some-ns},a'])
+
+    def test_pipeline_function_returns_pipeline_allowing_multi_key_commands(self):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.mset({'{some-ns},a': b'1', '{some-ns},b': b'2'})
+        pipe.mget(['{some-ns},a', '{some-ns},b'])
+        pipe.delete('{some-ns},a', '{some-ns},b')
+        pipe.publish('{some-ns},ch', 'ev')
+        assert [c.args for c in pipe.command_stack] == [
+            ('MSET', '{some-ns},a', b'1', '{some-ns},b', b'2'),
+            ('MGET', '{some-ns},a', '{some-ns},b'),
+            ('DEL', '{some-ns},a', '{some-ns},b'),
+            ('PUBLISH', '{some-ns},ch', 'ev')]
+
+    def test_pipeline_transaction_is_executed_in_node_of_namespace(self):
+        mock_pipe = self.mock_node_redis.pipeline.return_value
+        mock_pipe.execute.return_value = [True, 2]
+        pipe = self.client.pipeline(transaction=True)
+        pipe.mset({'{some-ns},a': b'1'})
+        pipe.delete('{some-ns},a', '{some-ns},b')
+        assert pipe.execute() == [True, 2]
+        self.mock_node_redis.pipeline.assert_called_once_with(transaction=True)
+        mock_pipe.execute_command.assert_has_calls([call('MSET', '{some-ns},a', b'1'),
+                                                    call('DEL', '{some-ns},a', '{some-ns},b')])
+        assert not pipe.command_stack
+
+    def test_pipeline_transaction_is_retried_after_refreshing_moved_slot(self):
+        mock_pipe = self.mock_node_redis.pipeline.return_value
+        mock_pipe.execute.side_effect = [redis_exceptions.MovedError('1234 dbaas-1:6379'), [2]]
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete('{some-ns},a', '{some-ns},b')
+        assert pipe.execute() == [2]
+        self.mock_nodes_manager.initialize.assert_called_once_with()
+        assert mock_pipe.execute.call_count == 2
+
+    def test_pipeline_transaction_can_fail_if_slot_keeps_moving(self):
+        mock_pipe = self.mock_node_redis.pipeline.return_value
+        mock_pipe.execute.side_effect = redis_exceptions.MovedError('1234 dbaas-1:6379')
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete('{some-ns},a')
+        with pytest.raises(redis_exceptions.MovedError):
+            pipe.execute()
+
+    def test_pipeline_transaction_can_fail_if_commands_map_to_several_slots(self):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete('{some-ns},a')
+        pipe.delete('{other-ns},a')
+        with pytest.raises(redis_exceptions.RedisClusterException):
+            pipe.execute()
+
+
+def test_get_routing_arg_function_returns_none_for_commands_routed_by_redis_py():
+    assert _get_routing_arg(('MGET', '{some-ns},a')) is None
+    assert _get_routing_arg(('SCAN', 0, b'COUNT', 10)) is None
+    assert _get_routing_arg(('DELIE',)) is None
+
+
+def test_create_startup_nodes_function_uses_default_port():
+    nodes = _create_startup_nodes(['dbaas-0', 'dbaas-1'], ['6380'])
+    assert [(n.host, n.port) for n in nodes] == [('dbaas-0', 6380), ('dbaas-1', 6379)]
+
+
+# Internal methods of redis-py overridden or called with keyword arguments by SDL Redis Cluster
+# client. A failure means that redis-py has changed them and the client has to be updated.
+@pytest.mark.parametrize('base, name, params', [
+    (RedisCluster, 'determine_slot', ['self', 'args']),
+    (RedisCluster, '_determine_nodes', ['self', 'args', 'kwargs']),
+    (RedisCluster, '_process_result', ['self', 'command', 'res', 'kwargs']),
+    (RedisCluster, 'pipeline', ['self', 'transaction', 'shard_hint']),
+    (RedisCluster, 'on_connect', ['self', 'connection']),
+    (RedisCluster, 'close', ['self']),
+    (ClusterPipeline, 'determine_slot', ['self', 'args']),
+    (ClusterPipeline, '_determine_nodes', ['self', 'args', 'kwargs']),
+    (ClusterPipeline, '_process_result', ['self', 'command', 'res', 'kwargs']),
+    (ClusterPipeline, 'execute', ['self', 'raise_on_error']),
+    (ClusterPipeline, '__init__', ['self', 'nodes_manager', 'commands_parser', 'result_callbacks',
+                                   'cluster_response_callbacks', 'startup_nodes',
+                                   'read_from_replicas', 'cluster_error_retry_attempts',
+                                   'reinitialize_steps', 'lock', 'kwargs']),
+])
+def test_overridden_redis_py_methods_have_expected_signatures(base, name, params):
+    assert list(inspect.signature(getattr(base, name)).parameters) == params
@@ -0,0 +1,358 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import asyncio
+import inspect
+from unittest.mock import patch, Mock, AsyncMock
+import pytest
+from ricsdl.asyncstorage import AsyncStorage
+from ricsdl.asyncstorage import AsyncLock
+from ricsdl.exceptions import (SdlTypeError, NotConnected, RejectedByBackend)
+
+EVENT_SEPARATOR = "___"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture()
+def async_storage_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.key = 'a'
+    request.cls.keys = {'a', 'b'}
+    request.cls.dm = {'b': b'2', 'a': b'1'}
+    request.cls.old_data = b'1'
+    request.cls.new_data = b'3'
+    request.cls.keyprefix = 'x'
+    request.cls.matchedkeys = ['x1', 'x2', 'x3', 'x4', 'x5']
+    request.cls.group = 'some-group'
+    request.cls.groupmembers = set([b'm1', b'm2'])
+    request.cls.groupmember = b'm1'
+    request.cls.lock_name = 'some-lock-name'
+    request.cls.lock_int_expiration = 10
+    request.cls.channels = {'abs', 'cbn'}
+    request.cls.channels_and_events = {'ch1': 'ev1', 'ch2': ['ev1', 'ev2', 'ev3']}
+    request.cls.ill_event = "illegal" + EVENT_SEPARATOR + "ev"
+
+    with patch('ricsdl.backend.get_async_backend_instance') as mock_db_backend:
+        mock_db_backend.return_value = AsyncMock()
+        storage = AsyncStorage()
+        request.cls.mock_db_backend = mock_db_backend.return_value
+    request.cls.storage = storage
+    yield
+
+
+@pytest.mark.usefixtures('async_storage_fixture')
+class TestAsyncStorage:
+    def test_is_active_function_success(self):
+        self.mock_db_backend.is_connected.return_value = True
+        ret = run(self.storage.is_active())
+        self.mock_db_backend.is_connected.assert_awaited_once()
+        assert ret is True
+
+    def test_is_active_function_can_catch_backend_exception_and_return_false(self):
+        self.mock_db_backend.is_connected.side_effect = NotConnected
+        ret = run(self.storage.is_active())
+        assert ret is False
+
+    def test_close_function_success(self):
+        run(self.storage.close())
+        self.mock_db_backend.close.assert_awaited_once()
+
+    def test_set_function_success(self):
+        run(self.storage.set(self.ns, self.dm))
+        self.mock_db_backend.set.assert_awaited_once_with(self.ns, self.dm)
+
+    def test_functions_raise_exception_for_wrong_argument_when_awaited(self):
+        assert inspect.iscoroutinefunction(AsyncStorage.get)
+        assert inspect.iscoroutinefunction(AsyncStorage.set)
+        coro = self.storage.get(0xbad, self.keys)
+        with pytest.raises(SdlTypeError):
+            run(coro)
+        self.mock_db_backend.get.assert_not_awaited()
+
+    def test_set_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            run(self.storage.set(123, {'a': b'v1'}))
+        with pytest.raises(SdlTypeError):
+            run(self.storage.set('ns', {0xbad: b'v1'}))
+        with pytest.raises(SdlTypeError):
+            run(self.storage.set('ns', {'a': 0xbad}))
+
+    def test_set_function_does_not_validate_data_map_items_of_trusted_caller(self):
+        with patch('ricsdl.backend.get_async_backend_instance') as mock_db_backend:
+            mock_db_backend.return_value = AsyncMock()
+            storage = AsyncStorage(trusted_caller=True)
+        run(storage.set(self.ns, {'a': 'not bytes'}))
+        mock_db_backend.return_value.set.assert_awaited_once_with(self.ns, {'a': 'not bytes'})
+        with pytest.raises(SdlTypeError):
+            run(storage.set(123, {'a': b'v1'}))
+
+    def test_publish_functions_do_not_validate_channels_and_events_of_trusted_caller(self):
+        with patch('ricsdl.backend.get_async_backend_instance') as mock_db_backend:
+            mock_db_backend.return_value = AsyncMock()
+            storage = AsyncStorage(trusted_caller=True)
+        run(storage.set_and_publish(self.ns, {'ch1': ['ev1___ev2']}, {'a': b'v1'}))
+        run(storage.remove_and_publish(self.ns, {0xbad: 'ev1'}, 'a'))
+        mock_db_backend.return_value.set_and_publish.assert_awaited_once_with(
+            self.ns, {'ch1': ['ev1___ev2']}, {'a': b'v1'})
+        mock_db_backend.return_value.remove_and_publish.assert_awaited_once_with(
+            self.ns, {0xbad: ['ev1']}, ['a'])
+
+    def test_set_if_function_success(self):
+        self.mock_db_backend.set_if.return_value = True
+        ret = run(self.storage.set_if(self.ns, self.key, self.old_data, self.new_data))
+        self.mock_db_backend.set_if.assert_awaited_once_with(self.ns, self.key, self.old_data,
+                                                             self.new_data)
+        assert ret is True
+
+    def test_set_if_not_exists_function_success(self):
+        self.mock_db_backend.set_if_not_exists.return_value = True
+        ret = run(self.storage.set_if_not_exists(self.ns, self.key, self.new_data))
+        self.mock_db_backend.set_if_not_exists.assert_awaited_once_with(self.ns, self.key,
+                                                                        self.new_data)
+        assert ret is True
+
+    def test_get_function_success(self):
+        self.mock_db_backend.get.return_value = self.dm
+        ret = run(self.storage.get(self.ns, self.keys))
+        call_args = self.mock_db_backend.get.call_args[0]
+        assert call_args[0] == self.ns
+        assert len(call_args[1]) == len(self.keys)
+        assert all(k in call_args[1] for k in self.keys)
+        assert ret == self.dm
+        # Validate that SDL returns a dictionary with keys in alphabetical order
+        assert sorted(self.dm)[0] == list(ret.keys())[0]
+
+    def test_get_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            run(self.storage.get(0xbad, self.keys))
+        with pytest.raises(SdlTypeError):
+            run(self.storage.get(self.ns, 0xbad))
+
+    def test_find_keys_function_success(self):
+        self.mock_db_backend.find_keys.return_value = self.matchedkeys
+        ret = run(self.storage.find_keys(self.ns, self.keyprefix))
+        self.mock_db_backend.find_keys.assert_awaited_once_with(self.ns, self.keyprefix)
+        assert ret == self.matchedkeys
+
+    def test_find_and_get_function_success(self):
+        self.mock_db_backend.find_and_get.return_value = self.dm
+        ret = run(self.storage.find_and_get(self.ns, self.keyprefix))
+        self.mock_db_backend.find_and_get.assert_awaited_once_with(self.ns, self.keyprefix)
+        assert ret == self.dm
+        assert sorted(self.dm)[0] == list(ret.keys())[0]
+
+    def test_remove_function_success(self):
+        run(self.storage.remove(self.ns, self.keys))
+        call_args = self.mock_db_backend.remove.call_args[0]
+        assert call_args[0] == self.ns
+        assert sorted(call_args[1]) == sorted(self.keys)
+
+    def test_remove_if_function_success(self):
+        self.mock_db_backend.remove_if.return_value = True
+        ret = run(self.storage.remove_if(self.ns, self.key, self.new_data))
+        self.mock_db_backend.remove_if.assert_awaited_once_with(self.ns, self.key, self.new_data)
+        assert ret is True
+
+    def test_remove_all_function_success(self):
+        self.mock_db_backend.find_keys.return_value = ['a1']
+        run(self.storage.remove_all(self.ns))
+        self.mock_db_backend.find_keys.assert_awaited_once_with(self.ns, '*')
+        self.mock_db_backend.remove.assert_awaited_once_with(self.ns, ['a1'])
+
+    def test_remove_all_function_does_not_remove_when_no_keys_found(self):
+        self.mock_db_backend.find_keys.return_value = []
+        run(self.storage.remove_all(self.ns))
+        self.mock_db_backend.remove.assert_not_awaited()
+
+    def test_group_functions_success(self):
+        run(self.storage.add_member(self.ns, self.group, self.groupmembers))
+        self.mock_db_backend.add_member.assert_awaited_once_with(self.ns, self.group,
+                                                                 self.groupmembers)
+        run(self.storage.remove_member(self.ns, self.group, self.groupmembers))
+        self.mock_db_backend.remove_member.assert_awaited_once_with(self.ns, self.group,
+                                                                    self.groupmembers)
+        self.mock_db_backend.get_members.return_value = self.groupmembers
+        assert run(self.storage.get_members(self.ns, self.group)) == self.groupmembers
+        self.mock_db_backend.is_member.return_value = True
+        assert run(self.storage.is_member(self.ns, self.group, self.groupmember)) is True
+        self.mock_db_backend.group_size.return_value = 2
+        assert run(self.storage.group_size(self.ns, self.group)) == 2
+        run(self.storage.remove_group(self.ns, self.group))
+        self.mock_db_backend.remove_group.assert_awaited_once_with(self.ns, self.group)
+
+    def test_group_functions_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            run(self.storage.add_member(self.ns, 0xbad, self.groupmembers))
+        with pytest.raises(SdlTypeError):
+            run(self.storage.is_member(self.ns, self.group, 0xbad))
+
+    def test_set_and_publish_success(self):
+        run(self.storage.set_and_publish(self.ns, self.channels_and_events, self.dm))
+        self.mock_db_backend.set_and_publish.assert_awaited_once_with(
+            self.ns, {'ch1': ['ev1'], 'ch2': ['ev1', 'ev2', 'ev3']}, self.dm)
+
+    def test_set_and_publish_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            run(self.storage.set_and_publish(self.ns, {"ch1": self.ill_event}, self.dm))
+        with pytest.raises(SdlTypeError):
+            run(self.storage.set_and_publish(self.ns, {"ch1": ["ev1", 0xbad]}, self.dm))
+
+    def test_set_if_and_publish_success(self):
+        self.mock_db_backend.set_if_and_publish.return_value = True
+        ret = run(self.storage.set_if_and_publish(self.ns, self.channels_and_events, self.key,
+                                                  self.old_data, self.new_data))
+        self.mock_db_backend.set_if_and_publish.assert_awaited_once_with(
+            self.ns, self.channels_and_events, self.key, self.old_data, self.new_data)
+        assert ret is True
+
+    def test_set_if_not_exists_and_publish_success(self):
+        self.mock_db_backend.set_if_not_exists_and_publish.return_value = True
+        ret = run(self.storage.set_if_not_exists_and_publish(self.ns, self.channels_and_events,
+                                                             self.key, self.new_data))
+        self.mock_db_backend.set_if_not_exists_and_publish.assert_awaited_once_with(
+            self.ns, self.channels_and_events, self.key, self.new_data)
+        assert ret is True
+
+    def test_remove_and_publish_success(self):
+        run(self.storage.remove_and_publish(self.ns, self.channels_and_events, self.key))
+        self.mock_db_backend.remove_and_publish.assert_awaited_once_with(
+            self.ns, self.channels_and_events, [self.key])
+
+    def test_remove_if_and_publish_success(self):
+        self.mock_db_backend.remove_if_and_publish.return_value = True
+        ret = run(self.storage.remove_if_and_publish(self.ns, self.channels_and_events, self.key,
+                                                     self.new_data))
+        self.mock_db_backend.remove_if_and_publish.assert_awaited_once_with(
+            self.ns, self.channels_and_events, self.key, self.new_data)
+        assert ret is True
+
+    def test_remove_all_and_publish_success(self):
+        run(self.storage.remove_all_and_publish(self.ns, self.channels_and_events))
+        self.mock_db_backend.remove_all_and_publish.assert_awaited_once_with(
+            self.ns, self.channels_and_events)
+
+    def test_subscribe_function_success(self):
+        async def cb(channel, message):
+            pass
+        run(self.storage.subscribe_channel(self.ns, cb, self.channels))
+        self.mock_db_backend.subscribe_channel.assert_awaited_once_with(
+            self.ns, cb, list(self.channels))
+
+    def test_subscribe_can_raise_exception_for_wrong_argument(self):
+        def cb1(channel):
+            pass
+        with pytest.raises(SdlTypeError):
+            run(self.storage.subscribe_channel(self.ns, cb1, self.channels))
+
+    def test_unsubscribe_function_success(self):
+        run(self.storage.unsubscribe_channel(self.ns, self.channels))
+        self.mock_db_backend.unsubscribe_channel.assert_awaited_once_with(
+            self.ns, list(self.channels))
+
+    def test_start_event_listener_success(self):
+        run(self.storage.start_event_listener())
+        self.mock_db_backend.start_event_listener.assert_awaited()
+
+    def test_handle_events_success(self):
+        run(self.storage.handle_events())
+        self.mock_db_backend.handle_events.assert_awaited()
+
+    @patch('ricsdl.asyncstorage.AsyncLock')
+    def test_get_lock_resource_function_success(self, mock_db_lock):
+        ret = self.storage.get_lock_resource(self.ns, self.lock_name, self.lock_int_expiration)
+        mock_db_lock.assert_called_once_with(self.ns, self.lock_name, self.lock_int_expiration,
+                                             self.storage)
+        assert ret == mock_db_lock.return_value
+
+    def test_get_lock_resource_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            self.storage.get_lock_resource(self.ns, self.lock_name, 'bad')
+
+    def test_get_backend_function_success(self):
+        ret = self.storage.get_backend()
+        assert ret == self.mock_db_backend
+
+    def test_storage_object_string_representation(self):
+        str_out = str(self.storage)
+        assert str_out is not None
+
+
+@pytest.fixture()
+def async_lock_fixture(request):
+    request.cls.expiration = 10
+    request.cls.retry_interval = 0.1
+    request.cls.retry_timeout = 1
+
+    with patch('ricsdl.backend.get_async_backend_lock_instance') as mock_db_backend_lock:
+        mock_db_backend_lock.return_value = AsyncMock()
+        lock = AsyncLock('test-ns', 'test-lock-name', request.cls.expiration, Mock())
+        request.cls.mock_db_backend_lock = mock_db_backend_lock.return_value
+    request.cls.lock = lock
+    yield
+
+
+@pytest.mark.usefixtures('async_lock_fixture')
+class TestAsyncLock:
+    def test_acquire_function_success(self):
+        run(self.lock.acquire(self.retry_interval, self.retry_timeout))
+        self.mock_db_backend_lock.acquire.assert_awaited_once_with(self.retry_interval,
+                                                                   self.retry_timeout)
+
+    def test_acquire_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            run(self.lock.acquire('bad', self.retry_timeout))
+
+    def test_release_function_success(self):
+        run(self.lock.release())
+        self.mock_db_backend_lock.release.assert_awaited_once()
+
+    def test_refresh_function_success(self):
+        run(self.lock.refresh())
+        self.mock_db_backend_lock.refresh.assert_awaited_once()
+
+    def test_get_validity_time_function_success(self):
+        self.mock_db_backend_lock.get_validity_time.return_value = self.expiration
+        ret = run(self.lock.get_validity_time())
+        assert ret == self.expiration
+
+    def test_lock_can_be_used_as_async_context_manager(self):
+        async def _use_lock():
+            async with self.lock:
+                pass
+        self.mock_db_backend_lock.acquire.return_value = True
+        run(_use_lock())
+        self.mock_db_backend_lock.acquire.assert_awaited_once()
+        self.mock_db_backend_lock.release.assert_awaited_once()
+
+    def test_lock_context_manager_raises_exception_if_acquire_fails(self):
+        async def _use_lock():
+            async with self.lock:
+                pass
+        self.mock_db_backend_lock.acquire.return_value = False
+        with pytest.raises(RejectedByBackend):
+            run(_use_lock())
+
+    def test_lock_object_string_representation(self):
+        str_out = str(self.lock)
+        assert str_out is not None
@@ -0,0 +1,100 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+from ricsdl.cache import _ReadCache
+
+
+class TestReadCache:
+    def test_lookup_function_returns_miss_for_unknown_entry(self):
+        cache = _ReadCache(10)
+        assert cache.lookup('ns', 'a', 'get') is _ReadCache.MISS
+
+    def test_store_and_lookup_function_success(self):
+        cache = _ReadCache(10)
+        cache.store('ns', 'a', 'get', b'1', cache.get_epoch('ns'))
+        cache.store('ns', 'a', ('is_member', b'm1'), True, cache.get_epoch('ns'))
+        cache.store('ns', 'b', 'get', None, cache.get_epoch('ns'))
+        assert cache.lookup('ns', 'a', 'get') == b'1'
+        assert cache.lookup('ns', 'a', ('is_member', b'm1')) is True
+        assert cache.lookup('ns', 'b', 'get') is None
+        assert cache.lookup('other-ns', 'a', 'get') is _ReadCache.MISS
+        assert len(cache) == 3
+
+    def test_store_function_evicts_least_recently_used_entry(self):
+        cache = _ReadCache(2)
+        cache.store('ns', 'a', 'get', b'1', cache.get_epoch('ns'))
+        cache.store('ns', 'b', 'get', b'2', cache.get_epoch('ns'))
+        cache.lookup('ns', 'a', 'get')
+        cache.store('ns', 'c', 'get', b'3', cache.get_epoch('ns'))
+        assert len(cache) == 2
+        assert cache.lookup('ns', 'b', 'get') is _ReadCache.MISS
+        assert cache.lookup('ns', 'a', 'get') == b'1'
+        assert cache.lookup('ns', 'c', 'get') == b'3'
+
+    def test_store_function_drops_value_read_before_invalidation(self):
+        cache = _ReadCache(10)
+        epoch = cache.get_epoch('ns')
+        cache.invalidate('ns', ['a'])
+        cache.store('ns', 'a', 'get', b'1', epoch)
+        assert cache.lookup('ns', 'a', 'get') is _ReadCache.MISS
+
+    def test_store_function_keeps_value_read_before_invalidation_of_other_namespace(self):
+        cache = _ReadCache(10)
+        epoch = cache.get_epoch('ns')
+        cache.invalidate('other-ns', ['a'])
+        cache.invalidate('other-ns', None)
+        cache.store('ns', 'a', 'get', b'1', epoch)
+        assert cache.lookup('ns', 'a', 'get') == b'1'
+
+    def test_store_function_drops_value_read_before_clear(self):
+        cache = _ReadCache(10)
+        epoch = cache.get_epoch('ns')
+        cache.clear()
+        cache.store('ns', 'a', 'get', b'1', epoch)
+        assert cache.lookup('ns', 'a', 'get') is _ReadCache.MISS
+
+    def test_invalidate_function_removes_all_entries_of_a_key(self):
+        cache = _ReadCache(10)
+        cache.store('ns', 'a', 'get_members', frozenset([b'm1']), cache.get_epoch('ns'))
+        cache.store('ns', 'a', ('is_member', b'm1'), True, cache.get_epoch('ns'))
+        cache.store('ns', 'b', 'get', b'2', cache.get_epoch('ns'))
+        cache.invalidate('ns', ['a'])
+        assert cache.lookup('ns', 'a', 'get_members') is _ReadCache.MISS
+        assert cache.lookup('ns', 'a', ('is_member', b'm1')) is _ReadCache.MISS
+        assert cache.lookup('ns', 'b', 'get') == b'2'
+        assert len(cache) == 1
+
+    def test_invalidate_function_removes_whole_namespace(self):
+        cache = _ReadCache(10)
+        cache.store('ns', 'a', 'get', b'1', cache.get_epoch('ns'))
+        cache.store('ns', 'b', 'get', b'2', cache.get_epoch('ns'))
+        cache.store('other-ns', 'a', 'get', b'1', cache.get_epoch('other-ns'))
+        cache.invalidate('ns', None)
+        assert cache.lookup('ns', 'a', 'get') is _ReadCache.MISS
+        assert cache.lookup('ns', 'b', 'get') is _ReadCache.MISS
+        assert cache.lookup('other-ns', 'a', 'get') == b'1'
+
+    def test_clear_function_removes_all_entries(self):
+        cache = _ReadCache(10)
+        cache.store('ns', 'a', 'get', b'1', cache.get_epoch('ns'))
+        cache.store('other-ns', 'a', 'get', b'1', cache.get_epoch('other-ns'))
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.lookup('ns', 'a', 'get') is _ReadCache.MISS
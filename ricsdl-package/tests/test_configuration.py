@@ -22,6 +22,9 @@
 import pytest
 from ricsdl.configuration import _Configuration
 from ricsdl.configuration import DbBackendType
+from ricsdl.configuration import DbShardingType
+from ricsdl.configuration import DbReadPreference
+from ricsdl.configuration import EventQueueOverflow
 
 
 @pytest.fixture()
@@ -68,6 +71,152 @@ def test_get_params_function_can_raise_exception_if_wrong_fake_db_type(self):
             _Configuration(fake_db_backend='bad value')
 
 
+    def test_get_params_function_can_return_command_size_limits(self, monkeypatch):
+        monkeypatch.setenv('SDL_MAX_KEYS_PER_COMMAND', '1000')
+        monkeypatch.setenv('SDL_MAX_BYTES_PER_COMMAND', '1048576')
+        params = _Configuration(fake_db_backend=None).get_params()
+        assert params.db_max_keys_per_command == 1000
+        assert params.db_max_bytes_per_command == 1048576
+
+    def test_get_params_function_returns_unlimited_command_size_by_default(self, config_fixture):
+        assert self.config.get_params().db_max_keys_per_command == 0
+        assert self.config.get_params().db_max_bytes_per_command == 0
+
+    def test_get_params_function_can_raise_exception_if_wrong_command_size_limit(self, monkeypatch):
+        monkeypatch.setenv('SDL_MAX_KEYS_PER_COMMAND', 'bad value')
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None)
+        monkeypatch.setenv('SDL_MAX_KEYS_PER_COMMAND', '-1')
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None)
+
+    def test_get_params_function_returns_modulo_sharding_by_default(self, config_fixture):
+        assert self.config.get_params().db_sharding == DbShardingType.MODULO
+        assert self.config.get_params().db_sharding_vnodes == 160
+        assert self.config.get_params().db_sharding_weights is None
+
+    def test_get_params_function_can_return_sharding_configuration(self, config_fixture,
+                                                                   monkeypatch):
+        monkeypatch.setenv('SDL_NS_SHARDING', 'Consistent')
+        monkeypatch.setenv('SDL_NS_SHARDING_VNODES', '64')
+        monkeypatch.setenv('SDL_NS_SHARDING_WEIGHTS', '2.5')
+        params = _Configuration(fake_db_backend=None).get_params()
+        assert params.db_sharding == DbShardingType.CONSISTENT
+        assert params.db_sharding_vnodes == 64
+        assert params.db_sharding_weights == [2.5, 1.0]
+
+    def test_get_params_function_can_raise_exception_if_wrong_sharding(self, config_fixture,
+                                                                       monkeypatch):
+        monkeypatch.setenv('SDL_NS_SHARDING', 'bad value')
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None)
+        monkeypatch.setenv('SDL_NS_SHARDING', 'rendezvous')
+        for weights in ['1,2,3', '1,0', 'bad value']:
+            monkeypatch.setenv('SDL_NS_SHARDING_WEIGHTS', weights)
+            with pytest.raises(ValueError, match=r"Configuration error"):
+                _Configuration(fake_db_backend=None)
+
+    def test_get_params_function_returns_default_connection_options(self, config_fixture):
+        params = self.config.get_params()
+        assert params.db_max_connections is None
+        assert params.db_pool_blocking is False
+        assert params.db_pool_timeout is None
+        assert params.db_socket_timeout is None
+        assert params.db_socket_connect_timeout is None
+        assert params.db_socket_keepalive is False
+        assert params.db_health_check_interval == 0
+
+    def test_get_params_function_can_return_connection_options(self, config_fixture,
+                                                               monkeypatch):
+        monkeypatch.setenv('SDL_DB_MAX_CONNECTIONS', '100')
+        monkeypatch.setenv('SDL_DB_POOL_BLOCKING', 'true')
+        monkeypatch.setenv('SDL_DB_POOL_TIMEOUT', '2.5')
+        monkeypatch.setenv('SDL_DB_SOCKET_TIMEOUT', '1')
+        monkeypatch.setenv('SDL_DB_SOCKET_CONNECT_TIMEOUT', '0.5')
+        monkeypatch.setenv('SDL_DB_SOCKET_KEEPALIVE', 'yes')
+        monkeypatch.setenv('SDL_DB_HEALTH_CHECK_INTERVAL', '30')
+        params = _Configuration(fake_db_backend=None,
+                                db_socket_timeout=3, db_pool_blocking=False).get_params()
+        assert params.db_max_connections == 100
+        assert params.db_pool_blocking is False
+        assert params.db_pool_timeout == 2.5
+        assert params.db_socket_timeout == 3.0
+        assert params.db_socket_connect_timeout == 0.5
+        assert params.db_socket_keepalive is True
+        assert params.db_health_check_interval == 30
+
+    def test_get_params_function_can_raise_exception_if_wrong_connection_option(self,
+                                                                                config_fixture,
+                                                                                monkeypatch):
+        for name, value in [('SDL_DB_MAX_CONNECTIONS', '1.5'), ('SDL_DB_POOL_BLOCKING', 'maybe'),
+                            ('SDL_DB_SOCKET_TIMEOUT', '-1'), ('SDL_DB_POOL_TIMEOUT', 'bad')]:
+            monkeypatch.setenv(name, value)
+            with pytest.raises(ValueError, match=r"Configuration error"):
+                _Configuration(fake_db_backend=None)
+            monkeypatch.delenv(name)
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None, db_socket_timeout='bad')
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None, db_max_connections=True)
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None, db_unknown_option=1)
+
+    def test_get_params_function_can_return_read_preference(self, config_fixture, monkeypatch):
+        assert self.config.get_params().db_read_preference == DbReadPreference.MASTER
+        monkeypatch.setenv('SDL_DB_READ_PREFERENCE', 'replica-preferred')
+        params = _Configuration(fake_db_backend=None).get_params()
+        assert params.db_read_preference == DbReadPreference.REPLICA_PREFERRED
+        params = _Configuration(fake_db_backend=None,
+                                db_read_preference=DbReadPreference.REPLICA).get_params()
+        assert params.db_read_preference == DbReadPreference.REPLICA
+        params = _Configuration(fake_db_backend=None, db_read_preference='master').get_params()
+        assert params.db_read_preference == DbReadPreference.MASTER
+
+    def test_get_params_function_can_raise_exception_if_wrong_read_preference(self,
+                                                                              config_fixture,
+                                                                              monkeypatch):
+        monkeypatch.setenv('SDL_DB_READ_PREFERENCE', 'slave')
+        with pytest.raises(ValueError, match=r"Configuration error.*replica-preferred"):
+            _Configuration(fake_db_backend=None)
+
+    def test_get_params_function_can_return_fake_db_event_queue_options(self, config_fixture,
+                                                                         monkeypatch):
+        assert self.config.get_params().fake_db_event_queue_size == 0
+        assert self.config.get_params().fake_db_event_queue_overflow == EventQueueOverflow.BLOCK
+        monkeypatch.setenv('SDL_FAKE_DB_EVENT_QUEUE_SIZE', '100')
+        monkeypatch.setenv('SDL_FAKE_DB_EVENT_QUEUE_OVERFLOW', 'drop-oldest')
+        params = _Configuration(fake_db_backend='dict').get_params()
+        assert params.fake_db_event_queue_size == 100
+        assert params.fake_db_event_queue_overflow == EventQueueOverflow.DROP_OLDEST
+        params = _Configuration(fake_db_backend='dict',
+                                fake_db_options={'event_queue_overflow': 'raise'}).get_params()
+        assert params.fake_db_event_queue_overflow == EventQueueOverflow.RAISE
+
+    def test_fake_db_options_are_not_database_connection_options(self, config_fixture):
+        with pytest.raises(ValueError, match=r"Unknown database connection options: "
+                                             r"fake_db_event_queue_size"):
+            _Configuration(fake_db_backend='dict', fake_db_event_queue_size=1)
+        with pytest.raises(ValueError, match=r"Unknown fake database options: queue_size"):
+            _Configuration(fake_db_backend='dict', fake_db_options={'queue_size': 1})
+
+    def test_get_params_function_can_return_redis_cluster_type(self, config_fixture,
+                                                               monkeypatch):
+        monkeypatch.delenv('DBAAS_SERVICE_SENTINEL_PORT')
+        monkeypatch.setenv('SDL_DB_REDIS_CLUSTER', 'true')
+        assert _Configuration(fake_db_backend=None).get_params().db_type == \
+            DbBackendType.REDIS_CLUSTER
+        assert _Configuration(fake_db_backend='dict').get_params().db_type == \
+            DbBackendType.FAKE_DICT
+        monkeypatch.setenv('SDL_DB_REDIS_CLUSTER', 'false')
+        assert _Configuration(fake_db_backend=None).get_params().db_type == DbBackendType.REDIS
+
+    def test_get_params_function_can_raise_exception_if_redis_cluster_with_sentinel(
+            self, config_fixture, monkeypatch):
+        monkeypatch.setenv('SDL_DB_REDIS_CLUSTER', 'true')
+        monkeypatch.setenv('DBAAS_SERVICE_SENTINEL_PORT', '26379')
+        with pytest.raises(ValueError, match=r"Configuration error"):
+            _Configuration(fake_db_backend=None)
+
     def test_configuration_object_string_representation(self, config_fixture):
         expected_config_info = {'DB host': 'service-ricplt-dbaas-tcp-cluster-0.ricplt',
                                 'DB ports': ['10000','10001'],
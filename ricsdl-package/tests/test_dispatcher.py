@@ -0,0 +1,241 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import threading
+import time
+import pytest
+from ricsdl.configuration import EventQueueOverflow
+from ricsdl.dispatcher import (_CallbackDispatcher, _EventBatcher)
+from ricsdl.exceptions import BackendError
+
+
+def wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.01)
+    return predicate()
+
+
+class _BlockingCallback:
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, channel, events):
+        self.started.set()
+        self.release.wait(2.0)
+        self.calls.append((channel, events))
+
+
+@pytest.fixture()
+def dispatchers():
+    created = []
+
+    def create(*args, **kwargs):
+        dispatcher = _CallbackDispatcher(*args, **kwargs)
+        created.append(dispatcher)
+        return dispatcher
+    yield create
+    for dispatcher in created:
+        dispatcher.close()
+
+
+def test_dispatch_function_calls_callbacks_of_one_channel_in_order(dispatchers):
+    dispatcher = dispatchers(4)
+    calls = []
+    for i in range(100):
+        dispatcher.dispatch('ch', lambda channel, events: calls.append(events), 'ch', [str(i)])
+    assert wait_for(lambda: len(calls) == 100)
+    assert calls == [[str(i)] for i in range(100)]
+
+
+def test_dispatch_function_calls_callbacks_of_different_channels_in_parallel(dispatchers):
+    dispatcher = dispatchers(2)
+    blocking_cb = _BlockingCallback()
+    calls = []
+    dispatcher.dispatch('ch1', blocking_cb, 'ch1', ['ev1'])
+    assert blocking_cb.started.wait(2.0)
+    dispatcher.dispatch('ch1', lambda channel, events: calls.append(events), 'ch1', ['ev2'])
+    dispatcher.dispatch('ch2', lambda channel, events: calls.append(events), 'ch2', ['ev3'])
+    assert wait_for(lambda: calls == [['ev3']])
+    blocking_cb.release.set()
+    assert wait_for(lambda: calls == [['ev3'], ['ev2']])
+    assert blocking_cb.calls == [('ch1', ['ev1'])]
+
+
+def test_dispatch_function_continues_after_callback_failure(dispatchers):
+    dispatcher = dispatchers(1)
+    calls = []
+
+    def failing_cb(channel, events):
+        raise ValueError('callback failed')
+    dispatcher.dispatch('ch', failing_cb, 'ch', ['ev1'])
+    dispatcher.dispatch('ch', lambda channel, events: calls.append(events), 'ch', ['ev2'])
+    assert wait_for(lambda: calls == [['ev2']])
+
+
+def test_dispatch_function_blocks_when_backlog_is_full(dispatchers):
+    dispatcher = dispatchers(1, 1, EventQueueOverflow.BLOCK)
+    blocking_cb = _BlockingCallback()
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev1'])
+    assert blocking_cb.started.wait(2.0)
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev2'])
+    thread = threading.Thread(target=dispatcher.dispatch, args=('ch', blocking_cb, 'ch', ['ev3']))
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+    blocking_cb.release.set()
+    thread.join(2.0)
+    assert wait_for(lambda: len(blocking_cb.calls) == 3)
+    assert dispatcher.dropped_events == 0
+
+
+def test_dispatch_function_drops_oldest_event_when_backlog_is_full(dispatchers):
+    dispatcher = dispatchers(1, 2, EventQueueOverflow.DROP_OLDEST)
+    blocking_cb = _BlockingCallback()
+    dispatcher.dispatch('ch1', blocking_cb, 'ch1', ['ev1'])
+    assert blocking_cb.started.wait(2.0)
+    dispatcher.dispatch('ch2', blocking_cb, 'ch2', ['ev2'])
+    dispatcher.dispatch('ch1', blocking_cb, 'ch1', ['ev3'])
+    dispatcher.dispatch('ch1', blocking_cb, 'ch1', ['ev4'])
+    blocking_cb.release.set()
+    assert wait_for(lambda: len(blocking_cb.calls) == 3)
+    assert sorted(blocking_cb.calls) == [('ch1', ['ev1']), ('ch1', ['ev3']), ('ch1', ['ev4'])]
+    assert dispatcher.dropped_events == 1
+
+
+def test_dispatch_function_raises_when_backlog_is_full(dispatchers):
+    dispatcher = dispatchers(1, 1, EventQueueOverflow.RAISE)
+    blocking_cb = _BlockingCallback()
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev1'])
+    assert blocking_cb.started.wait(2.0)
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev2'])
+    with pytest.raises(BackendError, match='backlog is full'):
+        dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev3'])
+    blocking_cb.release.set()
+    assert wait_for(lambda: len(blocking_cb.calls) == 2)
+    assert blocking_cb.calls == [('ch', ['ev1']), ('ch', ['ev2'])]
+    assert dispatcher.dropped_events == 1
+
+
+def test_dispatcher_accepts_overflow_handling_as_string(dispatchers):
+    dispatcher = dispatchers(1, 2, 'drop-oldest')
+    blocking_cb = _BlockingCallback()
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev1'])
+    assert blocking_cb.started.wait(2.0)
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev2'])
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev3'])
+    dispatcher.dispatch('ch', blocking_cb, 'ch', ['ev4'])
+    blocking_cb.release.set()
+    assert wait_for(lambda: len(blocking_cb.calls) == 3)
+    assert dispatcher.dropped_events == 1
+
+
+@pytest.mark.parametrize('workers, backlog, overflow', [
+    (0, 0, 'block'),
+    (1, -1, 'block'),
+    (1, 0, 'unknown'),
+])
+def test_dispatcher_raises_for_invalid_options(workers, backlog, overflow):
+    with pytest.raises(ValueError, match='Invalid event callback pool options'):
+        _CallbackDispatcher(workers, backlog, overflow)
+
+
+def test_close_function_stops_dispatching(dispatchers):
+    dispatcher = dispatchers(1)
+    calls = []
+    dispatcher.close()
+    dispatcher.dispatch('ch', lambda channel, events: calls.append(events), 'ch', ['ev'])
+    time.sleep(0.05)
+    assert calls == []
+
+
+@pytest.fixture()
+def batchers():
+    created = []
+
+    def create(*args, **kwargs):
+        batcher = _EventBatcher(*args, **kwargs)
+        created.append(batcher)
+        return batcher
+    yield create
+    for batcher in created:
+        batcher.close()
+
+
+def test_event_batcher_delivers_full_batch_in_receiving_thread(batchers):
+    batches = []
+    batcher = batchers(lambda batch: batches.append((threading.current_thread(), batch)), 2, 10)
+    batcher('ch1', ['ev1'])
+    batcher('ch2', ['ev2', 'ev3'])
+    batcher('ch1', ['ev4'])
+    assert batches == [(threading.current_thread(), [('ch1', ['ev1']), ('ch2', ['ev2', 'ev3'])])]
+
+
+def test_event_batcher_add_events_function_collects_list_of_events(batchers):
+    batches = []
+    batcher = batchers(batches.append, 2, 0.05)
+    batcher.add_events([])
+    batcher.add_events([('ch1', ['ev1']), ('ch2', ['ev2']), ('ch1', ['ev3'])])
+    assert batches == [[('ch1', ['ev1']), ('ch2', ['ev2'])], [('ch1', ['ev3'])]]
+    batcher.add_events([('ch1', ['ev4'])])
+    assert wait_for(lambda: len(batches) == 3)
+    assert batches[2] == [('ch1', ['ev4'])]
+
+
+def test_event_batcher_delivers_batch_when_max_latency_expires(batchers):
+    batches = []
+    batcher = batchers(batches.append, 100, 0.05)
+    batcher('ch1', ['ev1'])
+    batcher('ch1', ['ev2'])
+    assert batches == []
+    assert wait_for(lambda: batches == [[('ch1', ['ev1']), ('ch1', ['ev2'])]])
+    batcher('ch1', ['ev3'])
+    assert wait_for(lambda: len(batches) == 2)
+    assert batches[1] == [('ch1', ['ev3'])]
+
+
+def test_event_batcher_flush_function_delivers_collected_events(batchers):
+    batches = []
+    batcher = batchers(batches.append, 100, 10)
+    batcher.flush()
+    batcher('ch1', ['ev1'])
+    batcher.flush()
+    assert batches == [[('ch1', ['ev1'])]]
+
+
+def test_event_batcher_close_function_drops_collected_events(batchers):
+    batches = []
+    batcher = batchers(batches.append, 100, 0.05)
+    batcher('ch1', ['ev1'])
+    batcher.close()
+    time.sleep(0.1)
+    assert batches == []
+
+
+def test_event_batcher_drops_events_added_after_close(batchers):
+    batches = []
+    batcher = batchers(batches.append, 1, 0.05)
+    batcher.close()
+    batcher('ch1', ['ev1'])
+    batcher.flush()
+    assert batches == []
@@ -0,0 +1,316 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+
+import threading
+import time
+from unittest.mock import MagicMock, Mock, call
+import pytest
+from ricsdl.exceptions import (RejectedByBackend, SdlTypeError)
+from ricsdl.instrumentation import (_HotKeys, _InstrumentedBackend, _SlowOperationLog,
+                                    _SpaceSaving, _Statistics, _payload_size)
+
+
+class TestStatistics:
+    def test_record_function_counts_calls_per_operation_and_namespace(self):
+        stats = _Statistics()
+        stats.record('get', 'ns1', 0.0002, 0, 10)
+        stats.record('get', 'ns2', 0.003, 0, 20)
+        stats.record('set', 'ns1', 20.0, 5, 0, RejectedByBackend())
+        ret = stats.get()
+        assert ret['operations']['get']['calls'] == 2
+        assert ret['operations']['get']['bytes_in'] == 30
+        assert ret['operations']['get']['latency_sum'] == pytest.approx(0.0032)
+        assert ret['namespaces']['ns1']['get']['calls'] == 1
+        assert ret['namespaces']['ns1']['set']['errors'] == {'RejectedByBackend': 1}
+        assert ret['namespaces']['ns1']['set']['bytes_out'] == 5
+
+    def test_get_function_returns_cumulative_latency_buckets(self):
+        stats = _Statistics()
+        stats.record('get', 'ns', 0.0001, 0, 0)
+        stats.record('get', 'ns', 0.0002, 0, 0)
+        stats.record('get', 'ns', 20.0, 0, 0)
+        buckets = stats.get()['operations']['get']['latency_buckets']
+        assert buckets[0.0001] == 1
+        assert buckets[0.00025] == 2
+        assert buckets[10.0] == 2
+        assert buckets[float('inf')] == 3
+
+    def test_record_function_counts_calls_of_all_threads(self):
+        stats = _Statistics()
+
+        def record():
+            for _ in range(1000):
+                stats.record('get', 'ns', 0.001, 1, 1)
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stats.get()['operations']['get']['calls'] == 4000
+        assert stats.get()['operations']['get']['bytes_out'] == 4000
+
+    def test_record_function_does_not_keep_counters_of_ended_threads(self):
+        stats = _Statistics()
+        for _ in range(100):
+            thread = threading.Thread(target=stats.record, args=('get', 'ns', 0.001, 1, 1))
+            thread.start()
+            thread.join()
+        stats.record('get', 'ns', 0.001, 1, 1)
+        assert len(stats._thread_counters) == 1
+        assert stats.get()['operations']['get']['calls'] == 101
+        assert stats.get()['namespaces']['ns']['get']['bytes_in'] == 101
+
+    def test_to_prometheus_function_returns_metrics_in_text_format(self):
+        stats = _Statistics()
+        stats.record('get', 'ns"1', 0.0002, 0, 10, RejectedByBackend())
+        text = stats.to_prometheus()
+        assert '# TYPE sdl_operations_total counter\n' in text
+        assert 'sdl_operations_total{operation="get",namespace="ns\\"1"} 1\n' in text
+        assert ('sdl_operation_errors_total{operation="get",namespace="ns\\"1",'
+                'error="RejectedByBackend"} 1\n') in text
+        assert 'sdl_operation_received_bytes_total{operation="get",namespace="ns\\"1"} 10\n' in text
+        assert ('sdl_operation_duration_seconds_bucket{operation="get",namespace="ns\\"1",'
+                'le="0.0001"} 0\n') in text
+        assert ('sdl_operation_duration_seconds_bucket{operation="get",namespace="ns\\"1",'
+                'le="+Inf"} 1\n') in text
+        assert 'sdl_operation_duration_seconds_sum{operation="get",namespace="ns\\"1"} 0.0002\n' \
+            in text
+
+
+class TestSlowOperationLog:
+    def test_record_function_keeps_latest_entries(self):
+        slow_log = _SlowOperationLog(0.1, max_entries=2)
+        for idx in range(3):
+            slow_log.record({'operation': idx})
+        assert slow_log.get() == [{'operation': 1}, {'operation': 2}]
+        slow_log.clear()
+        assert slow_log.get() == []
+
+    def test_record_function_samples_entries(self):
+        slow_log = _SlowOperationLog(0.1, sample_rate=0)
+        slow_log.record({'operation': 'get'})
+        assert slow_log.get() == []
+
+    def test_record_function_can_log_entry(self, caplog):
+        slow_log = _SlowOperationLog(0.1, log=True)
+        slow_log.record({'operation': 'get'})
+        assert caplog.records[0].name == 'ricsdl'
+        assert "Slow SDL operation: {'operation': 'get'}" in caplog.text
+
+    def test_slow_operation_log_can_raise_exception_for_invalid_options(self):
+        with pytest.raises(ValueError):
+            _SlowOperationLog(-1)
+        with pytest.raises(ValueError):
+            _SlowOperationLog(0.1, max_entries=0)
+        with pytest.raises(ValueError):
+            _SlowOperationLog(0.1, sample_rate=1.5)
+
+
+class TestSpaceSaving:
+    def test_top_function_returns_exact_counts_within_capacity(self):
+        summary = _SpaceSaving(3)
+        for item in ['a', 'b', 'a', 'c', 'a', 'b']:
+            summary.add(item)
+        assert summary.top(2) == [('a', 3, 0), ('b', 2, 0)]
+
+    def test_add_function_replaces_least_counted_item_when_full(self):
+        summary = _SpaceSaving(2)
+        summary.add('a', 5)
+        summary.add('b', 2)
+        summary.add('b', 2)
+        summary.add('c', 1)
+        assert summary.top(3) == [('a', 5, 0), ('c', 5, 4)]
+
+    def test_frequent_items_are_found_from_long_stream(self):
+        summary = _SpaceSaving(10)
+        for idx in range(10000):
+            summary.add('hot-{}'.format(idx % 3) if idx % 2 else 'cold-{}'.format(idx))
+        assert sorted(item for item, _, _ in summary.top(3)) == ['hot-0', 'hot-1', 'hot-2']
+
+
+class TestHotKeys:
+    def test_get_keys_function_returns_keys_by_calls_and_bytes(self):
+        hot_keys = _HotKeys(10)
+        hot_keys.record('ns1', [('a', 1), ('b', 100)])
+        hot_keys.record('ns1', [('a', 1)])
+        hot_keys.record('ns2', [('a', 0)])
+        assert hot_keys.get_keys(2, 'calls') == [
+            {'namespace': 'ns1', 'key': 'a', 'calls': 2, 'error': 0},
+            {'namespace': 'ns1', 'key': 'b', 'calls': 1, 'error': 0}]
+        assert hot_keys.get_keys(1, 'bytes') == [
+            {'namespace': 'ns1', 'key': 'b', 'bytes': 100, 'error': 0}]
+        assert hot_keys.get_namespaces(5, 'calls') == [
+            {'namespace': 'ns1', 'calls': 2, 'error': 0},
+            {'namespace': 'ns2', 'calls': 1, 'error': 0}]
+        assert hot_keys.get_namespaces(5, 'bytes') == [
+            {'namespace': 'ns1', 'bytes': 102, 'error': 0}]
+
+    def test_hot_keys_can_raise_exception_for_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            _HotKeys(0)
+        with pytest.raises(SdlTypeError):
+            _HotKeys(1).get_keys(1, 'latency')
+
+
+class TestInstrumentedBackend:
+    def test_instrumented_operation_is_recorded_and_forwarded_to_backend(self):
+        backend = Mock()
+        backend.get_members.return_value = {b'm1', b'm22'}
+        stats = _Statistics()
+        instrumented = _InstrumentedBackend(backend, stats)
+        assert instrumented.get_members('ns', 'group') == {b'm1', b'm22'}
+        backend.get_members.assert_called_once_with('ns', 'group')
+        assert stats.get()['namespaces']['ns']['get_members']['bytes_in'] == 5
+
+    def test_failed_operation_is_recorded_and_exception_is_raised(self):
+        backend = Mock()
+        backend.set.side_effect = RejectedByBackend
+        stats = _Statistics()
+        with pytest.raises(RejectedByBackend):
+            _InstrumentedBackend(backend, stats).set('ns', {'a': b'1'}, atomic=True)
+        ret = stats.get()['operations']['set']
+        assert (ret['calls'], ret['errors']) == (1, {'RejectedByBackend': 1})
+        assert (ret['bytes_out'], ret['bytes_in']) == (1, 0)
+
+    def test_traced_operation_creates_span_with_attributes(self):
+        backend = Mock()
+        backend.get_client_index.return_value = 2
+        backend.set_and_publish.return_value = None
+        tracer = MagicMock()
+        span = tracer.start_as_current_span.return_value.__enter__.return_value
+        instrumented = _InstrumentedBackend(backend, tracer=tracer)
+        instrumented.set_and_publish('ns', {'ch': ['ev']}, {'a': b'1', 'b': b'22'}, atomic=True)
+        tracer.start_as_current_span.assert_called_once_with('sdl.set_and_publish', attributes={
+            'sdl.operation': 'set_and_publish', 'sdl.namespace': 'ns', 'sdl.key_count': 2,
+            'sdl.payload_bytes_out': 3, 'sdl.db_client_index': 2})
+        span.set_attribute.assert_has_calls([call('sdl.payload_bytes_in', 0),
+                                             call('sdl.outcome', 'ok')])
+        backend.get_client_index.assert_called_once_with('ns')
+
+    def test_traced_operation_sets_key_count_of_found_keys_and_outcome_of_failure(self):
+        backend = Mock(spec=['find_keys', 'remove'])
+        backend.find_keys.return_value = ['a', 'b', 'c']
+        backend.remove.side_effect = RejectedByBackend
+        tracer = MagicMock()
+        span = tracer.start_as_current_span.return_value.__enter__.return_value
+        instrumented = _InstrumentedBackend(backend, tracer=tracer)
+        instrumented.find_keys('ns', '*')
+        assert 'sdl.db_client_index' not in tracer.start_as_current_span.call_args[1]['attributes']
+        span.set_attribute.assert_any_call('sdl.key_count', 3)
+        with pytest.raises(RejectedByBackend):
+            instrumented.remove('ns', ['a'])
+        span.set_attribute.assert_called_with('sdl.outcome', 'RejectedByBackend')
+        assert tracer.start_as_current_span.return_value.__exit__.call_count == 2
+
+    def test_slow_operation_is_logged(self):
+        backend = Mock()
+        backend.get_client_index.return_value = 1
+        backend.find_and_get.return_value = {'a': b'1', 'b': b'22'}
+        slow_log = _SlowOperationLog(0)
+        instrumented = _InstrumentedBackend(backend, slow_log=slow_log)
+        instrumented.find_and_get('ns', 'a*', ordered=True)
+        entry = slow_log.get()[0]
+        assert entry['time'] <= time.time()
+        assert entry['duration'] >= 0
+        assert {k: v for k, v in entry.items() if k not in ('time', 'duration')} == {
+            'operation': 'find_and_get', 'namespace': 'ns', 'key_count': 2, 'key_pattern': 'a*',
+            'bytes_out': 0, 'bytes_in': 3, 'db_client_index': 1, 'error': None}
+
+    def test_failed_slow_operation_is_logged_with_error(self):
+        backend = Mock(spec=['set_if'])
+        backend.set_if.side_effect = RejectedByBackend
+        slow_log = _SlowOperationLog(0)
+        with pytest.raises(RejectedByBackend):
+            _InstrumentedBackend(backend, slow_log=slow_log).set_if('ns', 'a', b'1', b'22')
+        entry = slow_log.get()[0]
+        assert (entry['key_count'], entry['bytes_out'], entry['db_client_index'],
+                entry['error']) == (1, 3, None, 'RejectedByBackend')
+
+    def test_fast_operation_is_not_logged(self):
+        slow_log = _SlowOperationLog(10)
+        _InstrumentedBackend(Mock(), slow_log=slow_log).get('ns', ['a'])
+        assert slow_log.get() == []
+
+    def test_accessed_keys_are_tracked(self):
+        backend = Mock()
+        backend.get.return_value = {'a': b'1'}
+        backend.is_member.return_value = True
+        hot_keys = _HotKeys(10)
+        instrumented = _InstrumentedBackend(backend, hot_keys=hot_keys)
+        instrumented.set_and_publish('ns', {'ch': ['ev']}, {'a': b'22'}, atomic=True)
+        instrumented.get('ns', ['a', 'b'])
+        instrumented.set_if('ns', 'a', b'1', b'333')
+        instrumented.is_member('ns', 'group', b'm1')
+        instrumented.find_keys('ns', '*')
+        assert hot_keys.get_keys(3, 'calls') == [
+            {'namespace': 'ns', 'key': 'a', 'calls': 3, 'error': 0},
+            {'namespace': 'ns', 'key': 'b', 'calls': 1, 'error': 0},
+            {'namespace': 'ns', 'key': 'group', 'calls': 1, 'error': 0}]
+        assert hot_keys.get_keys(1, 'bytes') == [
+            {'namespace': 'ns', 'key': 'a', 'bytes': 6, 'error': 0}]
+        assert hot_keys.get_namespaces(1, 'calls') == [
+            {'namespace': 'ns', 'calls': 4, 'error': 0}]
+
+    def test_keys_of_batch_operations_are_tracked(self):
+        backend = Mock()
+        backend.execute_batch.return_value = [None, {'a': b'22'}, True]
+        hot_keys = _HotKeys(10)
+        instrumented = _InstrumentedBackend(backend, hot_keys=hot_keys)
+        instrumented.execute_batch([('set', 'ns1', ({'a': b'1'}, True)),
+                                    ('get', 'ns1', (['a', 'b'],)),
+                                    ('is_member', 'ns2', ('group', b'm1'))])
+        assert hot_keys.get_keys(3, 'calls') == [
+            {'namespace': 'ns1', 'key': 'a', 'calls': 2, 'error': 0},
+            {'namespace': 'ns1', 'key': 'b', 'calls': 1, 'error': 0},
+            {'namespace': 'ns2', 'key': 'group', 'calls': 1, 'error': 0}]
+        assert hot_keys.get_keys(1, 'bytes') == [
+            {'namespace': 'ns1', 'key': 'a', 'bytes': 3, 'error': 0}]
+        assert hot_keys.get_namespaces(2, 'calls') == [
+            {'namespace': 'ns1', 'calls': 2, 'error': 0},
+            {'namespace': 'ns2', 'calls': 1, 'error': 0}]
+
+    def test_traced_batch_has_key_count_and_namespace_of_its_operations(self):
+        backend = Mock(spec=['execute_batch'])
+        backend.execute_batch.return_value = [None, {}]
+        tracer = MagicMock()
+        instrumented = _InstrumentedBackend(backend, tracer=tracer)
+        instrumented.execute_batch([('set', 'ns', ({'a': b'1', 'b': b'22'}, True)),
+                                    ('get', 'ns', (['c'],))])
+        tracer.start_as_current_span.assert_called_once_with('sdl.execute_batch', attributes={
+            'sdl.operation': 'execute_batch', 'sdl.namespace': 'ns', 'sdl.key_count': 3,
+            'sdl.payload_bytes_out': 3})
+
+    def test_other_attributes_are_forwarded_to_backend_without_recording(self):
+        backend = Mock()
+        stats = _Statistics()
+        instrumented = _InstrumentedBackend(backend, stats)
+        instrumented.subscribe_channel('ns', Mock(), ['ch'])
+        backend.subscribe_channel.assert_called_once()
+        assert instrumented.get_redis_connection is backend.get_redis_connection
+        assert stats.get() == {'operations': {}, 'namespaces': {}}
+
+
+def test_payload_size_function_counts_bytes_of_data_arguments():
+    assert _payload_size(b'abc') == 3
+    assert _payload_size({'a': b'1', 'b': b'22'}) == 3
+    assert _payload_size({b'm1', b'm2'}) == 4
+    assert _payload_size(['a', 'b']) == 0
+    assert _payload_size(True) == 0
@@ -0,0 +1,112 @@
+# Copyright (c) 2019 AT&T Intellectual Property.
+# Copyright (c) 2018-2022 Nokia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# This source code is part of the near-RT RIC (RAN Intelligent Controller)
+# platform project (RICP).
+#
+
+import zlib
+import pytest
+from ricsdl.configuration import DbShardingType
+from ricsdl.sharding import (_create_ns_sharding, _NsSharding, get_moved_namespaces)
+
+
+NAMESPACES = ['ns-{}'.format(i) for i in range(1000)]
+NODES = ['dbaas-0', 'dbaas-1', 'dbaas-2']
+
+
+def count_namespaces(sharding):
+    counts = {node: 0 for node in sharding.nodes}
+    for ns in NAMESPACES:
+        counts[sharding.get_node(ns)] += 1
+    return counts
+
+
+@pytest.mark.parametrize('sharding_type', [DbShardingType.CONSISTENT, DbShardingType.RENDEZVOUS])
+class TestNsSharding:
+    def test_get_node_function_does_not_depend_on_node_order(self, sharding_type):
+        sharding = _create_ns_sharding(sharding_type, NODES)
+        reversed_sharding = _create_ns_sharding(sharding_type, list(reversed(NODES)))
+        for ns in NAMESPACES:
+            assert sharding.get_node(ns) == reversed_sharding.get_node(ns)
+            assert sharding.nodes[sharding.get_index(ns)] == sharding.get_node(ns)
+
+    def test_get_node_function_distributes_namespaces_to_all_nodes(self, sharding_type):
+        counts = count_namespaces(_create_ns_sharding(sharding_type, NODES))
+        for count in counts.values():
+            assert len(NAMESPACES) / 6 < count < len(NAMESPACES) / 1.5
+
+    def test_get_node_function_distributes_namespaces_by_weight(self, sharding_type):
+        counts = count_namespaces(_create_ns_sharding(sharding_type, NODES, [1.0, 1.0, 4.0]))
+        assert counts['dbaas-2'] > 1.5 * (counts['dbaas-0'] + counts['dbaas-1'])
+
+    def test_get_moved_namespaces_function_moves_namespaces_only_to_added_node(self,
+                                                                                sharding_type):
+        moved = get_moved_namespaces(NAMESPACES, NODES, NODES + ['dbaas-3'], sharding_type)
+        assert 0 < len(moved) < len(NAMESPACES) / 2
+        for ns, (old_node, new_node) in moved.items():
+            assert old_node in NODES
+            assert new_node == 'dbaas-3'
+
+    def test_get_moved_namespaces_function_moves_namespaces_only_from_removed_node(
+            self, sharding_type):
+        moved = get_moved_namespaces(NAMESPACES, NODES, NODES[:2], sharding_type)
+        assert moved
+        for ns, (old_node, new_node) in moved.items():
+            assert old_node == 'dbaas-2'
+
+    def test_get_node_function_separates_nodes_on_same_host_by_port(self, sharding_type):
+        sharding = _create_ns_sharding(sharding_type, ['dbaas', 'dbaas', 'dbaas'],
+                                       ports=['6379', '6380', '6381'])
+        assert sharding.nodes == ['dbaas:6379', 'dbaas:6380', 'dbaas:6381']
+        counts = count_namespaces(sharding)
+        for count in counts.values():
+            assert len(NAMESPACES) / 6 < count < len(NAMESPACES) / 1.5
+
+    def test_get_moved_namespaces_function_identifies_nodes_by_address_and_port(self,
+                                                                                 sharding_type):
+        moved = get_moved_namespaces(NAMESPACES, ['dbaas', 'dbaas'], ['dbaas', 'dbaas', 'dbaas'],
+                                     sharding_type, old_ports=['6379', '6380'],
+                                     new_ports=['6379', '6380', '6381'])
+        assert 0 < len(moved) < len(NAMESPACES) / 2
+        for ns, (old_node, new_node) in moved.items():
+            assert old_node in ['dbaas:6379', 'dbaas:6380']
+            assert new_node == 'dbaas:6381'
+
+
+def test_ns_sharding_base_class_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        _NsSharding(NODES)
+
+
+def test_modulo_sharding_selects_node_by_crc32_hash():
+    sharding = _create_ns_sharding(DbShardingType.MODULO, NODES)
+    for ns in NAMESPACES[:10]:
+        assert sharding.get_index(ns) == zlib.crc32(ns.encode()) % len(NODES)
+
+
+def test_get_moved_namespaces_function_returns_nothing_if_nodes_are_unchanged():
+    assert get_moved_namespaces(NAMESPACES, NODES, NODES) == {}
+
+
+def test_get_moved_namespaces_function_moves_most_namespaces_with_modulo_sharding():
+    moved = get_moved_namespaces(NAMESPACES, NODES, NODES + ['dbaas-3'], DbShardingType.MODULO)
+    assert len(moved) > len(NAMESPACES) / 2
+
+
+def test_sharding_can_raise_exception_without_nodes():
+    with pytest.raises(ValueError):
+        _create_ns_sharding(DbShardingType.CONSISTENT, [])
@@ -19,12 +19,13 @@
 #
 
 
-from unittest.mock import patch, Mock
+import time
+from unittest.mock import patch, MagicMock, Mock
 import pytest
 from ricsdl.syncstorage import SyncStorage
 from ricsdl.syncstorage import SyncLock
-from ricsdl.syncstorage import func_arg_checker
-from ricsdl.exceptions import (SdlTypeError, NotConnected)
+from ricsdl.syncstorage import func_arg_checker, _sort_by_key
+from ricsdl.exceptions import (SdlTypeError, NotConnected, RejectedByBackend, BackendError)
 
 EVENT_SEPARATOR = "___"
 
@@ -71,18 +72,54 @@ def test_is_active_function_can_catch_backend_exception_and_return_false(self):
 
     def test_set_function_success(self):
         self.storage.set(self.ns, self.dm)
-        self.mock_db_backend.set.assert_called_once_with(self.ns, self.dm)
+        self.mock_db_backend.set.assert_called_once_with(self.ns, self.dm, atomic=True)
+
+    def test_set_function_success_not_atomic(self):
+        self.storage.set(self.ns, self.dm, atomic=False)
+        self.mock_db_backend.set.assert_called_once_with(self.ns, self.dm, atomic=False)
 
     def test_set_function_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
             self.storage.set(123, {'a': b'v1'})
         with pytest.raises(SdlTypeError):
             self.storage.set('ns', [1, 2])
+        with pytest.raises(SdlTypeError):
+            self.storage.set(self.ns, self.dm, atomic=0xbad)
         with pytest.raises(SdlTypeError):
             self.storage.set('ns', {0xbad: b'v1'})
         with pytest.raises(SdlTypeError):
             self.storage.set('ns', {'a': 0xbad})
 
+    def test_set_function_does_not_validate_data_map_items_of_trusted_caller(self):
+        with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+            storage = SyncStorage(trusted_caller=True)
+        storage.set(self.ns, {'a': 'not bytes'})
+        storage.set_and_publish(self.ns, self.channels_and_events, {0xbad: b'v1'})
+        mock_db_backend.return_value.set.assert_called_once_with(self.ns, {'a': 'not bytes'},
+                                                                 atomic=True)
+        with pytest.raises(SdlTypeError):
+            storage.set(self.ns, [1, 2])
+
+    def test_publish_functions_do_not_validate_channels_and_events_of_trusted_caller(self):
+        with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+            storage = SyncStorage(trusted_caller=True)
+        storage.set_and_publish(self.ns, {'ch1': ['ev1___ev2']}, {'a': b'v1'})
+        storage.remove_and_publish(self.ns, {0xbad: 'ev1'}, 'a')
+        mock_db_backend.return_value.set_and_publish.assert_called_once_with(
+            self.ns, {'ch1': ['ev1___ev2']}, {'a': b'v1'}, atomic=True)
+        mock_db_backend.return_value.remove_and_publish.assert_called_once_with(
+            self.ns, {0xbad: ['ev1']}, ['a'], atomic=True)
+        with pytest.raises(SdlTypeError):
+            storage.remove_and_publish(self.ns, [0xbad], 'a')
+
+    def test_db_connection_options_are_given_to_configuration(self):
+        with patch('ricsdl.backend.get_backend_instance'):
+            storage = SyncStorage(db_connection_options={'db_socket_timeout': 1,
+                                                         'db_max_connections': 50})
+        params = storage.get_configuration().get_params()
+        assert params.db_socket_timeout == 1.0
+        assert params.db_max_connections == 50
+
     def test_set_if_function_success(self):
         self.mock_db_backend.set_if.return_value = True
         ret = self.storage.set_if(self.ns, self.key, self.old_data, self.new_data)
@@ -141,6 +178,20 @@ def test_get_function_success(self):
         # Validate that SDL returns a dictionary with keys in alphabetical order
         assert sorted(self.dm)[0] == list(ret.keys())[0]
 
+    def test_get_function_reads_sorted_keys_and_returns_sorted_backend_result_as_such(self):
+        sorted_dm = {'a': b'1', 'b': b'2'}
+        self.mock_db_backend.get.return_value = sorted_dm
+        ret = self.storage.get(self.ns, self.keys)
+        self.mock_db_backend.get.assert_called_once_with(self.ns, ['a', 'b'])
+        assert ret is sorted_dm
+
+    def test_get_function_unordered_returns_backend_result_as_such(self):
+        self.mock_db_backend.get.return_value = self.dm
+        ret = self.storage.get(self.ns, self.keys, ordered=False)
+        assert ret is self.dm
+        with pytest.raises(SdlTypeError):
+            self.storage.get(self.ns, self.keys, ordered='no')
+
     def test_get_function_can_return_empty_dict_when_no_key_values_exist(self):
         self.mock_db_backend.get.return_value = dict()
         ret = self.storage.get(self.ns, self.keys)
@@ -178,15 +229,24 @@ def test_find_keys_function_can_raise_exception_for_wrong_argument(self):
     def test_find_and_get_function_success(self):
         self.mock_db_backend.find_and_get.return_value = self.dm
         ret = self.storage.find_and_get(self.ns, self.keyprefix)
-        self.mock_db_backend.find_and_get.assert_called_once_with(self.ns, self.keyprefix)
+        self.mock_db_backend.find_and_get.assert_called_once_with(self.ns, self.keyprefix,
+                                                                  ordered=True)
         assert ret == self.dm
         # Validate that SDL returns a dictionary with keys in alphabetical order
         assert sorted(self.dm)[0] == list(ret.keys())[0]
 
+    def test_find_and_get_function_unordered_returns_backend_result_as_such(self):
+        self.mock_db_backend.find_and_get.return_value = self.dm
+        ret = self.storage.find_and_get(self.ns, self.keyprefix, ordered=False)
+        self.mock_db_backend.find_and_get.assert_called_once_with(self.ns, self.keyprefix,
+                                                                  ordered=False)
+        assert ret is self.dm
+
     def test_find_and_get_function_can_return_empty_dict_when_no_keys_exist(self):
         self.mock_db_backend.find_and_get.return_value = dict()
         ret = self.storage.find_and_get(self.ns, self.keyprefix)
-        self.mock_db_backend.find_and_get.assert_called_once_with(self.ns, self.keyprefix)
+        self.mock_db_backend.find_and_get.assert_called_once_with(self.ns, self.keyprefix,
+                                                                  ordered=True)
         assert ret == dict()
 
     def test_find_and_get_function_can_raise_exception_for_wrong_argument(self):
@@ -195,6 +255,40 @@ def test_find_and_get_function_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
             self.storage.find_and_get(self.ns, 0xbad)
 
+    def test_iter_keys_function_success(self):
+        self.mock_db_backend.iter_keys.return_value = iter(self.matchedkeys)
+        ret = self.storage.iter_keys(self.ns, self.keyprefix, batch_size=10)
+        self.mock_db_backend.iter_keys.assert_called_once_with(self.ns, self.keyprefix, 10)
+        assert list(ret) == self.matchedkeys
+
+    def test_iter_keys_function_uses_default_batch_size(self):
+        self.storage.iter_keys(self.ns, self.keyprefix)
+        self.mock_db_backend.iter_keys.assert_called_once_with(self.ns, self.keyprefix, 1000)
+
+    def test_iter_keys_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_keys(0xbad, self.keyprefix)
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_keys(self.ns, 0xbad)
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_keys(self.ns, self.keyprefix, '10')
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_keys(self.ns, self.keyprefix, 0)
+
+    def test_iter_items_function_success(self):
+        self.mock_db_backend.iter_items.return_value = iter(self.dm.items())
+        ret = self.storage.iter_items(self.ns, self.keyprefix, batch_size=10)
+        self.mock_db_backend.iter_items.assert_called_once_with(self.ns, self.keyprefix, 10)
+        assert dict(ret) == self.dm
+
+    def test_iter_items_function_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_items(0xbad, self.keyprefix)
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_items(self.ns, 0xbad)
+        with pytest.raises(SdlTypeError):
+            self.storage.iter_items(self.ns, self.keyprefix, batch_size=-1)
+
     def test_remove_function_success(self):
         self.storage.remove(self.ns, self.keys)
         self.mock_db_backend.remove.assert_called_once()
@@ -203,6 +297,11 @@ def test_remove_function_success(self):
         assert isinstance(call_args[1], list)
         assert len(call_args[1]) == len(self.keys)
         assert all(k in call_args[1] for k in self.keys)
+        assert self.mock_db_backend.remove.call_args[1] == {'atomic': True}
+
+    def test_remove_function_success_not_atomic(self):
+        self.storage.remove(self.ns, self.keys, atomic=False)
+        assert self.mock_db_backend.remove.call_args[1] == {'atomic': False}
 
     def test_remove_function_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
@@ -235,11 +334,28 @@ def test_remove_all_function_success(self):
         self.storage.remove_all(self.ns)
         self.mock_db_backend.find_keys.assert_called_once_with(self.ns, '*')
         self.mock_db_backend.remove.assert_called_once_with(self.ns,
-                                                            self.mock_db_backend.find_keys.return_value)
+                                                            self.mock_db_backend.find_keys.return_value,
+                                                            atomic=False)
+
+    def test_remove_all_function_success_in_batches(self):
+        progress_cb = Mock()
+        self.mock_db_backend.remove_all_in_batches.return_value = 3
+        ret = self.storage.remove_all(self.ns, batch_size=100, progress_cb=progress_cb)
+        self.mock_db_backend.remove_all_in_batches.assert_called_once_with(self.ns, 100,
+                                                                           progress_cb)
+        assert not self.mock_db_backend.find_keys.called
+        assert not self.mock_db_backend.remove.called
+        assert ret == 3
 
     def test_remove_all_function_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
             self.storage.remove_all(0xbad)
+        with pytest.raises(SdlTypeError):
+            self.storage.remove_all(self.ns, batch_size='100')
+        with pytest.raises(SdlTypeError):
+            self.storage.remove_all(self.ns, batch_size=0)
+        with pytest.raises(SdlTypeError):
+            self.storage.remove_all(self.ns, batch_size=100, progress_cb=0xbad)
 
     def test_add_member_function_success(self):
         self.storage.add_member(self.ns, self.group, self.groupmembers)
@@ -320,7 +436,7 @@ def test_set_and_publish_function_success(self):
         self.storage.set_and_publish(self.ns, self.channels_and_events, self.dm)
         self.mock_db_backend.set_and_publish.assert_called_once_with(self.ns,
                                                                      self.channels_and_events,
-                                                                     self.dm)
+                                                                     self.dm, atomic=True)
 
     def test_set_and_publish_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
@@ -440,7 +556,13 @@ def test_set_if_not_exists_and_publish_can_raise_exception_for_wrong_argument(se
     def test_remove_and_publish_function_success(self):
         self.storage.remove_and_publish(self.ns, self.channels_and_events, self.keys)
         self.mock_db_backend.remove_and_publish.assert_called_once_with(
-            self.ns, self.channels_and_events, list(self.keys))
+            self.ns, self.channels_and_events, list(self.keys), atomic=True)
+
+    def test_remove_and_publish_function_success_not_atomic(self):
+        self.storage.remove_and_publish(self.ns, self.channels_and_events, self.keys,
+                                        atomic=False)
+        self.mock_db_backend.remove_and_publish.assert_called_once_with(
+            self.ns, self.channels_and_events, list(self.keys), atomic=False)
 
     def test_remove_and_publish_can_raise_exception_for_wrong_argument(self):
         with pytest.raises(SdlTypeError):
@@ -531,6 +653,68 @@ def cb(channel, message):
         self.mock_db_backend.subscribe_channel.assert_called_once_with(
             self.ns, cb, list(self.channels))
 
+    def test_subscribe_function_can_dispatch_callbacks_to_worker_threads(self):
+        cb = Mock()
+        with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+            storage = SyncStorage(event_callback_pool={'workers': 2})
+        storage.subscribe_channel(self.ns, cb, 'ch1')
+        dispatched_cb = mock_db_backend.return_value.subscribe_channel.call_args[0][1]
+        assert dispatched_cb is not cb
+        dispatched_cb('ch1', ['ev1'])
+        for _ in range(200):
+            if cb.called:
+                break
+            time.sleep(0.01)
+        storage.close()
+        cb.assert_called_once_with('ch1', ['ev1'])
+
+    def test_subscribe_channel_batch_function_success(self):
+        batches = []
+        self.storage.subscribe_channel_batch(self.ns, batches.append, 'ch1', max_events=2)
+        add_events = self.mock_db_backend.subscribe_channel_batch.call_args[0][1]
+        self.mock_db_backend.subscribe_channel_batch.assert_called_once_with(self.ns, add_events,
+                                                                             ['ch1'])
+        add_events([('ch1', ['ev1']), ('ch1', ['ev2']), ('ch1', ['ev3'])])
+        assert batches == [[('ch1', ['ev1']), ('ch1', ['ev2'])], [('ch1', ['ev3'])]]
+
+    def test_subscribe_channel_batch_callback_is_not_called_after_unsubscribe(self):
+        batches = []
+        self.storage.subscribe_channel_batch(self.ns, batches.append, {'ch1', 'ch2'},
+                                             max_latency=0.05)
+        add_events = self.mock_db_backend.subscribe_channel_batch.call_args[0][1]
+        add_events([('ch1', ['ev1'])])
+        self.storage.unsubscribe_channel(self.ns, 'ch1')
+        add_events([('ch2', ['ev2'])])
+        self.storage.handle_events_batch()
+        assert batches == [[('ch1', ['ev1']), ('ch2', ['ev2'])]]
+        self.storage.unsubscribe_channel(self.ns, 'ch2')
+        add_events([('ch2', ['ev3'])])
+        self.storage.handle_events_batch()
+        time.sleep(0.1)
+        assert batches == [[('ch1', ['ev1']), ('ch2', ['ev2'])]]
+
+    def test_subscribe_channel_batch_function_closes_replaced_batcher(self):
+        batches = []
+        self.storage.subscribe_channel_batch(self.ns, batches.append, 'ch1', max_latency=0.05)
+        old_add_events = self.mock_db_backend.subscribe_channel_batch.call_args[0][1]
+        self.storage.subscribe_channel_batch(self.ns, len, 'ch1')
+        old_add_events([('ch1', ['ev1'])])
+        time.sleep(0.1)
+        assert batches == []
+
+    def test_subscribe_channel_batch_can_raise_exception_for_wrong_argument(self):
+        def cb2(channel, message):
+            pass
+        with pytest.raises(SdlTypeError):
+            self.storage.subscribe_channel_batch(self.ns, cb2, self.channels)
+        with pytest.raises(SdlTypeError):
+            self.storage.subscribe_channel_batch(self.ns, len, self.channels, max_events=0)
+        with pytest.raises(SdlTypeError):
+            self.storage.subscribe_channel_batch(self.ns, len, self.channels, max_latency=-1)
+        with pytest.raises(SdlTypeError):
+            self.storage.subscribe_channel_batch(self.ns, len, self.channels, max_events='1')
+        self.mock_db_backend.subscribe_channel_batch.assert_not_called()
+
     def test_subscribe_can_raise_exception_for_wrong_argument(self):
         def cb3(channel, message, extra):
             pass
@@ -554,6 +738,25 @@ def test_handle_events_success(self):
         self.storage.handle_events()
         self.mock_db_backend.handle_events.assert_called()
 
+    def test_handle_events_batch_function_delivers_collected_batches(self):
+        batches = []
+        self.storage.subscribe_channel_batch(self.ns, batches.append, 'ch1', max_latency=10)
+        add_events = self.mock_db_backend.subscribe_channel_batch.call_args[0][1]
+
+        def handle_events_batch(max_events, timeout):
+            add_events([('ch1', ['ev1'])])
+            return [('ch1', ['ev1'])]
+        self.mock_db_backend.handle_events_batch.side_effect = handle_events_batch
+        assert self.storage.handle_events_batch(10, 0.5) == [('ch1', ['ev1'])]
+        self.mock_db_backend.handle_events_batch.assert_called_once_with(10, 0.5)
+        assert batches == [[('ch1', ['ev1'])]]
+
+    def test_handle_events_batch_can_raise_exception_for_wrong_argument(self):
+        with pytest.raises(SdlTypeError):
+            self.storage.handle_events_batch(0)
+        with pytest.raises(SdlTypeError):
+            self.storage.handle_events_batch(10, '1')
+
     @patch('ricsdl.syncstorage.SyncLock')
     def test_get_lock_resource_function_success_when_expiration_time_is_integer(self, mock_db_lock):
         ret = self.storage.get_lock_resource(self.ns, self.lock_name, self.lock_int_expiration)
@@ -577,6 +780,107 @@ def test_get_lock_resource_function_can_raise_exception_for_wrong_argument(self)
         with pytest.raises(SdlTypeError):
             self.storage.get_lock_resource(self.ns, self.lock_name, 'bad')
 
+    def test_batch_function_success(self):
+        self.mock_db_backend.execute_batch.return_value = [None, self.dm, True, False]
+        with self.storage.batch() as batch:
+            set_result = batch.set(self.ns, self.dm)
+            get_result = batch.get(self.ns, self.keys)
+            set_if_result = batch.set_if(self.ns, self.key, self.old_data, self.new_data)
+            publish_result = batch.remove_if_and_publish(self.ns, self.channels_and_events,
+                                                         self.key, self.old_data)
+            assert len(batch) == 4
+            assert not get_result.done()
+        operations = self.mock_db_backend.execute_batch.call_args[0][0]
+        assert operations[0] == ('set', self.ns, (self.dm,))
+        assert operations[1][0:2] == ('get', self.ns)
+        assert sorted(operations[1][2][0]) == sorted(self.keys)
+        assert operations[2] == ('set_if', self.ns, (self.key, self.old_data, self.new_data))
+        assert operations[3] == ('remove_if_and_publish', self.ns,
+                                 ({'ch1': ['ev1'], 'ch2': ['ev1', 'ev2', 'ev3']}, self.key,
+                                  self.old_data))
+        assert set_result.result() is None
+        assert get_result.done()
+        assert get_result.result() == self.dm
+        # Validate that SDL returns a dictionary with keys in alphabetical order
+        assert sorted(self.dm)[0] == list(get_result.result().keys())[0]
+        assert set_if_result.result() is True
+        assert publish_result.result() is False
+
+    def test_batch_get_function_unordered_returns_backend_result_as_such(self):
+        self.mock_db_backend.execute_batch.return_value = [self.dm]
+        with self.storage.batch() as batch:
+            get_result = batch.get(self.ns, self.keys, ordered=False)
+        assert get_result.result() is self.dm
+
+    def test_batch_function_supports_all_key_and_group_operations(self):
+        batch = self.storage.batch()
+        batch.set_if_not_exists(self.ns, self.key, self.new_data)
+        batch.remove(self.ns, self.keys)
+        batch.add_member(self.ns, self.group, self.groupmembers)
+        batch.remove_member(self.ns, self.group, self.groupmembers)
+        batch.get_members(self.ns, self.group)
+        batch.is_member(self.ns, self.group, self.groupmember)
+        batch.group_size(self.ns, self.group)
+        batch.remove_group(self.ns, self.group)
+        batch.set_and_publish(self.ns, self.channels_and_events, self.dm)
+        batch.set_if_and_publish(self.ns, self.channels_and_events, self.key, self.old_data,
+                                 self.new_data)
+        batch.set_if_not_exists_and_publish(self.ns, self.channels_and_events, self.key,
+                                            self.new_data)
+        batch.remove_and_publish(self.ns, self.channels_and_events, self.key)
+        self.mock_db_backend.execute_batch.return_value = [None] * len(batch)
+        batch.execute()
+        operations = self.mock_db_backend.execute_batch.call_args[0][0]
+        assert [op[0] for op in operations] == [
+            'set_if_not_exists', 'remove', 'add_member', 'remove_member', 'get_members',
+            'is_member', 'group_size', 'remove_group', 'set_and_publish', 'set_if_and_publish',
+            'set_if_not_exists_and_publish', 'remove_and_publish']
+        assert len(batch) == 0
+
+    def test_batch_function_does_not_execute_empty_batch(self):
+        with self.storage.batch():
+            pass
+        self.mock_db_backend.execute_batch.assert_not_called()
+
+    def test_batch_function_does_not_execute_batch_if_with_block_raises_exception(self):
+        with pytest.raises(ValueError):
+            with self.storage.batch() as batch:
+                batch.set(self.ns, self.dm)
+                raise ValueError()
+        self.mock_db_backend.execute_batch.assert_not_called()
+
+    def test_batch_result_function_can_raise_operation_exception(self):
+        self.mock_db_backend.execute_batch.return_value = [NotConnected('no connection')]
+        with self.storage.batch() as batch:
+            result = batch.get(self.ns, self.keys)
+        with pytest.raises(NotConnected):
+            result.result()
+
+    def test_batch_result_function_raises_exception_if_batch_is_not_executed(self):
+        result = self.storage.batch().get(self.ns, self.keys)
+        with pytest.raises(RejectedByBackend):
+            result.result()
+
+    def test_batch_execute_function_sets_exception_to_all_results_when_batch_fails(self):
+        self.mock_db_backend.execute_batch.side_effect = NotConnected('no connection')
+        batch = self.storage.batch()
+        result = batch.set(self.ns, self.dm)
+        with pytest.raises(NotConnected):
+            batch.execute()
+        with pytest.raises(NotConnected):
+            result.result()
+
+    def test_batch_functions_can_raise_exception_for_wrong_argument(self):
+        batch = self.storage.batch()
+        with pytest.raises(SdlTypeError):
+            batch.set(self.ns, {'a': 0xbad})
+        with pytest.raises(SdlTypeError):
+            batch.get(0xbad, self.keys)
+        with pytest.raises(SdlTypeError):
+            batch.set_if_and_publish(self.ns, {"ch1": self.ill_event}, self.key, self.old_data,
+                                     self.new_data)
+        assert len(batch) == 0
+
     def test_get_backend_function_success(self):
         ret = self.storage.get_backend()
         assert ret == self.mock_db_backend
@@ -586,6 +890,187 @@ def test_storage_object_string_representation(self):
         assert str_out is not None
 
 
+@pytest.fixture()
+def sync_storage_read_cache_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.keys = {'a', 'b'}
+    request.cls.dm = {'b': b'2', 'a': b'1'}
+    request.cls.group = 'some-group'
+    request.cls.groupmembers = set([b'm1', b'm2'])
+
+    with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+        storage = SyncStorage(read_cache_size=10)
+        request.cls.mock_db_backend = mock_db_backend.return_value
+    request.cls.storage = storage
+    yield
+
+
+@pytest.mark.usefixtures('sync_storage_read_cache_fixture')
+class TestSyncStorageReadCache:
+    def test_get_function_reads_cached_data(self):
+        self.mock_db_backend.get.return_value = {'a': b'1'}
+        assert self.storage.get(self.ns, self.keys) == {'a': b'1'}
+        assert self.storage.get(self.ns, self.keys) == {'a': b'1'}
+        self.mock_db_backend.get.assert_called_once()
+        assert sorted(self.mock_db_backend.get.call_args[0][1]) == sorted(self.keys)
+        self.mock_db_backend.track_namespace.assert_called_once_with(
+            self.ns, self.storage._invalidate_read_cache)
+
+    def test_get_function_reads_only_uncached_keys(self):
+        self.mock_db_backend.get.return_value = {'a': b'1'}
+        self.storage.get(self.ns, {'a'})
+        self.mock_db_backend.get.return_value = {'b': b'2'}
+        assert self.storage.get(self.ns, self.keys) == self.dm
+        self.mock_db_backend.get.assert_called_with(self.ns, ['b'])
+
+    def test_get_function_reads_data_again_after_invalidation(self):
+        self.mock_db_backend.get.return_value = self.dm
+        self.storage.get(self.ns, self.keys)
+        invalidate_cb = self.mock_db_backend.track_namespace.call_args[0][1]
+        invalidate_cb(self.ns, ['a'])
+        self.mock_db_backend.get.return_value = {'a': b'3'}
+        assert self.storage.get(self.ns, self.keys) == {'a': b'3', 'b': b'2'}
+        self.mock_db_backend.get.assert_called_with(self.ns, ['a'])
+
+    def test_get_function_does_not_cache_data_invalidated_during_read(self):
+        def get_and_invalidate(ns, keys):
+            self.storage._invalidate_read_cache(ns, keys)
+            return self.dm
+        self.mock_db_backend.get.side_effect = get_and_invalidate
+        self.storage.get(self.ns, self.keys)
+        self.storage.get(self.ns, self.keys)
+        assert self.mock_db_backend.get.call_count == 2
+
+    def test_write_functions_invalidate_cached_data(self):
+        self.mock_db_backend.get.return_value = self.dm
+        self.storage.get(self.ns, self.keys)
+        self.storage.set(self.ns, {'a': b'3'})
+        self.storage.get(self.ns, self.keys)
+        self.mock_db_backend.get.assert_called_with(self.ns, ['a'])
+        self.storage.remove_and_publish(self.ns, {'ch1': 'ev1'}, 'b')
+        self.storage.get(self.ns, self.keys)
+        self.mock_db_backend.get.assert_called_with(self.ns, ['b'])
+        self.storage.remove_all(self.ns)
+        self.storage.get(self.ns, self.keys)
+        assert sorted(self.mock_db_backend.get.call_args[0][1]) == sorted(self.keys)
+        assert self.mock_db_backend.get.call_count == 4
+
+    def test_batch_write_functions_invalidate_cached_data(self):
+        self.mock_db_backend.get.return_value = self.dm
+        self.storage.get(self.ns, self.keys)
+        with self.storage.batch() as batch:
+            batch.set(self.ns, {'a': b'3'})
+        self.storage.get(self.ns, self.keys)
+        self.mock_db_backend.get.assert_called_with(self.ns, ['a'])
+
+    def test_get_members_and_is_member_functions_read_cached_data(self):
+        self.mock_db_backend.get_members.return_value = self.groupmembers
+        self.mock_db_backend.is_member.return_value = True
+        assert self.storage.get_members(self.ns, self.group) == self.groupmembers
+        assert self.storage.get_members(self.ns, self.group) == self.groupmembers
+        assert self.storage.is_member(self.ns, self.group, b'm1') is True
+        assert self.storage.is_member(self.ns, self.group, b'm1') is True
+        self.mock_db_backend.get_members.assert_called_once_with(self.ns, self.group)
+        self.mock_db_backend.is_member.assert_called_once_with(self.ns, self.group, b'm1')
+        self.storage.add_member(self.ns, self.group, b'm3')
+        self.storage.get_members(self.ns, self.group)
+        self.storage.is_member(self.ns, self.group, b'm1')
+        assert self.mock_db_backend.get_members.call_count == 2
+        assert self.mock_db_backend.is_member.call_count == 2
+
+    def test_get_members_function_returns_copy_of_cached_data(self):
+        self.mock_db_backend.get_members.return_value = self.groupmembers
+        self.storage.get_members(self.ns, self.group).add(b'm3')
+        assert self.storage.get_members(self.ns, self.group) == self.groupmembers
+
+
+@pytest.fixture()
+def sync_storage_statistics_fixture(request):
+    request.cls.ns = 'some-ns'
+    request.cls.dm = {'b': b'2', 'a': b'1'}
+
+    with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+        storage = SyncStorage(statistics=True)
+        request.cls.mock_db_backend = mock_db_backend.return_value
+    request.cls.storage = storage
+    yield
+
+
+@pytest.mark.usefixtures('sync_storage_statistics_fixture')
+class TestSyncStorageStatistics:
+    def test_get_statistics_function_returns_counts_of_backend_operations(self):
+        self.mock_db_backend.get.return_value = self.dm
+        self.storage.set(self.ns, self.dm)
+        self.storage.get(self.ns, {'a', 'b'})
+        self.storage.get(self.ns, {'a', 'b'})
+        stats = self.storage.get_statistics()
+        assert stats['operations']['get']['calls'] == 2
+        assert stats['operations']['get']['bytes_in'] == 4
+        assert stats['namespaces'][self.ns]['set']['calls'] == 1
+        assert stats['namespaces'][self.ns]['set']['bytes_out'] == 2
+        assert stats['namespaces'][self.ns]['set']['latency_buckets'][float('inf')] == 1
+        self.mock_db_backend.set.assert_called_once_with(self.ns, self.dm, atomic=True)
+
+    def test_get_statistics_function_returns_error_counts_by_exception_type(self):
+        self.mock_db_backend.set_if.side_effect = NotConnected
+        with pytest.raises(NotConnected):
+            self.storage.set_if(self.ns, 'a', b'1', b'2')
+        stats = self.storage.get_statistics()
+        assert stats['operations']['set_if']['calls'] == 1
+        assert stats['operations']['set_if']['errors'] == {'NotConnected': 1}
+
+    def test_get_prometheus_metrics_function_returns_metrics_of_operations(self):
+        self.storage.remove(self.ns, {'a'})
+        metrics = self.storage.get_prometheus_metrics()
+        assert 'sdl_operations_total{operation="remove",namespace="some-ns"} 1' in metrics
+        assert ('sdl_operation_duration_seconds_count{operation="remove",namespace="some-ns"} 1'
+                in metrics)
+
+    def test_backend_operations_are_traced_with_given_tracer(self):
+        tracer = MagicMock()
+        with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+            storage = SyncStorage(tracer=tracer)
+        mock_db_backend.return_value.group_size.return_value = 2
+        assert storage.group_size(self.ns, 'group') == 2
+        tracer.start_as_current_span.assert_called_once()
+        assert tracer.start_as_current_span.call_args[0] == ('sdl.group_size',)
+        assert storage.get_statistics() == {'operations': {}, 'namespaces': {}}
+
+    def test_slow_backend_operations_are_logged(self):
+        with patch('ricsdl.backend.get_backend_instance') as mock_db_backend:
+            storage = SyncStorage(slow_operation_log={'threshold': 0, 'max_entries': 1})
+        mock_db_backend.return_value.group_size.return_value = 2
+        storage.group_size(self.ns, 'group')
+        storage.remove(self.ns, {'a'})
+        assert [entry['operation'] for entry in storage.get_slow_operations()] == ['remove']
+
+    def test_hot_keys_and_namespaces_are_tracked(self):
+        with patch('ricsdl.backend.get_backend_instance'):
+            storage = SyncStorage(hot_key_capacity=10)
+        storage.set(self.ns, self.dm)
+        storage.set_if(self.ns, 'a', b'1', b'2')
+        assert storage.get_hot_keys(1) == [
+            {'namespace': self.ns, 'key': 'a', 'calls': 2, 'error': 0}]
+        assert storage.get_hot_namespaces(by='bytes') == [
+            {'namespace': self.ns, 'bytes': 3, 'error': 0}]
+        with pytest.raises(SdlTypeError):
+            storage.get_hot_keys('1')
+        with pytest.raises(SdlTypeError):
+            storage.get_hot_keys(1, by='latency')
+
+    def test_statistics_are_empty_when_disabled(self):
+        with patch('ricsdl.backend.get_backend_instance'):
+            storage = SyncStorage()
+        storage.set(self.ns, self.dm)
+        assert storage.get_statistics() == {'operations': {}, 'namespaces': {}}
+        assert storage.get_prometheus_metrics() == ''
+        assert storage.get_slow_operations() == []
+        assert storage.get_hot_keys() == []
+        assert storage.get_hot_namespaces() == []
+        with pytest.raises(SdlTypeError):
+            storage.get_hot_namespaces(by='latency')
+
+
 @pytest.fixture()
 def lock_fixture(request):
     request.cls.ns = 'some-ns'
@@ -680,3 +1165,32 @@ def _my_func(a='abc', b=1, c={'x', 'y'}, d={'x': b'1'}):
 
     with pytest.raises(SdlTypeError, match=r"Wrong argument type: 'd'=<class 'str'>. "):
         _my_func(d='wrong type')
+
+
+def test_function_mixed_arg_validator():
+    @func_arg_checker(SdlTypeError, 1, a=str, b=(int, float), c=set)
+    def _my_func(self, a='abc', b=1, c={'x', 'y'}):
+        pass
+    _my_func(None, 'abc')
+    _my_func(None, 'abc', 1, c={'z'})
+    with pytest.raises(SdlTypeError, match=r"Wrong argument type: 'c'=<class 'str'>. "):
+        _my_func(None, 'abc', 1.0, c='wrong type')
+    with pytest.raises(SdlTypeError, match=r"Wrong argument type: 'b'=<class 'str'>. "):
+        _my_func(None, 'abc', 'wrong type', c={'z'})
+
+
+def test_sort_by_key_function_copies_only_unsorted_dict():
+    data_map = {'a': b'1', 'b': b'2'}
+    assert _sort_by_key(data_map) is data_map
+    assert _sort_by_key({}) == {}
+    ret = _sort_by_key({'b': b'2', 'a': b'1'})
+    assert list(ret.items()) == [('a', b'1'), ('b', b'2')]
+
+
+def test_fake_db_options_configure_fake_db_event_queue():
+    sdl = SyncStorage(fake_db_backend='dict',
+                      fake_db_options={'event_queue_size': 1, 'event_queue_overflow': 'raise'})
+    sdl.set_and_publish('some-ns', {'ch': 'ev1'}, {'a': b'1'})
+    with pytest.raises(BackendError):
+        sdl.set_and_publish('some-ns', {'ch': 'ev2'}, {'a': b'2'})
+    assert sdl.handle_events() == ('ch', ['ev1'])